@@ -0,0 +1,96 @@
+"""
+Replay benchmark and regression gate for the Song Map position tracker.
+
+Synthesizes performances (drift, rubato, sloppy detection, section jumps)
+of the packaged Song Maps in backend/ plus a synthetic song and a long
+medley, replays them through SongMapPositionTracker.update() and prints
+per-update latency percentiles and position-error statistics.
+
+    python scripts/benchmark_tracker.py                          # Report
+    python scripts/benchmark_tracker.py --save baseline.json     # Record a baseline
+    python scripts/benchmark_tracker.py --baseline baseline.json # Gate: exit 1 on regressions
+"""
+
+import argparse
+import glob
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.realtime.position_tracker import SongMapPositionTracker, TRACKING_MODES
+from src.realtime.replay import run_suite, compare, synthetic_song_map
+
+
+def load_song_maps(medley_sections: int):
+    """Packaged Song Maps in backend/, plus synthetic ones."""
+    backend = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+    song_maps = {}
+    for path in sorted(glob.glob(os.path.join(backend, 'songmap_*.json'))):
+        with open(path) as f:
+            song_maps[os.path.splitext(os.path.basename(path))[0]] = json.load(f)
+    song_maps['synthetic'] = synthetic_song_map(12)
+    if medley_sections:
+        song_maps['medley'] = synthetic_song_map(medley_sections, seed=1)
+    return song_maps
+
+
+def print_results(mode: str, results: dict) -> None:
+    """One line per run."""
+    print(f"\n=== mode={mode} ===")
+    print(f"{'run':32s} {'onsets':>6s} {'p50us':>7s} {'p99us':>7s} {'maxus':>8s} "
+          f"{'err50ms':>8s} {'err95ms':>9s} {'locked':>7s} {'matched':>7s}  recovery")
+    for run, r in results.items():
+        recovery = ', '.join('never' if n is None else str(n) for n in r['recovery']) or '-'
+        print(f"{run:32s} {r['onsets']:6d} {r['onset_p50_us']:7.1f} {r['onset_p99_us']:7.1f} "
+              f"{r['onset_max_us']:8.1f} {r['error_p50_ms']:8.1f} {r['error_p95_ms']:9.1f} "
+              f"{r['locked']:7.3f} {r['matched']:7.3f}  {recovery}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Replay benchmark for SongMapPositionTracker')
+    parser.add_argument('--modes', nargs='+', default=list(TRACKING_MODES), choices=TRACKING_MODES)
+    parser.add_argument('--medley-sections', type=int, default=200,
+                        help='Sections of the synthetic medley (0 to skip it)')
+    parser.add_argument('--save', help='Write results as JSON (a baseline for --baseline)')
+    parser.add_argument('--baseline', help='Compare against a saved run; exit 1 on regressions')
+    parser.add_argument('--latency-tolerance', type=float, default=2.0,
+                        help='Allowed median onset latency ratio to the baseline')
+    parser.add_argument('--accuracy-tolerance', type=float, default=0.02,
+                        help='Allowed drop in matched/locked fractions')
+    args = parser.parse_args()
+
+    song_maps = load_song_maps(args.medley_sections)
+    results = {}
+    for mode in args.modes:
+        # Configured as in live sessions (jump detection in greedy mode)
+        results[mode] = run_suite(
+            song_maps,
+            make_tracker=lambda song_map: SongMapPositionTracker(song_map, mode=mode, jump_detection=True)
+        )
+        print_results(mode, results[mode])
+
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"\nSaved to {args.save}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = []
+        for mode, runs in baseline.items():
+            if mode in results:
+                regressions += [f"{mode}: {r}" for r in compare(
+                    results[mode], runs, args.latency_tolerance, args.accuracy_tolerance)]
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) against {args.baseline}:")
+            for regression in regressions:
+                print(f"  {regression}")
+            sys.exit(1)
+        print(f"\nNo regressions against {args.baseline}")
+
+
+if __name__ == '__main__':
+    main()
@@ -6,60 +6,150 @@ for live performance applications.
 """
 
 import numpy as np
-import librosa
 from typing import Optional, Tuple, List
-from collections import deque
+from dataclasses import dataclass
 import time
 
+from .frame import AnalysisFrame
+from .pitch import StreamingPitchTracker
+from .onset import SpectralFluxOnsetDetector
+from .tempo import OnlineTempoEstimator
+from .beat import BeatTracker
+from .worker import BackgroundAnalysisWorker
+from .tables import note_hz
+from .instrumentation import PipelineStats
+
 
 class RingBuffer:
-    """Efficient ring buffer for audio data."""
+    """
+    Efficient ring buffer for audio data.
+
+    Reads can fill a caller-provided array (``read(out=...)``) or return a
+    view into the buffer (``read_view``), so the steady-state audio path
+    does not allocate. With ``mirrored=True`` every sample is stored twice
+    (double-mapped layout), which makes the most recent ``size`` samples
+    contiguous at all times and lets ``read_view`` avoid copying even when
+    the data wraps.
+
+    With ``n_channels`` set, the buffer holds that many channels side by
+    side: writes take ``(n_channels, n)`` blocks and reads return
+    ``(n_channels, n)`` arrays. Samples are always on the last axis.
+
+    Args:
+        size: Capacity in samples
+        mirrored: Keep a mirrored copy so reads never wrap (default: False)
+        n_channels: Number of channels, or None for a 1-D mono buffer
+    """
 
-    def __init__(self, size: int):
+    def __init__(self, size: int, mirrored: bool = False, n_channels: Optional[int] = None):
         self.size = size
-        self.buffer = np.zeros(size, dtype=np.float32)
+        self.mirrored = mirrored
+        self.n_channels = n_channels
+        self._shape = () if n_channels is None else (n_channels,)
+        self.buffer = np.zeros(self._shape + (2 * size if mirrored else size,), dtype=np.float32)
         self.write_pos = 0
 
+        # Preallocated halves / scratch so reads and writes create no arrays
+        self._halves = (self.buffer[..., :size], self.buffer[..., size:]) if mirrored else (self.buffer,)
+        self._scratch = None if mirrored else np.zeros(self._shape + (size,), dtype=np.float32)
+
     def write(self, data: np.ndarray):
-        """Write data to the ring buffer."""
-        data_len = len(data)
+        """Write data to the ring buffer (samples on the last axis)."""
+        data_len = data.shape[-1]
 
         if data_len > self.size:
             # If data is larger than buffer, only keep the most recent
-            data = data[-self.size:]
+            data = data[..., -self.size:]
             data_len = self.size
 
         # Handle wrap-around
         space_to_end = self.size - self.write_pos
 
-        if data_len <= space_to_end:
-            # Data fits without wrapping
-            self.buffer[self.write_pos:self.write_pos + data_len] = data
-            self.write_pos = (self.write_pos + data_len) % self.size
-        else:
-            # Data wraps around
-            self.buffer[self.write_pos:] = data[:space_to_end]
-            remaining = data_len - space_to_end
-            self.buffer[:remaining] = data[space_to_end:]
-            self.write_pos = remaining
-
-    def read(self, n_samples: Optional[int] = None) -> np.ndarray:
-        """Read most recent n_samples from the buffer (in chronological order)."""
+        for half in self._halves:
+            if data_len <= space_to_end:
+                # Data fits without wrapping
+                half[..., self.write_pos:self.write_pos + data_len] = data
+            else:
+                # Data wraps around
+                half[..., self.write_pos:] = data[..., :space_to_end]
+                half[..., :data_len - space_to_end] = data[..., space_to_end:]
+
+        self.write_pos = (self.write_pos + data_len) % self.size
+
+    def read(self, n_samples: Optional[int] = None, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Read most recent n_samples from the buffer (in chronological order).
+
+        Args:
+            n_samples: Number of samples (default: ``len(out)`` or the buffer size)
+            out: Optional preallocated array to fill instead of allocating
+
+        Returns:
+            A new array, or ``out`` when provided
+        """
         if n_samples is None:
-            n_samples = self.size
+            n_samples = out.shape[-1] if out is not None else self.size
 
         n_samples = min(n_samples, self.size)
 
+        if out is None:
+            out = np.empty(self._shape + (n_samples,), dtype=self.buffer.dtype)
+        elif out.shape[-1] != n_samples:
+            raise ValueError(f"out has {out.shape[-1]} samples, expected {n_samples}")
+
         # Read in chronological order (oldest to newest)
-        if self.write_pos >= n_samples:
+        if self.mirrored or self.write_pos >= n_samples:
             # No wrap-around needed
-            return self.buffer[self.write_pos - n_samples:self.write_pos].copy()
+            out[...] = self.read_view(n_samples)
         else:
             # Wrap-around needed
             part1_size = n_samples - self.write_pos
-            part1 = self.buffer[-part1_size:]
-            part2 = self.buffer[:self.write_pos]
-            return np.concatenate([part1, part2])
+            out[..., :part1_size] = self.buffer[..., -part1_size:]
+            out[..., part1_size:] = self.buffer[..., :self.write_pos]
+
+        return out
+
+    def read_view(self, n_samples: Optional[int] = None) -> np.ndarray:
+        """
+        Read most recent n_samples without copying.
+
+        Returns a view into the buffer whenever the samples are contiguous
+        (always, for a mirrored buffer). Otherwise the samples are gathered
+        into an internal preallocated scratch array. Either way the result
+        is only valid until the next ``write``.
+
+        Args:
+            n_samples: Number of samples (default: buffer size)
+
+        Returns:
+            Array of the most recent samples, oldest first
+        """
+        if n_samples is None:
+            n_samples = self.size
+
+        n_samples = min(n_samples, self.size)
+
+        if self.mirrored:
+            end = self.write_pos + self.size
+            return self.buffer[..., end - n_samples:end]
+
+        if self.write_pos >= n_samples:
+            return self.buffer[..., self.write_pos - n_samples:self.write_pos]
+
+        return self.read(n_samples, out=self._scratch[..., :n_samples])
+
+
+@dataclass
+class BlockAnalysis:
+    """Combined analysis result for one audio block."""
+    time: float  # Stream time of the block (seconds)
+    pitch: Optional[float]  # Hz, or None if unvoiced / low confidence
+    voiced_prob: float  # Voicing probability from the pitch tracker
+    onset: bool  # Onset detected in this block
+    onset_strength: float  # Spectral-flux onset strength
+    beat: bool  # Beat accepted in this block
+    tempo: float  # Current tempo estimate (BPM)
+    next_beat: Optional[float] = None  # Predicted time of the next beat (seconds)
 
 
 class RealtimeAnalyzer:
@@ -67,43 +157,168 @@ class RealtimeAnalyzer:
     Real-time audio analyzer for pitch, onset, and beat detection.
 
     Optimized for low-latency live performance (<15ms per block).
+
+    ``process_block()`` runs every detector on one shared ``AnalysisFrame``
+    (a single FFT per hop). The per-detector methods (``analyze_pitch``,
+    ``detect_onset``, ``estimate_tempo``) keep their own buffers so they can
+    still be called independently with the same block.
+
+    With ``offload=True`` the pitch tracker runs on a background worker
+    thread (see ``worker.py``): ``process_block`` returns as soon as onset,
+    tempo and beat are done and reports the latest published pitch, which
+    may lag the block by a frame or two. Call ``close()`` when finished.
     """
 
-    def __init__(self, sample_rate: int = 44100):
+    def __init__(self, sample_rate: int = 44100, offload: bool = False):
         """
         Initialize the analyzer.
 
         Args:
             sample_rate: Audio sample rate in Hz (default: 44100)
+            offload: Run pitch tracking in process_block() on a background
+                worker thread (default: False)
         """
         self.sample_rate = sample_rate
         self.hop_length = 512  # ~11.6ms at 44.1kHz
         self.frame_length = 2048  # ~46ms at 44.1kHz
 
-        # Buffer for accumulating audio for analysis
-        self.buffer = RingBuffer(size=8192)  # ~185ms of audio
+        # Buffers for accumulating audio for analysis. Mirrored so frames
+        # are read as views and the per-block path does not copy.
+        self.buffer = RingBuffer(size=8192, mirrored=True)  # ~185ms of audio
 
         # Onset detection state
-        self.onset_buffer = RingBuffer(size=4096)
-        self.prev_onset_strength = 0.0
-        self.onset_threshold = 0.3
-
-        # Beat tracking state
-        self.beat_times = deque(maxlen=8)  # Store last 8 beat times
-        self.tempo_estimate = 120.0  # BPM
+        self.onset_buffer = RingBuffer(size=4096, mirrored=True)
+        self.onset_detector = SpectralFluxOnsetDetector(
+            sample_rate=self.sample_rate,
+            n_fft=self.frame_length,
+            threshold=0.3
+        )
+
+        # Beat tracking state (interval statistics and phase-locked grid)
+        self.beat_tracker = BeatTracker(tempo=120.0, history=8)
         self.last_tempo_update = time.time()
-        self.beat_buffer = RingBuffer(size=self.sample_rate * 4)  # 4 seconds
 
-        # Pitch detection configuration
-        self.fmin = librosa.note_to_hz('C2')  # ~65 Hz
-        self.fmax = librosa.note_to_hz('C7')  # ~2093 Hz
+        # Legacy estimate_tempo() state: its own frame, onset strength and
+        # online autocorrelation (updated once per block, no beat_track reruns)
+        self.beat_buffer = RingBuffer(size=self.frame_length, mirrored=True)
+        self.beat_onset_detector = SpectralFluxOnsetDetector(
+            sample_rate=self.sample_rate,
+            n_fft=self.frame_length
+        )
+        self.beat_tempo_tracker = OnlineTempoEstimator(
+            sample_rate=self.sample_rate,
+            hop_length=self.hop_length
+        )
 
-        # Performance tracking
+        # Pitch detection configuration
+        self.fmin = note_hz('C2')  # ~65 Hz
+        self.fmax = note_hz('C7')  # ~2093 Hz
+        self.pitch_tracker = self._make_pitch_tracker()
+
+        # Shared analysis frame for process_block()
+        self.block_buffer = RingBuffer(size=self.frame_length, mirrored=True)
+        self.frame = AnalysisFrame(self.frame_length)
+        self.samples_processed = 0
+
+        # Optional background worker for pitch (latest-value handoff). It
+        # gets its own tracker: analyze_pitch() keeps driving pitch_tracker
+        # on the caller's thread.
+        self.worker: Optional[BackgroundAnalysisWorker] = None
+        if offload:
+            self.worker = BackgroundAnalysisWorker(self._make_pitch_tracker())
+            self.worker.start()
+
+        # Online tempo estimation from the shared onset strength
+        self.tempo_tracker = OnlineTempoEstimator(
+            sample_rate=self.sample_rate,
+            hop_length=self.hop_length
+        )
+        self.last_envelope_tempo_update = 0.0
+
+        # Performance tracking: per-stage latency histograms, deadline misses
+        # and allocation pressure (see instrumentation.py)
         self.last_analysis_time = 0.0
+        self.stats = PipelineStats(stages=('frame', 'onset', 'tempo', 'beat', 'pitch'))
+
+    def _make_pitch_tracker(self) -> StreamingPitchTracker:
+        """Streaming pYIN tracker with the analyzer's pitch configuration."""
+        return StreamingPitchTracker(
+            sample_rate=self.sample_rate,
+            fmin=self.fmin,
+            fmax=self.fmax,
+            frame_length=self.frame_length,
+            hop_length=self.hop_length
+        )
+
+    def process_block(self, audio_block: np.ndarray, current_time: Optional[float] = None) -> BlockAnalysis:
+        """
+        Analyze one audio block with every detector.
+
+        The block is written once, the newest frame is transformed once,
+        and pitch, onset, tempo and beat tracking all read from that frame.
+        Onset, tempo and beat run first; pitch runs inline afterwards, or
+        on the background worker when offloading is enabled.
+
+        Args:
+            audio_block: Audio samples (mono), normally ``hop_length`` long
+            current_time: Optional timestamp for beat tracking (defaults to
+                the stream time, i.e. samples processed / sample rate)
+
+        Returns:
+            BlockAnalysis with pitch, onset, beat and tempo for this block
+        """
+        start_time = self.stats.begin_block()
+
+        self.block_buffer.write(audio_block)
+        self.samples_processed += len(audio_block)
+        if current_time is None:
+            current_time = self.samples_processed / self.sample_rate
+
+        frame = self.frame.update(self.block_buffer.read_view())
+        mark = self.stats.stage('frame', start_time)
+
+        onset, onset_strength = self.onset_detector.process_magnitude(frame.magnitude)
+        mark = self.stats.stage('onset', mark)
+
+        self.tempo_tracker.update(onset_strength)
+        tempo = self._estimate_tempo_from_envelope(current_time)
+        mark = self.stats.stage('tempo', mark)
+
+        beat = self.track_beat(onset, current_time)
+        next_beat = self.beat_tracker.predict_next_beat(current_time)
+        mark = self.stats.stage('beat', mark)
+
+        if self.worker is not None:
+            self.worker.submit(frame, current_time)
+            result = self.worker.pitch.get()
+            if result is None:
+                f0, voiced, voiced_prob = np.nan, False, 0.0
+            else:
+                f0, voiced, voiced_prob = result.f0, result.voiced, result.voiced_prob
+        else:
+            f0, voiced, voiced_prob = self.pitch_tracker.process_frame(frame.samples, frame.spectrum)
+        pitch = f0 if voiced and voiced_prob > 0.5 else None
+        self.stats.stage('pitch', mark)
+
+        self.last_analysis_time = self.stats.end_block(start_time, len(audio_block) / self.sample_rate)
+
+        return BlockAnalysis(
+            time=current_time,
+            pitch=pitch,
+            voiced_prob=voiced_prob,
+            onset=onset,
+            onset_strength=onset_strength,
+            beat=beat,
+            tempo=tempo,
+            next_beat=next_beat
+        )
 
     def analyze_pitch(self, audio_block: np.ndarray) -> Optional[float]:
         """
-        Detect pitch in the audio block using librosa's pyin algorithm.
+        Detect pitch in the audio block using the streaming pYIN tracker.
+
+        Each call evaluates one frame (the most recent ``frame_length``
+        samples) and advances the tracker's Viterbi state by one hop.
 
         Args:
             audio_block: Audio samples (mono)
@@ -111,98 +326,91 @@ class RealtimeAnalyzer:
         Returns:
             Detected pitch in Hz, or None if no pitch detected
         """
-        start_time = time.time()
+        start_time = time.perf_counter()
 
         # Add to buffer
         self.buffer.write(audio_block)
 
         # Get enough samples for pitch detection
-        analysis_samples = self.buffer.read(self.frame_length)
+        analysis_samples = self.buffer.read_view(self.frame_length)
 
         if len(analysis_samples) < self.frame_length:
             return None
 
         try:
-            # Use pyin for robust pitch detection
-            # Lower frame_length for lower latency
-            f0, voiced_flag, voiced_probs = librosa.pyin(
-                analysis_samples,
-                fmin=self.fmin,
-                fmax=self.fmax,
-                sr=self.sample_rate,
-                frame_length=self.frame_length,
-                hop_length=self.hop_length,
-                center=False  # Don't center for lower latency
-            )
+            f0, voiced_flag, voiced_prob = self.pitch_tracker.process_frame(analysis_samples)
 
-            # Get most recent pitch estimate
-            if f0 is not None and len(f0) > 0:
-                # Use the last (most recent) frame
-                recent_f0 = f0[-1]
-                recent_prob = voiced_probs[-1] if voiced_probs is not None else 0.0
-
-                # Only return pitch if confidence is high enough
-                if not np.isnan(recent_f0) and recent_prob > 0.5:
-                    self.last_analysis_time = time.time() - start_time
-                    return float(recent_f0)
+            # Only return pitch if confidence is high enough
+            if voiced_flag and voiced_prob > 0.5:
+                self._record_legacy('pitch', start_time)
+                return f0
 
         except Exception as e:
             # Don't crash on analysis errors
             pass
 
-        self.last_analysis_time = time.time() - start_time
+        self._record_legacy('pitch', start_time)
         return None
 
+    def _record_legacy(self, stage: str, start_time: float):
+        """Record a per-detector call (outside process_block) in the stage histograms."""
+        self.last_analysis_time = time.perf_counter() - start_time
+        self.stats.record(stage, self.last_analysis_time)
+
+    @property
+    def onset_threshold(self) -> float:
+        """Minimum onset strength (the adaptive threshold never drops below it)."""
+        return self.onset_detector.threshold
+
+    @onset_threshold.setter
+    def onset_threshold(self, value: float):
+        self.onset_detector.threshold = value
+
+    @property
+    def prev_onset_strength(self) -> float:
+        """Onset strength of the most recent block."""
+        return self.onset_detector.prev_strength
+
     def detect_onset(self, audio_block: np.ndarray) -> bool:
         """
         Detect onsets (note attacks) in the audio block.
 
+        Uses incremental log-mel spectral flux: one FFT and one mel
+        projection of the newest frame per block.
+
         Args:
             audio_block: Audio samples (mono)
 
         Returns:
             True if onset detected in this block
         """
+        start_time = time.perf_counter()
+
         # Add to onset buffer
         self.onset_buffer.write(audio_block)
 
         # Get samples for onset detection
-        analysis_samples = self.onset_buffer.read(self.frame_length)
+        analysis_samples = self.onset_buffer.read_view(self.frame_length)
 
         if len(analysis_samples) < self.frame_length:
             return False
 
         try:
-            # Compute onset strength
-            onset_env = librosa.onset.onset_strength(
-                y=analysis_samples,
-                sr=self.sample_rate,
-                hop_length=self.hop_length,
-                aggregate=np.median  # More robust than mean
-            )
-
-            # Get most recent onset strength
-            current_strength = onset_env[-1] if len(onset_env) > 0 else 0.0
-
-            # Detect onset using threshold and peak detection
-            # Onset occurs when strength rises above threshold and previous value
-            is_onset = (
-                current_strength > self.onset_threshold and
-                current_strength > self.prev_onset_strength * 1.5
-            )
-
-            self.prev_onset_strength = current_strength
-
-            return is_onset
+            is_onset, _ = self.onset_detector.process_frame(analysis_samples)
 
         except Exception as e:
-            return False
+            is_onset = False
+
+        self._record_legacy('onset', start_time)
+        return is_onset
 
     def estimate_tempo(self, audio_block: Optional[np.ndarray] = None) -> float:
         """
         Estimate current tempo in BPM.
 
-        This is called less frequently than pitch/onset detection.
+        Each block updates an online onset-strength autocorrelation by one
+        frame (bounded cost); the smoothed estimate is refreshed from it at
+        most every 2 seconds.
 
         Args:
             audio_block: Optional audio block to add to buffer
@@ -210,46 +418,67 @@ class RealtimeAnalyzer:
         Returns:
             Estimated tempo in BPM
         """
+        if audio_block is not None:
+            start_time = time.perf_counter()
+            self.beat_buffer.write(audio_block)
+            _, strength = self.beat_onset_detector.process_frame(
+                self.beat_buffer.read_view(self.frame_length)
+            )
+            self.beat_tempo_tracker.update(strength)
+            self._record_legacy('tempo', start_time)
+
         # Only update tempo every 2 seconds to avoid jitter
         current_time = time.time()
         if current_time - self.last_tempo_update < 2.0:
             return self.tempo_estimate
 
-        if audio_block is not None:
-            self.beat_buffer.write(audio_block)
+        # Use previous estimate as prior
+        tempo = self.beat_tempo_tracker.estimate(start_bpm=self.tempo_estimate)
+        if self._apply_tempo_update(tempo):
+            self.last_tempo_update = current_time
 
-        # Get 4 seconds of audio for tempo estimation
-        analysis_samples = self.beat_buffer.read()
+        return self.tempo_estimate
 
-        if len(analysis_samples) < self.sample_rate:  # Need at least 1 second
+    def _estimate_tempo_from_envelope(self, current_time: float) -> float:
+        """Refresh the tempo from the shared onset autocorrelation every 2 seconds."""
+        if current_time - self.last_envelope_tempo_update < 2.0:
             return self.tempo_estimate
 
-        try:
-            # Use librosa's tempo estimation
-            tempo, beats = librosa.beat.beat_track(
-                y=analysis_samples,
-                sr=self.sample_rate,
-                hop_length=self.hop_length,
-                start_bpm=self.tempo_estimate  # Use previous estimate as prior
-            )
+        # Use previous estimate as prior
+        tempo = self.tempo_tracker.estimate(start_bpm=self.tempo_estimate)
+        if self._apply_tempo_update(tempo):
+            self.last_envelope_tempo_update = current_time
 
-            if tempo is not None and tempo > 0:
-                # Smooth tempo estimate (low-pass filter)
-                # Don't change tempo too drastically
-                if isinstance(tempo, np.ndarray):
-                    tempo = tempo[0]
+        return self.tempo_estimate
 
-                # Limit tempo changes to 20 BPM per update
-                tempo_diff = tempo - self.tempo_estimate
-                tempo_diff = np.clip(tempo_diff, -20, 20)
+    def _apply_tempo_update(self, tempo) -> bool:
+        """Smooth a new tempo measurement into the estimate; returns True if applied."""
+        if tempo is None:
+            return False
 
-                self.tempo_estimate = self.tempo_estimate + tempo_diff * 0.3
-                self.last_tempo_update = current_time
+        # Smooth tempo estimate (low-pass filter)
+        # Don't change tempo too drastically
+        if isinstance(tempo, np.ndarray):
+            tempo = tempo[0]
 
-        except Exception as e:
-            pass
+        if tempo <= 0:
+            return False
 
-        return self.tempo_estimate
+        # Limit tempo changes to 20 BPM per update
+        tempo_diff = tempo - self.tempo_estimate
+        tempo_diff = np.clip(tempo_diff, -20, 20)
+
+        self.tempo_estimate = self.tempo_estimate + tempo_diff * 0.3
+        return True
+
+    @property
+    def tempo_estimate(self) -> float:
+        """Current tempo estimate in BPM (held by the beat tracker)."""
+        return self.beat_tracker.tempo
+
+    @tempo_estimate.setter
+    def tempo_estimate(self, value: float):
+        self.beat_tracker.tempo = value
 
     def track_beat(self, onset_detected: bool, current_time: float) -> bool:
         """
@@ -262,52 +491,51 @@ class RealtimeAnalyzer:
         Returns:
             True if a beat is detected
         """
-        if not onset_detected:
-            return False
-
-        # Calculate expected beat interval
-        beat_interval = 60.0 / self.tempo_estimate  # seconds per beat
-
-        if len(self.beat_times) == 0:
-            # First beat
-            self.beat_times.append(current_time)
-            return True
-
-        # Check if enough time has passed since last beat
-        time_since_last_beat = current_time - self.beat_times[-1]
-
-        # Accept beat if it's within 30% of expected interval
-        if time_since_last_beat >= beat_interval * 0.7:
-            self.beat_times.append(current_time)
-
-            # Update tempo estimate based on recent beats
-            if len(self.beat_times) >= 4:
-                recent_intervals = []
-                for i in range(len(self.beat_times) - 1):
-                    interval = self.beat_times[i + 1] - self.beat_times[i]
-                    recent_intervals.append(interval)
+        return self.beat_tracker.process(onset_detected, current_time)
 
-                # Calculate tempo from median interval
-                median_interval = np.median(recent_intervals)
-                if median_interval > 0:
-                    measured_tempo = 60.0 / median_interval
-                    # Smooth with current estimate
-                    self.tempo_estimate = 0.7 * self.tempo_estimate + 0.3 * measured_tempo
+    def predict_next_beat(self, current_time: float) -> Optional[float]:
+        """
+        Predict when the next beat will fall, for scheduling ahead.
 
-            return True
+        Args:
+            current_time: Current time in seconds
 
-        return False
+        Returns:
+            Time of the next beat in seconds, or None before the first beat
+        """
+        return self.beat_tracker.predict_next_beat(current_time)
 
     def get_performance_stats(self) -> dict:
         """
         Get performance statistics for monitoring.
 
         Returns:
-            Dictionary with performance metrics
+            Dictionary with performance metrics, including the structured
+            ``latency`` (per-stage p50/p95/p99/max), ``deadline`` and
+            ``allocations`` sections
         """
-        return {
+        extra_stages = {'pitch_worker': self.worker.latency} if self.worker is not None else None
+        stats = {
+            **self.stats.get_stats(extra_stages),
             'last_analysis_time_ms': self.last_analysis_time * 1000,
             'tempo_bpm': self.tempo_estimate,
-            'beats_tracked': len(self.beat_times),
+            'beats_tracked': self.beat_tracker.n_beats,
+            'beat_interval_std_ms': self.beat_tracker.interval_std * 1000,
             'onset_threshold': self.onset_threshold
         }
+        if self.worker is not None:
+            stats['worker'] = self.worker.get_stats()
+        return stats
+
+    def close(self):
+        """Stop the background worker, if any."""
+        if self.worker is not None:
+            self.worker.stop()
+
+    def __enter__(self):
+        """Context manager entry."""
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Context manager exit."""
+        self.close()
@@ -2,22 +2,59 @@
 Real-time audio input with minimal latency.
 
 Provides thread-safe audio capture from microphone using sounddevice
-with configurable buffer sizes for low-latency applications.
+with configurable buffer sizes for low-latency applications. Blocks are
+handed from the audio callback to the consumer through a preallocated
+lock-free ring (see block_ring.py). A virtual source (see sources.py) can
+replace the microphone for headless tests and load runs. In adaptive mode
+a slow consumer gets several queued blocks merged into one larger block
+instead of losing audio (see latency.py).
 """
 
-import sounddevice as sd
+import asyncio
 import numpy as np
-from queue import Queue, Full
-from typing import Optional, List, Dict, Any
+from queue import Empty
+from typing import Optional, List, Dict, Any, AsyncIterator
 import threading
 import time
 
+from .block_ring import BlockRing
+from .latency import LatencyManager
+from .sources import VirtualSource
+
+try:
+    import sounddevice as sd
+except (ImportError, OSError) as e:
+    # sounddevice not installed or PortAudio missing (e.g. headless CI);
+    # virtual sources still work
+    sd = None
+    _sounddevice_error = e
+
+
+def _require_sounddevice():
+    """Raise a helpful error if audio devices are unavailable."""
+    if sd is None:
+        raise ImportError(
+            "sounddevice/PortAudio not available. Run: pip install sounddevice "
+            "(and install PortAudio), or use a virtual source from realtime.sources\n"
+            f"Original error: {_sounddevice_error}"
+        )
+
 
 class RealtimeAudioInput:
     """Real-time audio input with minimal latency.
 
-    Uses sounddevice for cross-platform audio capture with thread-safe
-    queuing for downstream processing.
+    Uses sounddevice for cross-platform audio capture, or a virtual source
+    that drives the same callback from a file, array or generator. The
+    callback copies
+    each block into a preallocated single-producer/single-consumer ring
+    (no locking or allocation in the audio thread); consumers get a view
+    of the block, valid until their next ``get_block`` call.
+
+    With ``adaptive=True`` the input watches the backlog and drop count on
+    every read. When the consumer falls behind, queued blocks are merged
+    into one analysis block of up to ``max_coalesce`` blocks; when it has
+    caught up, reads shrink back to a single block. Adjustments are
+    reported under ``latency_mode`` in ``get_stats()``.
 
     Args:
         sample_rate: Audio sample rate in Hz (default: 44100)
@@ -25,6 +62,9 @@ class RealtimeAudioInput:
         channels: Number of audio channels (default: 1 for mono)
         device: Input device ID or None for default
         queue_size: Maximum number of blocks to buffer (default: 10)
+        source: Virtual source to play instead of a device (default: None)
+        adaptive: Coalesce queued blocks when the consumer lags (default: False)
+        max_coalesce: Most blocks merged into one read in adaptive mode (default: 4)
 
     Example:
         >>> audio_input = RealtimeAudioInput()
@@ -33,6 +73,11 @@ class RealtimeAudioInput:
         ...     block = audio_input.get_block()
         ...     # Process audio block
         >>> audio_input.stop()
+
+        Headless, 100x real time:
+        >>> source = FileSource('take.wav', speed=100.0)
+        >>> with RealtimeAudioInput(source=source) as audio_input:
+        ...     block = audio_input.get_block(timeout=1.0)
     """
 
     def __init__(
@@ -41,19 +86,28 @@ class RealtimeAudioInput:
         block_size: int = 512,
         channels: int = 1,
         device: Optional[int] = None,
-        queue_size: int = 10
+        queue_size: int = 10,
+        source: Optional[VirtualSource] = None,
+        adaptive: bool = False,
+        max_coalesce: int = 4
     ):
         self.sample_rate = sample_rate
         self.block_size = block_size
         self.channels = channels
         self.device = device
         self.queue_size = queue_size
+        self.source = source
+
+        # Lock-free block ring between the audio thread and the consumer
+        self.ring = BlockRing(queue_size, block_size, channels)
 
-        # Thread-safe audio queue
-        self.audio_queue = Queue(maxsize=queue_size)
+        # Adaptive latency mode: coalesced blocks are assembled in place
+        self.adaptive = adaptive
+        self.latency = LatencyManager(max_coalesce=max_coalesce, high_watermark=queue_size // 2)
+        self._coalesce_buffer = np.zeros((max_coalesce * block_size, channels), dtype=np.float32)
 
         # Stream state
-        self.stream: Optional[sd.InputStream] = None
+        self.stream: Optional['sd.InputStream'] = None
         self.is_running = False
         self.lock = threading.Lock()
 
@@ -63,7 +117,7 @@ class RealtimeAudioInput:
         self.last_error: Optional[str] = None
         self.start_time: Optional[float] = None
 
-    def callback(self, indata: np.ndarray, frames: int, time_info: Any, status: sd.CallbackFlags) -> None:
+    def callback(self, indata: np.ndarray, frames: int, time_info: Any, status: 'sd.CallbackFlags') -> None:
         """Audio callback - runs in separate thread.
 
         This callback is invoked by sounddevice in a separate audio thread.
@@ -79,16 +133,11 @@ class RealtimeAudioInput:
             self.last_error = str(status)
             print(f'⚠️  Audio input warning: {status}')
 
-        try:
-            # Copy data to avoid race conditions
-            audio_copy = indata.copy()
-
-            # Try to add to queue without blocking
-            self.audio_queue.put_nowait(audio_copy)
+        # Copy into the next free slot without blocking
+        if self.ring.write(indata):
             self.blocks_captured += 1
-
-        except Full:
-            # Queue is full - drop this block
+        else:
+            # Ring is full - drop this block
             self.blocks_dropped += 1
             if self.blocks_dropped % 10 == 0:
                 print(f'⚠️  Dropped {self.blocks_dropped} audio blocks (queue full)')
@@ -98,6 +147,7 @@ class RealtimeAudioInput:
 
         Raises:
             RuntimeError: If stream is already running
+            ImportError: If no source is given and sounddevice is unavailable
             sd.PortAudioError: If audio device cannot be opened
         """
         with self.lock:
@@ -105,21 +155,37 @@ class RealtimeAudioInput:
                 raise RuntimeError("Audio stream is already running")
 
             try:
-                # Create and start stream
-                self.stream = sd.InputStream(
-                    samplerate=self.sample_rate,
-                    blocksize=self.block_size,
-                    channels=self.channels,
-                    device=self.device,
-                    callback=self.callback,
-                    dtype=np.float32
-                )
-                self.stream.start()
+                self.ring.clear()
+                self.latency.reset()
+                self.blocks_captured = 0
+                self.blocks_dropped = 0
+
+                if self.source is not None:
+                    # Virtual source drives the callback from its own thread;
+                    # unpaced sources wait for room in the ring instead of dropping
+                    self.source.start(
+                        self.callback,
+                        self.sample_rate,
+                        self.block_size,
+                        self.channels,
+                        has_space=lambda: self.ring.pending < self.queue_size
+                    )
+                else:
+                    _require_sounddevice()
+
+                    # Create and start stream
+                    self.stream = sd.InputStream(
+                        samplerate=self.sample_rate,
+                        blocksize=self.block_size,
+                        channels=self.channels,
+                        device=self.device,
+                        callback=self.callback,
+                        dtype=np.float32
+                    )
+                    self.stream.start()
 
                 self.is_running = True
                 self.start_time = time.time()
-                self.blocks_captured = 0
-                self.blocks_dropped = 0
 
                 # Calculate latency
                 latency_ms = (self.block_size / self.sample_rate) * 1000
@@ -128,7 +194,10 @@ class RealtimeAudioInput:
                 print(f"   Sample rate: {self.sample_rate} Hz")
                 print(f"   Block size: {self.block_size} samples ({latency_ms:.1f}ms)")
                 print(f"   Channels: {self.channels}")
-                print(f"   Device: {self.device if self.device else 'default'}")
+                if self.source is not None:
+                    print(f"   Source: {type(self.source).__name__} (speed: {self.source.speed or 'unpaced'})")
+                else:
+                    print(f"   Device: {self.device if self.device else 'default'}")
 
             except Exception as e:
                 self.last_error = str(e)
@@ -146,6 +215,9 @@ class RealtimeAudioInput:
                 self.stream.close()
                 self.stream = None
 
+            if self.source is not None:
+                self.source.stop()
+
             self.is_running = False
 
             # Print statistics
@@ -159,6 +231,44 @@ class RealtimeAudioInput:
                     drop_rate = (self.blocks_dropped / (self.blocks_captured + self.blocks_dropped)) * 100
                     print(f"   Drop rate: {drop_rate:.2f}%")
 
+    @property
+    def exhausted(self) -> bool:
+        """True once a virtual source has delivered its last block and every block was read."""
+        return self.source is not None and self.source.finished.is_set() and self.ring.pending == 0
+
+    def _coalesce(self, block: Optional[np.ndarray]) -> Optional[np.ndarray]:
+        """Merge queued blocks into ``block`` when adaptive mode calls for it.
+
+        Only blocks that are already queued are merged, so a read never
+        waits longer than it would for a single block.
+
+        Args:
+            block: Block just read from the ring, or None
+
+        Returns:
+            ``block`` itself, or a view of the coalescing buffer holding
+            ``block`` followed by the next queued blocks
+        """
+        if block is None or not self.adaptive:
+            return block
+
+        n_blocks = self.latency.update(self.ring.pending, self.blocks_dropped)
+        if n_blocks == 1:
+            return block
+
+        # Each read releases the previous slot, so copy before reading on.
+        # Slots may hold short blocks (e.g. a source's last one), so merge
+        # by their actual lengths.
+        buffer = self._coalesce_buffer
+        total = len(block)
+        buffer[:total] = block
+        for _ in range(1, n_blocks):
+            queued = self.ring.read_nowait()
+            buffer[total:total + len(queued)] = queued
+            total += len(queued)
+        self.ring.release()
+        return buffer[:total]
+
     def get_block(self, timeout: Optional[float] = None) -> np.ndarray:
         """Get next audio block (blocking).
 
@@ -166,7 +276,11 @@ class RealtimeAudioInput:
             timeout: Maximum time to wait in seconds, or None to wait forever
 
         Returns:
-            Audio block as numpy array of shape (block_size, channels)
+            Audio block as numpy array of shape (block_size, channels), or
+            several merged blocks in adaptive mode (fewer frames if one
+            of them was short). This
+            is a view, valid until the next ``get_block`` /
+            ``get_block_nowait`` call; copy it to keep it longer.
 
         Raises:
             RuntimeError: If stream is not running
@@ -175,21 +289,64 @@ class RealtimeAudioInput:
         if not self.is_running:
             raise RuntimeError("Audio stream is not running. Call start() first.")
 
-        return self.audio_queue.get(timeout=timeout)
+        return self._coalesce(self.ring.read(timeout=timeout))
 
     def get_block_nowait(self) -> Optional[np.ndarray]:
         """Get next audio block without blocking.
 
         Returns:
-            Audio block if available, None otherwise
+            Audio block (a view, as for ``get_block``) if available, None otherwise
         """
         if not self.is_running:
             return None
 
-        try:
-            return self.audio_queue.get_nowait()
-        except:
-            return None
+        return self._coalesce(self.ring.read_nowait())
+
+    async def get_block_async(self, timeout: Optional[float] = None) -> np.ndarray:
+        """Get next audio block without blocking the event loop.
+
+        The audio thread wakes the awaiting coroutine through
+        ``loop.call_soon_threadsafe``, so any number of inputs can share
+        one event loop.
+
+        Args:
+            timeout: Maximum time to wait in seconds, or None to wait forever
+
+        Returns:
+            Audio block (a view, as for ``get_block``)
+
+        Raises:
+            RuntimeError: If stream is not running
+            queue.Empty: If timeout expires before block is available
+        """
+        if not self.is_running:
+            raise RuntimeError("Audio stream is not running. Call start() first.")
+
+        return self._coalesce(await self.ring.read_async(timeout=timeout))
+
+    async def blocks(self, poll_interval: float = 0.1) -> AsyncIterator[np.ndarray]:
+        """Iterate over audio blocks as they arrive.
+
+        Ends when the stream is stopped or a virtual source is exhausted.
+        Each block is a view, valid until the next iteration.
+
+        Args:
+            poll_interval: How often an idle iterator re-checks whether the
+                stream was stopped, in seconds (default: 0.1)
+
+        Example:
+            >>> async for block in audio_input.blocks():
+            ...     analyzer.process_block(block[:, 0])
+        """
+        while self.is_running and not self.exhausted:
+            if self.ring.pending:
+                # Backlog: let other coroutines run between blocks
+                await asyncio.sleep(0)
+            try:
+                block = await self.ring.read_async(timeout=poll_interval)
+            except Empty:
+                continue
+            yield self._coalesce(block)
 
     def clear_queue(self) -> int:
         """Clear all pending blocks from queue.
@@ -197,14 +354,7 @@ class RealtimeAudioInput:
         Returns:
             Number of blocks cleared
         """
-        cleared = 0
-        while not self.audio_queue.empty():
-            try:
-                self.audio_queue.get_nowait()
-                cleared += 1
-            except:
-                break
-        return cleared
+        return self.ring.clear()
 
     def get_stats(self) -> Dict[str, Any]:
         """Get current statistics.
@@ -219,9 +369,14 @@ class RealtimeAudioInput:
             'channels': self.channels,
             'blocks_captured': self.blocks_captured,
             'blocks_dropped': self.blocks_dropped,
-            'queue_size': self.audio_queue.qsize(),
+            'queue_size': self.ring.pending,
             'queue_max': self.queue_size,
-            'last_error': self.last_error
+            'last_error': self.last_error,
+            'source': self.source.get_stats() if self.source is not None else None,
+            'latency_mode': {
+                'adaptive': self.adaptive,
+                **self.latency.get_stats(self.block_size)
+            }
         }
 
         if self.start_time and self.is_running:
@@ -246,8 +401,11 @@ def list_audio_devices() -> List[Dict[str, Any]]:
     """List all available audio input devices.
 
     Returns:
-        List of device info dictionaries
+        List of device info dictionaries (empty if sounddevice is unavailable)
     """
+    if sd is None:
+        return []
+
     devices = []
     for idx, device in enumerate(sd.query_devices()):
         if device['max_input_channels'] > 0:
@@ -267,6 +425,9 @@ def get_default_device() -> Optional[Dict[str, Any]]:
     Returns:
         Device info dictionary or None if no default device
     """
+    if sd is None:
+        return None
+
     try:
         device_id = sd.default.device[0]  # Input device
         device = sd.query_devices(device_id)
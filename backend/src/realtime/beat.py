@@ -0,0 +1,180 @@
+"""
+Onset-driven beat tracking for Performia.
+
+Keeps the recent inter-beat intervals in a fixed-size NumPy array with
+running sums (no per-beat list building), derives the tempo from their
+median exactly as ``RealtimeAnalyzer.track_beat`` always has, and keeps a
+phase-locked beat grid so the next beat can be predicted ahead of time.
+"""
+
+import numpy as np
+from typing import Optional
+
+
+class BeatTracker:
+    """
+    Beat tracker with O(1) interval statistics and next-beat prediction.
+
+    An onset is accepted as a beat when at least ``tolerance`` of the
+    expected beat interval has passed since the previous beat. Once
+    ``min_beats`` beats have been seen, each accepted beat smooths the
+    tempo towards ``60 / median(interval)``.
+
+    Next-beat prediction uses a second-order phase-locked loop: the beat
+    grid is ``phase + k * period``. Each accepted beat is matched to the
+    nearest grid point; the phase is pulled ``phase_gain`` of the way
+    towards it and the period is corrected by ``period_gain`` of the
+    per-beat error. Until the first beat the grid period follows the
+    tempo estimate (including one set from outside).
+
+    Args:
+        tempo: Initial tempo in BPM (default: 120)
+        history: Number of recent beats whose intervals are kept (default: 8)
+        min_beats: Beats needed before the tempo is updated (default: 4)
+        smoothing: Weight of a new tempo measurement (default: 0.3)
+        tolerance: Minimum fraction of the beat interval between beats (default: 0.7)
+        phase_gain: Phase correction per beat, 0-1 (default: 0.5)
+        period_gain: Period correction per beat, 0-1 (default: 0.25)
+    """
+
+    def __init__(
+        self,
+        tempo: float = 120.0,
+        history: int = 8,
+        min_beats: int = 4,
+        smoothing: float = 0.3,
+        tolerance: float = 0.7,
+        phase_gain: float = 0.5,
+        period_gain: float = 0.25
+    ):
+        self.initial_tempo = tempo
+        self.history = history
+        self.min_beats = min_beats
+        self.smoothing = smoothing
+        self.tolerance = tolerance
+        self.phase_gain = phase_gain
+        self.period_gain = period_gain
+
+        self.intervals = np.zeros(history - 1)
+        self.reset()
+
+    def reset(self) -> None:
+        """Forget all beats and return to the initial tempo."""
+        self._tempo = self.initial_tempo
+        self.intervals[:] = 0.0
+        self.n_intervals = 0
+        self._next_slot = 0
+        self.interval_sum = 0.0
+        self.interval_sq_sum = 0.0
+
+        self.n_beats = 0
+        self.last_beat_time: Optional[float] = None
+        self.phase: Optional[float] = None  # Phase-locked time of the last beat
+        self.period = self.beat_interval  # Beat grid period (seconds)
+
+    @property
+    def tempo(self) -> float:
+        """Current tempo estimate in BPM."""
+        return self._tempo
+
+    @tempo.setter
+    def tempo(self, value: float):
+        self._tempo = value
+        if self.phase is None:
+            # Grid not locked yet: start it from the new tempo
+            self.period = 60.0 / value
+
+    @property
+    def beat_interval(self) -> float:
+        """Expected seconds per beat at the current tempo."""
+        return 60.0 / self.tempo
+
+    @property
+    def interval_mean(self) -> float:
+        """Mean of the stored intervals (0 if none)."""
+        if self.n_intervals == 0:
+            return 0.0
+        return self.interval_sum / self.n_intervals
+
+    @property
+    def interval_std(self) -> float:
+        """Standard deviation of the stored intervals (0 if none)."""
+        if self.n_intervals == 0:
+            return 0.0
+        mean = self.interval_mean
+        return float(np.sqrt(max(0.0, self.interval_sq_sum / self.n_intervals - mean * mean)))
+
+    def _add_interval(self, interval: float) -> None:
+        """Replace the oldest interval, updating the running sums."""
+        if self.n_intervals == len(self.intervals):
+            old = self.intervals[self._next_slot]
+            self.interval_sum -= old
+            self.interval_sq_sum -= old * old
+        else:
+            self.n_intervals += 1
+
+        self.intervals[self._next_slot] = interval
+        self.interval_sum += interval
+        self.interval_sq_sum += interval * interval
+        self._next_slot = (self._next_slot + 1) % len(self.intervals)
+
+    def _lock_phase(self, beat_time: float) -> None:
+        """Pull the beat grid towards an accepted beat."""
+        if self.phase is None:
+            self.phase = beat_time
+            return
+
+        n_periods = max(1, round((beat_time - self.phase) / self.period))
+        predicted = self.phase + n_periods * self.period
+        error = beat_time - predicted
+        self.phase = predicted + self.phase_gain * error
+        self.period += self.period_gain * error / n_periods
+
+    def process(self, onset_detected: bool, current_time: float) -> bool:
+        """
+        Update with one block's onset decision.
+
+        Args:
+            onset_detected: Whether an onset was detected
+            current_time: Current time in seconds
+
+        Returns:
+            True if the onset was accepted as a beat
+        """
+        if not onset_detected:
+            return False
+
+        if self.last_beat_time is not None:
+            time_since_last_beat = current_time - self.last_beat_time
+            if time_since_last_beat < self.beat_interval * self.tolerance:
+                return False
+            self._add_interval(time_since_last_beat)
+
+        self.last_beat_time = current_time
+        self.n_beats += 1
+
+        # Tempo from the median of the recent intervals
+        if self.n_beats >= self.min_beats and self.n_intervals > 0:
+            median_interval = np.median(self.intervals[:self.n_intervals])
+            if median_interval > 0:
+                measured_tempo = 60.0 / median_interval
+                self._tempo = (1 - self.smoothing) * self._tempo + self.smoothing * measured_tempo
+
+        self._lock_phase(current_time)
+        return True
+
+    def predict_next_beat(self, current_time: float) -> Optional[float]:
+        """
+        Time of the next beat on the phase-locked grid.
+
+        Args:
+            current_time: Current time in seconds
+
+        Returns:
+            First grid time after ``current_time``, or None before any beat
+        """
+        if self.phase is None:
+            return None
+
+        n_periods = max(1, int(np.floor((current_time - self.phase) / self.period)) + 1)
+        return self.phase + n_periods * self.period
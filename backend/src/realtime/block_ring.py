@@ -0,0 +1,234 @@
+"""
+Single-producer / single-consumer block ring for Performia's audio input.
+
+The audio callback must not lock, allocate or wait. ``BlockRing``
+preallocates ``capacity + 1`` fixed-size float32 slots; the producer
+(audio thread) copies each block into the next free slot and the consumer
+gets a view of the oldest one, which stays valid until its next read.
+
+The read and write indices only ever grow and each is written by one side
+only, so a plain attribute store (atomic in CPython) publishes a slot
+without a lock. The consumer is woken through a bare lock that only the
+producer releases, and only while the consumer is actually waiting; a
+``threading.Event`` (or ``Queue``) takes a condition lock that the woken
+consumer immediately contends for, which costs the callback several times
+more. An asyncio consumer (``read_async``) is woken with
+``loop.call_soon_threadsafe`` instead, so it never blocks its event loop.
+"""
+
+import asyncio
+import threading
+import time
+import numpy as np
+from queue import Empty
+from typing import Optional, Tuple
+
+
+class BlockRing:
+    """
+    Lock-free SPSC ring of fixed-size audio blocks.
+
+    ``capacity`` blocks can be pending (not yet read) at once, exactly like
+    ``Queue(maxsize=capacity)``; one more slot holds the block the consumer
+    is currently looking at.
+
+    Args:
+        capacity: Maximum number of pending blocks
+        block_size: Samples per block
+        channels: Channels per block (default: 1)
+    """
+
+    def __init__(self, capacity: int, block_size: int, channels: int = 1):
+        self.capacity = capacity
+        self.block_size = block_size
+        self.channels = channels
+        self.n_slots = capacity + 1
+
+        self.slots = np.zeros((self.n_slots, block_size, channels), dtype=np.float32)
+        self.lengths = [block_size] * self.n_slots
+        # Per-slot views, so a full-size block costs one slice assignment
+        self._slot_views = list(self.slots)
+        self._slot_shape = (block_size, channels)
+
+        # Written by the producer only
+        self.write_index = 0
+        # Written by the consumer only
+        self.read_index = 0
+        self._held = False  # Consumer holds the slot at read_index
+        self._waiting = False  # Consumer is blocked in read()
+
+        # Locked = no signal. Only the producer releases it, so checking
+        # locked() before release() cannot race.
+        self._wake = threading.Lock()
+        self._wake.acquire()
+        # (loop, future) of an asyncio consumer awaiting a block
+        self._async_waiter: Optional[Tuple[asyncio.AbstractEventLoop, asyncio.Future]] = None
+
+    @property
+    def pending(self) -> int:
+        """Number of blocks written but not yet read."""
+        return self.write_index - self.read_index - self._held
+
+    def write(self, block: np.ndarray) -> bool:
+        """
+        Copy one block into the ring (producer side, never blocks).
+
+        Args:
+            block: Samples, ``(frames, channels)`` or ``(frames,)``; frames
+                beyond ``block_size`` are truncated
+
+        Returns:
+            False if the ring is full and the block was dropped
+        """
+        write_index = self.write_index
+        if write_index - self.read_index >= self.capacity + self._held:
+            return False
+
+        slot = write_index % self.n_slots
+        if block.shape == self._slot_shape:
+            self._slot_views[slot][...] = block
+            self.lengths[slot] = self.block_size
+        else:
+            n = min(len(block), self.block_size)
+            self._slot_views[slot][:n] = block[:n].reshape(n, -1)
+            self.lengths[slot] = n
+
+        # Publish the slot
+        self.write_index = write_index + 1
+        if self._waiting and self._wake.locked():
+            self._wake.release()
+        waiter = self._async_waiter
+        if waiter is not None:
+            self._async_waiter = None
+            self._notify_async(waiter)
+        return True
+
+    @staticmethod
+    def _notify_async(waiter: Tuple[asyncio.AbstractEventLoop, asyncio.Future]) -> None:
+        """Resolve an asyncio consumer's future on its own loop."""
+        loop, future = waiter
+        try:
+            loop.call_soon_threadsafe(_resolve, future)
+        except RuntimeError:
+            # Loop already closed: nobody is waiting any more
+            pass
+
+    def release(self) -> None:
+        """Hand the slot of the last block read back to the producer."""
+        if self._held:
+            # Clear the flag first: the producer then sees the stricter limit
+            self._held = False
+            self.read_index += 1
+
+    def read_nowait(self) -> Optional[np.ndarray]:
+        """
+        Oldest pending block (consumer side).
+
+        Returns:
+            View of the block, valid until the next read or ``release()``,
+            or None if no block is pending
+        """
+        self.release()
+        if self.read_index == self.write_index:
+            return None
+
+        slot = self.read_index % self.n_slots
+        self._held = True
+        view = self._slot_views[slot]
+        n = self.lengths[slot]
+        return view if n == self.block_size else view[:n]
+
+    def read(self, timeout: Optional[float] = None) -> np.ndarray:
+        """
+        Oldest pending block, waiting for one if necessary.
+
+        Args:
+            timeout: Maximum time to wait in seconds, or None to wait forever
+
+        Returns:
+            View of the block, valid until the next read or ``release()``
+
+        Raises:
+            queue.Empty: If timeout expires before a block is available
+        """
+        block = self.read_nowait()
+        if block is not None:
+            return block
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+        self._waiting = True
+        try:
+            while True:
+                # Re-check after announcing the wait, so a block written in
+                # between is not missed (a stale signal only causes one
+                # extra pass)
+                block = self.read_nowait()
+                if block is not None:
+                    return block
+
+                if deadline is None:
+                    self._wake.acquire()
+                else:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise Empty
+                    self._wake.acquire(timeout=remaining)
+        finally:
+            self._waiting = False
+
+    async def read_async(self, timeout: Optional[float] = None) -> np.ndarray:
+        """
+        Oldest pending block, awaiting one without blocking the event loop.
+
+        Args:
+            timeout: Maximum time to wait in seconds, or None to wait forever
+
+        Returns:
+            View of the block, valid until the next read or ``release()``
+
+        Raises:
+            queue.Empty: If timeout expires before a block is available
+        """
+        block = self.read_nowait()
+        if block is not None:
+            return block
+
+        loop = asyncio.get_running_loop()
+        deadline = None if timeout is None else loop.time() + timeout
+        while True:
+            future = loop.create_future()
+            self._async_waiter = (loop, future)
+            try:
+                # Re-check after registering, so a block written in between
+                # is not missed
+                block = self.read_nowait()
+                if block is not None:
+                    return block
+
+                remaining = None if deadline is None else deadline - loop.time()
+                if remaining is not None and remaining <= 0:
+                    raise Empty
+                try:
+                    await asyncio.wait_for(future, remaining)
+                except asyncio.TimeoutError:
+                    raise Empty from None
+            finally:
+                self._async_waiter = None
+
+    def clear(self) -> int:
+        """
+        Drop all pending blocks (consumer side).
+
+        Returns:
+            Number of blocks dropped
+        """
+        self.release()
+        cleared = self.write_index - self.read_index
+        self.read_index += cleared
+        return cleared
+
+
+def _resolve(future: asyncio.Future) -> None:
+    """Wake an awaiting consumer (runs on its event loop)."""
+    if not future.done():
+        future.set_result(None)
@@ -0,0 +1,96 @@
+"""
+Shared per-hop analysis frame for Performia.
+
+Pitch, onset and tempo detection all look at the same most recent frame
+of audio. ``AnalysisFrame`` transforms that frame once per hop and exposes
+the results every detector needs:
+
+- ``spectrum``: rfft of the frame zero-padded to ``2 * frame_length``
+  (its power spectrum gives the non-circular autocorrelation used by YIN)
+- ``magnitude``: the Hann-windowed ``frame_length``-point magnitude
+  spectrum used for spectral flux
+
+The windowed spectrum is derived from the padded one without a second
+FFT: the even bins of a 2N-point transform of a zero-padded frame are its
+N-point DFT, and a periodic Hann window is a 3-tap kernel in frequency
+(0.5 X[k] - 0.25 X[k-1] - 0.25 X[k+1]).
+
+Every array is preallocated and updated in place, so a hop allocates no
+array data (with NumPy >= 2, whose ``rfft`` accepts ``out``).
+"""
+
+import numpy as np
+from typing import Optional
+
+# NumPy 2 FFTs can write into an existing array
+FFT_OUT = np.lib.NumpyVersion(np.__version__) >= '2.0.0'
+
+
+class AnalysisFrame:
+    """
+    One windowed STFT column (plus padded spectrum), computed once per hop.
+
+    With ``n_channels`` set, every array gains a leading channel axis and
+    all channels are transformed in one batched FFT.
+
+    Args:
+        frame_length: Frame length in samples (even)
+        n_channels: Number of channels, or None for 1-D mono arrays
+    """
+
+    def __init__(self, frame_length: int = 2048, n_channels: Optional[int] = None):
+        self.frame_length = frame_length
+        self.n_fft = 2 * frame_length
+        self.n_channels = n_channels
+        shape = () if n_channels is None else (n_channels,)
+
+        # The frame is the first half of the zero-padded FFT input
+        self._padded = np.zeros(shape + (self.n_fft,), dtype=np.float64)
+        self.samples = self._padded[..., :frame_length]
+        self.spectrum = np.zeros(shape + (frame_length + 1,), dtype=np.complex128)
+        self.magnitude = np.zeros(shape + (frame_length // 2 + 1,), dtype=np.float64)
+        self._windowed = np.zeros(shape + (frame_length // 2 + 1,), dtype=np.complex128)
+        self._neighbours = np.zeros(shape + (frame_length // 2 - 1,), dtype=np.complex128)
+        self._edges = np.zeros(shape + (2,), dtype=np.float64)
+
+        # Views of the first and last windowed bins, and of their inner neighbours
+        n_bins = frame_length // 2 + 1
+        self._edge_bins = slice(None, None, n_bins - 1)
+        self._edge_neighbours = slice(1, n_bins - 1, n_bins - 3)
+
+        # Hop counter, -1 until the first update
+        self.index = -1
+
+    def update(self, samples: np.ndarray) -> 'AnalysisFrame':
+        """
+        Transform the newest frame.
+
+        Args:
+            samples: The most recent ``frame_length`` samples, shaped
+                ``(n_channels, frame_length)`` for multi-channel frames
+
+        Returns:
+            self, for chaining
+        """
+        np.copyto(self.samples, samples)
+        if FFT_OUT:
+            np.fft.rfft(self._padded, out=self.spectrum)
+        else:
+            self.spectrum[...] = np.fft.rfft(self._padded)
+
+        # N-point DFT bins 0..N/2, then Hann via the 3-tap kernel. The
+        # neighbours outside 0..N/2 are complex conjugates (real input).
+        bins = self.spectrum[..., ::2]
+        windowed = self._windowed
+        np.multiply(bins, 0.5, out=windowed)
+        neighbours = self._neighbours
+        np.add(bins[..., :-2], bins[..., 2:], out=neighbours)
+        neighbours *= 0.25
+        windowed[..., 1:-1] -= neighbours
+        edges = self._edges
+        np.multiply(bins[..., self._edge_neighbours].real, 0.5, out=edges)
+        windowed[..., self._edge_bins] -= edges
+        np.abs(windowed, out=self.magnitude)
+
+        self.index += 1
+        return self
@@ -0,0 +1,239 @@
+"""
+Always-on latency instrumentation for Performia's real-time analysis.
+
+``LatencyHistogram`` is an HDR-style log-linear histogram: a fixed array
+of buckets (``sub_buckets`` per power of two of microseconds), so
+recording is O(1) with no allocation and percentiles keep the same
+relative precision from microseconds to seconds.
+
+``PipelineStats`` groups one histogram per processing stage with
+block-deadline accounting (a block that takes longer than its own audio
+duration is a miss) and allocation-pressure counters. CPython has no
+cheap per-allocation hook, so allocation pressure is measured through the
+garbage collector: collections (and their pause time) that run inside a
+block, plus the growth of ``sys.getallocatedblocks()`` sampled when stats
+are read.
+"""
+
+import gc
+import math
+import sys
+import time
+import numpy as np
+from typing import Dict, Iterable, Optional
+
+
+# Process-wide GC activity, maintained by a single gc.callbacks hook:
+# [collections started, total pause in seconds, start time of current collection]
+_gc_activity = [0, 0.0, 0.0]
+_gc_hook_installed = False
+
+
+def _gc_callback(phase: str, info: dict):
+    """Count collections and accumulate their pause time."""
+    if phase == 'start':
+        _gc_activity[0] += 1
+        _gc_activity[2] = time.perf_counter()
+    else:
+        _gc_activity[1] += time.perf_counter() - _gc_activity[2]
+
+
+def _install_gc_hook():
+    """Register the GC hook once per process."""
+    global _gc_hook_installed
+    if not _gc_hook_installed:
+        gc.callbacks.append(_gc_callback)
+        _gc_hook_installed = True
+
+
+class LatencyHistogram:
+    """
+    Fixed-size log-linear latency histogram.
+
+    Values are bucketed in microseconds: each power of two is split into
+    ``sub_buckets`` linear buckets, giving ~``100 / sub_buckets`` percent
+    relative precision. Percentiles report the upper edge of their bucket
+    (never above the recorded maximum).
+
+    Args:
+        sub_buckets: Linear buckets per power of two (default: 32)
+        max_exponent: Largest power of two of microseconds tracked
+            (default: 25, i.e. ~33 seconds)
+    """
+
+    def __init__(self, sub_buckets: int = 32, max_exponent: int = 25):
+        self.sub_buckets = sub_buckets
+        self.n_buckets = (max_exponent + 1) * sub_buckets
+
+        # Upper edge (microseconds) of every bucket; bucket 0 holds < 1us and
+        # the last one everything beyond the range
+        index = np.arange(self.n_buckets)
+        exponent, sub = index // sub_buckets, index % sub_buckets
+        self._upper_us = (0.5 + (sub + 1) / (2 * sub_buckets)) * 2.0 ** exponent
+        self._upper_us[0] = 1.0
+        self._upper_us[-1] = np.inf
+
+        self.counts = np.zeros(self.n_buckets, dtype=np.int64)
+        self.reset()
+
+    def reset(self) -> None:
+        """Clear all recorded values."""
+        self.counts[:] = 0
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds: float) -> None:
+        """Record one latency."""
+        us = seconds * 1e6
+        if us < 1.0:
+            index = 0
+        else:
+            mantissa, exponent = math.frexp(us)
+            index = min(exponent * self.sub_buckets + int((mantissa - 0.5) * 2 * self.sub_buckets),
+                        self.n_buckets - 1)
+
+        self.counts[index] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def percentile(self, q: float) -> float:
+        """
+        Latency at percentile ``q`` (0-100), in seconds.
+
+        Returns:
+            Upper edge of the bucket holding the percentile, or 0 if empty
+        """
+        if self.count == 0:
+            return 0.0
+        rank = max(1, int(math.ceil(q / 100.0 * self.count)))
+        index = int(np.searchsorted(np.cumsum(self.counts), rank))
+        return min(self._upper_us[index] * 1e-6, self.max)
+
+    def to_dict(self) -> dict:
+        """Summary in milliseconds."""
+        return {
+            'count': self.count,
+            'mean_ms': (self.total / self.count * 1000) if self.count else 0.0,
+            'p50_ms': self.percentile(50) * 1000,
+            'p95_ms': self.percentile(95) * 1000,
+            'p99_ms': self.percentile(99) * 1000,
+            'max_ms': self.max * 1000
+        }
+
+
+class PipelineStats:
+    """
+    Per-stage latency histograms, deadline misses and allocation pressure.
+
+    Usage per block::
+
+        start = stats.begin_block()
+        t = stats.stage('onset', start)    # time since start
+        t = stats.stage('pitch', t)        # time since previous mark
+        stats.end_block(start, block_period)
+
+    Args:
+        stages: Names of the stages timed inside a block
+    """
+
+    def __init__(self, stages: Iterable[str]):
+        _install_gc_hook()
+        self.stages: Dict[str, LatencyHistogram] = {name: LatencyHistogram() for name in stages}
+        self.total = LatencyHistogram()
+        self.reset()
+
+    def reset(self) -> None:
+        """Clear all counters and histograms."""
+        for histogram in self.stages.values():
+            histogram.reset()
+        self.total.reset()
+
+        self.blocks = 0
+        self.deadline_misses = 0
+        self.worst_overrun = 0.0
+        self.block_period = 0.0
+
+        self.gc_collections = 0
+        self.gc_pause = 0.0
+        self.blocks_with_gc = 0
+        self._gc_at_block_start = (0, 0.0)
+        self._allocated_blocks_baseline = sys.getallocatedblocks()
+
+    def begin_block(self) -> float:
+        """Mark the start of a block; returns the start timestamp."""
+        self._gc_at_block_start = (_gc_activity[0], _gc_activity[1])
+        return time.perf_counter()
+
+    def stage(self, name: str, since: float) -> float:
+        """Record a stage that ran from ``since`` until now; returns now."""
+        now = time.perf_counter()
+        self.stages[name].record(now - since)
+        return now
+
+    def record(self, name: str, seconds: float) -> None:
+        """Record a stage timed elsewhere (e.g. on another thread or by a legacy method)."""
+        self.stages[name].record(seconds)
+
+    def end_block(self, start: float, block_period: float) -> float:
+        """
+        Close a block started with ``begin_block``.
+
+        Args:
+            start: Value returned by ``begin_block``
+            block_period: Audio duration of the block in seconds (the deadline)
+
+        Returns:
+            Total processing time of the block in seconds
+        """
+        elapsed = time.perf_counter() - start
+        self.total.record(elapsed)
+        self.blocks += 1
+        self.block_period = block_period
+
+        if elapsed > block_period:
+            self.deadline_misses += 1
+            self.worst_overrun = max(self.worst_overrun, elapsed - block_period)
+
+        collections = _gc_activity[0] - self._gc_at_block_start[0]
+        if collections:
+            self.gc_collections += collections
+            self.gc_pause += _gc_activity[1] - self._gc_at_block_start[1]
+            self.blocks_with_gc += 1
+
+        return elapsed
+
+    def get_stats(self, extra_stages: Optional[Dict[str, LatencyHistogram]] = None) -> dict:
+        """
+        Structured statistics.
+
+        Args:
+            extra_stages: Additional histograms to report (e.g. from a worker thread)
+
+        Returns:
+            Dictionary with ``latency``, ``deadline`` and ``allocations`` sections
+        """
+        latency = {'total': self.total.to_dict()}
+        for name, histogram in self.stages.items():
+            latency[name] = histogram.to_dict()
+        for name, histogram in (extra_stages or {}).items():
+            latency[name] = histogram.to_dict()
+
+        return {
+            'latency': latency,
+            'deadline': {
+                'blocks': self.blocks,
+                'block_period_ms': self.block_period * 1000,
+                'misses': self.deadline_misses,
+                'miss_rate': self.deadline_misses / self.blocks if self.blocks else 0.0,
+                'worst_overrun_ms': self.worst_overrun * 1000
+            },
+            'allocations': {
+                'gc_collections_in_blocks': self.gc_collections,
+                'gc_pause_in_blocks_ms': self.gc_pause * 1000,
+                'blocks_with_gc': self.blocks_with_gc,
+                'allocated_blocks_growth': sys.getallocatedblocks() - self._allocated_blocks_baseline
+            }
+        }
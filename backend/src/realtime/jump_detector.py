@@ -0,0 +1,211 @@
+"""
+Section jump detection for the Song Map position tracker.
+
+The greedy matcher only looks around where it expects the performer to
+be, so after a skipped or repeated section it keeps matching the wrong
+onsets. ``JumpDetector`` keeps a small set of alternative hypotheses (the
+onsets around the current position, and the starts of the Song Map
+sections plus a few onsets into each, since a jump is only noticed some
+onsets later) and scores every one of them against the pattern of recent
+inter-onset intervals in one vectorized pass. The tracker switches when
+an alternative clearly fits better than the current track, preferring
+the current position unless a section start is clearly better still.
+"""
+
+import numpy as np
+from typing import Optional, Sequence, Tuple
+
+
+class JumpDetector:
+    """
+    Scores section-start hypotheses against recent inter-onset intervals.
+
+    Intervals are compared as log ratios, after fitting each hypothesis's
+    own tempo offset (within ``max_tempo_change``), so a tempo estimate
+    thrown off by the jump itself does not hide the right section. A
+    position near the current one is taken at once (the track slipped); a
+    section start elsewhere only once the next onset confirms it.
+
+    Args:
+        onset_times: Song Map onset times in seconds, sorted
+        section_starts: Onset index at which each section starts
+        pattern_length: Recent intervals compared (default: 5)
+        max_delay: Most onsets after a jump before it is detected, and
+            onsets either side of the current position tried (default: 3)
+        max_tempo_change: Largest tempo ratio fitted per hypothesis (default: 1.25)
+        ioi_tolerance: Seconds added to intervals before taking logs (default: 0.05)
+        max_cost: Highest mean interval error a new position may have (default: 0.1)
+        margin: How much better than the current track it must fit (default: 0.15)
+        local_bias: How much worse a position near the current one may fit
+            than the best section start and still be preferred (default: 0.05)
+        miss_cost: Error counted for an onset the current track did not
+            match, or matched without advancing (default: 1.0)
+    """
+
+    def __init__(
+        self,
+        onset_times: np.ndarray,
+        section_starts: Sequence[int],
+        pattern_length: int = 5,
+        max_delay: int = 3,
+        max_tempo_change: float = 1.25,
+        ioi_tolerance: float = 0.05,
+        max_cost: float = 0.1,
+        margin: float = 0.15,
+        local_bias: float = 0.05,
+        miss_cost: float = 1.0
+    ):
+        self.onset_times = np.ascontiguousarray(onset_times, dtype=np.float64)
+        self.pattern_length = pattern_length
+        self.max_delay = max_delay
+        self.max_tempo_log = np.log(max_tempo_change)
+        self.ioi_tolerance = ioi_tolerance
+        self.max_cost = max_cost
+        self.margin = margin
+        self.local_bias = local_bias
+        self.miss_cost = miss_cost
+
+        self._log_iois = np.log(np.diff(self.onset_times) + ioi_tolerance)
+
+        # Hypotheses: the first interval of the pattern starts at a section
+        # start plus 0..max_delay onsets (sorted, repeats dropped: cheaper
+        # than a hashed np.unique when a session starts on a long map)
+        starts = np.asarray(section_starts, dtype=np.intp)
+        firsts = np.sort((starts[:, None] + np.arange(max_delay + 1)).ravel())
+        keep = (np.diff(firsts, prepend=-1) != 0) & (firsts + pattern_length < len(self.onset_times))
+        self.candidates = firsts[keep]
+        self._patterns = self._log_iois[self.candidates[:, None] + np.arange(pattern_length)]
+
+        self.reset()
+
+    def reset(self) -> None:
+        """Forget pending jumps and statistics (a new performance)."""
+        self.n_checks = 0
+        self.n_jumps = 0
+        self.n_relocks = 0
+        self.last_jump: Optional[dict] = None
+        self._pending: Optional[int] = None
+
+    def track_cost(self, performance_times: Sequence[float], matched: Sequence[int]) -> float:
+        """
+        Mean interval error of the current track over the pattern.
+
+        Args:
+            performance_times: Recent detected onset times
+            matched: Map onset matched to each (-1 if none)
+
+        Returns:
+            Median log-ratio error (so one spurious onset does not count as
+            a lost track), ``miss_cost`` for intervals the track did not
+            follow (an unmatched onset, or a match before the previous one)
+        """
+        n = self.pattern_length
+        times = np.asarray(performance_times, dtype=np.float64)[-n - 1:]
+        matched = np.asarray(matched, dtype=np.intp)[-n - 1:]
+
+        followed = (matched[:-1] >= 0) & (matched[1:] >= matched[:-1])
+        map_iois = self.onset_times[matched[1:]] - self.onset_times[np.maximum(matched[:-1], 0)]
+        residual = (np.log(np.where(followed, map_iois, 1.0) + self.ioi_tolerance)
+                    - np.log(np.diff(times) + self.ioi_tolerance))
+        residual -= np.clip(np.median(residual[followed]) if followed.any() else 0.0,
+                            -self.max_tempo_log, self.max_tempo_log)
+        return float(np.median(np.where(followed, np.abs(residual), self.miss_cost)))
+
+    def check(
+        self,
+        performance_times: Sequence[float],
+        matched: Sequence[int],
+        expected_song_time: float
+    ) -> Optional[Tuple[int, float, float]]:
+        """
+        Look for a jump after the latest onset.
+
+        Args:
+            performance_times: Recent detected onset times, oldest first
+            matched: Map onset matched to each (-1 if none)
+            expected_song_time: Where the current track expects the
+                performer to be, to choose among equally good hypotheses
+
+        Returns:
+            (onset_index, cost, tempo_ratio): the map onset the latest
+            detected onset corresponds to, and the tempo fitted there, if a
+            hypothesis clearly beats the current track; None otherwise
+        """
+        if len(performance_times) < self.pattern_length + 1 or len(self.candidates) == 0:
+            return None
+        times = np.asarray(performance_times, dtype=np.float64)[-self.pattern_length - 1:]
+        matched = np.asarray(matched, dtype=np.intp)[-self.pattern_length - 1:]
+
+        current_cost = self.track_cost(times, matched)
+        if current_cost < self.max_cost + self.margin:
+            return None
+        self.n_checks += 1
+        observed = np.log(np.diff(times) + self.ioi_tolerance)
+
+        # Near the current position first: the track only slipped
+        n = self.pattern_length
+        center = int(self.onset_times.searchsorted(expected_song_time)) - n
+        firsts = np.arange(max(center - self.max_delay, 0), min(center + self.max_delay + 1, len(self._log_iois) - n + 1))
+        local = None
+        if len(firsts):
+            local_costs, local_offsets = self._score(self._log_iois[firsts[:, None] + np.arange(n)], observed)
+            i = int(local_costs.argmin())
+            local = (int(firsts[i]) + n, float(local_costs[i]), float(local_offsets[i]))
+
+        # Then every section start at once
+        costs, offsets = self._score(self._patterns, observed)
+        best_cost = float(costs.min())
+
+        if local is not None and local[1] <= self.max_cost and local[1] <= best_cost + self.local_bias:
+            position, cost, offset = local
+            if matched[-1] == position:
+                return None
+            self.n_relocks += 1
+            return position, cost, float(np.exp(offset))
+
+        if best_cost <= self.max_cost and best_cost + self.margin <= current_cost:
+            # Repeated sections fit equally well: take the one nearest the expected position
+            positions = self.candidates + n
+            near = np.flatnonzero(costs <= best_cost + 0.02)
+            best = near[np.abs(self.onset_times[positions[near]] - expected_song_time).argmin()]
+            position, cost, offset = int(positions[best]), best_cost, float(offsets[best])
+        else:
+            self._pending = None
+            return None
+
+        # Far away: only once the next onset confirms it (among many
+        # sections, some pattern fits a few sloppy onsets by chance)
+        pending, self._pending = self._pending, position
+        if pending != position - 1 or matched[-1] == position:
+            return None
+
+        self.n_jumps += 1
+        self.last_jump = {'from': int(matched[-1]), 'to': position, 'cost': cost, 'replaced_cost': current_cost}
+        return position, cost, float(np.exp(offset))
+
+    def _score(self, patterns: np.ndarray, observed: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Mean interval error of each hypothesis after fitting its tempo.
+
+        Args:
+            patterns: Map log intervals, one row per hypothesis
+            observed: Detected log intervals
+
+        Returns:
+            (costs, log tempo offsets), one per row
+        """
+        residual = patterns - observed
+        k = self.pattern_length // 2
+        offsets = np.clip(np.partition(residual, k, axis=1)[:, k], -self.max_tempo_log, self.max_tempo_log)
+        residual -= offsets[:, None]
+        return np.abs(residual).mean(axis=1), offsets
+
+    def get_stats(self) -> dict:
+        """Get jump detection statistics."""
+        return {
+            'hypotheses': len(self.candidates),
+            'checks': self.n_checks,
+            'jumps': self.n_jumps,
+            'relocks': self.n_relocks,
+            'last_jump': self.last_jump
+        }
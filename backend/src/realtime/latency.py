@@ -0,0 +1,128 @@
+"""
+Latency management for RealtimeAudioInput.
+
+When the consumer falls behind the audio thread, blocks pile up in the
+ring until they are dropped. ``LatencyManager`` watches the backlog and
+the drop counter and picks a coalescing factor: how many queued blocks
+are merged into one larger analysis block. Merging lets a slow consumer
+catch up with fewer, larger calls instead of losing audio; once the
+backlog has stayed empty for a while the factor shrinks back so latency
+returns to a single block.
+"""
+
+import time
+from collections import deque
+from typing import Optional
+
+
+class LatencyManager:
+    """
+    Chooses how many queued blocks to coalesce per read.
+
+    The factor doubles (up to ``max_coalesce``) when the backlog reaches
+    ``high_watermark`` blocks or blocks were dropped since the last read,
+    and halves after ``recovery_reads`` consecutive reads found no backlog.
+    Every change is recorded with its reason.
+
+    Args:
+        max_coalesce: Largest number of blocks merged into one (default: 4)
+        high_watermark: Backlog (in blocks) that triggers growth (default: 5)
+        recovery_reads: Backlog-free reads before shrinking (default: 50)
+        history: Number of adjustments kept for reporting (default: 20)
+    """
+
+    def __init__(
+        self,
+        max_coalesce: int = 4,
+        high_watermark: int = 5,
+        recovery_reads: int = 50,
+        history: int = 20
+    ):
+        if max_coalesce < 1:
+            raise ValueError(f"max_coalesce must be at least 1, got {max_coalesce}")
+        self.max_coalesce = max_coalesce
+        self.high_watermark = max(1, high_watermark)
+        self.recovery_reads = recovery_reads
+
+        self.adjustments = deque(maxlen=history)
+        self.reset()
+
+    def reset(self) -> None:
+        """Return to one block per read and clear all counters."""
+        self.coalesce = 1
+        self.n_grown = 0
+        self.n_shrunk = 0
+        self.max_backlog = 0
+        self.blocks_coalesced = 0
+        self._drops_seen = 0
+        self._idle_reads = 0
+        self.adjustments.clear()
+
+    def update(self, backlog: int, dropped: int) -> int:
+        """
+        Update with the state seen at one read.
+
+        Args:
+            backlog: Blocks still queued after the one being read
+            dropped: Total blocks dropped so far
+
+        Returns:
+            Number of blocks to merge into this read (at most ``backlog + 1``)
+        """
+        self.max_backlog = max(self.max_backlog, backlog)
+        new_drops = dropped - self._drops_seen
+        self._drops_seen = dropped
+
+        if new_drops > 0 or backlog >= self.high_watermark:
+            self._idle_reads = 0
+            if self.coalesce < self.max_coalesce:
+                reason = f"dropped {new_drops} blocks" if new_drops > 0 else f"backlog of {backlog} blocks"
+                self._adjust(min(self.coalesce * 2, self.max_coalesce), reason, backlog)
+                self.n_grown += 1
+        elif backlog == 0:
+            self._idle_reads += 1
+            if self.coalesce > 1 and self._idle_reads >= self.recovery_reads:
+                self._idle_reads = 0
+                self._adjust(self.coalesce // 2, f"no backlog for {self.recovery_reads} reads", backlog)
+                self.n_shrunk += 1
+        else:
+            self._idle_reads = 0
+
+        n_blocks = min(self.coalesce, backlog + 1)
+        self.blocks_coalesced += n_blocks - 1
+        return n_blocks
+
+    def _adjust(self, coalesce: int, reason: str, backlog: int) -> None:
+        """Change the factor and record why."""
+        self.adjustments.append({
+            'time': time.time(),
+            'from': self.coalesce,
+            'to': coalesce,
+            'reason': reason,
+            'backlog': backlog
+        })
+        self.coalesce = coalesce
+
+    def get_stats(self, block_size: Optional[int] = None) -> dict:
+        """
+        Get latency-management statistics.
+
+        Args:
+            block_size: Device block size, to report the analysis block size
+
+        Returns:
+            Dictionary with the current factor, counters and recent adjustments
+        """
+        stats = {
+            'coalesce': self.coalesce,
+            'max_coalesce': self.max_coalesce,
+            'adjustments': self.n_grown + self.n_shrunk,
+            'grown': self.n_grown,
+            'shrunk': self.n_shrunk,
+            'max_backlog': self.max_backlog,
+            'blocks_coalesced': self.blocks_coalesced,
+            'recent_adjustments': list(self.adjustments)
+        }
+        if block_size is not None:
+            stats['analysis_block_size'] = self.coalesce * block_size
+        return stats
@@ -4,6 +4,36 @@ Async Message Bus for Inter-Agent Communication
 High-performance message bus using asyncio for real-time agent communication.
 Supports priority-based routing, pub/sub patterns, and broadcast messaging.
 
+Messages wait in one FIFO lane per priority (``MessageLanes``): publishing
+and dequeuing are O(1) deque operations, with no heap and no message
+comparisons, and messages of equal priority are delivered in the order
+they were published. Lanes drain strictly by priority, or weighted so that
+a flood of high-priority traffic cannot starve the rest.
+
+Delivery goes through a routing table keyed by (message_type, to_agent),
+so a direct message reaches only its target agent's handlers (plus any
+subscribed to the whole type), and a broadcast fans out to every handler
+of its type. Plain functions are called inline; only coroutine handlers
+are awaited, and ``asyncio.gather`` is used only when several are.
+
+Delivery runs on ``delivery_workers`` tasks. A subscriber that may be slow
+gets its own bounded inbox (``subscribe(..., inbox_size=N)``) drained by
+its own task, so the workers only append to it and a slow consumer never
+holds up CRITICAL beat events (plain-function inbox handlers run in the
+default thread pool, so a blocking one cannot stall the event loop
+either); when the inbox is full its overflow policy
+blocks, drops the oldest or newest message, or replaces the newest queued
+message with the latest one. Inbox depth, lag and drops are reported per
+subscriber by ``get_stats()``.
+
+State updates (position, context) can opt in to coalescing by setting a
+``coalesce_key``: while a NORMAL or LOW message with the same
+(message_type, coalesce_key) is still queued, a newer one replaces it in
+place, so consumers only see the latest state and a bursty producer holds
+at most one queued message per key. CRITICAL and HIGH messages are never
+coalesced; one with a key drops the queued update of that key, so the
+older state cannot be delivered after it.
+
 Performance targets:
 - Message publish latency: <0.1ms
 - Message delivery latency: <1ms
@@ -11,18 +41,28 @@ Performance targets:
 - Memory: <10MB for 10,000 queued messages
 """
 
-from dataclasses import dataclass, field
-from typing import Any, Callable, Dict, List, Optional, Set
+from typing import Any, Callable, Dict, List, Optional, Sequence, Set, Tuple
 from enum import IntEnum
 import asyncio
+import inspect
+import itertools
 import time
-from collections import defaultdict
+from collections import defaultdict, deque
 import logging
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+# to_agent of a message for every subscriber of its type
+BROADCAST = "broadcast"
+
+# What a full subscriber inbox does with a new message: wait for space
+# (backpressure on the delivery worker), drop the oldest queued message,
+# drop the new one, or let the new one replace the newest queued message
+OVERFLOW_POLICIES = ('block', 'drop_oldest', 'drop_newest', 'coalesce_latest')
+
+
 class MessagePriority(IntEnum):
     """Message priority levels for queue ordering."""
     CRITICAL = 0   # Beat events, timing-critical updates
@@ -31,25 +71,474 @@ class MessagePriority(IntEnum):
     LOW = 3        # Logging, analytics, non-critical
 
 
-@dataclass(order=True)
+# Lowest-urgency priority coalescing applies to: NORMAL and LOW messages
+# with a coalesce_key; CRITICAL beat events and HIGH decisions never are
+COALESCE_MIN_PRIORITY = MessagePriority.NORMAL
+
+# Process-wide message sequence numbers
+_message_sequence = itertools.count(1)
+
+
 class AgentMessage:
     """Message passed between agents.
 
-    Uses dataclass ordering based on priority for PriorityQueue.
-    The priority field comes first for proper sorting.
+    A slotted class rather than a dataclass: no per-instance ``__dict__``,
+    and construction only stores the fields and takes the next sequence
+    number. ``message_id``, unless given, is formatted from the sender and
+    the sequence number on first access. Messages order by priority.
+
+    Args:
+        priority: Delivery priority
+        timestamp: When the message was created (seconds)
+        from_agent: Sending agent
+        to_agent: Receiving agent, or "broadcast" for all agents
+        message_type: Type subscribers listen for
+        payload: Message data (default: empty dict)
+        message_id: Explicit ID (default: generated on first access)
+        coalesce_key: Opt in to coalescing: a queued NORMAL or LOW message
+            of the same type and key is replaced by this one (e.g. the
+            sending agent for position updates). None (default) is always
+            queued.
+    """
+
+    __slots__ = ('priority', 'timestamp', 'from_agent', 'to_agent', 'message_type',
+                 'payload', 'sequence', '_message_id', 'coalesce_key')
+
+    def __init__(
+        self,
+        priority: MessagePriority,
+        timestamp: float,
+        from_agent: str,
+        to_agent: str,
+        message_type: str,
+        payload: Optional[Dict[str, Any]] = None,
+        message_id: str = "",
+        coalesce_key: Optional[str] = None
+    ):
+        self.priority = priority
+        self.timestamp = timestamp
+        self.from_agent = from_agent
+        self.to_agent = to_agent
+        self.message_type = message_type
+        self.payload = payload if payload is not None else {}
+        self.sequence = next(_message_sequence)
+        self._message_id = message_id
+        self.coalesce_key = coalesce_key
+
+    @property
+    def message_id(self) -> str:
+        """Unique message ID (``<from_agent>_<sequence>`` unless given)."""
+        if not self._message_id:
+            self._message_id = f"{self.from_agent}_{self.sequence}"
+        return self._message_id
+
+    @message_id.setter
+    def message_id(self, value: str):
+        self._message_id = value
+
+    def __lt__(self, other: 'AgentMessage') -> bool:
+        return self.priority < other.priority
+
+    def __le__(self, other: 'AgentMessage') -> bool:
+        return self.priority <= other.priority
+
+    def __gt__(self, other: 'AgentMessage') -> bool:
+        return self.priority > other.priority
+
+    def __ge__(self, other: 'AgentMessage') -> bool:
+        return self.priority >= other.priority
+
+    def __repr__(self) -> str:
+        return (f"AgentMessage(priority={self.priority!r}, from_agent={self.from_agent!r}, "
+                f"to_agent={self.to_agent!r}, message_type={self.message_type!r}, "
+                f"payload={self.payload!r}, message_id={self.message_id!r})")
+
+
+# Messages dequeued from each lane per round in weighted draining
+DEFAULT_LANE_WEIGHTS: Dict[MessagePriority, int] = {
+    MessagePriority.CRITICAL: 8,
+    MessagePriority.HIGH: 4,
+    MessagePriority.NORMAL: 2,
+    MessagePriority.LOW: 1,
+}
+
+
+class MessageLanes:
+    """
+    Bounded message queue with one FIFO lane per MessagePriority.
+
+    A drop-in for the ``asyncio.PriorityQueue`` the bus used before
+    (``put_nowait``, ``get``, ``task_done``, ``join``, ...), but publish and
+    dequeue are O(1) and order within a priority is preserved.
+
+    A NORMAL or LOW message with a ``coalesce_key`` is coalesced: while one
+    of the same (message_type, coalesce_key) is queued, a newer one takes
+    its place in line rather than queuing behind it. The first message of
+    the key stays in the lane as a placeholder; ``_pending`` holds the
+    latest, which is what ``get`` returns for it. An update more urgent
+    than the placeholder's lane (NORMAL onto a queued LOW one) moves the
+    placeholder to the back of its own lane instead, so it is not held
+    behind messages less urgent than itself. Coalescing never takes a
+    new slot, so it succeeds even when the queue is full. A CRITICAL or
+    HIGH message with the key is queued in its own lane and drops the
+    queued update, so older state is never delivered after it.
+
+    Args:
+        maxsize: Maximum messages across all lanes (0 for unbounded)
+        weights: Messages taken from each lane per round, e.g.
+            ``DEFAULT_LANE_WEIGHTS``, so lower priorities still progress
+            under sustained higher-priority load. None drains strictly by
+            priority: a lane is served only when all higher ones are empty.
+    """
+
+    def __init__(self, maxsize: int = 0, weights: Optional[Dict[MessagePriority, int]] = None):
+        self.maxsize = maxsize
+        self.lanes: List[deque] = [deque() for _ in MessagePriority]
+        if weights is not None:
+            if any(weights.get(p, 0) < 1 for p in MessagePriority):
+                raise ValueError(f"lane weights must be >= 1 for every priority, got {weights}")
+            weights = [weights[p] for p in MessagePriority]
+        self.weights: Optional[List[int]] = weights
+        self._credits = list(weights) if weights is not None else None
+        self._size = 0
+        self._unfinished = 0
+        self._pending: Dict[Tuple[str, str], 'AgentMessage'] = {}
+        self._pending_lane: Dict[Tuple[str, str], MessagePriority] = {}  # Lane of each placeholder
+        self.coalesced = 0
+        self._not_empty = asyncio.Event()
+        self._finished = asyncio.Event()
+        self._finished.set()
+
+    def qsize(self) -> int:
+        """Messages waiting in all lanes."""
+        return self._size
+
+    def empty(self) -> bool:
+        return self._size == 0
+
+    def full(self) -> bool:
+        return 0 < self.maxsize <= self._size
+
+    def lane_sizes(self) -> Dict[str, int]:
+        """Messages waiting per priority."""
+        return {p.name: len(lane) for p, lane in zip(MessagePriority, self.lanes)}
+
+    def put_nowait(self, message: 'AgentMessage') -> None:
+        """
+        Append a message to the lane of its priority, or replace the queued
+        message it coalesces with.
+
+        Raises:
+            asyncio.QueueFull: If ``maxsize`` messages are already waiting
+        """
+        if message.coalesce_key is not None and message.priority >= COALESCE_MIN_PRIORITY:
+            key = (message.message_type, message.coalesce_key)
+            if key in self._pending:
+                self._coalesce(key, message)
+                return
+            if 0 < self.maxsize <= self._size:
+                raise asyncio.QueueFull
+            self._pending[key] = message
+            self._pending_lane[key] = message.priority
+        else:
+            if message.coalesce_key is not None and self._pending:
+                self._supersede((message.message_type, message.coalesce_key))
+            if 0 < self.maxsize <= self._size:
+                raise asyncio.QueueFull
+        self.lanes[message.priority].append(message)
+        self._size += 1
+        self._unfinished += 1
+        self._finished.clear()
+        self._not_empty.set()
+
+    def put_many(self, messages: Sequence['AgentMessage']) -> None:
+        """
+        Append a burst of messages, all or none; coalescing messages replace
+        queued ones (or earlier ones of the burst) as with ``put_nowait``.
+
+        Raises:
+            asyncio.QueueFull: If the burst does not fit
+        """
+        pending = self._pending
+        keys = [
+            (m.message_type, m.coalesce_key)
+            if m.coalesce_key is not None and m.priority >= COALESCE_MIN_PRIORITY else None
+            for m in messages
+        ]
+        added = len(messages)
+        if any(keys):
+            new_keys = {key for key in keys if key is not None and key not in pending}
+            added = keys.count(None) + len(new_keys)
+        if 0 < self.maxsize < self._size + added:
+            raise asyncio.QueueFull
+
+        lanes = self.lanes
+        added = 0
+        for message, key in zip(messages, keys):
+            if key is not None:
+                if key in pending:
+                    self._coalesce(key, message)
+                    continue
+                pending[key] = message
+                self._pending_lane[key] = message.priority
+            elif message.coalesce_key is not None and pending:
+                self._supersede((message.message_type, message.coalesce_key))
+            lanes[message.priority].append(message)
+            added += 1
+        self._size += added
+        self._unfinished += added
+        if added:
+            self._finished.clear()
+            self._not_empty.set()
+
+    def _coalesce(self, key: Tuple[str, str], message: 'AgentMessage') -> None:
+        """
+        Make ``message`` the latest update of the queued ``key``. If it is
+        more urgent than the placeholder's lane, the placeholder leaves that
+        lane and ``message`` is queued in its own one in its place.
+        """
+        lane = self._pending_lane[key]
+        if message.priority < lane:
+            self._remove_placeholder(key, self.lanes[lane])
+            self.lanes[message.priority].append(message)
+            self._pending_lane[key] = message.priority
+        self._pending[key] = message
+        self.coalesced += 1
+
+    def _supersede(self, key: Tuple[str, str]) -> None:
+        """
+        Drop the queued update of ``key``, if any, for a CRITICAL or HIGH
+        message of the same key: delivered after it, the older state would
+        win.
+        """
+        if self._pending.pop(key, None) is None:
+            return
+        self._remove_placeholder(key, self.lanes[self._pending_lane.pop(key)])
+        self._size -= 1
+        self._unfinished -= 1
+        self.coalesced += 1
+
+    @staticmethod
+    def _remove_placeholder(key: Tuple[str, str], lane: deque) -> None:
+        """Remove the placeholder of ``key`` from ``lane``, where it is the only message of its key."""
+        for i, queued in enumerate(lane):
+            if queued.coalesce_key == key[1] and queued.message_type == key[0]:
+                del lane[i]
+                return
+
+    def get_nowait(self) -> 'AgentMessage':
+        """
+        Take the next message.
+
+        Raises:
+            asyncio.QueueEmpty: If no message is waiting
+        """
+        if not self._size:
+            raise asyncio.QueueEmpty
+        self._size -= 1
+        message = self._next()
+
+        # A coalescing placeholder stands for the latest message of its key
+        if message.coalesce_key is not None and message.priority >= COALESCE_MIN_PRIORITY:
+            key = (message.message_type, message.coalesce_key)
+            del self._pending_lane[key]
+            return self._pending.pop(key)
+        return message
+
+    def _next(self) -> 'AgentMessage':
+        """Pop the next message from the lanes (at least one is non-empty)."""
+        if self._credits is None:
+            for lane in self.lanes:
+                if lane:
+                    return lane.popleft()
+
+        # Weighted: the highest-priority lane with credit left this round;
+        # a new round starts once no waiting lane has any
+        for _ in range(2):
+            for p, lane in enumerate(self.lanes):
+                if lane and self._credits[p]:
+                    self._credits[p] -= 1
+                    return lane.popleft()
+            self._credits[:] = self.weights
+
+    async def get(self) -> 'AgentMessage':
+        """Take the next message, waiting for one if necessary."""
+        while not self._size:
+            self._not_empty.clear()
+            await self._not_empty.wait()
+        return self.get_nowait()
+
+    def task_done(self) -> None:
+        """Mark a message taken with ``get`` as handled."""
+        if self._unfinished <= 0:
+            raise ValueError('task_done() called too many times')
+        self._unfinished -= 1
+        if self._unfinished == 0:
+            self._finished.set()
+
+    async def join(self) -> None:
+        """Wait until every message put has been handled."""
+        await self._finished.wait()
+
+
+class Subscription:
+    """
+    One handler subscribed to a message type.
+
+    Args:
+        handler: Function or coroutine function receiving the AgentMessage
+        min_priority: Lowest priority delivered (CRITICAL=0 ... LOW=3)
+        agent_id: Agent the handler belongs to: it receives messages of
+            the type addressed to this agent, and broadcasts. None receives
+            every message of the type, whoever it is addressed to.
+        message_type: Type subscribed to
+        inbox: Bounded inbox the handler is run from, or None to run it
+            on the delivery workers
+    """
+
+    __slots__ = ('handler', 'min_priority', 'agent_id', 'is_async', 'message_type', 'inbox')
+
+    def __init__(
+        self,
+        handler: Callable,
+        min_priority: MessagePriority,
+        agent_id: Optional[str],
+        message_type: str = "",
+        inbox: Optional['SubscriberInbox'] = None
+    ):
+        self.handler = handler
+        self.min_priority = min_priority
+        self.agent_id = agent_id
+        self.is_async = inspect.iscoroutinefunction(handler)
+        self.message_type = message_type
+        self.inbox = inbox
+
+
+class SubscriberInbox:
+    """
+    Bounded per-subscriber queue, drained by its own task.
+
+    Delivery workers hand messages over with ``offer`` (O(1), never
+    waiting unless the policy is 'block'), so however slow the handler is,
+    it only falls behind in its own inbox. A plain-function handler is run
+    in the event loop's default executor, one message at a time, so even
+    one that blocks only holds up its own inbox.
+
+    Args:
+        handler: Function or coroutine function receiving the AgentMessage
+        maxsize: Messages the inbox holds
+        overflow: What a full inbox does with a new message (see OVERFLOW_POLICIES)
     """
-    priority: MessagePriority
-    timestamp: float = field(compare=False)
-    from_agent: str = field(compare=False)
-    to_agent: str = field(compare=False)  # or "broadcast" for all agents
-    message_type: str = field(compare=False)
-    payload: Dict[str, Any] = field(default_factory=dict, compare=False)
-    message_id: str = field(default="", compare=False)
 
-    def __post_init__(self):
-        """Generate message ID if not provided."""
-        if not self.message_id:
-            self.message_id = f"{self.from_agent}_{self.timestamp}_{id(self)}"
+    def __init__(self, handler: Callable, maxsize: int, overflow: str = 'drop_oldest'):
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"overflow must be one of {OVERFLOW_POLICIES}, got {overflow!r}")
+        if maxsize < 1:
+            raise ValueError(f"inbox size must be >= 1, got {maxsize}")
+        self.handler = handler
+        self.is_async = inspect.iscoroutinefunction(handler)
+        self.maxsize = maxsize
+        self.overflow = overflow
+        self.queue: deque = deque()  # (message, time queued)
+        self.task: Optional[asyncio.Task] = None
+
+        self.delivered = 0
+        self.dropped = 0
+        self.coalesced = 0
+        self.blocked = 0
+        self.max_depth = 0
+        self.max_lag = 0.0  # Longest wait from inbox to handler (seconds)
+
+        self._not_empty = asyncio.Event()
+        self._not_full = asyncio.Event()
+        self._not_full.set()
+        self._idle = asyncio.Event()
+        self._idle.set()
+
+    def offer(self, message: AgentMessage) -> bool:
+        """
+        Queue a message without waiting, applying the overflow policy.
+
+        Returns:
+            False only if the inbox is full and the policy is 'block'
+        """
+        queue = self.queue
+        if len(queue) >= self.maxsize:
+            if self.overflow == 'block':
+                return False
+            if self.overflow == 'drop_newest':
+                self.dropped += 1
+                return True
+            if self.overflow == 'drop_oldest':
+                queue.popleft()
+                self.dropped += 1
+            else:
+                queue.pop()
+                self.coalesced += 1
+        queue.append((message, time.perf_counter()))
+        if len(queue) > self.max_depth:
+            self.max_depth = len(queue)
+        self._idle.clear()
+        self._not_empty.set()
+        return True
+
+    async def put(self, message: AgentMessage):
+        """Queue a message, waiting for space in a full 'block' inbox."""
+        self.blocked += 1
+        while not self.offer(message):
+            self._not_full.clear()
+            await self._not_full.wait()
+
+    async def run(self):
+        """Call the handler for every queued message, in order (run as a task)."""
+        handler = self.handler
+        queue = self.queue
+        loop = asyncio.get_running_loop()
+        while True:
+            while not queue:
+                self._idle.set()
+                self._not_empty.clear()
+                await self._not_empty.wait()
+
+            message, queued_at = queue.popleft()
+            self._not_full.set()
+            lag = time.perf_counter() - queued_at
+            if lag > self.max_lag:
+                self.max_lag = lag
+
+            try:
+                if self.is_async:
+                    await handler(message)
+                else:
+                    result = await loop.run_in_executor(None, handler, message)
+                    if inspect.isawaitable(result):
+                        await result
+            except Exception as e:
+                logger.error(f"Error in '{message.message_type}' inbox handler: {e}")
+            self.delivered += 1
+
+    async def join(self):
+        """Wait until every queued message has been handled."""
+        while self.queue or not self._idle.is_set():
+            await self._idle.wait()
+
+    def lag(self) -> float:
+        """How long the oldest queued message has waited (seconds)."""
+        return time.perf_counter() - self.queue[0][1] if self.queue else 0.0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Depth, lag and drop statistics."""
+        return {
+            'depth': len(self.queue),
+            'max_depth': self.max_depth,
+            'lag_ms': self.lag() * 1000,
+            'max_lag_ms': self.max_lag * 1000,
+            'delivered': self.delivered,
+            'dropped': self.dropped,
+            'coalesced': self.coalesced,
+            'blocked': self.blocked,
+            'overflow': self.overflow,
+        }
 
 
 class MessageStats:
@@ -70,6 +559,14 @@ class MessageStats:
         self.message_type_counts[message.message_type] += 1
         self.priority_counts[message.priority] += 1
 
+    def record_publish_many(self, messages: Sequence[AgentMessage], duration: float):
+        """Record metrics of a published burst (duration of the whole burst)."""
+        self.messages_published += len(messages)
+        self.total_publish_time += duration
+        for message in messages:
+            self.message_type_counts[message.message_type] += 1
+            self.priority_counts[message.priority] += 1
+
     def record_delivery(self, duration: float):
         """Record message delivery metrics."""
         self.messages_delivered += 1
@@ -104,19 +601,22 @@ class AgentMessageBus:
     High-performance async message bus for agent communication.
 
     Features:
-    - Priority-based message delivery
-    - Type-based pub/sub routing
+    - Priority-based message delivery (FIFO lanes, strict or weighted)
+    - Type-based pub/sub routing, direct messages to one agent's handlers
     - Broadcast messaging to all agents
+    - Synchronous handlers called inline (no coroutine per message)
     - Message filtering by priority
+    - Opt-in coalescing of NORMAL/LOW state updates (``coalesce_key``)
     - Performance monitoring and metrics
     - Non-blocking publish with async processing
 
     Usage:
         bus = AgentMessageBus()
 
-        # Subscribe to message types
+        # Subscribe to message types (chord changes addressed to the bass
+        # agent, or broadcast)
         bus.subscribe("beat_event", beat_handler)
-        bus.subscribe("chord_change", chord_handler)
+        bus.subscribe("chord_change", chord_handler, agent_id="bass_agent")
 
         # Publish messages
         await bus.publish(AgentMessage(
@@ -132,21 +632,42 @@ class AgentMessageBus:
         asyncio.create_task(bus.process_messages())
     """
 
-    def __init__(self, max_queue_size: int = 10000):
+    def __init__(
+        self,
+        max_queue_size: int = 10000,
+        lane_weights: Optional[Dict[MessagePriority, int]] = None,
+        delivery_workers: int = 1
+    ):
         """
         Initialize message bus.
 
         Args:
             max_queue_size: Maximum messages in queue (prevents memory overflow)
+            lane_weights: Weighted draining of the priority lanes (see
+                MessageLanes and DEFAULT_LANE_WEIGHTS); None (default)
+                delivers strictly in priority order
+            delivery_workers: Tasks delivering messages concurrently. With
+                more than one, handlers run on the workers (no inbox) may
+                see messages out of order; inbox handlers never do.
         """
-        # Priority queue for messages (lower priority value = higher priority)
-        self.message_queue: asyncio.PriorityQueue = asyncio.PriorityQueue(
-            maxsize=max_queue_size
-        )
+        if delivery_workers < 1:
+            raise ValueError(f"delivery_workers must be >= 1, got {delivery_workers}")
+        self.delivery_workers = delivery_workers
+
+        # One FIFO lane per priority (lower priority value = higher priority)
+        self.message_queue = MessageLanes(maxsize=max_queue_size, weights=lane_weights)
 
-        # Subscribers by message type
+        # Subscribers by message type (handlers, in subscription order)
         self.subscribers: Dict[str, List[Callable]] = defaultdict(list)
 
+        # Routing tables, rebuilt on (un)subscribe: every subscription of a
+        # type (broadcast fan-out), the type-wide ones (direct messages to
+        # agents without their own), and per (message_type, to_agent)
+        self._subscriptions: Dict[str, List[Subscription]] = defaultdict(list)
+        self._broadcast_routes: Dict[str, Tuple[Subscription, ...]] = {}
+        self._type_routes: Dict[str, Tuple[Subscription, ...]] = {}
+        self._direct_routes: Dict[Tuple[str, str], Tuple[Subscription, ...]] = {}
+
         # Registered agents for broadcast
         self.registered_agents: Set[str] = set()
 
@@ -155,7 +676,8 @@ class AgentMessageBus:
 
         # Control flags
         self.running = False
-        self.processing_task: Optional[asyncio.Task] = None
+        self.processing_tasks: List[asyncio.Task] = []
+        self._active_workers = 0
 
     def register_agent(self, agent_id: str):
         """Register an agent for broadcast messages."""
@@ -171,40 +693,90 @@ class AgentMessageBus:
         self,
         message_type: str,
         handler: Callable,
-        min_priority: MessagePriority = MessagePriority.LOW
+        min_priority: MessagePriority = MessagePriority.LOW,
+        agent_id: Optional[str] = None,
+        inbox_size: Optional[int] = None,
+        overflow: str = 'drop_oldest'
     ):
         """
         Subscribe to a message type.
 
         Args:
             message_type: Type of message to listen for
-            handler: Async function to handle message (receives AgentMessage)
+            handler: Function or async function to handle message (receives
+                AgentMessage); plain functions are called inline on the
+                delivery loop, without a coroutine per message, so they
+                must not block
             min_priority: Minimum priority level to receive (filters lower priority)
+            agent_id: Receive only messages addressed to this agent (and
+                broadcasts); None (default) receives every message of the type
+            inbox_size: Run the handler from its own inbox of this many
+                messages, so it cannot delay other subscribers (a plain
+                function is then called in the default thread pool, so it
+                may block but must be thread-safe); None (default) runs it
+                on the delivery workers
+            overflow: What a full inbox does with a new message, one of
+                OVERFLOW_POLICIES (default: 'drop_oldest')
         """
-        # Wrap handler with priority filter if needed
-        if min_priority != MessagePriority.LOW:
-            original_handler = handler
-            async def filtered_handler(message: AgentMessage):
-                if message.priority <= min_priority:
-                    await original_handler(message)
-            handler = filtered_handler
-
+        inbox = SubscriberInbox(handler, inbox_size, overflow) if inbox_size is not None else None
+        self._subscriptions[message_type].append(
+            Subscription(handler, min_priority, agent_id, message_type, inbox)
+        )
         self.subscribers[message_type].append(handler)
-        logger.debug(f"Subscribed to '{message_type}' (min_priority={min_priority.name})")
+        self._rebuild_routes(message_type)
+        if inbox is not None and self.running:
+            self._start_inbox(inbox)
+        logger.debug(
+            f"Subscribed to '{message_type}' (min_priority={min_priority.name}, agent={agent_id or 'any'})"
+        )
 
     def unsubscribe(self, message_type: str, handler: Callable):
-        """Unsubscribe a handler from a message type."""
+        """Unsubscribe a handler from a message type (for every agent it was subscribed for)."""
         if message_type in self.subscribers:
-            try:
-                self.subscribers[message_type].remove(handler)
-                logger.debug(f"Unsubscribed from '{message_type}'")
-            except ValueError:
-                pass
+            remaining = [sub for sub in self._subscriptions[message_type] if sub.handler != handler]
+            if len(remaining) == len(self._subscriptions[message_type]):
+                return
+            for sub in self._subscriptions[message_type]:
+                if sub.handler == handler and sub.inbox is not None and sub.inbox.task is not None:
+                    sub.inbox.task.cancel()
+            self._subscriptions[message_type] = remaining
+            self.subscribers[message_type] = [sub.handler for sub in remaining]
+            self._rebuild_routes(message_type)
+            logger.debug(f"Unsubscribed from '{message_type}'")
+
+    def _rebuild_routes(self, message_type: str):
+        """Rebuild the routing tables of one message type."""
+        subscriptions = self._subscriptions[message_type]
+        self._broadcast_routes[message_type] = tuple(subscriptions)
+        self._type_routes[message_type] = tuple(sub for sub in subscriptions if sub.agent_id is None)
+
+        for key in [key for key in self._direct_routes if key[0] == message_type]:
+            del self._direct_routes[key]
+        for agent_id in {sub.agent_id for sub in subscriptions if sub.agent_id is not None}:
+            self._direct_routes[(message_type, agent_id)] = tuple(
+                sub for sub in subscriptions if sub.agent_id in (None, agent_id)
+            )
+
+    def get_routes(self, message_type: str, to_agent: str = BROADCAST) -> List[Callable]:
+        """Handlers a message of this type addressed to ``to_agent`` is delivered to."""
+        return [sub.handler for sub in self._routes(message_type, to_agent)]
+
+    def _routes(self, message_type: str, to_agent: str) -> Tuple[Subscription, ...]:
+        """Subscriptions of a message type addressed to ``to_agent``."""
+        if to_agent == BROADCAST:
+            return self._broadcast_routes.get(message_type, ())
+        routes = self._direct_routes.get((message_type, to_agent))
+        if routes is None:
+            routes = self._type_routes.get(message_type, ())
+        return routes
 
     async def publish(self, message: AgentMessage):
         """
         Publish a message to the bus (non-blocking).
 
+        A NORMAL or LOW message with a ``coalesce_key`` replaces a queued
+        one of the same type and key instead of queuing behind it.
+
         Args:
             message: AgentMessage to publish
 
@@ -214,17 +786,18 @@ class AgentMessageBus:
         start_time = time.perf_counter()
 
         try:
-            # Put message in priority queue (non-blocking)
+            # Append to its priority lane (non-blocking)
             self.message_queue.put_nowait(message)
 
             # Record metrics
             publish_duration = time.perf_counter() - start_time
             self.stats.record_publish(message, publish_duration)
 
-            logger.debug(
-                f"Published: {message.from_agent} -> {message.to_agent} "
-                f"[{message.message_type}] priority={message.priority.name}"
-            )
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    f"Published: {message.from_agent} -> {message.to_agent} "
+                    f"[{message.message_type}] priority={message.priority.name}"
+                )
 
         except asyncio.QueueFull:
             logger.error(
@@ -233,14 +806,45 @@ class AgentMessageBus:
             )
             raise
 
+    async def publish_many(self, messages: Sequence[AgentMessage]):
+        """
+        Publish a burst of messages in one operation (non-blocking).
+
+        E.g. a bar's worth of beat events: the burst is queued as a whole,
+        in order, or not at all, with one wakeup of the delivery workers.
+
+        Args:
+            messages: AgentMessages to publish, in order
+
+        Raises:
+            asyncio.QueueFull: If the burst does not fit in the queue
+        """
+        start_time = time.perf_counter()
+
+        try:
+            self.message_queue.put_many(messages)
+        except asyncio.QueueFull:
+            logger.error(
+                f"Message queue full! Dropping burst of {len(messages)} messages "
+                f"({self.message_queue.qsize()} queued)"
+            )
+            raise
+
+        self.stats.record_publish_many(messages, time.perf_counter() - start_time)
+
     async def process_messages(self):
         """
         Process messages from queue in priority order.
 
-        This is the main message processing loop. Should be run as a task:
+        This is the main message processing loop, run by each delivery
+        worker. Should be run as a task:
             asyncio.create_task(bus.process_messages())
         """
         self.running = True
+        self._active_workers += 1
+        for inbox in self._inboxes():
+            if inbox.task is None or inbox.task.done():
+                self._start_inbox(inbox)
         logger.info("Message bus processing started")
 
         try:
@@ -268,53 +872,129 @@ class AgentMessageBus:
             logger.error(f"Error in message processing: {e}", exc_info=True)
             raise
         finally:
-            self.running = False
+            self._active_workers -= 1
+            if self._active_workers == 0:
+                self.running = False
+
+    def _inbox_subscriptions(self) -> List[Subscription]:
+        """Subscriptions run from an inbox."""
+        return [sub for subs in self._subscriptions.values() for sub in subs if sub.inbox is not None]
+
+    def _inboxes(self) -> List[SubscriberInbox]:
+        """Inboxes of all subscriptions."""
+        return [sub.inbox for sub in self._inbox_subscriptions()]
+
+    def _start_inbox(self, inbox: SubscriberInbox):
+        """Start the task draining an inbox."""
+        inbox.task = asyncio.create_task(inbox.run())
 
     async def _deliver_message(self, message: AgentMessage):
         """
         Deliver message to appropriate subscribers.
 
-        Handles both direct messages and broadcasts.
+        Direct messages go to their recipient's handlers and the type-wide
+        ones; broadcasts to every handler of the type. Plain handlers run
+        inline; coroutines are awaited together. A failing handler is
+        logged and does not affect the others.
         """
-        handlers = self.subscribers.get(message.message_type, [])
+        routes = self._routes(message.message_type, message.to_agent)
 
-        if not handlers:
+        if not routes:
             logger.debug(f"No subscribers for message type: {message.message_type}")
             return
 
-        # Check if broadcast or direct
-        if message.to_agent == "broadcast":
-            # Deliver to all subscribers
-            delivery_tasks = [handler(message) for handler in handlers]
-        else:
-            # In a more advanced system, we might filter by to_agent
-            # For now, all subscribers get the message
-            delivery_tasks = [handler(message) for handler in handlers]
+        pending = None
+        for sub in routes:
+            if message.priority > sub.min_priority:
+                continue
+            if sub.inbox is not None:
+                # Handed over; only a full 'block' inbox makes the worker wait
+                if sub.inbox.offer(message):
+                    continue
+                result = sub.inbox.put(message)
+                if pending is None:
+                    pending = [result]
+                else:
+                    pending.append(result)
+                continue
+            try:
+                result = sub.handler(message)
+            except Exception as e:
+                logger.error(f"Error in '{message.message_type}' handler: {e}")
+                continue
+            if sub.is_async or inspect.isawaitable(result):
+                if pending is None:
+                    pending = [result]
+                else:
+                    pending.append(result)
 
-        # Execute all handlers concurrently
-        if delivery_tasks:
-            await asyncio.gather(*delivery_tasks, return_exceptions=True)
+        if pending is None:
+            return
+        if len(pending) == 1:
+            # No gather (and no task) for a single coroutine
+            try:
+                await pending[0]
+            except Exception as e:
+                logger.error(f"Error in '{message.message_type}' handler: {e}")
+            return
+        for result in await asyncio.gather(*pending, return_exceptions=True):
+            if isinstance(result, Exception):
+                logger.error(f"Error in '{message.message_type}' handler: {result}")
 
     async def start(self):
-        """Start the message bus processing task."""
-        if not self.running:
-            self.processing_task = asyncio.create_task(self.process_messages())
+        """Start the delivery worker tasks."""
+        # Guard on the tasks: ``running`` is only set once a worker runs
+        if not self.processing_tasks:
+            self.processing_tasks = [
+                asyncio.create_task(self.process_messages()) for _ in range(self.delivery_workers)
+            ]
 
-    async def stop(self):
-        """Stop the message bus and wait for queue to drain."""
+    async def stop(self, timeout: float = 5.0):
+        """
+        Stop the message bus, first waiting for queue and inboxes to drain.
+
+        Args:
+            timeout: Seconds to wait for the whole drain; messages a slow
+                subscriber has not handled by then are logged and dropped
+        """
         logger.info("Stopping message bus...")
-        self.running = False
 
-        if self.processing_task:
-            # Wait for current message to finish
-            await asyncio.wait_for(self.message_queue.join(), timeout=5.0)
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        try:
+            if self.processing_tasks:
+                # Wait for queued messages, then for the inboxes they went to
+                await asyncio.wait_for(self.message_queue.join(), timeout=timeout)
+                inboxes = self._inboxes()
+                if inboxes:
+                    await asyncio.wait_for(
+                        asyncio.gather(*(inbox.join() for inbox in inboxes)),
+                        timeout=max(deadline - loop.time(), 0.0)
+                    )
+        except asyncio.TimeoutError:
+            logger.warning(
+                f"Message bus drain timed out: {self.message_queue.qsize()} messages still queued"
+            )
+            for sub in self._inbox_subscriptions():
+                if sub.inbox.queue:
+                    logger.warning(
+                        f"Inbox of '{sub.message_type}' handler "
+                        f"{getattr(sub.handler, '__qualname__', repr(sub.handler))}: "
+                        f"{len(sub.inbox.queue)} messages pending"
+                    )
+        finally:
+            self.running = False
 
-            # Cancel processing task
-            self.processing_task.cancel()
-            try:
-                await self.processing_task
-            except asyncio.CancelledError:
-                pass
+            # Cancel workers and inbox tasks
+            tasks = self.processing_tasks + [inbox.task for inbox in self._inboxes() if inbox.task is not None]
+            for task in tasks:
+                task.cancel()
+            for task in tasks:
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+            self.processing_tasks = []
 
         logger.info("Message bus stopped")
 
@@ -323,11 +1003,24 @@ class AgentMessageBus:
         return {
             **self.stats.get_stats(),
             'queue_size': self.message_queue.qsize(),
+            'messages_coalesced': self.message_queue.coalesced,
+            'lane_sizes': self.message_queue.lane_sizes(),
             'registered_agents': len(self.registered_agents),
             'subscriber_types': len(self.subscribers),
+            'delivery_workers': self.delivery_workers,
+            'subscribers': [
+                {
+                    'message_type': sub.message_type,
+                    'agent_id': sub.agent_id,
+                    'handler': getattr(sub.handler, '__qualname__', repr(sub.handler)),
+                    **sub.inbox.get_stats()
+                }
+                for sub in self._inbox_subscriptions()
+            ],
             'running': self.running
         }
 
     def reset_stats(self):
         """Reset performance statistics."""
         self.stats.reset()
+        self.message_queue.coalesced = 0
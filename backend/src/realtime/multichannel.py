@@ -0,0 +1,143 @@
+"""
+Multi-channel real-time analysis for Performia.
+
+Analyzes every input of a multi-mic rig in one vectorized pass instead of
+running one ``RealtimeAnalyzer`` per channel: a stacked ring buffer, one
+batched FFT per hop, and onset / pitch detectors whose per-channel state
+lives in stacked arrays.
+"""
+
+import numpy as np
+from typing import Optional
+from dataclasses import dataclass
+
+from .analyzer import RingBuffer
+from .frame import AnalysisFrame
+from .pitch import MultiChannelPitchTracker
+from .onset import MultiChannelOnsetDetector
+from .tables import note_hz
+from .instrumentation import PipelineStats
+
+
+@dataclass
+class MultiChannelAnalysis:
+    """Per-channel analysis result for one multi-channel block."""
+    time: float  # Stream time of the block (seconds)
+    pitch: np.ndarray  # Hz per channel, NaN if unvoiced / low confidence
+    voiced_prob: np.ndarray  # Voicing probability per channel
+    onset: np.ndarray  # Onset detected per channel (bool)
+    onset_strength: np.ndarray  # Spectral-flux onset strength per channel
+
+    @property
+    def any_onset(self) -> bool:
+        """True if any channel has an onset in this block."""
+        return bool(self.onset.any())
+
+
+class MultiChannelAnalyzer:
+    """
+    Batched pitch and onset analysis for ``(n_channels, block)`` input.
+
+    Uses the same frame size, hop, pitch range and onset configuration as
+    ``RealtimeAnalyzer``, and each channel gives the same pitch and onsets
+    as a separate ``RealtimeAnalyzer.process_block`` on that channel.
+    Tempo and beat tracking stay with the single-stream analyzer.
+    """
+
+    def __init__(self, n_channels: int, sample_rate: int = 44100):
+        """
+        Initialize the analyzer.
+
+        Args:
+            n_channels: Number of input channels
+            sample_rate: Audio sample rate in Hz (default: 44100)
+        """
+        self.n_channels = n_channels
+        self.sample_rate = sample_rate
+        self.hop_length = 512  # ~11.6ms at 44.1kHz
+        self.frame_length = 2048  # ~46ms at 44.1kHz
+
+        # Stacked buffers and frame, one row per channel
+        self.buffer = RingBuffer(size=self.frame_length, mirrored=True, n_channels=n_channels)
+        self.frame = AnalysisFrame(self.frame_length, n_channels=n_channels)
+        self.samples_processed = 0
+
+        self.onset_detector = MultiChannelOnsetDetector(
+            n_channels,
+            sample_rate=self.sample_rate,
+            n_fft=self.frame_length,
+            threshold=0.3
+        )
+
+        self.fmin = note_hz('C2')  # ~65 Hz
+        self.fmax = note_hz('C7')  # ~2093 Hz
+        self.pitch_tracker = MultiChannelPitchTracker(
+            n_channels,
+            sample_rate=self.sample_rate,
+            fmin=self.fmin,
+            fmax=self.fmax,
+            frame_length=self.frame_length,
+            hop_length=self.hop_length
+        )
+
+        # Performance tracking
+        self.last_analysis_time = 0.0
+        self.stats = PipelineStats(stages=('frame', 'onset', 'pitch'))
+
+    def process_block(self, audio_block: np.ndarray, current_time: Optional[float] = None) -> MultiChannelAnalysis:
+        """
+        Analyze one block of every channel.
+
+        Args:
+            audio_block: Audio samples, ``(n_channels, block_size)``
+            current_time: Optional timestamp (defaults to the stream time)
+
+        Returns:
+            MultiChannelAnalysis with per-channel pitch and onsets
+        """
+        start_time = self.stats.begin_block()
+
+        if audio_block.shape[0] != self.n_channels:
+            raise ValueError(
+                f"Expected {self.n_channels} channels, got block of shape {audio_block.shape}"
+            )
+
+        self.buffer.write(audio_block)
+        self.samples_processed += audio_block.shape[-1]
+        if current_time is None:
+            current_time = self.samples_processed / self.sample_rate
+
+        frame = self.frame.update(self.buffer.read_view())
+        mark = self.stats.stage('frame', start_time)
+
+        onset, onset_strength = self.onset_detector.process_magnitude(frame.magnitude)
+        mark = self.stats.stage('onset', mark)
+
+        f0, voiced, voiced_prob = self.pitch_tracker.process_frame(frame.samples, frame.spectrum)
+        pitch = np.where(voiced & (voiced_prob > 0.5), f0, np.nan)
+        self.stats.stage('pitch', mark)
+
+        self.last_analysis_time = self.stats.end_block(start_time, audio_block.shape[-1] / self.sample_rate)
+
+        return MultiChannelAnalysis(
+            time=current_time,
+            pitch=pitch,
+            voiced_prob=voiced_prob,
+            onset=onset,
+            onset_strength=onset_strength
+        )
+
+    def get_performance_stats(self) -> dict:
+        """
+        Get performance statistics for monitoring.
+
+        Returns:
+            Dictionary with performance metrics, including the structured
+            ``latency``, ``deadline`` and ``allocations`` sections
+        """
+        return {
+            **self.stats.get_stats(),
+            'last_analysis_time_ms': self.last_analysis_time * 1000,
+            'n_channels': self.n_channels,
+            'onset_threshold': self.onset_detector.threshold
+        }
@@ -0,0 +1,422 @@
+"""
+Streaming pitch tracking for Performia.
+
+Implements the probabilistic YIN (pYIN) estimator as a stateful,
+frame-by-frame tracker. The observation model is a direct port of
+``librosa.pyin`` so a single frame yields the same voiced probability,
+but the HMM is decoded online: the Viterbi state is carried between
+blocks and only the newest frame is evaluated on each hop.
+"""
+
+import numpy as np
+from typing import Optional, Tuple
+from numpy.lib.stride_tricks import sliding_window_view
+
+from .frame import FFT_OUT
+from .tables import pitch_tables
+
+
+class StreamingPitchTracker:
+    """
+    Incremental pYIN pitch tracker.
+
+    ``librosa.pyin`` rebuilds its threshold prior and a dense
+    ``(2 * n_bins) x (2 * n_bins)`` transition matrix and decodes the whole
+    window on every call. This tracker takes those tables from the shared
+    cache in ``tables.py`` (built once per configuration), keeps the
+    Viterbi log-probabilities between calls and applies the (banded) pitch
+    transition to a single new frame per hop, which keeps the cost well
+    under 1ms per block.
+
+    Args:
+        sample_rate: Audio sample rate in Hz
+        fmin: Minimum frequency in Hz
+        fmax: Maximum frequency in Hz
+        frame_length: Analysis frame length in samples (default: 2048)
+        hop_length: Samples between successive frames (default: 512)
+        n_thresholds: Number of YIN thresholds in the prior (default: 100)
+        beta_parameters: Shape of the beta prior over thresholds
+        boltzmann_parameter: Boltzmann parameter for the trough prior
+        resolution: Pitch bin resolution in semitones (default: 0.1)
+        max_transition_rate: Maximum pitch transition rate in octaves/second
+        switch_prob: Probability of switching between voiced and unvoiced
+        no_trough_prob: Probability mass given to the global minimum
+            when no trough falls below a threshold
+    """
+
+    def __init__(
+        self,
+        sample_rate: int,
+        fmin: float,
+        fmax: float,
+        frame_length: int = 2048,
+        hop_length: int = 512,
+        n_thresholds: int = 100,
+        beta_parameters: Tuple[float, float] = (2, 18),
+        boltzmann_parameter: float = 2.0,
+        resolution: float = 0.1,
+        max_transition_rate: float = 35.92,
+        switch_prob: float = 0.01,
+        no_trough_prob: float = 0.01
+    ):
+        self.sample_rate = sample_rate
+        self.fmin = fmin
+        self.fmax = fmax
+        self.frame_length = frame_length
+        self.hop_length = hop_length
+        self.boltzmann_parameter = boltzmann_parameter
+        self.no_trough_prob = no_trough_prob
+
+        # Shared static tables (period range, threshold prior, pitch bins,
+        # banded transition)
+        tables = pitch_tables(
+            sample_rate, float(fmin), float(fmax), frame_length, hop_length,
+            n_thresholds, tuple(beta_parameters), resolution, max_transition_rate
+        )
+        self.min_period = tables.min_period
+        self.max_period = tables.max_period
+        self._n_fft = 2 * frame_length
+        self._lag_range = tables.lag_range
+        self.thresholds = tables.thresholds
+        self.beta_probs = tables.beta_probs
+        self._beta_cumsum = tables.beta_cumsum
+        self.n_bins_per_semitone = tables.n_bins_per_semitone
+        self.n_pitch_bins = tables.n_pitch_bins
+        self.freqs = tables.freqs
+        self._tiny = np.finfo(np.float64).tiny
+        self._half_width = tables.half_width
+        self._log_band = tables.log_band
+        band = 2 * self._half_width + 1
+
+        self._log_stay = np.log(1 - switch_prob)
+        self._log_switch = np.log(switch_prob)
+        self._log_init = np.log(1.0 / (2 * self.n_pitch_bins) + self._tiny)
+
+        # Scratch for the banded max-plus product (voiced and unvoiced lanes)
+        self._padded_delta = np.full(
+            (2, self.n_pitch_bins + 2 * self._half_width), np.log(self._tiny)
+        )
+        self._band_scratch = np.empty((2, band, self.n_pitch_bins))
+        self._band_result = np.empty((2, self.n_pitch_bins))
+        self._allocate_scratch(())
+
+        self.reset()
+
+    def _allocate_scratch(self, shape: Tuple[int, ...]) -> None:
+        """Buffers the difference function and decoder work in, with a leading ``shape``."""
+        n_periods = self.max_period - self.min_period + 1
+        self._power = np.zeros(shape + (self._n_fft // 2 + 1,), dtype=np.complex128)  # irfft input
+        self._power_imag = np.zeros(shape + (self._n_fft // 2 + 1,))
+        self._acf = np.zeros(shape + (self._n_fft,))
+        self._energy = np.zeros(shape + (self.max_period,))
+        self._diff = np.zeros(shape + (self.max_period,))
+        self._cumulative_mean = np.zeros(shape + (self.max_period,))
+        self._yin_frame = np.zeros(shape + (n_periods,))
+        self._observation_buffer = np.zeros(shape + (2 * self.n_pitch_bins,))
+        self._log_obs = np.zeros(shape + (2 * self.n_pitch_bins,))
+        self._delta_buffer = np.zeros(shape + (2, self.n_pitch_bins))
+        self._stay = np.zeros(shape + (self.n_pitch_bins,))
+        self._switch = np.zeros(shape + (self.n_pitch_bins,))
+
+    def reset(self) -> None:
+        """Forget the decoding history (e.g. between songs)."""
+        self._delta = None
+        self.frames_processed = 0
+
+    def _yin(self, frame: np.ndarray, spectrum: Optional[np.ndarray] = None) -> np.ndarray:
+        """Cumulative mean normalized difference function of one frame."""
+        if spectrum is None:
+            spectrum = np.fft.rfft(frame, n=self._n_fft)
+        power = self._power.real
+        np.square(spectrum.real, out=power)
+        power += np.square(spectrum.imag, out=self._power_imag)
+        if FFT_OUT:
+            acf = np.fft.irfft(self._power, n=self._n_fft, out=self._acf)
+        else:
+            acf = np.fft.irfft(self._power, n=self._n_fft)
+        return self._yin_from_acf(frame, acf)
+
+    def _yin_from_acf(self, frame: np.ndarray, acf: np.ndarray) -> np.ndarray:
+        """CMND from a precomputed autocorrelation (equation 8 of the YIN paper)."""
+        energy = np.square(frame[:self.max_period], out=self._energy, dtype=np.float64)
+        np.cumsum(energy, out=energy)
+        diff = np.subtract(acf[0], acf[1:self.max_period + 1], out=self._diff)
+        diff *= 2
+        diff -= energy
+        cumulative_mean = np.cumsum(diff, out=self._cumulative_mean)
+        cumulative_mean /= self._lag_range
+        denominator = cumulative_mean[self.min_period - 1:]
+        denominator += self._tiny
+        return np.divide(diff[self.min_period - 1:], denominator, out=self._yin_frame)
+
+    def _observation(self, yin_frame: np.ndarray) -> Tuple[np.ndarray, float]:
+        """pYIN observation probabilities for one frame (port of librosa's helper)."""
+        n_bins = self.n_pitch_bins
+        observation = self._observation_buffer
+        observation.fill(0)
+
+        # 1. Troughs of the difference function
+        is_trough = np.zeros(len(yin_frame), dtype=bool)
+        is_trough[1:-1] = (yin_frame[1:-1] < yin_frame[:-2]) & (yin_frame[1:-1] <= yin_frame[2:])
+        is_trough[-1] = yin_frame[-1] < yin_frame[-2]
+        is_trough[0] = yin_frame[0] < yin_frame[1]
+        trough_index = np.flatnonzero(is_trough)
+
+        if len(trough_index) > 0:
+            # 2. Troughs below each threshold, with a Boltzmann prior favouring short periods
+            trough_heights = yin_frame[trough_index]
+            below = trough_heights[:, None] < self.thresholds[None, 1:]
+            n_troughs = np.count_nonzero(below, axis=0)
+            lam = self.boltzmann_parameter
+
+            # (1 - e^-lam) e^(-lam position) / (1 - e^(-lam n_troughs)), in place
+            prior = np.cumsum(below, axis=0, dtype=np.float64)
+            prior -= 1
+            prior *= -lam
+            np.exp(prior, out=prior)
+            prior *= 1 - np.exp(-lam)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                prior /= 1 - np.exp(-lam * n_troughs)
+            prior[~below] = 0
+            probs = prior.dot(self.beta_probs)
+
+            # 3. Thresholds with no trough below them vote for the global minimum
+            global_min = np.argmin(trough_heights)
+            n_thresholds_below_min = np.count_nonzero(~below[global_min])
+            probs[global_min] += self.no_trough_prob * self._beta_cumsum[n_thresholds_below_min]
+
+            nonzero = probs > 0
+            trough_index = trough_index[nonzero]
+            probs = probs[nonzero]
+
+            # 4. Refine by parabolic interpolation and map to pitch bins
+            shifts = np.zeros(len(trough_index))
+            interior = (trough_index > 0) & (trough_index < len(yin_frame) - 1)
+            idx = trough_index[interior]
+            a = yin_frame[idx + 1] + yin_frame[idx - 1] - 2 * yin_frame[idx]
+            b = (yin_frame[idx + 1] - yin_frame[idx - 1]) / 2
+            with np.errstate(divide='ignore', invalid='ignore'):
+                shifts[interior] = np.where(np.abs(b) >= np.abs(a), 0.0, -b / a)
+
+            f0_candidates = self.sample_rate / (self.min_period + trough_index + shifts)
+            bin_index = 12 * self.n_bins_per_semitone * np.log2(f0_candidates / self.fmin)
+            bin_index = np.clip(np.round(bin_index), 0, n_bins).astype(int)
+            observation[bin_index] = probs
+
+        voiced_prob = float(np.clip(np.sum(observation[:n_bins]), 0, 1))
+        observation[n_bins:] = (1 - voiced_prob) / n_bins
+        return observation, voiced_prob
+
+    def _band_max(self) -> np.ndarray:
+        """max_i (delta[i] + log T[i, j]) over the transition band, per voicing lane."""
+        h = self._half_width
+        self._padded_delta[:, h:h + self.n_pitch_bins] = self._delta
+        windows = sliding_window_view(self._padded_delta, self.n_pitch_bins, axis=1)
+        # Copy first: a ufunc would buffer the overlapping windows itself
+        np.copyto(self._band_scratch, windows)
+        self._band_scratch += self._log_band
+        return np.max(self._band_scratch, axis=1, out=self._band_result)
+
+    def _advance(self, observation: np.ndarray) -> np.ndarray:
+        """Viterbi step into the preallocated delta: log_obs + best banded predecessor."""
+        log_obs = np.add(observation, self._tiny, out=self._log_obs)
+        log_obs = np.log(log_obs, out=log_obs).reshape(self._delta_buffer.shape)
+        delta = self._delta_buffer
+
+        if self._delta is None:
+            return np.add(log_obs, self._log_init, out=delta)
+
+        # _band_max has copied the previous delta, so it is overwritten in place
+        band_max = self._band_max()
+        from_voiced, from_unvoiced = band_max[..., 0, :], band_max[..., 1, :]
+        for lane, (same, other) in enumerate([(from_voiced, from_unvoiced), (from_unvoiced, from_voiced)]):
+            np.add(same, self._log_stay, out=self._stay)
+            np.add(other, self._log_switch, out=self._switch)
+            np.maximum(self._stay, self._switch, out=delta[..., lane, :])
+        delta += log_obs
+        return delta
+
+    def _decode(self, observation: np.ndarray) -> int:
+        """Advance the Viterbi recursion by one frame and return the best state."""
+        delta = self._advance(observation)
+
+        # Renormalize so the log-probabilities stay bounded across a long performance
+        delta -= np.max(delta)
+        self._delta = delta
+        self.frames_processed += 1
+        return int(np.argmax(delta))
+
+    def process_frame(
+        self,
+        frame: np.ndarray,
+        spectrum: Optional[np.ndarray] = None
+    ) -> Tuple[float, bool, float]:
+        """
+        Analyze the newest frame and advance the tracker by one hop.
+
+        Args:
+            frame: The most recent ``frame_length`` samples (mono)
+            spectrum: Optional rfft of ``frame`` zero-padded to
+                ``2 * frame_length`` (e.g. ``AnalysisFrame.spectrum``), to
+                avoid transforming the frame a second time
+
+        Returns:
+            (f0, voiced_flag, voiced_prob) for this frame. ``f0`` is NaN
+            when the decoded state is unvoiced.
+        """
+        yin_frame = self._yin(np.asarray(frame, dtype=np.float64), spectrum)
+        observation, voiced_prob = self._observation(yin_frame)
+        state = self._decode(observation)
+
+        voiced = state < self.n_pitch_bins
+        f0 = float(self.freqs[state % self.n_pitch_bins]) if voiced else float('nan')
+        return f0, voiced, voiced_prob
+
+
+class MultiChannelPitchTracker(StreamingPitchTracker):
+    """
+    Streaming pYIN for several channels at once.
+
+    Shares the precomputed tables of ``StreamingPitchTracker`` and keeps
+    one Viterbi state per channel in a stacked ``(n_channels, 2, n_bins)``
+    array. The difference function, trough search, observation model and
+    banded decode are each a single vectorized pass over all channels, so
+    per-channel Python overhead is paid once per block. Each channel gives
+    the same result as its own ``StreamingPitchTracker``.
+
+    Args:
+        n_channels: Number of channels
+        sample_rate: Audio sample rate in Hz
+        fmin: Minimum frequency in Hz
+        fmax: Maximum frequency in Hz
+        **kwargs: Tracker parameters (see ``StreamingPitchTracker``)
+    """
+
+    def __init__(self, n_channels: int, sample_rate: int, fmin: float, fmax: float, **kwargs):
+        self.n_channels = n_channels
+        super().__init__(sample_rate, fmin, fmax, **kwargs)
+
+        # Per-channel scratch for the banded max-plus product
+        band = 2 * self._half_width + 1
+        self._padded_delta = np.full(
+            (n_channels, 2, self.n_pitch_bins + 2 * self._half_width), np.log(self._tiny)
+        )
+        self._band_scratch = np.empty((n_channels, 2, band, self.n_pitch_bins))
+        self._band_result = np.empty((n_channels, 2, self.n_pitch_bins))
+        self._allocate_scratch((n_channels,))
+
+    def _yin_from_acf(self, frame: np.ndarray, acf: np.ndarray) -> np.ndarray:
+        """CMND of every channel, ``(n_channels, n_periods)``."""
+        energy = np.square(frame[:, :self.max_period], out=self._energy, dtype=np.float64)
+        np.cumsum(energy, axis=1, out=energy)
+        diff = np.subtract(acf[:, :1], acf[:, 1:self.max_period + 1], out=self._diff)
+        diff *= 2
+        diff -= energy
+        cumulative_mean = np.cumsum(diff, axis=1, out=self._cumulative_mean)
+        cumulative_mean /= self._lag_range
+        denominator = cumulative_mean[:, self.min_period - 1:]
+        denominator += self._tiny
+        return np.divide(diff[:, self.min_period - 1:], denominator, out=self._yin_frame)
+
+    def _observation(self, yin_frame: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """pYIN observation probabilities for every channel."""
+        n_bins = self.n_pitch_bins
+        n_channels, n_periods = yin_frame.shape
+        observation = np.zeros((n_channels, 2 * n_bins))
+
+        # 1. Troughs of every channel, flattened channel by channel
+        is_trough = np.zeros(yin_frame.shape, dtype=bool)
+        is_trough[:, 1:-1] = (yin_frame[:, 1:-1] < yin_frame[:, :-2]) & (yin_frame[:, 1:-1] <= yin_frame[:, 2:])
+        is_trough[:, -1] = yin_frame[:, -1] < yin_frame[:, -2]
+        is_trough[:, 0] = yin_frame[:, 0] < yin_frame[:, 1]
+        channel, trough_index = np.nonzero(is_trough)
+
+        if len(trough_index) > 0:
+            # Segments of consecutive troughs belonging to the same channel
+            starts = np.flatnonzero(np.r_[True, channel[1:] != channel[:-1]])
+            ends = np.r_[starts[1:], len(channel)] - 1
+            segment = np.cumsum(np.r_[0, channel[1:] != channel[:-1]])
+
+            # 2. Troughs below each threshold, ranked within their channel
+            trough_heights = yin_frame[channel, trough_index]
+            below = trough_heights[:, None] < self.thresholds[None, 1:]
+            cumulative = np.cumsum(below, axis=0)
+            offset = cumulative[starts] - below[starts]
+            positions = cumulative - offset[segment] - 1
+            n_troughs = (cumulative[ends] - offset)[segment]
+            lam = self.boltzmann_parameter
+            with np.errstate(divide='ignore', invalid='ignore'):
+                prior = (1 - np.exp(-lam)) * np.exp(-lam * positions) / (1 - np.exp(-lam * n_troughs))
+            prior[~below] = 0
+            probs = prior.dot(self.beta_probs)
+
+            # 3. Global minimum of each channel (first occurrence, as argmin)
+            global_min = np.lexsort((trough_heights, segment))[starts]
+            n_thresholds_below_min = np.count_nonzero(~below[global_min], axis=1)
+            probs[global_min] += self.no_trough_prob * self._beta_cumsum[n_thresholds_below_min]
+
+            nonzero = probs > 0
+            channel = channel[nonzero]
+            trough_index = trough_index[nonzero]
+            probs = probs[nonzero]
+
+            # 4. Parabolic interpolation and pitch bins
+            shifts = np.zeros(len(trough_index))
+            interior = (trough_index > 0) & (trough_index < n_periods - 1)
+            ch, idx = channel[interior], trough_index[interior]
+            a = yin_frame[ch, idx + 1] + yin_frame[ch, idx - 1] - 2 * yin_frame[ch, idx]
+            b = (yin_frame[ch, idx + 1] - yin_frame[ch, idx - 1]) / 2
+            with np.errstate(divide='ignore', invalid='ignore'):
+                shifts[interior] = np.where(np.abs(b) >= np.abs(a), 0.0, -b / a)
+
+            f0_candidates = self.sample_rate / (self.min_period + trough_index + shifts)
+            bin_index = 12 * self.n_bins_per_semitone * np.log2(f0_candidates / self.fmin)
+            bin_index = np.clip(np.round(bin_index), 0, n_bins).astype(int)
+            observation[channel, bin_index] = probs
+
+        voiced_prob = np.clip(np.sum(observation[:, :n_bins], axis=1), 0, 1)
+        observation[:, n_bins:] = ((1 - voiced_prob) / n_bins)[:, None]
+        return observation, voiced_prob
+
+    def _band_max(self) -> np.ndarray:
+        """Banded max-plus product for every channel and voicing lane."""
+        h = self._half_width
+        self._padded_delta[:, :, h:h + self.n_pitch_bins] = self._delta
+        windows = sliding_window_view(self._padded_delta, self.n_pitch_bins, axis=2)
+        np.copyto(self._band_scratch, windows)
+        self._band_scratch += self._log_band
+        return np.max(self._band_scratch, axis=2, out=self._band_result)
+
+    def _decode(self, observation: np.ndarray) -> np.ndarray:
+        """Advance every channel's Viterbi recursion and return the best states."""
+        delta = self._advance(observation)
+
+        delta -= np.max(delta, axis=(1, 2), keepdims=True)
+        self._delta = delta
+        self.frames_processed += 1
+        return np.argmax(delta.reshape(self.n_channels, -1), axis=1)
+
+    def process_frame(
+        self,
+        frame: np.ndarray,
+        spectrum: Optional[np.ndarray] = None
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Analyze the newest frame of every channel and advance by one hop.
+
+        Args:
+            frame: The most recent ``frame_length`` samples, ``(n_channels, frame_length)``
+            spectrum: Optional padded rfft of ``frame`` (e.g. a multi-channel
+                ``AnalysisFrame.spectrum``)
+
+        Returns:
+            (f0, voiced_flag, voiced_prob) arrays of length ``n_channels``.
+            ``f0`` is NaN for channels whose decoded state is unvoiced.
+        """
+        yin_frame = self._yin(np.asarray(frame, dtype=np.float64), spectrum)
+        observation, voiced_prob = self._observation(yin_frame)
+        state = self._decode(observation)
+
+        voiced = state < self.n_pitch_bins
+        f0 = np.where(voiced, self.freqs[state % self.n_pitch_bins], np.nan)
+        return f0, voiced, voiced_prob
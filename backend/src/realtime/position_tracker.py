@@ -12,11 +12,32 @@ This tracker simply determines WHERE the performer is within that map.
 """
 
 import numpy as np
-from typing import Optional, List, Dict, Any, Tuple
+from typing import TYPE_CHECKING, Optional, List, Dict, Any, Sequence, Tuple, Union
 from dataclasses import dataclass, field
 from collections import deque
 import time
-import bisect
+
+from .jump_detector import JumpDetector
+from .score_follower import OnsetScoreFollower
+
+if TYPE_CHECKING:
+    from .song_map_cache import CompiledSongMap
+
+
+# Compact onset index: one 24-byte record per Song Map onset, sorted by time
+ONSET_DTYPE = np.dtype([
+    ('time', np.float64),  # Seconds from start of song
+    ('section', np.int32),  # Section index in the Song Map
+    ('line', np.int32),  # Line index within the section
+    ('syllable', np.int32),  # Syllable index within the line
+    ('chord', np.int32),  # Index into SongMapPositionTracker.chords, -1 if none
+])
+
+# Onsets either side of the expected position considered for a match
+MATCH_CANDIDATES = 10
+
+# Onset matching modes: nearest onset in a window, or online DTW score following
+TRACKING_MODES = ('greedy', 'dtw')
 
 
 @dataclass
@@ -64,28 +85,73 @@ class SongMapPositionTracker:
     5. Target <25ms latency (validated by benchmarks)
 
     Args:
-        song_map: Pre-analyzed Song Map dictionary
+        song_map: Pre-analyzed Song Map dictionary, or a CompiledSongMap
+            (see song_map_cache.py) whose arrays are used as they are
         onset_match_window: Time window for matching detected onsets to map (seconds)
         min_onset_confidence: Minimum confidence for using an onset match
         tempo_smoothing: Smoothing factor for tempo ratio updates (0-1)
+        mode: Onset matching, 'greedy' (best onset within the match window
+            around the extrapolated position) or 'dtw' (online DTW over the
+            onset stream, which recovers after skips; see score_follower.py)
+        jump_detection: In 'greedy' mode, also score the section starts
+            against recent inter-onset intervals and move there when one
+            clearly fits better (see jump_detector.py; default: False,
+            live performance sessions turn it on)
     """
 
     def __init__(
         self,
-        song_map: Dict[str, Any],
+        song_map: Union[Dict[str, Any], 'CompiledSongMap'],
         onset_match_window: float = 0.15,  # 150ms window for matching
         min_onset_confidence: float = 0.6,
-        tempo_smoothing: float = 0.3
+        tempo_smoothing: float = 0.3,
+        mode: str = 'greedy',
+        jump_detection: bool = False
     ):
-        self.song_map = song_map
+        if mode not in TRACKING_MODES:
+            raise ValueError(f"mode must be one of {TRACKING_MODES}, got {mode!r}")
+
+        self.mode = mode
         self.onset_match_window = onset_match_window
         self.min_onset_confidence = min_onset_confidence
         self.tempo_smoothing = tempo_smoothing
 
-        # Parse Song Map into efficient data structures
-        self.sections = self._parse_sections(song_map)
-        self.onsets = self._parse_onsets(song_map)
-        self.onset_times = [o.time for o in self.onsets]  # For binary search
+        section_starts = None
+        if isinstance(song_map, dict):
+            # Parse Song Map into efficient data structures: a structured onset
+            # array (see ONSET_DTYPE), a contiguous copy of its times for
+            # searchsorted, and the syllable of every onset in the same order
+            self.song_map = song_map
+            self.section_by_index: Sequence[Optional[SongMapSection]] = []
+            self.sections: Sequence[SongMapSection] = self._parse_sections(song_map)
+            self.chords: List[str] = []
+            self.syllables: Sequence[Dict[str, Any]] = []
+            self.onsets = self._parse_onsets(song_map)
+            self.onset_times = np.ascontiguousarray(self.onsets['time'])
+        else:
+            # Compiled Song Map: the same structures, memory-mapped, with
+            # sections and syllables decoded on access
+            self.song_map = song_map.metadata
+            self.section_by_index = song_map.section_by_index
+            self.sections = song_map.sections
+            self.chords = song_map.chords
+            self.syllables = song_map.syllables
+            self.onsets = song_map.onsets
+            self.onset_times = song_map.onset_times
+            section_starts = song_map.section_starts
+        self._match_distance = np.empty(2 * MATCH_CANDIDATES + 1)
+
+        # Score follower for the 'dtw' mode
+        self.follower: Optional[OnsetScoreFollower] = None
+        if mode == 'dtw':
+            self.follower = OnsetScoreFollower(self.onset_times, self.onsets['chord'], self.chords)
+
+        # Section-start hypotheses for the 'greedy' mode
+        self.jump_detector: Optional[JumpDetector] = None
+        if mode == 'greedy' and jump_detection:
+            if section_starts is None:
+                _, section_starts = np.unique(self.onsets['section'], return_index=True)
+            self.jump_detector = JumpDetector(self.onset_times, section_starts)
 
         # Current position
         self.position = PerformerPosition(
@@ -98,6 +164,7 @@ class SongMapPositionTracker:
 
         # Onset tracking
         self.recent_onsets = deque(maxlen=8)  # Last 8 detected onsets
+        self.recent_matches = deque(maxlen=8)  # Onset matched to each (-1 if none)
         self.performance_start_time: Optional[float] = None
         self.last_update_time: Optional[float] = None
 
@@ -107,11 +174,24 @@ class SongMapPositionTracker:
         # Jump detection (for section skips/repeats)
         self.expected_next_onset_idx: Optional[int] = None
 
+        # Last confident match, which extrapolation and matching project from
+        self.matched_onset_idx: Optional[int] = None
+        self.matched_song_time = 0.0
+        self.matched_confidence = 0.0
+
     def _parse_sections(self, song_map: Dict[str, Any]) -> List[SongMapSection]:
-        """Parse sections from Song Map."""
+        """
+        Parse sections from Song Map.
+
+        Sections without syllables are skipped; ``self.section_by_index``
+        maps every Song Map section index to its parsed section (or None).
+        """
         sections = []
+        self.section_by_index = []
 
         for section_data in song_map.get('sections', []):
+            self.section_by_index.append(None)
+
             # Calculate section timing from first/last syllable
             lines = section_data.get('lines', [])
 
@@ -144,12 +224,23 @@ class SongMapPositionTracker:
                     end_time=end_time,
                     lines=lines
                 ))
+                self.section_by_index[-1] = sections[-1]
 
         return sections
 
-    def _parse_onsets(self, song_map: Dict[str, Any]) -> List[SongMapOnset]:
-        """Parse onsets from Song Map syllable timing."""
+    def _parse_onsets(self, song_map: Dict[str, Any]) -> np.ndarray:
+        """
+        Parse onsets from Song Map syllable timing.
+
+        Chord symbols are interned into ``self.chords``; the syllable of
+        every onset is stored, in onset order, in ``self.syllables``.
+
+        Returns:
+            Structured array of ONSET_DTYPE records, sorted by time
+        """
         onsets = []
+        syllable_table = []
+        chord_ids: Dict[str, int] = {}
 
         for section_idx, section_data in enumerate(song_map.get('sections', [])):
             lines = section_data.get('lines', [])
@@ -161,19 +252,42 @@ class SongMapPositionTracker:
                     # Each syllable start is an onset
                     onset_time = syllable.get('startTime', 0.0)
 
-                    onsets.append(SongMapOnset(
-                        time=onset_time,
-                        section_index=section_idx,
-                        line_index=line_idx,
-                        syllable_index=syllable_idx,
-                        chord=syllable.get('chord'),
-                        confidence=1.0  # From offline analysis
-                    ))
+                    chord = syllable.get('chord')
+                    if chord is None:
+                        chord_id = -1
+                    else:
+                        chord_id = chord_ids.setdefault(chord, len(chord_ids))
+
+                    onsets.append((onset_time, section_idx, line_idx, syllable_idx, chord_id))
+                    syllable_table.append(syllable)
 
-        # Sort by time
-        onsets.sort(key=lambda o: o.time)
+        self.chords = list(chord_ids)
 
-        return onsets
+        # Sort by time (stable, so simultaneous onsets keep Song Map order)
+        onsets = np.array(onsets, dtype=ONSET_DTYPE)
+        order = np.argsort(onsets['time'], kind='stable')
+        self.syllables = [syllable_table[i] for i in order.tolist()]
+        return onsets[order]
+
+    def get_onset(self, index: int) -> SongMapOnset:
+        """
+        Get one Song Map onset as a SongMapOnset.
+
+        Args:
+            index: Onset index (in time order)
+
+        Returns:
+            SongMapOnset built from the onset index
+        """
+        onset_time, section_idx, line_idx, syllable_idx, chord_id = self.onsets.item(index)
+        return SongMapOnset(
+            time=onset_time,
+            section_index=section_idx,
+            line_index=line_idx,
+            syllable_index=syllable_idx,
+            chord=self.chords[chord_id] if chord_id >= 0 else None,
+            confidence=1.0  # From offline analysis
+        )
 
     def start(self) -> None:
         """Start tracking performance."""
@@ -188,16 +302,31 @@ class SongMapPositionTracker:
             tempo_ratio=1.0
         )
         self.recent_onsets.clear()
+        self.recent_matches.clear()
         self.tempo_estimates.clear()
         self.expected_next_onset_idx = 0
-
-    def update(self, onset_detected: bool, current_time: Optional[float] = None) -> PerformerPosition:
+        self.matched_onset_idx = None
+        self.matched_song_time = 0.0
+        self.matched_confidence = 0.0
+        if self.follower is not None:
+            self.follower.reset()
+        if self.jump_detector is not None:
+            self.jump_detector.reset()
+
+    def update(
+        self,
+        onset_detected: bool,
+        current_time: Optional[float] = None,
+        chroma: Optional[np.ndarray] = None
+    ) -> PerformerPosition:
         """
         Update position based on onset detection.
 
         Args:
             onset_detected: Whether an onset was detected in this audio block
             current_time: Optional explicit timestamp (otherwise uses time.time())
+            chroma: Optional 12-bin chroma of this block, compared with the
+                Song Map chords in 'dtw' mode
 
         Returns:
             Current performer position
@@ -212,7 +341,7 @@ class SongMapPositionTracker:
         performance_elapsed = current_time - self.performance_start_time
 
         if onset_detected:
-            self._handle_onset(performance_elapsed)
+            self._handle_onset(performance_elapsed, chroma)
         else:
             # No onset - extrapolate position based on tempo
             self._extrapolate_position(performance_elapsed)
@@ -220,95 +349,163 @@ class SongMapPositionTracker:
         self.last_update_time = current_time
         return self.position
 
-    def _handle_onset(self, performance_time: float) -> None:
+    def _handle_onset(self, performance_time: float, chroma: Optional[np.ndarray] = None) -> None:
         """Handle a detected onset."""
         self.recent_onsets.append(performance_time)
 
         # Find matching onset in Song Map
-        match_idx, confidence = self._find_matching_onset(performance_time)
+        previous_idx = None
+        if self.follower is not None:
+            match_idx, confidence = self.follower.step(performance_time, self.position.tempo_ratio, chroma)
+            if match_idx is not None and match_idx == self.matched_onset_idx:
+                # Spurious onset: the alignment stayed put
+                return
+            previous_idx = self.matched_onset_idx
+            if previous_idx is None or not 0 < match_idx - previous_idx <= self.follower.max_skip + 1:
+                # Jumped: no interval to estimate tempo from
+                previous_idx = match_idx
+        else:
+            match_idx, confidence = self._find_matching_onset(performance_time)
+            if self.jump_detector is not None:
+                jump = self._detect_jump(performance_time, match_idx, confidence)
+                if jump is not None:
+                    match_idx, confidence = jump
+                    previous_idx = match_idx  # No interval to estimate tempo from
 
         if match_idx is not None and confidence >= self.min_onset_confidence:
             # Found a confident match
-            matched_onset = self.onsets[match_idx]
+            onset_time, section_idx, line_idx, syllable_idx, _ = self.onsets.item(match_idx)
 
             # Update position
-            self.position.song_time = matched_onset.time
-            self.position.section_index = matched_onset.section_index
-            self.position.line_index = matched_onset.line_index
-            self.position.syllable_index = matched_onset.syllable_index
+            self.position.song_time = onset_time
+            self.position.section_index = section_idx
+            self.position.line_index = line_idx
+            self.position.syllable_index = syllable_idx
             self.position.confidence = confidence
             self.position.last_onset_time = performance_time
 
             # Update tempo estimate
-            self._update_tempo_estimate(match_idx, performance_time)
+            self._update_tempo_estimate(match_idx, performance_time, previous_idx)
 
             # Update expected next onset
             self.expected_next_onset_idx = match_idx + 1
+            self.matched_onset_idx = match_idx
+            self.matched_song_time = onset_time
+            self.matched_confidence = confidence
 
-    def _find_matching_onset(self, performance_time: float) -> Tuple[Optional[int], float]:
+    def _detect_jump(
+        self,
+        performance_time: float,
+        match_idx: Optional[int],
+        confidence: float
+    ) -> Optional[Tuple[int, float]]:
         """
-        Find the Song Map onset that best matches the detected onset.
+        Check the greedy match against the section-start hypotheses.
 
         Returns:
-            (onset_index, confidence) or (None, 0.0) if no good match
+            (onset_index, confidence) to use instead, if a section start
+            clearly fits the recent onsets better; None otherwise
         """
-        if not self.onsets:
-            return None, 0.0
+        confident = match_idx is not None and confidence >= self.min_onset_confidence
+        self.recent_matches.append(match_idx if confident else -1)
 
-        # Estimate where we should be in the song based on last known position
-        expected_song_time = self.position.song_time
         if self.position.last_onset_time is not None:
-            time_since_last = performance_time - self.position.last_onset_time
-            expected_song_time += time_since_last * self.position.tempo_ratio
+            expected_song_time = (self.matched_song_time
+                                  + (performance_time - self.position.last_onset_time) * self.position.tempo_ratio)
         else:
-            # First onset - use performance time as song time (assume starting from 0)
             expected_song_time = performance_time
 
-        # Search for onsets near the expected position
-        search_center_idx = bisect.bisect_left(self.onset_times, expected_song_time)
-
-        # Check onsets in a window around expected position
-        best_idx = None
-        best_confidence = 0.0
+        jump = self.jump_detector.check(self.recent_onsets, self.recent_matches, expected_song_time)
+        if jump is None:
+            return None
 
-        # Search forward and backward from expected position
-        for offset in range(-10, 11):  # Check ±10 onsets
-            idx = search_center_idx + offset
-
-            if idx < 0 or idx >= len(self.onsets):
-                continue
+        # The recent onsets now follow the new position, at the tempo fitted
+        # there (the greedy estimate was fed by the wrong matches)
+        position, cost, tempo_ratio = jump
+        for back in range(min(len(self.recent_matches), self.jump_detector.pattern_length + 1)):
+            self.recent_matches[-1 - back] = position - back
+        self.tempo_estimates.clear()
+        self.tempo_estimates.append(tempo_ratio)
+        self.position.tempo_ratio = tempo_ratio
+        return position, float(np.exp(-cost))
 
-            onset = self.onsets[idx]
+    def _find_matching_onset(self, performance_time: float) -> Tuple[Optional[int], float]:
+        """
+        Find the Song Map onset that best matches the detected onset.
 
-            # Calculate how far this onset is from where we expect to be
-            song_time_diff = abs(onset.time - expected_song_time)
+        Scores the onsets around the expected position in one vectorized
+        pass (searchsorted, then an argmin over distances, which ranks
+        candidates exactly as their confidences do); ties go to the
+        earliest onset.
 
-            # If within match window, calculate confidence
-            if song_time_diff <= self.onset_match_window:
-                # Higher confidence for closer matches
-                confidence = 1.0 - (song_time_diff / self.onset_match_window)
+        Returns:
+            (onset_index, confidence) or (None, 0.0) if no good match
+        """
+        if len(self.onsets) == 0:
+            return None, 0.0
 
-                # Boost confidence if this is the expected next onset
-                if idx == self.expected_next_onset_idx:
-                    confidence = min(1.0, confidence * 1.5)
+        # Estimate where we should be in the song based on the last match
+        if self.position.last_onset_time is not None:
+            time_since_last = performance_time - self.position.last_onset_time
+            expected_song_time = self.matched_song_time + time_since_last * self.position.tempo_ratio
+        else:
+            # First onset - use performance time as song time (assume starting from 0)
+            expected_song_time = performance_time
 
-                if confidence > best_confidence:
-                    best_confidence = confidence
-                    best_idx = idx
+        # Candidate onsets around the expected position
+        search_center_idx = int(self.onset_times.searchsorted(expected_song_time))
+        lo = max(search_center_idx - MATCH_CANDIDATES, 0)
+        hi = min(search_center_idx + MATCH_CANDIDATES + 1, len(self.onsets))
+
+        # Confidence falls with distance, so the best unboosted candidate is
+        # the closest one (the first, on ties)
+        distance = self._match_distance[:hi - lo]
+        np.subtract(self.onset_times[lo:hi], expected_song_time, out=distance)
+        np.abs(distance, out=distance)
+        best = int(distance.argmin())
+        best_idx = lo + best
+        best_confidence = 1.0 - distance.item(best) / self.onset_match_window
+
+        # Boost confidence if this is the expected next onset
+        expected = self.expected_next_onset_idx
+        if expected is not None and lo <= expected < hi:
+            expected_distance = distance.item(expected - lo)
+            if expected_distance <= self.onset_match_window:
+                confidence = min(1.0, (1.0 - expected_distance / self.onset_match_window) * 1.5)
+                if confidence > best_confidence or (confidence == best_confidence and expected < best_idx):
+                    best_idx, best_confidence = expected, confidence
+
+        # Outside the match window (or on its edge) is no match
+        if best_confidence <= 0.0:
+            return None, 0.0
 
         return best_idx, best_confidence
 
-    def _update_tempo_estimate(self, onset_idx: int, performance_time: float) -> None:
-        """Update tempo ratio estimate based on matched onset."""
+    def _update_tempo_estimate(
+        self,
+        onset_idx: int,
+        performance_time: float,
+        previous_idx: Optional[int] = None
+    ) -> None:
+        """
+        Update tempo ratio estimate based on matched onset.
+
+        Args:
+            onset_idx: Matched Song Map onset
+            performance_time: When it was played
+            previous_idx: Onset matched before it (default: ``onset_idx - 1``)
+        """
         if self.position.last_onset_time is None:
             return
+        if previous_idx is None:
+            previous_idx = onset_idx - 1
 
         # Calculate actual time between onsets
         performance_interval = performance_time - self.position.last_onset_time
 
         # Calculate expected interval from Song Map
-        if onset_idx > 0:
-            map_interval = self.onsets[onset_idx].time - self.onsets[onset_idx - 1].time
+        if 0 <= previous_idx < onset_idx:
+            map_interval = self.onset_times[onset_idx] - self.onset_times[previous_idx]
 
             if map_interval > 0 and performance_interval > 0:
                 # Tempo ratio = map_time / performance_time
@@ -339,14 +536,14 @@ class SongMapPositionTracker:
         # Calculate how much time has passed
         time_since_last = performance_time - self.position.last_onset_time
 
-        # Extrapolate song position using tempo ratio
+        # Extrapolate song position from the last match using tempo ratio
         song_time_advance = time_since_last * self.position.tempo_ratio
-        self.position.song_time += song_time_advance
+        self.position.song_time = self.matched_song_time + song_time_advance
 
         # Decrease confidence over time when extrapolating
         # Confidence decays to 0.5 after 1 second without an onset
         decay_factor = np.exp(-time_since_last * 0.693)  # Half-life of 1 second
-        self.position.confidence *= decay_factor
+        self.position.confidence = self.matched_confidence * decay_factor
 
         # Update section/line/syllable based on new song_time
         self._update_position_from_song_time()
@@ -354,18 +551,18 @@ class SongMapPositionTracker:
     def _update_position_from_song_time(self) -> None:
         """Update section/line/syllable indices based on current song_time."""
         # Find current onset based on song time
-        idx = bisect.bisect_left(self.onset_times, self.position.song_time)
+        idx = int(self.onset_times.searchsorted(self.position.song_time))
 
         if idx > 0 and idx <= len(self.onsets):
-            onset = self.onsets[idx - 1]
-            self.position.section_index = onset.section_index
-            self.position.line_index = onset.line_index
-            self.position.syllable_index = onset.syllable_index
+            _, section_idx, line_idx, syllable_idx, _ = self.onsets.item(idx - 1)
+            self.position.section_index = section_idx
+            self.position.line_index = line_idx
+            self.position.syllable_index = syllable_idx
 
     def get_current_section(self) -> Optional[SongMapSection]:
         """Get current section."""
-        if 0 <= self.position.section_index < len(self.sections):
-            return self.sections[self.position.section_index]
+        if 0 <= self.position.section_index < len(self.section_by_index):
+            return self.section_by_index[self.position.section_index]
         return None
 
     def get_current_line(self) -> Optional[Dict[str, Any]]:
@@ -377,37 +574,33 @@ class SongMapPositionTracker:
 
     def get_current_syllable(self) -> Optional[Dict[str, Any]]:
         """Get current syllable."""
-        line = self.get_current_line()
-        if line:
-            syllables = line.get('syllables', [])
-            if 0 <= self.position.syllable_index < len(syllables):
-                return syllables[self.position.syllable_index]
-        return None
+        return self._get_syllable_at_position(
+            self.position.section_index,
+            self.position.line_index,
+            self.position.syllable_index
+        )
 
-    def get_lookahead(self, seconds: float = 2.0) -> List[Dict[str, Any]]:
+    def get_lookahead(self, seconds: float = 2.0, limit: Optional[int] = None) -> List[Dict[str, Any]]:
         """
         Get upcoming syllables for teleprompter lookahead.
 
+        A range slice of the onset-ordered syllable table, so the cost does
+        not depend on the length of the song.
+
         Args:
             seconds: How many seconds ahead to look
+            limit: Maximum number of syllables to return (default: all)
 
         Returns:
-            List of upcoming syllable dictionaries
+            List of upcoming syllable dictionaries, in onset order
         """
-        lookahead_until = self.position.song_time + seconds
-        upcoming = []
+        song_time = self.position.song_time
+        start = int(self.onset_times.searchsorted(song_time, side='right'))
+        end = int(self.onset_times.searchsorted(song_time + seconds, side='right'))
+        if limit is not None:
+            end = min(end, start + limit)
 
-        for onset in self.onsets:
-            if onset.time > self.position.song_time and onset.time <= lookahead_until:
-                syllable = self._get_syllable_at_position(
-                    onset.section_index,
-                    onset.line_index,
-                    onset.syllable_index
-                )
-                if syllable:
-                    upcoming.append(syllable)
-
-        return upcoming
+        return self.syllables[start:end]
 
     def _get_syllable_at_position(
         self,
@@ -416,9 +609,9 @@ class SongMapPositionTracker:
         syllable_idx: int
     ) -> Optional[Dict[str, Any]]:
         """Get syllable at specific position."""
-        if 0 <= section_idx < len(self.sections):
-            section = self.sections[section_idx]
-            if 0 <= line_idx < len(section.lines):
+        if 0 <= section_idx < len(self.section_by_index):
+            section = self.section_by_index[section_idx]
+            if section and 0 <= line_idx < len(section.lines):
                 line = section.lines[line_idx]
                 syllables = line.get('syllables', [])
                 if 0 <= syllable_idx < len(syllables):
@@ -427,13 +620,84 @@ class SongMapPositionTracker:
 
     def get_stats(self) -> Dict[str, Any]:
         """Get current tracking statistics."""
+        section = self.get_current_section()
         return {
             'song_time': self.position.song_time,
-            'section': self.get_current_section().name if self.get_current_section() else None,
+            'section': section.name if section else None,
             'confidence': self.position.confidence,
             'tempo_ratio': self.position.tempo_ratio,
             'tempo_bpm_ratio': self.position.tempo_ratio,  # Same as tempo_ratio
             'recent_onsets': len(self.recent_onsets),
             'total_sections': len(self.sections),
-            'total_onsets': len(self.onsets)
+            'total_onsets': len(self.onsets),
+            'mode': self.mode,
+            'follower': self.follower.get_stats() if self.follower is not None else None,
+            'jumps': self.jump_detector.get_stats() if self.jump_detector is not None else None
         }
+
+
+def _chord_symbol(label: str) -> Optional[str]:
+    """Chord symbol of a pipeline chord label ('A:maj' -> 'A', 'A:min' -> 'Am', 'N' -> None)."""
+    root, _, quality = label.partition(':')
+    if not root or root == 'N':
+        return None
+    if quality in ('', 'maj'):
+        return root
+    if quality == 'min':
+        return root + 'm'
+    return root + quality
+
+
+def tracker_song_map(song_map: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Convert a packaged Song Map to the tracker's section/line/syllable layout.
+
+    Lyric phrases become lines, with their words spread evenly over the
+    phrase; a map without lyrics uses its beats as onsets, one line per bar.
+    Onsets go to the section they start in and take the chord sounding
+    at their start. Maps that already have lines are returned unchanged.
+
+    Args:
+        song_map: Packaged Song Map (``beats``, ``downbeats``, ``lyrics``,
+            ``sections`` and ``chords`` lists)
+
+    Returns:
+        Song Map in the layout SongMapPositionTracker parses
+    """
+    if any('lines' in section for section in song_map.get('sections', [])):
+        return song_map
+
+    lines = []
+    if song_map.get('lyrics'):
+        for phrase in song_map['lyrics']:
+            words = phrase['text'].split() or ['']
+            step = (phrase['end'] - phrase['start']) / len(words)
+            lines.append([(phrase['start'] + i * step, word, step) for i, word in enumerate(words)])
+    else:
+        beats = song_map.get('beats', [])
+        bar_starts = np.searchsorted(beats, song_map.get('downbeats', []))
+        for bar in np.split(np.arange(len(beats)), bar_starts[bar_starts > 0]):
+            if len(bar):
+                lines.append([(beats[i], '', (beats[i + 1] - beats[i]) if i + 1 < len(beats) else 0.5)
+                              for i in bar])
+
+    chords = song_map.get('chords', [])
+    chord_starts = [chord['start'] for chord in chords]
+    section_data = song_map.get('sections') or [{'start': 0.0, 'label': 'song'}]
+    section_starts = [section['start'] for section in section_data]
+
+    sections = [{'name': section['label'], 'lines': []} for section in section_data]
+    for line in lines:
+        syllables = []
+        for start, text, duration in line:
+            c = int(np.searchsorted(chord_starts, start, side='right')) - 1
+            syllables.append({
+                'text': text,
+                'startTime': float(start),
+                'duration': float(duration),
+                'chord': _chord_symbol(chords[c]['label']) if c >= 0 else None
+            })
+        s = max(int(np.searchsorted(section_starts, line[0][0], side='right')) - 1, 0)
+        sections[s]['lines'].append({'syllables': syllables})
+
+    return {'title': song_map.get('title', song_map.get('id', 'Unknown')), 'sections': sections}
@@ -0,0 +1,416 @@
+"""
+Replay harness for the Song Map position tracker.
+
+Synthesizes performances of a Song Map (tempo drift, rubato, timing
+jitter, missed and extra onsets, skipped and repeated sections), replays
+them through ``SongMapPositionTracker.update()`` block by block with
+explicit timestamps, and measures per-update latency together with how far
+the tracked position is from where the performer really is. Everything is
+seeded, so a run is repeatable and its summary can be compared against a
+saved baseline (see ``compare`` and ``scripts/benchmark_tracker.py``).
+
+Packaged Song Maps (pipeline output with ``beats``/``lyrics``/``sections``
+lists, like ``backend/songmap_*.json``) are converted to the tracker's
+section/line/syllable layout with ``tracker_song_map`` (from
+position_tracker.py).
+"""
+
+import time
+import numpy as np
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from .position_tracker import SongMapPositionTracker, tracker_song_map
+
+
+@dataclass
+class PerformanceScenario:
+    """How a synthesized performance departs from the Song Map."""
+    name: str = 'straight'
+    tempo: float = 1.0  # Performer tempo relative to the map
+    drift: float = 0.0  # Fractional tempo change by the end of the performance
+    rubato: float = 0.0  # Depth of a slow sinusoidal tempo modulation (fraction)
+    rubato_period: float = 8.0  # Seconds per rubato cycle
+    jitter: float = 0.01  # Onset timing noise (seconds, standard deviation)
+    miss_rate: float = 0.0  # Fraction of onsets the detector misses
+    extra_rate: float = 0.0  # Spurious onsets per played onset
+    skips: int = 0  # Random forward section skips
+    repeats: int = 0  # Random backward section repeats
+    section_order: Optional[List[int]] = None  # Explicit section order (overrides skips/repeats)
+    jump_pause: float = 0.5  # Seconds between sections at a jump
+    seed: int = 0
+
+
+# Scenarios of the standard suite
+DEFAULT_SCENARIOS = [
+    PerformanceScenario('straight'),
+    PerformanceScenario('drift', tempo=0.95, drift=0.1),
+    PerformanceScenario('rubato', rubato=0.08),
+    PerformanceScenario('sloppy', jitter=0.02, miss_rate=0.1, extra_rate=0.05),
+    PerformanceScenario('jumps', tempo=0.95, skips=1, repeats=1),
+]
+
+
+@dataclass
+class SynthesizedPerformance:
+    """A performance of a Song Map, with the ground truth to score against."""
+    onset_times: np.ndarray  # Detected onsets (performance seconds)
+    truth: np.ndarray  # Song Map onset of each detected onset (-1 for spurious)
+    path_times: np.ndarray  # Performance time of every played Song Map onset
+    path: np.ndarray  # Song Map onset index of every played onset, detected or not
+    jumps: List[int] = field(default_factory=list)  # Detected onset index where each jump lands
+
+    def song_time_at(self, map_onset_times: np.ndarray, performance_times: np.ndarray) -> np.ndarray:
+        """
+        True song position at the given performance times.
+
+        Interpolates between consecutive played onsets, holds the last
+        onset across a jump, and is NaN before the first onset.
+
+        Args:
+            map_onset_times: The Song Map's onset times
+            performance_times: Times to evaluate (performance seconds)
+
+        Returns:
+            Song time (seconds) at each time
+        """
+        performance_times = np.asarray(performance_times, dtype=np.float64)
+        k = self.path_times.searchsorted(performance_times, side='right') - 1
+        before = k < 0
+        k = np.maximum(k, 0)
+        nxt = np.minimum(k + 1, len(self.path) - 1)
+
+        song = map_onset_times[self.path[k]]
+        contiguous = (self.path[nxt] == self.path[k] + 1) & (nxt > k)
+        span = np.where(contiguous, self.path_times[nxt] - self.path_times[k], 1.0)
+        rate = np.where(contiguous, (map_onset_times[self.path[nxt]] - song) / np.maximum(span, 1e-9), 0.0)
+        return np.where(before, np.nan, song + np.minimum(performance_times - self.path_times[k], span) * rate)
+
+
+@dataclass
+class ReplayResult:
+    """Latency and accuracy of one replay."""
+    update_latency_us: np.ndarray  # Every update() call
+    onset_latency_us: np.ndarray  # update() calls with an onset
+    position_error: np.ndarray  # |tracked - true song time| after every update (seconds)
+    correct: np.ndarray  # Per detected true onset: matched to its syllable (or the same one of a repeat)
+    recovery: List[Optional[int]]  # Per jump: onsets until 3 in a row are correct (None: never)
+
+    def summary(self, lock_tolerance: float = 0.1) -> Dict[str, Any]:
+        """
+        Summarize the replay.
+
+        Args:
+            lock_tolerance: Position error (seconds) still counted as locked
+
+        Returns:
+            Dictionary of latency percentiles (microseconds), position error
+            statistics (milliseconds), matched and locked fractions, and
+            recovery after each jump
+        """
+        error = self.position_error[np.isfinite(self.position_error)]
+
+        def percentile(values: np.ndarray, q: float) -> float:
+            return float(np.percentile(values, q)) if len(values) else 0.0
+
+        return {
+            'updates': len(self.update_latency_us),
+            'onsets': len(self.onset_latency_us),
+            'update_p50_us': percentile(self.update_latency_us, 50),
+            'update_p99_us': percentile(self.update_latency_us, 99),
+            'onset_p50_us': percentile(self.onset_latency_us, 50),
+            'onset_p99_us': percentile(self.onset_latency_us, 99),
+            'onset_max_us': float(self.onset_latency_us.max()) if len(self.onset_latency_us) else 0.0,
+            'error_mean_ms': float(error.mean() * 1000) if len(error) else 0.0,
+            'error_p50_ms': percentile(error, 50) * 1000,
+            'error_p95_ms': percentile(error, 95) * 1000,
+            'locked': float(np.mean(error <= lock_tolerance)) if len(error) else 0.0,
+            'matched': float(self.correct.mean()) if len(self.correct) else 0.0,
+            'recovery': list(self.recovery),
+        }
+
+
+def synthetic_song_map(n_sections: int = 12, seed: int = 0) -> Dict[str, Any]:
+    """
+    Lyric Song Map alternating verses and a repeated chorus.
+
+    Verses have their own random rhythm; every chorus has the same one,
+    so repeats are as ambiguous as in real songs.
+
+    Args:
+        n_sections: Number of sections
+        seed: Random seed
+
+    Returns:
+        Song Map in the tracker's layout
+    """
+    rng = np.random.default_rng(seed)
+
+    def rhythm() -> List[np.ndarray]:
+        return [rng.choice([0.15, 0.25, 0.35, 0.5], rng.integers(4, 9)) for _ in range(4)]
+
+    chorus = rhythm()
+    song_time = 1.0
+    sections = []
+    for s in range(n_sections):
+        is_chorus = s % 2 == 1
+        lines = []
+        for l, gaps in enumerate(chorus if is_chorus else rhythm()):
+            syllables = []
+            for k, gap in enumerate(gaps):
+                syllables.append({
+                    'text': f'{s}.{l}.{k}',
+                    'startTime': round(song_time, 3),
+                    'duration': 0.2,
+                    'chord': ['C', 'Am', 'F', 'G'][l]
+                })
+                song_time += gap
+            song_time += 0.6
+            lines.append({'syllables': syllables})
+        sections.append({'name': 'Chorus' if is_chorus else f'Verse {s // 2 + 1}', 'lines': lines})
+    return {'sections': sections}
+
+
+def _section_order(n_sections: int, scenario: PerformanceScenario, rng: np.random.Generator) -> List[int]:
+    """Playing order with the scenario's random skips and repeats."""
+    if scenario.section_order is not None:
+        return list(scenario.section_order)
+
+    order = list(range(n_sections))
+    for kind in ['skip'] * scenario.skips + ['repeat'] * scenario.repeats:
+        if len(order) < 4:
+            break
+        # Jump after a section in the middle half of the current order
+        at = int(rng.integers(len(order) // 4, 3 * len(order) // 4)) + 1
+        if kind == 'skip':
+            order = order[:at] + order[at + min(2, len(order) - at - 1):]
+        else:
+            back = order[max(0, at - 2):at]
+            order = order[:at] + back + order[at:]
+    return order
+
+
+def synthesize_performance(
+    tracker: SongMapPositionTracker,
+    scenario: PerformanceScenario
+) -> SynthesizedPerformance:
+    """
+    Synthesize a performance of the tracker's Song Map.
+
+    Args:
+        tracker: Tracker holding the Song Map
+        scenario: How to depart from the map
+
+    Returns:
+        Detected onsets with their ground truth
+    """
+    rng = np.random.default_rng(scenario.seed)
+    map_times = tracker.onset_times
+    sections = tracker.onsets['section']
+
+    # Onsets of each Song Map section, in the order they are played
+    present = np.unique(sections)
+    order = _section_order(len(present), scenario, rng)
+    segments = [np.flatnonzero(sections == present[s]) for s in order]
+    segments = [segment for segment in segments if len(segment)]
+
+    # Performance time of every played onset under the tempo model; a
+    # jump is a pause instead of the map's interval
+    path = np.concatenate(segments) if segments else np.zeros(0, dtype=np.intp)
+    jump_positions = [i for i in range(1, len(path)) if path[i] != path[i - 1] + 1]
+    path_times = []
+    now = map_times[path[0]] / scenario.tempo if len(path) else 0.0
+    for i in range(len(path)):
+        if i:
+            local_tempo = (scenario.tempo * (1 + scenario.drift * i / len(path))
+                           * (1 + scenario.rubato * np.sin(2 * np.pi * now / scenario.rubato_period)))
+            if path[i] == path[i - 1] + 1:
+                now += (map_times[path[i]] - map_times[path[i - 1]]) / local_tempo
+            else:
+                now += scenario.jump_pause
+        path_times.append(now)
+
+    path_times = np.array(path_times)
+    detected_times = path_times + rng.normal(0, scenario.jitter, len(path))
+
+    # Missed onsets drop out; spurious ones fall between played onsets
+    kept = rng.random(len(path)) >= scenario.miss_rate
+    n_extra = int(round(scenario.extra_rate * len(path)))
+    extra_times = rng.uniform(path_times[0], path_times[-1], n_extra) if len(path) else np.zeros(0)
+
+    onset_times = np.concatenate([detected_times[kept], extra_times])
+    truth = np.concatenate([path[kept], np.full(n_extra, -1, dtype=np.intp)])
+    path_position = np.concatenate([np.flatnonzero(kept), np.full(n_extra, -1)])
+    order = np.argsort(onset_times, kind='stable')
+
+    # Where each jump lands among the detected onsets
+    landed = path_position[order]
+    jumps = [int(np.argmax(landed >= position)) for position in jump_positions if (landed >= position).any()]
+
+    return SynthesizedPerformance(
+        onset_times=onset_times[order],
+        truth=truth[order],
+        path_times=path_times,
+        path=path,
+        jumps=jumps
+    )
+
+
+def replay(
+    tracker: SongMapPositionTracker,
+    performance: SynthesizedPerformance,
+    block_size: int = 512,
+    sample_rate: int = 44100
+) -> ReplayResult:
+    """
+    Replay a performance through ``tracker.update()`` block by block.
+
+    Every audio block without an onset is an ``update(False)``, every
+    detected onset an ``update(True)`` at its exact time, all with explicit
+    timestamps, so a replay runs as fast as the tracker allows.
+
+    An onset counts as matched when the tracker matched it to its syllable,
+    or to the same syllable of another section with the same name (a
+    repeated chorus has no way of telling its instances apart); position
+    error is always against the true song time.
+
+    Args:
+        tracker: Tracker to replay through (restarted first)
+        performance: Performance to replay
+        block_size: Samples per audio block (default: 512)
+        sample_rate: Sample rate in Hz (default: 44100)
+
+    Returns:
+        Latency and accuracy of the replay
+    """
+    tracker.start()
+    start_time = tracker.performance_start_time
+    block_period = block_size / sample_rate
+    map_times = tracker.onset_times
+
+    # Syllables of repeated sections (same name, line and syllable) share a key
+    keys: Dict[tuple, int] = {}
+    syllable_keys = [
+        keys.setdefault((tracker.section_by_index[section].name, line, syllable), len(keys))
+        for section, line, syllable in zip(tracker.onsets['section'].tolist(), tracker.onsets['line'].tolist(),
+                                           tracker.onsets['syllable'].tolist())
+    ]
+
+    update_times, update_latency, onset_latency, song_times, correct = [], [], [], [], []
+    now = 0.0
+    for onset_time, truth in zip(performance.onset_times.tolist(), performance.truth.tolist()):
+        while now + block_period < onset_time:
+            now += block_period
+            begin = time.perf_counter_ns()
+            position = tracker.update(False, current_time=start_time + now)
+            update_latency.append(time.perf_counter_ns() - begin)
+            update_times.append(now)
+            song_times.append(position.song_time)
+
+        now = max(now, onset_time)
+        begin = time.perf_counter_ns()
+        position = tracker.update(True, current_time=start_time + onset_time)
+        elapsed = time.perf_counter_ns() - begin
+        update_latency.append(elapsed)
+        onset_latency.append(elapsed)
+        update_times.append(onset_time)
+        song_times.append(position.song_time)
+
+        if truth >= 0:
+            matched = tracker.matched_onset_idx
+            correct.append(matched is not None and (map_times[matched] == map_times[truth]
+                                                    or syllable_keys[matched] == syllable_keys[truth]))
+
+    error = np.abs(np.array(song_times) - performance.song_time_at(map_times, np.array(update_times)))
+
+    # Onsets after each jump until three in a row are correct
+    true_onsets = np.cumsum(performance.truth >= 0) - 1
+    correct = np.array(correct, dtype=bool)
+    recovery = []
+    for jump in performance.jumps:
+        first = int(true_onsets[jump]) if performance.truth[jump] >= 0 else int(true_onsets[jump]) + 1
+        n = 0
+        while first + n + 3 <= len(correct) and not correct[first + n:first + n + 3].all():
+            n += 1
+        recovery.append(n if first + n + 3 <= len(correct) else None)
+
+    return ReplayResult(
+        update_latency_us=np.array(update_latency) / 1000,
+        onset_latency_us=np.array(onset_latency) / 1000,
+        position_error=error,
+        correct=correct,
+        recovery=recovery
+    )
+
+
+def run_suite(
+    song_maps: Dict[str, Dict[str, Any]],
+    scenarios: Sequence[PerformanceScenario] = DEFAULT_SCENARIOS,
+    make_tracker: Optional[Callable[[Dict[str, Any]], SongMapPositionTracker]] = None,
+    block_size: int = 512
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Replay every scenario on every Song Map.
+
+    Args:
+        song_maps: Song Maps by name (packaged maps are converted)
+        scenarios: Scenarios to synthesize (default: DEFAULT_SCENARIOS)
+        make_tracker: Tracker factory (default: SongMapPositionTracker)
+        block_size: Samples per audio block (default: 512)
+
+    Returns:
+        Summary of each run, keyed ``'<song map>/<scenario>'``
+    """
+    make_tracker = make_tracker or SongMapPositionTracker
+    results = {}
+    for name, song_map in song_maps.items():
+        tracker = make_tracker(tracker_song_map(song_map))
+        if len(tracker.onsets) < 2:
+            continue
+        for scenario in scenarios:
+            performance = synthesize_performance(tracker, scenario)
+            results[f'{name}/{scenario.name}'] = replay(tracker, performance, block_size).summary()
+    return results
+
+
+def compare(
+    results: Dict[str, Dict[str, Any]],
+    baseline: Dict[str, Dict[str, Any]],
+    latency_tolerance: float = 2.0,
+    accuracy_tolerance: float = 0.02,
+    latency_slack_us: float = 50.0,
+    budget_us: float = 25000.0
+) -> List[str]:
+    """
+    Regressions of a suite run against a baseline run.
+
+    Median onset latency is compared with the baseline (p99 over a short
+    song is little more than the slowest update, too noisy to compare);
+    p99 only has to stay inside the latency budget.
+
+    Args:
+        results: Output of ``run_suite``
+        baseline: Earlier output of ``run_suite``
+        latency_tolerance: Allowed ratio of median onset latency to the baseline
+        accuracy_tolerance: Allowed drop in the matched and locked fractions
+        latency_slack_us: Median latency growth always allowed (timer noise)
+        budget_us: Hard limit on p99 onset latency (default: 25ms)
+
+    Returns:
+        One message per regression (empty if none)
+    """
+    regressions = []
+    for run, base in baseline.items():
+        if run not in results:
+            regressions.append(f"{run}: missing")
+            continue
+        current = results[run]
+        for key in ('matched', 'locked'):
+            if current[key] < base[key] - accuracy_tolerance:
+                regressions.append(f"{run}: {key} {current[key]:.3f} < baseline {base[key]:.3f}")
+        limit = max(base['onset_p50_us'] * latency_tolerance, base['onset_p50_us'] + latency_slack_us)
+        if current['onset_p50_us'] > limit:
+            regressions.append(f"{run}: onset p50 {current['onset_p50_us']:.1f}us > {limit:.1f}us")
+        if current['onset_p99_us'] > budget_us:
+            regressions.append(f"{run}: onset p99 {current['onset_p99_us']:.1f}us over the {budget_us:.0f}us budget")
+    return regressions
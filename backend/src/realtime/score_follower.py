@@ -0,0 +1,293 @@
+"""
+Onset-level score following for the Song Map position tracker.
+
+``OnsetScoreFollower`` aligns the stream of detected onsets against the
+Song Map's onset times with online dynamic time warping. Each detected
+onset either advances along the map (matching the next onset, or skipping
+a few the detector missed) or stays put (a spurious onset); transitions
+are scored by how well the detected inter-onset interval, scaled by the
+current tempo ratio, matches the map's interval, plus an optional chroma
+term against the chord at each onset.
+
+Only a band of states around the best alignment is kept, so every step
+costs the same regardless of song length. When the alignment has fitted
+badly for several onsets in a row (the performer jumped to another part
+of the song), the recent interval pattern is matched against the whole
+map in one vectorized pass and the band is moved there.
+"""
+
+import numpy as np
+from collections import deque
+from numpy.lib.stride_tricks import sliding_window_view
+from typing import Optional, Sequence, Tuple
+
+
+PITCH_CLASSES = {'C': 0, 'D': 2, 'E': 4, 'F': 5, 'G': 7, 'A': 9, 'B': 11}
+
+
+def chord_template(chord: Optional[str]) -> Optional[np.ndarray]:
+    """
+    Unit-norm 12-bin chroma template of a chord symbol's triad.
+
+    Understands a root with optional accidental followed by ``m`` for minor
+    (``'C'``, ``'F#m'``, ``'Bbm7'``); anything else after the root is read
+    as major.
+
+    Args:
+        chord: Chord symbol, or None
+
+    Returns:
+        Template (C = bin 0), or None if the symbol has no recognizable root
+    """
+    if not chord or chord[0].upper() not in PITCH_CLASSES:
+        return None
+
+    root = PITCH_CLASSES[chord[0].upper()]
+    quality = chord[1:]
+    if quality[:1] == '#':
+        root, quality = root + 1, quality[1:]
+    elif quality[:1] == 'b':
+        root, quality = root - 1, quality[1:]
+    minor = quality.startswith('m') and not quality.startswith('maj')
+
+    template = np.zeros(12)
+    template[[root % 12, (root + (3 if minor else 4)) % 12, (root + 7) % 12]] = 1.0
+    return template / np.sqrt(3.0)
+
+
+class OnsetScoreFollower:
+    """
+    Online DTW alignment of detected onsets to Song Map onsets.
+
+    Args:
+        onset_times: Song Map onset times in seconds, sorted
+        chord_ids: Chord index of each onset (-1 for none), for chroma costs
+        chords: Chord symbols indexed by ``chord_ids``
+        band: Number of alignment states kept per step (default: 24)
+        max_skip: Most map onsets a single detected onset may skip (default: 3)
+        miss_penalty: Cost per skipped map onset (default: 0.3)
+        extra_penalty: Cost of a detected onset matching no map onset (default: 0.5)
+        ioi_tolerance: Seconds added to both intervals before comparing their
+            log ratio, so short intervals are not over-penalized (default: 0.05)
+        chroma_weight: Weight of the chroma distance term (default: 1.0)
+        lost_cost: Mean step cost above which the alignment counts as lost
+            (default: 0.25)
+        pattern_length: Detected intervals used to relocate after a jump
+            (default: 5)
+    """
+
+    def __init__(
+        self,
+        onset_times: np.ndarray,
+        chord_ids: Optional[np.ndarray] = None,
+        chords: Sequence[str] = (),
+        band: int = 24,
+        max_skip: int = 3,
+        miss_penalty: float = 0.3,
+        extra_penalty: float = 0.5,
+        ioi_tolerance: float = 0.05,
+        chroma_weight: float = 1.0,
+        lost_cost: float = 0.25,
+        pattern_length: int = 5
+    ):
+        self.onset_times = np.ascontiguousarray(onset_times, dtype=np.float64)
+        self.n_onsets = len(self.onset_times)
+        self.band = band
+        self.max_skip = max_skip
+        self.miss_penalty = miss_penalty
+        self.extra_penalty = extra_penalty
+        self.ioi_tolerance = ioi_tolerance
+        self.chroma_weight = chroma_weight
+        self.lost_cost = lost_cost
+        self.pattern_length = pattern_length
+
+        # States kept behind the best one, for paths that have not advanced
+        self.back = max(1, band // 6)
+
+        # Chroma templates per onset (row of zeros where there is no chord)
+        templates = [chord_template(chord) for chord in chords]
+        self.templates = np.array([t if t is not None else np.zeros(12) for t in templates] + [np.zeros(12)])
+        self.has_chord = np.array([t is not None for t in templates] + [False])
+        if chord_ids is None:
+            chord_ids = np.full(self.n_onsets, -1)
+        self.chord_ids = np.asarray(chord_ids, dtype=np.intp)
+
+        # Relocation index: log intervals between distinct onset times
+        unique_times, self._unique_first = np.unique(self.onset_times, return_index=True)
+        self._log_iois = np.log(np.diff(unique_times) + ioi_tolerance)
+
+        self.reset()
+
+    def reset(self) -> None:
+        """Forget the alignment; the next onset starts a new one."""
+        self._offset = 0
+        self._cost: Optional[np.ndarray] = None
+        self._last: Optional[np.ndarray] = None
+        self.position: Optional[int] = None
+        self.history = deque(maxlen=self.pattern_length + 1)
+        self.recent_costs = deque(maxlen=self.pattern_length)
+
+        self.steps = 0
+        self.relocations = 0
+
+    def step(
+        self,
+        performance_time: float,
+        tempo_ratio: float = 1.0,
+        chroma: Optional[np.ndarray] = None
+    ) -> Tuple[Optional[int], float]:
+        """
+        Align one detected onset.
+
+        Args:
+            performance_time: Time of the onset since the performance started
+            tempo_ratio: Current performer tempo relative to the map
+            chroma: Optional 12-bin chroma vector at the onset
+
+        Returns:
+            (onset_index, confidence): the map onset the best alignment
+            ends on, and exp(-cost of this step)
+        """
+        if self.n_onsets == 0:
+            return None, 0.0
+
+        self.steps += 1
+        self.history.append(performance_time)
+
+        if self._cost is None:
+            step_cost = self._start(performance_time)
+        else:
+            step_cost = self._advance(performance_time, tempo_ratio, chroma)
+
+        self.recent_costs.append(step_cost)
+        if (len(self.recent_costs) == self.recent_costs.maxlen
+                and sum(self.recent_costs) / len(self.recent_costs) > self.lost_cost):
+            if self._relocate(performance_time, tempo_ratio):
+                step_cost = 0.0
+
+        return self.position, float(np.exp(-step_cost))
+
+    def _start(self, performance_time: float) -> float:
+        """First onset: assume the performer starts where the clock says."""
+        center = int(self.onset_times.searchsorted(performance_time))
+        self._offset = max(0, min(center, self.n_onsets - 1) - self.back)
+
+        states = np.arange(self._offset, self._offset + self.band)
+        valid = states < self.n_onsets
+        times = self.onset_times[np.minimum(states, self.n_onsets - 1)]
+
+        self._cost = np.where(valid, np.abs(times - performance_time) / self.ioi_tolerance, np.inf)
+        self._last = np.full(self.band, performance_time)
+        return self._settle()
+
+    def _advance(self, performance_time: float, tempo_ratio: float, chroma: Optional[np.ndarray]) -> float:
+        """One DTW step over the band."""
+        cost, last, offset = self._cost, self._last, self._offset
+        width = self.band + self.max_skip + 1
+
+        states = np.arange(offset, offset + width)
+        valid = states < self.n_onsets
+        times = self.onset_times[np.minimum(states, self.n_onsets - 1)]
+
+        # Stay: a spurious onset, the path's last matched time is unchanged
+        new_cost = np.full(width, np.inf)
+        new_last = np.full(width, performance_time)
+        new_cost[:self.band] = cost + self.extra_penalty
+        new_last[:self.band] = last
+
+        # Advance by d map onsets (d - 1 of them missed by the detector)
+        log_observed = np.log((performance_time - last) * tempo_ratio + self.ioi_tolerance)
+        for d in range(1, self.max_skip + 2):
+            map_ioi = times[d:d + self.band] - times[:self.band]
+            candidate = (cost + (d - 1) * self.miss_penalty
+                         + np.abs(log_observed - np.log(map_ioi + self.ioi_tolerance)))
+            target = new_cost[d:d + self.band]
+            better = candidate < target
+            target[better] = candidate[better]
+            new_last[d:d + self.band][better] = performance_time
+
+        if chroma is not None:
+            new_cost += self._chroma_cost(states, chroma)
+
+        new_cost[~valid] = np.inf
+        if not np.isfinite(new_cost.min()):
+            return self._restart(performance_time)
+
+        # Re-center the band on the best state
+        best = offset + int(new_cost.argmin())
+        self._offset = max(offset, best - self.back)
+        shift = self._offset - offset
+        kept = min(self.band, width - shift)
+
+        self._cost = np.full(self.band, np.inf)
+        self._last = np.full(self.band, performance_time)
+        self._cost[:kept] = new_cost[shift:shift + kept]
+        self._last[:kept] = new_last[shift:shift + kept]
+        return self._settle()
+
+    def _settle(self) -> float:
+        """Make the best state's cost zero and record it as the position.
+
+        Returns:
+            Cost of the best state before normalizing (the cost of this step,
+            since the previous best state was at zero)
+        """
+        best = int(self._cost.argmin())
+        best_cost = float(self._cost[best])
+        self._cost -= best_cost
+        self.position = self._offset + best
+        return best_cost
+
+    def _restart(self, performance_time: float) -> float:
+        """No state is reachable any more: start again from the clock."""
+        return self._start(performance_time) + 2 * self.lost_cost
+
+    def _chroma_cost(self, states: np.ndarray, chroma: np.ndarray) -> np.ndarray:
+        """Chroma distance to the chord at each state (0 where there is no chord)."""
+        norm = np.linalg.norm(chroma)
+        if norm == 0:
+            return 0.0
+        chord_ids = self.chord_ids[np.minimum(states, self.n_onsets - 1)]
+        similarity = self.templates[chord_ids] @ (np.asarray(chroma, dtype=np.float64) / norm)
+        return np.where(self.has_chord[chord_ids], self.chroma_weight * (1.0 - similarity), 0.0)
+
+    def _relocate(self, performance_time: float, tempo_ratio: float) -> bool:
+        """
+        Match the recent interval pattern against the whole map.
+
+        Returns:
+            True if a well-fitting position was found and the band moved there
+        """
+        if len(self.history) < self.history.maxlen or len(self._log_iois) < self.pattern_length:
+            return False
+
+        observed = np.diff(np.array(self.history)) * tempo_ratio
+        log_observed = np.log(observed + self.ioi_tolerance)
+
+        # Window w covers distinct onsets w .. w + pattern_length
+        windows = sliding_window_view(self._log_iois, self.pattern_length)
+        costs = np.abs(windows - log_observed).mean(axis=1)
+        window = int(costs.argmin())
+        if costs[window] > self.lost_cost / 2:
+            return False
+
+        position = int(self._unique_first[window + self.pattern_length])
+        self._offset = max(0, position - self.back)
+        self._cost = np.full(self.band, np.inf)
+        self._cost[position - self._offset] = 0.0
+        self._last = np.full(self.band, performance_time)
+        self.position = position
+
+        self.relocations += 1
+        self.recent_costs.clear()
+        return True
+
+    def get_stats(self) -> dict:
+        """Get alignment statistics."""
+        return {
+            'position': self.position,
+            'steps': self.steps,
+            'relocations': self.relocations,
+            'band': self.band,
+            'recent_cost': float(np.mean(self.recent_costs)) if self.recent_costs else 0.0
+        }
@@ -0,0 +1,332 @@
+"""
+Compiled Song Map cache for fast performance session start-up.
+
+Building a ``SongMapPositionTracker`` from a Song Map dict walks every
+section, line and syllable and sorts the onsets, and the JSON has to be
+parsed first, so session start-up grew with the length of the song. The
+tracker-ready form of a Song Map (the structured onset array and its
+times, the section table and section starts, and the onset-ordered
+syllable table) is therefore compiled once into a binary file next to the
+JSON (``<name>.tracker``) and memory-mapped when a session starts:
+
+    compiled = load_song_map('output/job/job.song_map.json')
+    tracker = SongMapPositionTracker(compiled)
+
+The file holds a small JSON header followed by aligned raw arrays.
+Syllables and section lines are stored as JSON blobs indexed by offset
+arrays and decoded only when the teleprompter asks for them, so opening a
+compiled map reads the header and maps the arrays, whatever the song's
+length. The cache is keyed by the source file's size and modification time
+(and ``CACHE_VERSION``) and rebuilt when the Song Map changes.
+"""
+
+import json
+import logging
+import os
+import numpy as np
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+from .position_tracker import SongMapPositionTracker, SongMapSection, ONSET_DTYPE, tracker_song_map
+
+logger = logging.getLogger(__name__)
+
+# Bump when the file layout or the tracker's parsing changes
+CACHE_VERSION = 1
+
+CACHE_MAGIC = b'PFSONGMP'
+CACHE_SUFFIX = '.tracker'
+
+# Arrays start on 64-byte boundaries
+_ALIGNMENT = 64
+
+# One record per Song Map section (in Song Map order)
+SECTION_DTYPE = np.dtype([
+    ('start_time', np.float64),  # First syllable start (seconds)
+    ('end_time', np.float64),  # Last syllable end (seconds)
+    ('onsets', np.int32),  # Syllables in the section (0: skipped by the tracker)
+])
+
+
+class BlobTable(Sequence):
+    """
+    Read-only sequence of JSON values stored as one byte blob.
+
+    Items are decoded on first access and kept; slices return lists.
+
+    Args:
+        offsets: Start of every item in ``data``, plus the end (int64)
+        data: Concatenated UTF-8 JSON (uint8)
+    """
+
+    def __init__(self, offsets: np.ndarray, data: np.ndarray):
+        self.offsets = offsets
+        self.data = data
+        self._decoded: Dict[int, Any] = {}
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError('BlobTable index out of range')
+        if index not in self._decoded:
+            start, end = int(self.offsets[index]), int(self.offsets[index + 1])
+            self._decoded[index] = json.loads(self.data[start:end].tobytes())
+        return self._decoded[index]
+
+    @staticmethod
+    def encode(items: Sequence[Any]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Encode items for a BlobTable.
+
+        Returns:
+            (offsets, data) arrays
+        """
+        blobs = [json.dumps(item, separators=(',', ':')).encode('utf-8') for item in items]
+        offsets = np.zeros(len(blobs) + 1, dtype=np.int64)
+        np.cumsum([len(b) for b in blobs], out=offsets[1:])
+        return offsets, np.frombuffer(b''.join(blobs), dtype=np.uint8)
+
+
+class SectionTable(Sequence):
+    """
+    Sections of a compiled Song Map, built on first access.
+
+    Args:
+        compiled: The compiled Song Map
+        indices: Song Map section index of each item
+    """
+
+    def __init__(self, compiled: 'CompiledSongMap', indices: Sequence[int]):
+        self.compiled = compiled
+        self.indices = indices
+
+    def __len__(self) -> int:
+        return len(self.indices)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        return self.compiled.section(int(self.indices[index]))
+
+
+class CompiledSongMap:
+    """
+    Tracker-ready arrays of one Song Map (see ``SongMapPositionTracker``).
+
+    Use ``compile_song_map`` or ``load_song_map`` rather than the
+    constructor.
+
+    Args:
+        header: Decoded file header (metadata, chords, section names, array layout)
+        buffer: The array data following the header, memory-mapped or in memory
+    """
+
+    def __init__(self, header: Dict[str, Any], buffer: np.ndarray):
+        self.header = header
+        self.buffer = buffer
+        self.metadata: Dict[str, Any] = header['metadata']
+        self.chords: List[str] = header['chords']
+        self.section_names: List[str] = header['section_names']
+        self.source: Dict[str, int] = header['source']
+
+        arrays = {
+            name: np.ndarray(tuple(spec['shape']), np.lib.format.descr_to_dtype(spec['dtype']),
+                             buffer=buffer, offset=spec['offset'])
+            for name, spec in header['arrays'].items()
+        }
+        self.onsets: np.ndarray = arrays['onsets']
+        self.onset_times: np.ndarray = arrays['onset_times']
+        self.section_bounds: np.ndarray = arrays['section_bounds']
+        self.section_starts: np.ndarray = arrays['section_starts']
+        self.syllables = BlobTable(arrays['syllable_offsets'], arrays['syllable_data'])
+        self._lines = BlobTable(arrays['line_offsets'], arrays['line_data'])
+
+        self._sections: Dict[int, Optional[SongMapSection]] = {}
+        self.section_by_index = SectionTable(self, range(len(self.section_bounds)))
+        self.sections = SectionTable(self, np.flatnonzero(self.section_bounds['onsets'] > 0))
+
+    def section(self, index: int) -> Optional[SongMapSection]:
+        """Song Map section ``index`` (None if it has no syllables), lines decoded on first access."""
+        if index not in self._sections:
+            start_time, end_time, n_onsets = self.section_bounds.item(index)
+            self._sections[index] = SongMapSection(
+                name=self.section_names[index],
+                start_time=start_time,
+                end_time=end_time,
+                lines=self._lines[index]
+            ) if n_onsets > 0 else None
+        return self._sections[index]
+
+    @classmethod
+    def from_buffer(cls, buffer: np.ndarray) -> 'CompiledSongMap':
+        """
+        Open a compiled Song Map from its bytes.
+
+        Args:
+            buffer: File contents as uint8 (e.g. an ``np.memmap``)
+
+        Raises:
+            ValueError: Not a compiled Song Map of this version
+        """
+        if len(buffer) < 16 or buffer[:8].tobytes() != CACHE_MAGIC:
+            raise ValueError('not a compiled Song Map')
+        header_length = int.from_bytes(buffer[8:16].tobytes(), 'little')
+        header = json.loads(buffer[16:16 + header_length].tobytes())
+        if header.get('version') != CACHE_VERSION or np.lib.format.descr_to_dtype(header['onset_dtype']) != ONSET_DTYPE:
+            raise ValueError(f"compiled Song Map version {header.get('version')}, expected {CACHE_VERSION}")
+        data = buffer[_align(16 + header_length):]
+        for name, spec in header['arrays'].items():
+            nbytes = np.lib.format.descr_to_dtype(spec['dtype']).itemsize * int(np.prod(spec['shape']))
+            if spec['offset'] + nbytes > len(data):
+                raise ValueError(f'compiled Song Map truncated in {name!r}')
+        return cls(header, data)
+
+    @classmethod
+    def open(cls, path: Union[str, Path]) -> 'CompiledSongMap':
+        """
+        Memory-map a compiled Song Map file.
+
+        Raises:
+            OSError: File missing or unreadable
+            ValueError: Not a compiled Song Map of this version
+        """
+        return cls.from_buffer(np.memmap(path, dtype=np.uint8, mode='r'))
+
+
+def cache_path(song_map_path: Union[str, Path]) -> Path:
+    """Compiled cache file of a Song Map JSON (``x.song_map.json`` -> ``x.song_map.tracker``)."""
+    return Path(song_map_path).with_suffix(CACHE_SUFFIX)
+
+
+def _source_key(song_map_path: Union[str, Path]) -> Dict[str, int]:
+    """Size and modification time of the source JSON, which the cache is keyed by."""
+    stat = os.stat(song_map_path)
+    return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+
+def _align(n: int) -> int:
+    return -(-n // _ALIGNMENT) * _ALIGNMENT
+
+
+def compile_song_map(song_map: Dict[str, Any], source: Optional[Dict[str, int]] = None) -> bytes:
+    """
+    Compile a Song Map into the cache file format.
+
+    Packaged Song Maps are converted with ``tracker_song_map`` first; the
+    onsets and sections are parsed by ``SongMapPositionTracker`` itself, so
+    a tracker built from the compiled map is identical to one built from
+    the dict.
+
+    Args:
+        song_map: Song Map dict (tracker or packaged layout)
+        source: Key of the source file (see ``_source_key``), if any
+
+    Returns:
+        File contents; open with ``CompiledSongMap.from_buffer``
+    """
+    converted = tracker_song_map(song_map)
+    tracker = SongMapPositionTracker(converted, jump_detection=False)
+    raw_sections = converted.get('sections', [])
+
+    section_bounds = np.zeros(len(raw_sections), dtype=SECTION_DTYPE)
+    section_bounds['onsets'] = np.bincount(tracker.onsets['section'], minlength=len(raw_sections))
+    for index, section in enumerate(tracker.section_by_index):
+        if section is not None:
+            section_bounds[index]['start_time'] = section.start_time
+            section_bounds[index]['end_time'] = section.end_time
+    _, section_starts = np.unique(tracker.onsets['section'], return_index=True)
+
+    syllable_offsets, syllable_data = BlobTable.encode(tracker.syllables)
+    line_offsets, line_data = BlobTable.encode([s.get('lines', []) for s in raw_sections])
+    arrays = {
+        'onsets': tracker.onsets,
+        'onset_times': tracker.onset_times,
+        'section_bounds': section_bounds,
+        'section_starts': section_starts.astype(np.int64),
+        'syllable_offsets': syllable_offsets,
+        'syllable_data': syllable_data,
+        'line_offsets': line_offsets,
+        'line_data': line_data,
+    }
+
+    header = {
+        'version': CACHE_VERSION,
+        'onset_dtype': np.lib.format.dtype_to_descr(ONSET_DTYPE),
+        'source': source or {},
+        # Top-level scalars (title, artist, ...) for the session
+        'metadata': {k: v for k, v in song_map.items() if isinstance(v, (str, int, float, bool)) or v is None},
+        'chords': tracker.chords,
+        'section_names': [s.get('name', 'Unknown') for s in raw_sections],
+        'arrays': {},
+    }
+
+    # Array offsets are relative to the first aligned byte after the header
+    offset = 0
+    for name, array in arrays.items():
+        array = np.ascontiguousarray(array)
+        arrays[name] = array
+        header['arrays'][name] = {
+            'dtype': np.lib.format.dtype_to_descr(array.dtype),
+            'shape': list(array.shape),
+            'offset': offset,
+        }
+        offset = _align(offset + array.nbytes)
+
+    header_bytes = json.dumps(header).encode('utf-8')
+    data_offset = _align(16 + len(header_bytes))
+    contents = bytearray(data_offset + offset)
+    contents[:8] = CACHE_MAGIC
+    contents[8:16] = len(header_bytes).to_bytes(8, 'little')
+    contents[16:16 + len(header_bytes)] = header_bytes
+    for name, array in arrays.items():
+        start = data_offset + header['arrays'][name]['offset']
+        contents[start:start + array.nbytes] = array.tobytes()
+    return bytes(contents)
+
+
+def load_song_map(song_map_path: Union[str, Path]) -> CompiledSongMap:
+    """
+    Open a Song Map JSON through its compiled cache.
+
+    The cache next to the JSON is memory-mapped if it was compiled from the
+    file as it is now; otherwise the JSON is parsed, compiled and the cache
+    (re)written. If the cache cannot be written (e.g. a read-only library),
+    the compiled map is served from memory.
+
+    Args:
+        song_map_path: Path of the Song Map JSON
+
+    Returns:
+        CompiledSongMap to build a ``SongMapPositionTracker`` from
+    """
+    source = _source_key(song_map_path)
+    path = cache_path(song_map_path)
+
+    try:
+        compiled = CompiledSongMap.open(path)
+        if compiled.source == source:
+            return compiled
+    except (OSError, ValueError):
+        pass
+
+    with open(song_map_path, 'r') as f:
+        contents = compile_song_map(json.load(f), source)
+
+    # Write beside and rename, so a session never maps a half-written file
+    tmp_path = path.with_name(f'{path.name}.{os.getpid()}.tmp')
+    try:
+        with open(tmp_path, 'wb') as f:
+            f.write(contents)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        logger.warning(f"Could not write compiled Song Map {path}: {e}")
+        return CompiledSongMap.from_buffer(np.frombuffer(contents, dtype=np.uint8))
+
+    logger.info(f"Compiled Song Map {song_map_path} -> {path}")
+    return CompiledSongMap.open(path)
@@ -0,0 +1,256 @@
+"""
+Virtual audio sources for RealtimeAudioInput.
+
+A virtual source stands in for the sounddevice input stream: a driver
+thread calls ``RealtimeAudioInput.callback`` once per block, exactly like
+the audio thread does, so everything downstream (block ring, analyzer,
+tracker, WebSocket updates) runs unchanged without a microphone.
+
+Sources play at a multiple of real time (``speed=1.0`` is live pace,
+``speed=100.0`` is 100x) or, with ``speed=None``, as fast as the consumer
+takes the blocks. Paced sources drop blocks when the consumer falls
+behind, like a real device; unpaced ones wait for room instead, so a run
+is deterministic and lossless.
+"""
+
+import abc
+import threading
+import time
+import numpy as np
+import librosa
+from typing import Callable, Iterable, Iterator, Optional
+
+
+class VirtualSource(abc.ABC):
+    """
+    Base class of virtual audio sources.
+
+    Subclasses implement ``_blocks``, yielding ``(frames, channels)``
+    float32 blocks; a subclass without it cannot be instantiated.
+
+    Args:
+        speed: Playback speed relative to real time, or None for as fast
+            as possible (default: 1.0)
+    """
+
+    def __init__(self, speed: Optional[float] = 1.0):
+        if speed is not None and speed <= 0:
+            raise ValueError(f"speed must be positive or None, got {speed}")
+        self.speed = speed
+
+        self.is_active = False
+        self.finished = threading.Event()
+        self.blocks_delivered = 0
+        self.last_error: Optional[str] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @abc.abstractmethod
+    def _blocks(self, sample_rate: int, block_size: int, channels: int) -> Iterator[np.ndarray]:
+        """Yield the blocks to deliver."""
+
+    def start(
+        self,
+        callback: Callable,
+        sample_rate: int,
+        block_size: int,
+        channels: int,
+        has_space: Optional[Callable[[], bool]] = None
+    ) -> None:
+        """
+        Start delivering blocks on a driver thread.
+
+        Args:
+            callback: Called as ``callback(indata, frames, time_info, status)``
+            sample_rate: Stream sample rate in Hz
+            block_size: Samples per block
+            channels: Channels per block
+            has_space: Returns whether the consumer can take another block;
+                used instead of pacing when ``speed`` is None
+        """
+        if self.is_active:
+            raise RuntimeError("Source is already running")
+
+        # Build the block iterator here so configuration errors surface in start()
+        blocks = self._blocks(sample_rate, block_size, channels)
+
+        self.is_active = True
+        self.finished.clear()
+        self.blocks_delivered = 0
+        self.last_error = None
+        self._thread = threading.Thread(
+            target=self._run,
+            args=(blocks, callback, block_size / sample_rate, has_space),
+            daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout: float = 1.0) -> None:
+        """Stop the driver thread."""
+        self.is_active = False
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+            self._thread = None
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until every block has been delivered.
+
+        Returns:
+            True if the source finished within the timeout
+        """
+        return self.finished.wait(timeout)
+
+    def _run(self, blocks: Iterator[np.ndarray], callback: Callable, block_period: float,
+             has_space: Optional[Callable[[], bool]]):
+        """Driver loop: deliver blocks paced (or back-pressured) like a device."""
+        next_block = time.perf_counter()
+
+        try:
+            for block in blocks:
+                if not self.is_active:
+                    break
+
+                if self.speed is None:
+                    # As fast as possible, but never faster than the consumer
+                    while has_space is not None and not has_space():
+                        if not self.is_active:
+                            return
+                        time.sleep(0.0001)
+                else:
+                    next_block += block_period / self.speed
+                    remaining = next_block - time.perf_counter()
+                    if remaining > 0:
+                        time.sleep(remaining)
+
+                callback(block, len(block), None, None)
+                self.blocks_delivered += 1
+
+        except Exception as e:
+            self.last_error = str(e)
+
+        finally:
+            self.finished.set()
+
+    def get_stats(self) -> dict:
+        """Get source statistics."""
+        return {
+            'type': type(self).__name__,
+            'speed': self.speed,
+            'blocks_delivered': self.blocks_delivered,
+            'finished': self.finished.is_set(),
+            'last_error': self.last_error
+        }
+
+
+class ArraySource(VirtualSource):
+    """
+    Plays an in-memory signal.
+
+    The signal is cut into full blocks (the last one zero-padded). A mono
+    signal is copied to every channel; otherwise its channel count must
+    match the input's.
+
+    Args:
+        audio: Samples, ``(n_samples,)`` or ``(n_samples, channels)``
+        sample_rate: Sample rate of ``audio`` in Hz (must match the input)
+        speed: Playback speed relative to real time, or None for as fast
+            as possible (default: 1.0)
+        loop: Restart from the beginning at the end (default: False)
+    """
+
+    def __init__(self, audio: np.ndarray, sample_rate: int, speed: Optional[float] = 1.0, loop: bool = False):
+        super().__init__(speed)
+        self.audio = np.asarray(audio, dtype=np.float32)
+        self.sample_rate = sample_rate
+        self.loop = loop
+
+    def _load(self, sample_rate: int) -> np.ndarray:
+        """Signal to play, ``(n_samples,)`` or ``(n_samples, channels)``."""
+        if sample_rate != self.sample_rate:
+            raise ValueError(
+                f"Source sample rate {self.sample_rate} Hz does not match input rate {sample_rate} Hz"
+            )
+        return self.audio
+
+    def _blocks(self, sample_rate: int, block_size: int, channels: int) -> Iterator[np.ndarray]:
+        audio = self._load(sample_rate)
+        if audio.ndim == 1:
+            audio = audio[:, None]
+        if audio.shape[1] != channels:
+            if audio.shape[1] != 1:
+                raise ValueError(f"Source has {audio.shape[1]} channels, input expects {channels}")
+            audio = np.repeat(audio, channels, axis=1)
+
+        # Full blocks only, like a device
+        n_blocks = max(1, -(-len(audio) // block_size))
+        padded = np.zeros((n_blocks * block_size, channels), dtype=np.float32)
+        padded[:len(audio)] = audio
+        blocks = padded.reshape(n_blocks, block_size, channels)
+
+        return self._iterate(blocks)
+
+    def _iterate(self, blocks: np.ndarray) -> Iterator[np.ndarray]:
+        while True:
+            yield from blocks
+            if not self.loop:
+                return
+
+
+class FileSource(ArraySource):
+    """
+    Plays an audio file (any format librosa can read).
+
+    The file is loaded when the source starts, resampled to the input's
+    sample rate and downmixed if the input is mono.
+
+    Args:
+        path: Audio file path
+        speed: Playback speed relative to real time, or None for as fast
+            as possible (default: 1.0)
+        loop: Restart from the beginning at the end (default: False)
+    """
+
+    def __init__(self, path: str, speed: Optional[float] = 1.0, loop: bool = False):
+        super().__init__(np.zeros(0, dtype=np.float32), sample_rate=0, speed=speed, loop=loop)
+        self.path = path
+
+    def _load(self, sample_rate: int) -> np.ndarray:
+        if self.sample_rate != sample_rate:
+            audio, _ = librosa.load(self.path, sr=sample_rate, mono=False)
+            self.audio = np.ascontiguousarray(audio.T, dtype=np.float32)
+            self.sample_rate = sample_rate
+        return self.audio
+
+    def _blocks(self, sample_rate: int, block_size: int, channels: int) -> Iterator[np.ndarray]:
+        audio = self._load(sample_rate)
+        if channels == 1 and audio.ndim == 2:
+            self.audio = audio.mean(axis=1)
+        return super()._blocks(sample_rate, block_size, channels)
+
+
+class GeneratorSource(VirtualSource):
+    """
+    Plays blocks produced by an iterable (e.g. a generator synthesizing
+    test signals on the fly).
+
+    Args:
+        blocks: Iterable of ``(block_size,)`` or ``(block_size, channels)`` arrays
+        speed: Playback speed relative to real time, or None for as fast
+            as possible (default: 1.0)
+    """
+
+    def __init__(self, blocks: Iterable[np.ndarray], speed: Optional[float] = 1.0):
+        super().__init__(speed)
+        self.blocks = blocks
+
+    def _blocks(self, sample_rate: int, block_size: int, channels: int) -> Iterator[np.ndarray]:
+        return self._iterate(block_size, channels)
+
+    def _iterate(self, block_size: int, channels: int) -> Iterator[np.ndarray]:
+        for block in self.blocks:
+            block = np.asarray(block, dtype=np.float32)
+            if block.ndim == 1:
+                block = np.repeat(block[:, None], channels, axis=1)
+            if block.shape != (block_size, channels):
+                raise ValueError(f"Expected blocks of shape {(block_size, channels)}, got {block.shape}")
+            yield block
@@ -0,0 +1,147 @@
+"""
+Shared static DSP tables for Performia's real-time analyzers.
+
+Windows, filterbanks, pitch bins and the pYIN transition band depend only
+on the sample rate and analysis configuration, so each is built once per
+process (``functools.lru_cache``, keyed by those parameters) and shared by
+every analyzer, detector and tracker. Arrays are returned read-only.
+
+``preload()`` builds the tables of the default ``RealtimeAnalyzer``
+configuration (and warms the per-block code path) ahead of time, so even
+the first performance session starts without a warmup spike.
+"""
+
+import numpy as np
+import librosa
+import scipy.stats
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Tuple
+
+
+def _read_only(array: np.ndarray) -> np.ndarray:
+    """Mark a shared table immutable."""
+    array.setflags(write=False)
+    return array
+
+
+@lru_cache(maxsize=None)
+def note_hz(note: str) -> float:
+    """Frequency of a note name in Hz (e.g. ``'C2'``)."""
+    return float(librosa.note_to_hz(note))
+
+
+@lru_cache(maxsize=None)
+def hann_window(n_fft: int) -> np.ndarray:
+    """Periodic Hann window of ``n_fft`` samples (as used by librosa's STFT)."""
+    return _read_only(librosa.filters.get_window('hann', n_fft, fftbins=True))
+
+
+@lru_cache(maxsize=None)
+def mel_filterbank(sample_rate: int, n_fft: int, n_mels: int) -> np.ndarray:
+    """Mel filterbank, ``(n_mels, n_fft // 2 + 1)``, widened to float64 for in-place products."""
+    return _read_only(librosa.filters.mel(sr=sample_rate, n_fft=n_fft, n_mels=n_mels).astype(np.float64))
+
+
+@dataclass(frozen=True)
+class PitchTables:
+    """Static tables of the streaming pYIN tracker."""
+    min_period: int  # Shortest period searched (samples)
+    max_period: int  # Longest period searched (samples)
+    lag_range: np.ndarray  # 1..max_period, for the cumulative mean
+    thresholds: np.ndarray  # YIN thresholds
+    beta_probs: np.ndarray  # Beta prior over thresholds
+    beta_cumsum: np.ndarray  # Cumulative prior, with a leading 0
+    n_bins_per_semitone: int
+    n_pitch_bins: int
+    freqs: np.ndarray  # Center frequency of every pitch bin
+    half_width: int  # Half width of the pitch transition band
+    log_band: np.ndarray  # log T[j - h + o, j] at [o, j]
+
+
+@lru_cache(maxsize=None)
+def pitch_tables(
+    sample_rate: int,
+    fmin: float,
+    fmax: float,
+    frame_length: int,
+    hop_length: int,
+    n_thresholds: int,
+    beta_parameters: Tuple[float, float],
+    resolution: float,
+    max_transition_rate: float
+) -> PitchTables:
+    """
+    Build the pYIN tables for one tracker configuration.
+
+    Same parameters as ``StreamingPitchTracker``.
+
+    Returns:
+        PitchTables with read-only arrays
+    """
+    # Period search range (same as librosa.pyin)
+    min_period = int(np.floor(sample_rate / fmax))
+    max_period = min(int(np.ceil(sample_rate / fmin)), frame_length - 1)
+
+    # Prior over thresholds
+    thresholds = np.linspace(0, 1, n_thresholds + 1)
+    beta_cdf = scipy.stats.beta.cdf(thresholds, beta_parameters[0], beta_parameters[1])
+    beta_probs = np.diff(beta_cdf)
+    beta_cumsum = np.concatenate([[0.0], np.cumsum(beta_probs)])
+
+    # Pitch bins
+    n_bins_per_semitone = int(np.ceil(1.0 / resolution))
+    n_pitch_bins = int(np.floor(12 * n_bins_per_semitone * np.log2(fmax / fmin))) + 1
+    freqs = fmin * 2 ** (np.arange(n_pitch_bins) / (12 * n_bins_per_semitone))
+
+    # Banded transition, stored as log T[j - h + o, j] at [o, j] so the
+    # max-plus product reduces across rows instead of along short ones
+    max_semitones_per_frame = round(max_transition_rate * 12 * hop_length / sample_rate)
+    transition_width = max_semitones_per_frame * n_bins_per_semitone + 1
+    transition = librosa.sequence.transition_local(
+        n_pitch_bins, transition_width, window='triangle', wrap=False
+    )
+    tiny = np.finfo(np.float64).tiny
+    half_width = transition_width // 2
+    band = 2 * half_width + 1
+    padded = np.zeros((n_pitch_bins + 2 * half_width, n_pitch_bins))
+    padded[half_width:half_width + n_pitch_bins] = transition
+    cols = np.arange(n_pitch_bins)
+    rows = np.arange(band)[:, None] + cols[None, :]
+    log_band = np.log(padded[rows, cols[None, :]] + tiny)
+
+    return PitchTables(
+        min_period=min_period,
+        max_period=max_period,
+        lag_range=_read_only(np.arange(1, max_period + 1, dtype=np.float64)),
+        thresholds=_read_only(thresholds),
+        beta_probs=_read_only(beta_probs),
+        beta_cumsum=_read_only(beta_cumsum),
+        n_bins_per_semitone=n_bins_per_semitone,
+        n_pitch_bins=n_pitch_bins,
+        freqs=_read_only(freqs),
+        half_width=half_width,
+        log_band=_read_only(log_band)
+    )
+
+
+@lru_cache(maxsize=None)
+def preload(sample_rate: int = 44100) -> None:
+    """
+    Build the tables used by ``RealtimeAnalyzer(sample_rate)`` (once per rate).
+
+    Args:
+        sample_rate: Audio sample rate in Hz (default: 44100)
+    """
+    from .analyzer import RealtimeAnalyzer
+
+    # Constructing an analyzer touches every table it needs; one silent
+    # block warms the FFT and detector code paths
+    analyzer = RealtimeAnalyzer(sample_rate=sample_rate)
+    analyzer.process_block(np.zeros(analyzer.hop_length, dtype=np.float32))
+
+
+def clear() -> None:
+    """Drop all cached tables (e.g. in tests)."""
+    for cached in (note_hz, hann_window, mel_filterbank, pitch_tables, preload):
+        cached.cache_clear()
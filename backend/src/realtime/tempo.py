@@ -0,0 +1,128 @@
+"""
+Online tempo estimation for Performia.
+
+Replaces periodic ``librosa.beat.beat_track`` reruns over a multi-second
+buffer with an onset-strength autocorrelation that is updated by one frame
+per block. Each update touches one value per candidate lag, so the cost of
+a block is bounded and constant; reading the tempo is an argmax over the
+same lags, weighted by librosa's log-normal tempo prior.
+"""
+
+import numpy as np
+from typing import Optional
+
+
+class OnlineTempoEstimator:
+    """
+    Streaming tempo estimator over the onset-strength envelope.
+
+    Keeps an exponentially-forgetting autocorrelation of the mean-removed
+    onset strength for every lag between ``60 / max_bpm`` and
+    ``60 / min_bpm`` seconds. The history is a mirrored ring stored newest
+    first, so the values needed by all lags are one contiguous slice.
+
+    Args:
+        sample_rate: Audio sample rate in Hz
+        hop_length: Samples per onset-strength frame (default: 512)
+        min_bpm: Slowest tempo considered (default: 40)
+        max_bpm: Fastest tempo considered (default: 240)
+        window: Time constant of the forgetting factor in seconds (default: 4)
+        std_bpm: Width of the tempo prior in octaves, as in librosa (default: 1)
+        min_duration: Seconds of envelope required before estimating (default: 1)
+    """
+
+    def __init__(
+        self,
+        sample_rate: int,
+        hop_length: int = 512,
+        min_bpm: float = 40.0,
+        max_bpm: float = 240.0,
+        window: float = 4.0,
+        std_bpm: float = 1.0,
+        min_duration: float = 1.0
+    ):
+        self.sample_rate = sample_rate
+        self.hop_length = hop_length
+        self.frame_rate = sample_rate / hop_length
+        self.std_bpm = std_bpm
+
+        self.min_lag = max(1, int(np.floor(60.0 * self.frame_rate / max_bpm)))
+        self.max_lag = int(np.ceil(60.0 * self.frame_rate / min_bpm))
+        self.lags = np.arange(self.min_lag, self.max_lag + 1)
+        self.bpms = 60.0 * self.frame_rate / self.lags
+        self._log2_bpms = np.log2(self.bpms)
+
+        self.decay = float(np.exp(-1.0 / (window * self.frame_rate)))
+        self.min_frames = int(min_duration * self.frame_rate)
+
+        self._scratch = np.zeros(len(self.lags))
+        self.reset()
+
+    def reset(self) -> None:
+        """Clear the envelope history and autocorrelation."""
+        self._history = np.zeros(2 * (self.max_lag + 1))
+        self._pos = 0
+        self.autocorrelation = np.zeros(len(self.lags))
+        self.mean = 0.0
+        self.frames_processed = 0
+
+    def update(self, strength: float) -> None:
+        """
+        Add one onset-strength frame.
+
+        Args:
+            strength: Onset strength of the newest frame
+        """
+        self.mean += (1.0 - self.decay) * (strength - self.mean)
+        x = strength - self.mean
+
+        # Newest-first mirrored ring: history[pos + lag] is x[t - lag]
+        size = self.max_lag + 1
+        self._pos = (self._pos - 1) % size
+        self._history[self._pos] = x
+        self._history[self._pos + size] = x
+
+        past = self._history[self._pos + self.min_lag:self._pos + self.max_lag + 1]
+        np.multiply(past, x, out=self._scratch)
+        self.autocorrelation *= self.decay
+        self.autocorrelation += self._scratch
+
+        self.frames_processed += 1
+
+    def estimate(self, start_bpm: float = 120.0) -> Optional[float]:
+        """
+        Current tempo estimate.
+
+        Args:
+            start_bpm: Center of the tempo prior (e.g. the previous estimate)
+
+        Returns:
+            Tempo in BPM, or None until enough envelope has been seen or
+            when there is no periodicity
+        """
+        n = self.frames_processed
+        if n < self.min_frames:
+            return None
+
+        # Normalize each lag by its total forgetting weight so lags that
+        # have seen fewer products are not penalized early in the stream
+        n_terms = np.maximum(n - self.lags, 0)
+        weight = 1.0 - self.decay ** n_terms
+        ac = np.where(weight > 0, self.autocorrelation / np.maximum(weight, 1e-12), 0.0)
+
+        prior = np.exp(-0.5 * ((self._log2_bpms - np.log2(start_bpm)) / self.std_bpm) ** 2)
+        score = np.maximum(ac, 0.0) * prior
+
+        best = int(np.argmax(score))
+        if score[best] <= 0:
+            return None
+
+        # Parabolic interpolation between neighbouring lags
+        lag = float(self.lags[best])
+        if 0 < best < len(score) - 1:
+            a, b, c = score[best - 1], score[best], score[best + 1]
+            denom = a - 2 * b + c
+            if denom < 0:
+                lag += 0.5 * (a - c) / denom
+
+        return 60.0 * self.frame_rate / lag
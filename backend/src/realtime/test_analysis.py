@@ -10,7 +10,11 @@ import numpy as np
 import soundfile as sf
 import time
 import os
-from analyzer import RealtimeAnalyzer
+import sys
+
+# Import through the package so the analyzer's sibling modules resolve
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from realtime.analyzer import RealtimeAnalyzer
 
 
 def generate_test_audio(filename: str, duration: float = 10.0, sample_rate: int = 44100):
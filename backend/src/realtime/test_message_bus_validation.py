@@ -14,7 +14,9 @@ from message_bus import (
     AgentMessageBus,
     AgentMessage,
     MessagePriority,
-    MessageStats
+    MessageStats,
+    MessageLanes,
+    BROADCAST
 )
 
 
@@ -315,6 +317,130 @@ async def test_throughput(suite: ValidationSuite):
     await bus.stop()
 
 
+async def test_lane_throughput(suite: ValidationSuite):
+    """Test queue throughput of the priority lanes."""
+    print("\n🧪 Test: Lane Throughput")
+
+    messages = [
+        AgentMessage(from_agent="sender", to_agent="target", message_type="lane_test",
+                     payload={"index": i}, priority=MessagePriority(i % 4), timestamp=0.0)
+        for i in range(50000)
+    ]
+    rates = {}
+    for name, queue in (("lanes", MessageLanes()), ("heap", asyncio.PriorityQueue())):
+        start = time.perf_counter()
+        for message in messages:
+            queue.put_nowait(message)
+        while not queue.empty():
+            queue.get_nowait()
+        rates[name] = len(messages) / (time.perf_counter() - start)
+
+    suite.assert_greater(rates["lanes"], 2 * rates["heap"], "Lanes > 2x PriorityQueue put+get rate")
+    suite.assert_greater(rates["lanes"], 100000, "Lanes > 100,000 put+get/s")
+
+    print(f"    Queue put+get: lanes {rates['lanes']:.0f}/s, PriorityQueue {rates['heap']:.0f}/s")
+
+
+async def deliver_rate(bus: AgentMessageBus, messages: List[AgentMessage]) -> float:
+    """Messages delivered per second, straight through _deliver_message."""
+    start = time.perf_counter()
+    for message in messages:
+        await bus._deliver_message(message)
+    return len(messages) / (time.perf_counter() - start)
+
+
+async def test_routing_cost(suite: ValidationSuite):
+    """Test delivery cost of direct messages and plain handlers."""
+    print("\n🧪 Test: Routing Cost")
+
+    # 48 agents: a direct message reaches one, a broadcast all of them
+    bus = AgentMessageBus()
+
+    async def handler(msg: AgentMessage):
+        pass
+
+    for i in range(48):
+        bus.subscribe("note", handler, agent_id=f"agent_{i}")
+    direct = [AgentMessage(from_agent="conductor", to_agent=f"agent_{i % 48}", message_type="note",
+                           priority=MessagePriority.HIGH, timestamp=0.0) for i in range(2000)]
+    broadcast = [AgentMessage(from_agent="conductor", to_agent=BROADCAST, message_type="note",
+                              priority=MessagePriority.HIGH, timestamp=0.0) for _ in range(200)]
+    direct_rate = await deliver_rate(bus, direct)
+    broadcast_rate = await deliver_rate(bus, broadcast)
+
+    suite.assert_greater(direct_rate, 10 * broadcast_rate, "48 agents: direct > 10x broadcast rate")
+    print(f"    48 agents: direct {direct_rate:.0f} msg/s, broadcast {broadcast_rate:.0f} msg/s")
+
+    # Three handlers: plain functions skip the coroutine and gather
+    messages = [AgentMessage(from_agent="a", to_agent=BROADCAST, message_type="t",
+                             priority=MessagePriority.NORMAL, timestamp=0.0) for _ in range(5000)]
+    rates = {}
+    for name, handler in (("sync", lambda msg: None), ("async", handler)):
+        bus = AgentMessageBus()
+        for _ in range(3):
+            bus.subscribe("t", handler)
+        rates[name] = await deliver_rate(bus, messages)
+
+    suite.assert_greater(rates["sync"], 2 * rates["async"], "3 handlers: sync > 2x async rate")
+    print(f"    3 handlers: sync {rates['sync']:.0f} msg/s, async {rates['async']:.0f} msg/s")
+
+
+async def test_slow_subscriber(suite: ValidationSuite):
+    """Test beat latency next to a slow inbox subscriber."""
+    print("\n🧪 Test: Slow Subscriber Isolation")
+
+    bus = AgentMessageBus()
+    beat_latencies = []
+
+    def on_beat(msg: AgentMessage):
+        beat_latencies.append(time.perf_counter() - msg.timestamp)
+
+    async def slow_logger(msg: AgentMessage):
+        await asyncio.sleep(0.02)
+
+    bus.subscribe("beat_event", on_beat, agent_id="drums")
+    bus.subscribe("beat_event", slow_logger, agent_id="analytics", inbox_size=8, overflow='drop_oldest')
+    await bus.start()
+
+    for _ in range(100):
+        await bus.publish(AgentMessage(
+            from_agent="conductor", to_agent=BROADCAST, message_type="beat_event",
+            priority=MessagePriority.CRITICAL, timestamp=time.perf_counter()
+        ))
+        await asyncio.sleep(0.001)
+
+    stats = bus.get_stats()['subscribers'][0]
+    await bus.stop()
+
+    suite.assert_less(max(beat_latencies) * 1000, 10.0, "Max beat latency < 10ms")
+    # Dropping the oldest bounds the lag to about eight beats
+    suite.assert_less(stats['max_lag_ms'], 50.0, "Slow subscriber lag < 50ms")
+
+    print(f"    Beat latency max {max(beat_latencies) * 1000:.2f}ms; slow subscriber: "
+          f"depth={stats['depth']} lag={stats['lag_ms']:.1f}ms dropped={stats['dropped']}")
+
+    # Several workers deliver to slow worker-run handlers concurrently
+    async def slow(msg: AgentMessage):
+        await asyncio.sleep(0.005)
+
+    durations = {}
+    for workers in (1, 4):
+        bus = AgentMessageBus(delivery_workers=workers)
+        bus.subscribe("worker_test", slow)
+        await bus.start()
+        start = time.perf_counter()
+        for i in range(40):
+            await bus.publish(AgentMessage(
+                from_agent="sender", to_agent="target", message_type="worker_test",
+                payload={"index": i}, priority=MessagePriority.NORMAL, timestamp=0.0
+            ))
+        await bus.stop()
+        durations[workers] = time.perf_counter() - start
+
+    suite.assert_less(durations[4], durations[1] / 2, "4 delivery workers > 2x faster than 1")
+    print(f"    40 x 5ms handlers: 1 worker {durations[1]:.3f}s, 4 workers {durations[4]:.3f}s")
+
+
 async def test_latency(suite: ValidationSuite):
     """Test message latency."""
     print("\n🧪 Test: Latency Performance")
@@ -397,6 +523,9 @@ async def main():
     await test_broadcast(suite)
     await test_concurrent_publishers(suite)
     await test_throughput(suite)
+    await test_lane_throughput(suite)
+    await test_routing_cost(suite)
+    await test_slow_subscriber(suite)
     await test_latency(suite)
     await test_no_message_loss(suite)
 
@@ -6,10 +6,14 @@ Captures live audio from default microphone and displays
 RMS amplitude with a console-based level meter.
 """
 
+import os
 import sys
 import time
 import numpy as np
-from audio_input import RealtimeAudioInput, list_audio_devices, get_default_device
+
+# Import through the package so audio_input's sibling modules resolve
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from realtime.audio_input import RealtimeAudioInput, list_audio_devices, get_default_device
 
 
 def calculate_rms(audio_block: np.ndarray) -> float:
@@ -126,7 +130,7 @@ def main():
             try:
                 # Get audio block (with timeout)
                 block = audio_input.get_block(timeout=0.1)
-                blocks_in_interval.append(block)
+                blocks_in_interval.append(block.copy())  # Views are reused by the ring
 
                 # Check if it's time to update display
                 now = time.time()
@@ -0,0 +1,184 @@
+"""
+Background analysis worker for Performia.
+
+Runs the expensive per-frame detectors (pitch) off the audio consumer
+thread. The consumer hands over the newest frame through a "latest value"
+slot and reads the newest result from another, so neither side waits for
+the other: onset detection and position tracking keep their own latency
+budget, and a worker that falls behind skips to the most recent frame
+instead of building a backlog.
+"""
+
+import logging
+import threading
+from time import perf_counter
+from dataclasses import dataclass
+from typing import Any, Optional, Tuple
+
+from .frame import AnalysisFrame
+from .instrumentation import LatencyHistogram
+from .pitch import StreamingPitchTracker
+
+logger = logging.getLogger(__name__)
+
+
+class LatestValue:
+    """
+    Single-producer "latest value" slot.
+
+    ``publish`` replaces the stored ``(version, value)`` tuple with one
+    attribute store and ``get`` reads it with one attribute load. Both are
+    atomic in CPython, so the slot needs no lock and readers never block
+    the writer. Published values must not be mutated afterwards.
+
+    Args:
+        initial: Value returned before the first publish (version 0)
+    """
+
+    __slots__ = ('_item',)
+
+    def __init__(self, initial: Any = None):
+        self._item: Tuple[int, Any] = (0, initial)
+
+    def publish(self, value: Any) -> None:
+        """Replace the current value (single writer only)."""
+        self._item = (self._item[0] + 1, value)
+
+    def get(self) -> Any:
+        """Most recently published value."""
+        return self._item[1]
+
+    def get_versioned(self) -> Tuple[int, Any]:
+        """Most recently published value with its version (publish count)."""
+        return self._item
+
+    @property
+    def version(self) -> int:
+        """Number of values published so far."""
+        return self._item[0]
+
+
+@dataclass(frozen=True)
+class PitchResult:
+    """Pitch tracker output for one analysis frame."""
+    frame_index: int  # AnalysisFrame.index the result belongs to
+    time: float  # Stream time of that frame (seconds)
+    f0: float  # Hz, NaN if unvoiced
+    voiced: bool
+    voiced_prob: float
+
+
+class BackgroundAnalysisWorker:
+    """
+    Dedicated thread running the pitch tracker on the newest frame.
+
+    ``submit`` never blocks: it snapshots the frame into the input slot and
+    wakes the thread. The thread always analyzes the most recent snapshot
+    and publishes a ``PitchResult`` into ``self.pitch``. Frames that were
+    replaced before the thread got to them are counted as skipped, and
+    frames the tracker failed on are logged and counted as errors.
+
+    Args:
+        pitch_tracker: Tracker owned by the worker while it is running (not
+            to be used from any other thread meanwhile)
+    """
+
+    def __init__(self, pitch_tracker: StreamingPitchTracker):
+        self.pitch_tracker = pitch_tracker
+
+        self.frames = LatestValue()  # (frame_index, time, samples, spectrum)
+        self.pitch = LatestValue()  # PitchResult
+
+        self.frames_analyzed = 0
+        self.frames_skipped = 0
+        self.errors = 0
+        self.latency = LatencyHistogram()  # Per-frame pitch analysis time
+
+        self.is_running = False
+        self._wake = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        """Start the worker thread."""
+        if self.is_running:
+            return
+
+        self.is_running = True
+        self._thread = threading.Thread(
+            target=self._run, name="performia-analysis-worker", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout: float = 1.0):
+        """Stop the worker thread and wait for it to exit."""
+        if not self.is_running:
+            return
+
+        self.is_running = False
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+            self._thread = None
+
+    def submit(self, frame: AnalysisFrame, time: float):
+        """
+        Hand the newest frame to the worker (non-blocking).
+
+        Args:
+            frame: Current shared analysis frame (copied, so the caller may
+                update it immediately)
+            time: Stream time of the frame in seconds
+        """
+        self.frames.publish((frame.index, time, frame.samples.copy(), frame.spectrum.copy()))
+        self._wake.set()
+
+    @property
+    def frames_submitted(self) -> int:
+        """Number of frames handed to the worker."""
+        return self.frames.version
+
+    def _run(self):
+        """Worker loop: analyze the latest frame whenever a new one arrives."""
+        last_version = 0
+
+        while self.is_running:
+            self._wake.wait(timeout=0.1)
+            self._wake.clear()
+
+            version, job = self.frames.get_versioned()
+            if version == last_version:
+                continue
+
+            self.frames_skipped += version - last_version - 1
+            last_version = version
+
+            frame_index, time, samples, spectrum = job
+            start = perf_counter()
+            try:
+                f0, voiced, voiced_prob = self.pitch_tracker.process_frame(samples, spectrum)
+            except Exception as e:
+                # Don't crash the worker on analysis errors
+                self.errors += 1
+                logger.error(f"Error in pitch worker on frame {frame_index}: {e}")
+                continue
+            self.latency.record(perf_counter() - start)
+
+            self.pitch.publish(PitchResult(
+                frame_index=frame_index,
+                time=time,
+                f0=float(f0),
+                voiced=bool(voiced),
+                voiced_prob=float(voiced_prob)
+            ))
+            self.frames_analyzed += 1
+
+    def get_stats(self) -> dict:
+        """Get worker statistics."""
+        return {
+            'is_running': self.is_running,
+            'frames_submitted': self.frames_submitted,
+            'frames_analyzed': self.frames_analyzed,
+            'frames_skipped': self.frames_skipped,
+            'errors': self.errors,
+            'latency': self.latency.to_dict()
+        }
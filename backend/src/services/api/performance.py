@@ -6,28 +6,57 @@ using the Song Map position tracker.
 """
 
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect, HTTPException
-from typing import Dict, Optional, List
+from pathlib import Path
+from typing import Dict, Optional, List, Union
 import asyncio
 import time
 import json
 import logging
+import numpy as np
 
-from ...realtime.audio_input import RealtimeAudioInput
+from ...realtime.audio_input import RealtimeAudioInput, get_default_device
+from ...realtime.sources import VirtualSource
 from ...realtime.analyzer import RealtimeAnalyzer
-from ...realtime.position_tracker import SongMapPositionTracker
+from ...realtime.multichannel import MultiChannelAnalyzer
+from ...realtime.position_tracker import SongMapPositionTracker, TRACKING_MODES
+from ...realtime.song_map_cache import CompiledSongMap, load_song_map
+from ...realtime.tables import preload as preload_analysis_tables
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/performance", tags=["performance"])
 
+# Pipeline output, as in main.py: <song_id>/<song_id>.song_map.json
+SONG_MAP_DIR = Path(__file__).parent.parent.parent.parent / "output"
+
 
 class PerformanceSession:
-    """Manages a single live performance session."""
+    """Manages a single live performance session.
+
+    Args:
+        song_map: Song Map to follow, as a dict or compiled (see
+            ``load_song_map``, which makes start-up independent of song length)
+        channels: Number of input channels (default: 1)
+        source: Virtual audio source instead of the microphone, e.g. for
+            headless load tests (default: None)
+        tracking_mode: Position tracker mode, 'greedy' or 'dtw' (score
+            following that recovers after skips and repeats; default: 'greedy')
+    """
 
-    def __init__(self, song_map: Dict):
+    def __init__(
+        self,
+        song_map: Union[Dict, CompiledSongMap],
+        channels: int = 1,
+        source: Optional[VirtualSource] = None,
+        tracking_mode: str = 'greedy'
+    ):
         self.song_map = song_map
+        self.channels = channels
+        self.source = source
+        self.tracking_mode = tracking_mode
         self.audio_input: Optional[RealtimeAudioInput] = None
         self.analyzer: Optional[RealtimeAnalyzer] = None
+        self.multichannel_analyzer: Optional[MultiChannelAnalyzer] = None
         self.tracker: Optional[SongMapPositionTracker] = None
         self.is_running = False
         self.websocket: Optional[WebSocket] = None
@@ -40,10 +69,20 @@ class PerformanceSession:
         self.audio_input = RealtimeAudioInput(
             block_size=512,  # 11.6ms latency
             sample_rate=44100,
-            channels=1
+            channels=self.channels,
+            source=self.source,
+            # Under CPU pressure, merge queued blocks rather than drop audio
+            # (_analyze_block still analyzes them hop by hop)
+            adaptive=True
         )
-        self.analyzer = RealtimeAnalyzer(sample_rate=44100)
-        self.tracker = SongMapPositionTracker(self.song_map)
+        if self.channels > 1:
+            # Multi-mic rig: all channels analyzed in one batched pass
+            self.multichannel_analyzer = MultiChannelAnalyzer(self.channels, sample_rate=44100)
+        else:
+            # Pitch runs on a background worker so onset -> tracker never waits on it
+            self.analyzer = RealtimeAnalyzer(sample_rate=44100, offload=True)
+        # Greedy tracking follows section skips/repeats via jump detection
+        self.tracker = SongMapPositionTracker(self.song_map, mode=self.tracking_mode, jump_detection=True)
 
         # Start audio input
         self.audio_input.start()
@@ -63,22 +102,40 @@ class PerformanceSession:
         if self.audio_input:
             self.audio_input.stop()
 
+        if self.analyzer:
+            self.analyzer.close()
+
         logger.info("Performance session stopped")
 
+    def get_stats(self) -> dict:
+        """
+        Structured session statistics.
+
+        Returns:
+            Dictionary with ``audio``, ``analysis`` (per-stage latency
+            histograms, deadline misses, allocations) and ``tracking`` stats
+        """
+        analyzer = self.multichannel_analyzer or self.analyzer
+        return {
+            'is_running': self.is_running,
+            'audio': self.audio_input.get_stats() if self.audio_input else {},
+            'analysis': analyzer.get_performance_stats() if analyzer else {},
+            'tracking': self.tracker.get_stats() if self.tracker else {}
+        }
+
     async def process_audio_loop(self):
-        """Main audio processing loop."""
-        try:
-            while self.is_running:
-                # Get audio block
-                try:
-                    audio_block = self.audio_input.get_block(timeout=0.1)
+        """Main audio processing loop.
 
-                    # Flatten to mono if needed
-                    if len(audio_block.shape) > 1:
-                        audio_block = audio_block.mean(axis=1)
+        Blocks are awaited rather than polled, so sessions sharing the event
+        loop never wait on each other's audio.
+        """
+        try:
+            async for audio_block in self.audio_input.blocks():
+                if not self.is_running:
+                    break
 
-                    # Detect onset
-                    onset_detected = self.analyzer.detect_onset(audio_block)
+                try:
+                    onset_detected = self._analyze_block(audio_block)
 
                     # Update position
                     position = self.tracker.update(onset_detected=onset_detected)
@@ -95,6 +152,34 @@ class PerformanceSession:
             logger.error(f"Error in audio loop: {e}")
             raise
 
+    def _analyze_block(self, audio_block: np.ndarray) -> bool:
+        """Analyze one delivered block, hop by hop.
+
+        In adaptive mode a lagging session receives several blocks merged
+        into one; each hop still gets its own analysis so no onset is lost
+        and the tempo envelope keeps one sample per hop.
+
+        Returns:
+            True if an onset was detected in any hop of the block
+        """
+        analyzer = self.multichannel_analyzer or self.analyzer
+        if not self.multichannel_analyzer and len(audio_block.shape) > 1:
+            # Flatten to mono if needed
+            audio_block = audio_block.mean(axis=1)
+
+        onset_detected = False
+        for start in range(0, len(audio_block), analyzer.hop_length):
+            hop = audio_block[start:start + analyzer.hop_length]
+            if self.multichannel_analyzer:
+                # (block, channels) -> (channels, block); an onset on any mic counts
+                analysis = self.multichannel_analyzer.process_block(hop.T)
+                onset_detected |= analysis.any_onset
+            else:
+                # Analyze hop (pitch, onset, beat, tempo from one shared frame)
+                analysis = self.analyzer.process_block(hop)
+                onset_detected |= analysis.onset
+        return onset_detected
+
     async def _send_position_update(self):
         """Send position update to frontend via WebSocket."""
         if not self.websocket or not self.tracker:
@@ -103,7 +188,7 @@ class PerformanceSession:
         position = self.tracker.position
         current_syllable = self.tracker.get_current_syllable()
         current_section = self.tracker.get_current_section()
-        upcoming = self.tracker.get_lookahead(seconds=3.0)
+        upcoming = self.tracker.get_lookahead(seconds=3.0, limit=10)
 
         update = {
             'type': 'position_update',
@@ -120,7 +205,7 @@ class PerformanceSession:
                 'syllable': current_syllable,
                 'section': current_section.name if current_section else None
             },
-            'upcoming': upcoming[:10],  # Next 10 syllables
+            'upcoming': upcoming,  # Next 10 syllables
             'stats': self.tracker.get_stats()
         }
 
@@ -184,7 +269,7 @@ async def websocket_endpoint(websocket: WebSocket, session_id: str):
         await websocket.send_json({
             'type': 'session_started',
             'session_id': session_id,
-            'song_title': session.song_map.get('title', 'Unknown')
+            'song_title': session.tracker.song_map.get('title', 'Unknown')
         })
 
         # Run audio processing loop
@@ -203,31 +288,55 @@ async def websocket_endpoint(websocket: WebSocket, session_id: str):
 
 
 @router.post("/sessions")
-async def create_session(song_id: str):
+async def create_session(song_id: str, channels: int = 1, tracking_mode: str = 'greedy'):
     """
     Create a new performance session for a song.
 
     Args:
         song_id: ID of the song to perform
+        channels: Number of input channels (mics) to analyze, at most what
+            the default input device records
+        tracking_mode: Position tracker mode, 'greedy' or 'dtw'
 
     Returns:
         Session ID for WebSocket connection
     """
-    # Load Song Map from database/filesystem
-    # For now, use a placeholder
+    if tracking_mode not in TRACKING_MODES:
+        raise HTTPException(status_code=400, detail=f"tracking_mode must be one of {TRACKING_MODES}")
+    if channels < 1:
+        raise HTTPException(status_code=400, detail=f"channels must be >= 1, got {channels}")
+    if channels > 1:
+        # Sessions record from the default input device (unknown when headless)
+        device = await asyncio.to_thread(get_default_device)
+        if device is not None and channels > device['channels']:
+            raise HTTPException(
+                status_code=400,
+                detail=f"channels must be <= {device['channels']} for input device '{device['name']}', got {channels}"
+            )
+
+    # Load the Song Map through its compiled cache (compiled on first use)
     # TODO: Integrate with library service to load Song Map
+    song_name = Path(song_id).name
+    song_map_path = SONG_MAP_DIR / song_name / f"{song_name}.song_map.json"
+    if song_map_path.exists():
+        song_map = await asyncio.to_thread(load_song_map, song_map_path)
+    else:
+        # For now, use a placeholder
+        song_map = {
+            'title': 'Test Song',
+            'artist': 'Test Artist',
+            'sections': []
+        }
 
-    song_map = {
-        'title': 'Test Song',
-        'artist': 'Test Artist',
-        'sections': []
-    }
+    # Build the shared DSP tables now (once per process) rather than on
+    # the first audio block, off the event loop
+    await asyncio.to_thread(preload_analysis_tables, 44100)
 
     # Generate session ID
     session_id = f"session_{int(time.time() * 1000)}"
 
     # Create session
-    session = PerformanceSession(song_map)
+    session = PerformanceSession(song_map, channels=channels, tracking_mode=tracking_mode)
     active_sessions[session_id] = session
 
     return {
@@ -270,17 +379,12 @@ async def get_session_status(session_id: str):
     if not session:
         raise HTTPException(status_code=404, detail="Session not found")
 
-    stats = {}
-    if session.tracker:
-        stats = session.tracker.get_stats()
-
-    audio_stats = {}
-    if session.audio_input:
-        audio_stats = session.audio_input.get_stats()
+    stats = session.get_stats()
 
     return {
         'session_id': session_id,
-        'is_running': session.is_running,
-        'tracking_stats': stats,
-        'audio_stats': audio_stats
+        'is_running': stats['is_running'],
+        'tracking_stats': stats['tracking'],
+        'audio_stats': stats['audio'],
+        'analysis_stats': stats['analysis']
     }
@@ -6,10 +6,21 @@ import sys
 import os
 import numpy as np
 import time
+import librosa
+import threading
+import json
+from queue import Queue, Full, Empty
 
 # Add src to path
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../src/realtime')))
-from analyzer import RealtimeAnalyzer
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../src')))
+from realtime.analyzer import RealtimeAnalyzer
+from realtime.multichannel import MultiChannelAnalyzer
+from realtime.pitch import StreamingPitchTracker
+from realtime.block_ring import BlockRing
+from realtime.audio_input import RealtimeAudioInput
+from realtime.sources import ArraySource
+from realtime.position_tracker import SongMapPositionTracker
+from realtime import tables
 
 def benchmark_pitch_detection():
     """Benchmark pitch detection performance."""
@@ -63,6 +74,58 @@ def benchmark_pitch_detection():
     
     print("  Target: <10ms average latency")
 
+def benchmark_streaming_vs_pyin():
+    """Compare the streaming pYIN tracker against per-block librosa.pyin."""
+    print("\nBenchmark 1b: Streaming pYIN vs librosa.pyin (per 512-sample block)")
+    print("-" * 60)
+
+    sample_rate = 44100
+    frame_length = 2048
+    block_size = 512
+    fmin = librosa.note_to_hz('C2')
+    fmax = librosa.note_to_hz('C7')
+    tracker = StreamingPitchTracker(sample_rate, fmin, fmax, frame_length, block_size)
+
+    t = np.arange(sample_rate) / sample_rate
+    audio = (np.sin(2 * np.pi * 440.0 * t) + 0.05 * np.random.randn(len(t))).astype(np.float32)
+    frames = [audio[i - frame_length:i] for i in range(frame_length, len(audio), block_size)]
+
+    # Time each path in its own pass so neither pollutes the other's caches
+    pyin_latencies = []
+    pyin_results = []
+    for frame in frames:
+        start = time.perf_counter()
+        f0, voiced_flag, voiced_probs = librosa.pyin(
+            frame, fmin=fmin, fmax=fmax, sr=sample_rate,
+            frame_length=frame_length, hop_length=block_size, center=False
+        )
+        pyin_latencies.append((time.perf_counter() - start) * 1000)
+        pyin_results.append((f0[-1], voiced_probs[-1]))
+
+    streaming_latencies = []
+    streaming_results = []
+    for frame in frames:
+        start = time.perf_counter()
+        streaming_results.append(tracker.process_frame(frame))
+        streaming_latencies.append((time.perf_counter() - start) * 1000)
+
+    max_error_cents = 0.0
+    max_prob_error = 0.0
+    for (f0, prob), (stream_f0, stream_voiced, stream_prob) in zip(pyin_results, streaming_results):
+        if stream_voiced and not np.isnan(f0):
+            max_error_cents = max(max_error_cents, abs(1200 * np.log2(stream_f0 / f0)))
+        max_prob_error = max(max_prob_error, abs(stream_prob - prob))
+
+    for name, latencies in [("pyin", pyin_latencies), ("streaming", streaming_latencies)]:
+        print(f"  {name:10s}: avg={np.mean(latencies):6.3f}ms "
+              f"p50={np.percentile(latencies, 50):6.3f}ms "
+              f"p99={np.percentile(latencies, 99):6.3f}ms")
+
+    print(f"  Speedup: {np.mean(pyin_latencies) / np.mean(streaming_latencies):.1f}x")
+    print(f"  Max f0 difference: {max_error_cents:.3f} cents | "
+          f"max voiced prob difference: {max_prob_error:.2e}")
+    print("  Target: <1ms average latency (streaming)")
+
 def benchmark_onset_detection():
     """Benchmark onset detection performance."""
     print("\nBenchmark 2: Onset Detection Performance")
@@ -194,6 +257,324 @@ def benchmark_combined_pipeline():
     print(f"  Audio duration: {duration:.2f}s")
     print(f"  Real-time factor: {duration / (sum(total_latencies)/1000):.2f}x")
 
+def benchmark_block_latency():
+    """Benchmark process_block latency, including tempo refresh blocks."""
+    print("\nBenchmark 4: process_block Latency (tempo refresh every 2s)")
+    print("-" * 60)
+
+    analyzer = RealtimeAnalyzer(sample_rate=44100)
+    block_size = 512
+
+    # 20 seconds of 120 BPM clicks
+    duration = 20.0
+    audio = np.zeros(int(44100 * duration), dtype=np.float32)
+    for beat_time in np.arange(0.0, duration, 0.5):
+        idx = int(beat_time * 44100)
+        t = np.linspace(0, 0.01, 100)
+        audio[idx:idx + 100] += np.sin(2 * np.pi * 1000 * t) * np.exp(-t * 200)
+
+    latencies = []
+    refresh_latencies = []
+    for i in range(0, len(audio) - block_size, block_size):
+        last_update = analyzer.last_envelope_tempo_update
+
+        start = time.perf_counter()
+        analyzer.process_block(audio[i:i + block_size])
+        latency = (time.perf_counter() - start) * 1000
+
+        latencies.append(latency)
+        if analyzer.last_envelope_tempo_update != last_update:
+            refresh_latencies.append(latency)
+
+    print(f"  All blocks ({len(latencies)}): "
+          f"p50={np.percentile(latencies, 50):5.2f}ms "
+          f"p99={np.percentile(latencies, 99):5.2f}ms "
+          f"max={np.max(latencies):5.2f}ms")
+    if refresh_latencies:
+        print(f"  Tempo refresh blocks ({len(refresh_latencies)}): "
+              f"avg={np.mean(refresh_latencies):5.2f}ms "
+              f"max={np.max(refresh_latencies):5.2f}ms")
+    print(f"  Final tempo: {analyzer.tempo_estimate:.1f} BPM")
+
+def benchmark_offload():
+    """Benchmark the onset path with and without offloading pitch."""
+    print("\nBenchmark 5: Onset Path Latency, Inline vs Offloaded Pitch")
+    print("-" * 60)
+
+    block_size = 512
+    block_duration = block_size / 44100
+    duration = 5.0
+
+    # Sung-like material: vibrato tone with note attacks every 0.5s
+    t = np.arange(int(44100 * duration)) / 44100
+    freq = 220.0 * (1 + 0.01 * np.sin(2 * np.pi * 5 * t))
+    audio = 0.3 * np.sin(2 * np.pi * np.cumsum(freq) / 44100)
+    audio *= 0.5 + 0.5 * np.exp(-(t % 0.5) * 8)
+    audio = audio.astype(np.float32)
+
+    for offload in (False, True):
+        analyzer = RealtimeAnalyzer(sample_rate=44100, offload=offload)
+
+        # Blocks are paced like a live input; process_block returns when the
+        # onset result (what the position tracker consumes) is available
+        latencies = []
+        next_block = time.perf_counter()
+        for i in range(0, len(audio) - block_size, block_size):
+            next_block += block_duration
+            start = time.perf_counter()
+            analyzer.process_block(audio[i:i + block_size])
+            latencies.append((time.perf_counter() - start) * 1000)
+
+            remaining = next_block - time.perf_counter()
+            if remaining > 0:
+                time.sleep(remaining)
+
+        stats = analyzer.get_performance_stats()
+        analyzer.close()
+
+        label = "Offloaded" if offload else "Inline"
+        print(f"  {label:10s}: p50={np.percentile(latencies, 50):5.2f}ms "
+              f"p95={np.percentile(latencies, 95):5.2f}ms "
+              f"p99={np.percentile(latencies, 99):5.2f}ms "
+              f"max={np.max(latencies):5.2f}ms")
+        if offload:
+            worker = stats['worker']
+            print(f"  {'':10s}  pitch frames analyzed={worker['frames_analyzed']} "
+                  f"skipped={worker['frames_skipped']}")
+
+def benchmark_multichannel():
+    """Benchmark batched multi-channel analysis against separate analyzers."""
+    print("\nBenchmark 6: Multi-Channel Batched vs Separate Analyzers")
+    print("-" * 60)
+
+    block_size = 512
+    n_blocks = 200
+    rng = np.random.default_rng(0)
+
+    for n_channels in (1, 2, 4, 8, 16):
+        t = np.arange(block_size * n_blocks) / 44100
+        freqs = 110.0 * 2 ** (np.arange(n_channels)[:, None] / 4)
+        audio = (0.4 * np.sin(2 * np.pi * freqs * t) +
+                 0.01 * rng.standard_normal((n_channels, len(t)))).astype(np.float32)
+
+        batched = MultiChannelAnalyzer(n_channels, sample_rate=44100)
+        separate = [RealtimeAnalyzer(sample_rate=44100) for _ in range(n_channels)]
+
+        batched_latencies = []
+        separate_latencies = []
+        for i in range(0, audio.shape[1] - block_size, block_size):
+            block = audio[:, i:i + block_size]
+
+            start = time.perf_counter()
+            batched.process_block(block)
+            batched_latencies.append((time.perf_counter() - start) * 1000)
+
+            start = time.perf_counter()
+            for channel, analyzer in enumerate(separate):
+                analyzer.process_block(block[channel])
+            separate_latencies.append((time.perf_counter() - start) * 1000)
+
+        batched_avg = np.mean(batched_latencies)
+        separate_avg = np.mean(separate_latencies)
+        print(f"  {n_channels:2d} channels: batched={batched_avg:5.2f}ms "
+              f"({batched_avg / n_channels:5.3f}ms/ch) separate={separate_avg:5.2f}ms "
+              f"speedup={separate_avg / batched_avg:4.1f}x")
+
+def benchmark_session_startup():
+    """Benchmark analyzer construction and first block, cold vs cached tables."""
+    print("\nBenchmark 7: Session Startup (cold vs cached DSP tables)")
+    print("-" * 60)
+
+    block = np.zeros(512, dtype=np.float32)
+
+    for label in ("Cold", "Cached"):
+        if label == "Cold":
+            tables.clear()
+
+        start = time.perf_counter()
+        analyzer = RealtimeAnalyzer(sample_rate=44100)
+        init_ms = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        analyzer.process_block(block)
+        first_block_ms = (time.perf_counter() - start) * 1000
+
+        print(f"  {label:6s}: construction={init_ms:8.3f}ms first block={first_block_ms:6.3f}ms")
+
+def benchmark_callback_transport():
+    """Benchmark audio-callback jitter, Queue(maxsize=10) vs SPSC block ring."""
+    print("\nBenchmark 8: Audio Callback Jitter (Queue vs SPSC ring, synthetic driver)")
+    print("-" * 60)
+
+    block_size = 512
+    block_duration = block_size / 44100
+    n_blocks = 400
+    indata = np.random.default_rng(0).uniform(-1, 1, (block_size, 1)).astype(np.float32)
+
+    # The previous RealtimeAudioInput transport: copy + Queue.put_nowait
+    audio_queue = Queue(maxsize=10)
+
+    def queue_callback():
+        try:
+            audio_queue.put_nowait(indata.copy())
+        except Full:
+            pass
+
+    def queue_get():
+        return audio_queue.get(timeout=0.1)
+
+    ring = BlockRing(10, block_size)
+
+    def ring_callback():
+        ring.write(indata)
+
+    def ring_get():
+        return ring.read(timeout=0.1)
+
+    for label, callback, get in (("Queue", queue_callback, queue_get), ("Ring", ring_callback, ring_get)):
+        analyzer = RealtimeAnalyzer(sample_rate=44100)
+        durations = []
+
+        def driver():
+            # Stand-in for the PortAudio thread: one callback per block period
+            next_block = time.perf_counter()
+            for _ in range(n_blocks):
+                next_block += block_duration
+                start = time.perf_counter()
+                callback()
+                durations.append((time.perf_counter() - start) * 1e6)
+
+                remaining = next_block - time.perf_counter()
+                if remaining > 0:
+                    time.sleep(remaining)
+
+        thread = threading.Thread(target=driver)
+        thread.start()
+
+        # Consumer does the real per-block analysis, contending for the GIL
+        while thread.is_alive():
+            try:
+                block = get()
+            except Empty:
+                continue
+            analyzer.process_block(block[:, 0])
+        thread.join()
+
+        print(f"  {label:6s}: callback p50={np.percentile(durations, 50):6.1f}us "
+              f"p99={np.percentile(durations, 99):7.1f}us "
+              f"max={np.max(durations):8.1f}us "
+              f"std={np.std(durations):6.1f}us")
+
+def benchmark_headless_chain():
+    """Benchmark input -> analyzer -> tracker driven by a virtual source."""
+    print("\nBenchmark 9: Headless Input -> Analyzer -> Tracker (virtual source)")
+    print("-" * 60)
+
+    song_map_path = os.path.join(os.path.dirname(__file__), '../../songmap_32193cf0.json')
+    with open(song_map_path) as f:
+        song_map = json.load(f)
+
+    # Clicks on the song map's beats over a quiet tone
+    duration = 8.0
+    t = np.arange(int(44100 * duration)) / 44100
+    audio = 0.05 * np.sin(2 * np.pi * 220 * t)
+    for beat in song_map['beats']:
+        start = int(beat * 44100)
+        audio[start:start + 441] += np.hanning(882)[441:] * 0.8
+    audio = audio.astype(np.float32)
+
+    for speed, with_analysis in ((100.0, False), (None, False), (None, True)):
+        source = ArraySource(audio, 44100, speed=speed)
+        analyzer = RealtimeAnalyzer(sample_rate=44100)
+        tracker = SongMapPositionTracker(song_map)
+        tracker.start()
+
+        n_blocks = 0
+        start = time.perf_counter()
+        with RealtimeAudioInput(sample_rate=44100, source=source) as audio_input:
+            while not audio_input.exhausted:
+                try:
+                    block = audio_input.get_block(timeout=0.01)
+                except Empty:
+                    continue
+                if with_analysis:
+                    analysis = analyzer.process_block(block[:, 0])
+                    tracker.update(analysis.onset, current_time=analysis.time)
+                n_blocks += 1
+            stats = audio_input.get_stats()
+        elapsed = time.perf_counter() - start
+
+        label = f"{'unpaced' if speed is None else f'{speed:.0f}x paced'}, " \
+                f"{'full chain' if with_analysis else 'input only'}"
+        print(f"  {label:28s}: {duration / elapsed:7.1f}x real time "
+              f"blocks={n_blocks} dropped={stats['blocks_dropped']}")
+
+def benchmark_score_following():
+    """Benchmark greedy matching, with and without jump detection, vs DTW score following."""
+    print("\nBenchmark 10: Score Following After Section Skips and Repeats")
+    print("-" * 60)
+
+    # Twelve four-line sections of syllables 0.15-0.5s apart
+    rng = np.random.default_rng(0)
+    song_time = 1.0
+    sections = []
+    for s in range(12):
+        lines = []
+        for l in range(4):
+            syllables = []
+            for k in range(rng.integers(4, 9)):
+                syllables.append({'text': f'{s}.{l}.{k}', 'startTime': round(song_time, 3), 'duration': 0.2})
+                song_time += rng.choice([0.15, 0.25, 0.35, 0.5])
+            song_time += 0.6
+            lines.append({'syllables': syllables})
+        sections.append({'name': f'Section {s}', 'lines': lines})
+    song_map = {'sections': sections}
+
+    # Sections 0-2, skip to 5-6, repeat 2-3, skip to 9-11
+    onsets = SongMapPositionTracker(song_map).onsets
+    starts = [int(np.argmax(onsets['section'] == s)) for s in range(12)] + [len(onsets)]
+    segments = [(0, 3), (5, 7), (2, 4), (9, 12)]
+    path = [i for first, last in segments for i in range(starts[first], starts[last])]
+    jumps = np.cumsum([starts[last] - starts[first] for first, last in segments[:-1]])
+
+    # Performed at 95% speed with 15ms jitter; 0.5s pause at each jump
+    performance = [onsets['time'][path[0]] / 0.95]
+    for previous, idx in zip(path, path[1:]):
+        gap = (onsets['time'][idx] - onsets['time'][previous]) / 0.95 if idx == previous + 1 else 0.5
+        performance.append(performance[-1] + gap)
+    performance = np.array(performance) + rng.normal(0, 0.015, len(path))
+
+    block_period = 512 / 44100
+    for label, mode, jump_detection in (('greedy', 'greedy', False), ('jumps', 'greedy', True), ('dtw', 'dtw', False)):
+        tracker = SongMapPositionTracker(song_map, mode=mode, jump_detection=jump_detection)
+        tracker.start()
+        start_time = tracker.performance_start_time
+
+        correct, latencies = [], []
+        now = 0.0
+        for idx, onset_time in zip(path, performance):
+            while now + block_period < onset_time:
+                now += block_period
+                tracker.update(False, current_time=start_time + now)
+            now = onset_time
+            start = time.perf_counter()
+            tracker.update(True, current_time=start_time + onset_time)
+            latencies.append((time.perf_counter() - start) * 1e6)
+            correct.append(tracker.matched_onset_idx == idx)
+        correct = np.array(correct)
+
+        # Onsets after each jump until three in a row are matched correctly
+        recovery = []
+        for jump in jumps:
+            n = 0
+            while jump + n + 3 <= len(correct) and not correct[jump + n:jump + n + 3].all():
+                n += 1
+            recovery.append(str(n) if jump + n + 3 <= len(correct) else 'never')
+
+        print(f"  {label:6s}: matched {correct.mean() * 100:5.1f}% of {len(path)} onsets, "
+              f"recovery after jumps: {', '.join(recovery)} onsets, "
+              f"update p50={np.percentile(latencies, 50):5.1f}us p99={np.percentile(latencies, 99):6.1f}us")
+
 def main():
     """Run all benchmarks."""
     print("=" * 80)
@@ -201,8 +582,16 @@ def main():
     print("=" * 80)
     
     benchmark_pitch_detection()
+    benchmark_streaming_vs_pyin()
     benchmark_onset_detection()
     benchmark_combined_pipeline()
+    benchmark_block_latency()
+    benchmark_offload()
+    benchmark_multichannel()
+    benchmark_session_startup()
+    benchmark_callback_transport()
+    benchmark_headless_chain()
+    benchmark_score_following()
     
     print("\n" + "=" * 80)
     print("Benchmarks Complete!")
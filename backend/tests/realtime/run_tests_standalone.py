@@ -9,8 +9,7 @@ import time
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../src')))
 
 # Direct import
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../src/realtime')))
-from analyzer import RealtimeAnalyzer, RingBuffer
+from realtime.analyzer import RealtimeAnalyzer, RingBuffer
 
 print("Performia Real-Time Analyzer Tests")
 print("=" * 80)
@@ -8,6 +8,7 @@ and performance benchmarks.
 import pytest
 import numpy as np
 import time
+import tracemalloc
 import os
 import sys
 
@@ -15,7 +16,8 @@ import sys
 src_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../src'))
 sys.path.insert(0, src_path)
 
-from realtime.analyzer import RealtimeAnalyzer, RingBuffer
+from realtime.analyzer import RealtimeAnalyzer, RingBuffer, BlockAnalysis
+from realtime.frame import AnalysisFrame, FFT_OUT
 
 
 class TestRingBuffer:
@@ -64,6 +66,72 @@ class TestRingBuffer:
         expected = np.array([1, 2, 3, 4, 5, 6, 7, 8, 9], dtype=np.float32)
         np.testing.assert_array_almost_equal(result, expected)
 
+    @pytest.mark.parametrize("mirrored", [False, True])
+    def test_read_into_and_view(self, mirrored):
+        """read(out=...) and read_view match a plain read across wrap-around."""
+        buffer = RingBuffer(size=100, mirrored=mirrored)
+        history = np.zeros(100, dtype=np.float32)
+        rng = np.random.default_rng(0)
+
+        for _ in range(20):
+            data = rng.standard_normal(rng.integers(1, 150)).astype(np.float32)
+            buffer.write(data)
+            history = np.concatenate([history, data])[-100:]
+
+            for n in (1, 37, 100):
+                out = np.empty(n, dtype=np.float32)
+                assert buffer.read(out=out) is out
+                np.testing.assert_array_equal(out, history[-n:])
+                np.testing.assert_array_equal(buffer.read_view(n), history[-n:])
+
+    def test_read_view_does_not_copy(self):
+        """A mirrored buffer returns views into its storage, even when wrapped."""
+        buffer = RingBuffer(size=10, mirrored=True)
+        buffer.write(np.arange(7, dtype=np.float32))
+        buffer.write(np.arange(7, 14, dtype=np.float32))  # wraps
+
+        view = buffer.read_view(10)
+        assert np.shares_memory(view, buffer.buffer)
+        np.testing.assert_array_equal(view, np.arange(4, 14, dtype=np.float32))
+
+    def test_read_out_size_mismatch(self):
+        """An out array of the wrong length is rejected."""
+        buffer = RingBuffer(size=10)
+        with pytest.raises(ValueError):
+            buffer.read(5, out=np.empty(4, dtype=np.float32))
+
+    @pytest.mark.parametrize("mirrored", [False, True])
+    def test_steady_state_allocates_no_arrays(self, mirrored):
+        """Steady-state write + read allocates no array data (tracemalloc)."""
+        buffer = RingBuffer(size=8192, mirrored=mirrored)
+        block = np.ones(512, dtype=np.float32)
+        frame = np.empty(2048, dtype=np.float32)
+
+        # Warm up
+        for _ in range(100):
+            buffer.write(block)
+            buffer.read(out=frame)
+            buffer.read_view(2048)
+
+        tracemalloc.start()
+        try:
+            baseline, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+
+            for _ in range(1000):
+                buffer.write(block)
+                buffer.read(out=frame)
+                buffer.read_view(2048)
+
+            current, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        # Only transient array headers are created; a single copied block
+        # (block.nbytes == 2048) would already exceed these bounds
+        assert current - baseline < 1024
+        assert peak - baseline < 1024
+
 
 class TestPitchDetection:
     """Test pitch detection accuracy."""
@@ -316,6 +384,113 @@ class TestBeatTracking:
         assert abs(estimated_tempo - 90.0) < 2.0
 
 
+class TestProcessBlock:
+    """Test the unified single-frame analysis path."""
+
+    def generate_notes(self, sample_rate: int = 44100):
+        """Two plucked notes with a gap, for pitch and onset content."""
+        audio = np.zeros(sample_rate, dtype=np.float32)
+        for start, freq in [(0.1, 440.0), (0.5, 329.63)]:
+            idx = int(start * sample_rate)
+            t = np.arange(int(0.3 * sample_rate)) / sample_rate
+            audio[idx:idx + len(t)] += 0.5 * np.sin(2 * np.pi * freq * t) * np.exp(-t * 3)
+        return audio
+
+    def test_frame_magnitude_matches_windowed_fft(self):
+        """The derived Hann magnitude equals a direct windowed rfft."""
+        frame = AnalysisFrame(2048)
+        samples = np.random.default_rng(0).standard_normal(2048)
+        frame.update(samples)
+
+        window = np.hanning(2049)[:-1]  # periodic Hann
+        expected = np.abs(np.fft.rfft(samples * window))
+        np.testing.assert_allclose(frame.magnitude, expected, atol=1e-9)
+        assert frame.index == 0
+
+    def test_matches_individual_detectors(self):
+        """process_block gives the same pitch and onsets as the separate calls."""
+        combined = RealtimeAnalyzer(sample_rate=44100)
+        separate = RealtimeAnalyzer(sample_rate=44100)
+        audio = self.generate_notes()
+
+        block_size = 512
+        for i in range(0, len(audio) - block_size, block_size):
+            block = audio[i:i + block_size]
+            result = combined.process_block(block)
+
+            assert isinstance(result, BlockAnalysis)
+            assert result.onset == separate.detect_onset(block)
+            pitch = separate.analyze_pitch(block)
+            if pitch is None:
+                assert result.pitch is None
+            else:
+                assert result.pitch == pytest.approx(pitch)
+
+        assert combined.frame.index == len(audio) // block_size - 1
+
+    def test_stream_time(self):
+        """Without an explicit timestamp, blocks are stamped with stream time."""
+        analyzer = RealtimeAnalyzer(sample_rate=44100)
+        block = np.zeros(512, dtype=np.float32)
+
+        analyzer.process_block(block)
+        result = analyzer.process_block(block)
+
+        assert result.time == pytest.approx(1024 / 44100)
+
+    def test_tempo_from_shared_envelope(self):
+        """Tempo is estimated from the shared onset envelope."""
+        analyzer = RealtimeAnalyzer(sample_rate=44100)
+        audio = TestBeatTracking().generate_metronome(tempo_bpm=120.0, duration=8.0)
+
+        block_size = 512
+        for i in range(0, len(audio) - block_size, block_size):
+            result = analyzer.process_block(audio[i:i + block_size])
+
+        print(f"process_block tempo = {result.tempo:.1f} BPM")
+        assert abs(result.tempo - 120.0) < 2.0
+
+    def test_frame_updates_in_place(self):
+        """Every hop writes into the same preallocated arrays."""
+        frame = AnalysisFrame(2048)
+        arrays = (frame.samples, frame.spectrum, frame.magnitude)
+        rng = np.random.default_rng(0)
+        for _ in range(3):
+            samples = rng.standard_normal(2048)
+            frame.update(samples)
+
+        assert all(a is b for a, b in zip((frame.samples, frame.spectrum, frame.magnitude), arrays))
+        np.testing.assert_allclose(frame.spectrum, np.fft.rfft(samples, n=4096), atol=1e-9)
+
+    @pytest.mark.skipif(not FFT_OUT, reason="rfft(out=...) needs NumPy >= 2")
+    def test_steady_state_allocation(self):
+        """A steady-state process_block allocates less than one frame of data (tracemalloc)."""
+        analyzer = RealtimeAnalyzer(sample_rate=44100)
+        t = np.arange(512 * 400) / 44100
+        blocks = (0.3 * np.sin(2 * np.pi * 220.0 * t)).astype(np.float32).reshape(-1, 512)
+
+        # Warm up (fills the onset and beat histories)
+        for block in blocks[:300]:
+            analyzer.process_block(block)
+
+        tracemalloc.start()
+        try:
+            baseline, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+
+            for block in blocks[300:]:
+                analyzer.process_block(block)
+
+            current, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        # Only small per-block temporaries (pYIN troughs, array headers)
+        # remain; a fresh padded spectrum alone would be 32 KiB
+        assert current - baseline < analyzer.frame.samples.nbytes
+        assert peak - baseline < analyzer.frame.samples.nbytes
+
+
 class TestPerformance:
     """Performance benchmarks."""
 
@@ -0,0 +1,164 @@
+"""
+Unit tests for the beat tracker.
+"""
+
+import pytest
+import numpy as np
+import os
+import sys
+from collections import deque
+
+# Add src to path for imports
+src_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../src'))
+sys.path.insert(0, src_path)
+
+from realtime.analyzer import RealtimeAnalyzer
+from realtime.beat import BeatTracker
+
+
+SAMPLE_RATE = 44100
+HOP_LENGTH = 512
+HOP_TIME = HOP_LENGTH / SAMPLE_RATE
+
+
+@pytest.fixture
+def tracker():
+    """Create tracker with the analyzer's configuration."""
+    return BeatTracker(tempo=120.0, history=8)
+
+
+def click_onsets(tempo_bpm: float, duration: float):
+    """Per-block (onset, time) pairs for a click track, quantized to the hop."""
+    n_blocks = int(duration / HOP_TIME)
+    onsets = np.zeros(n_blocks, dtype=bool)
+    beat_times = np.arange(0.0, duration, 60.0 / tempo_bpm)
+    onsets[np.minimum(np.round(beat_times / HOP_TIME).astype(int), n_blocks - 1)] = True
+    return [(bool(onset), i * HOP_TIME) for i, onset in enumerate(onsets)]
+
+
+def reference_track_beat(onsets, tempo: float = 120.0):
+    """The original list-and-median track_beat, for equivalence checks."""
+    beat_times = deque(maxlen=8)
+    tempos = []
+    for onset, current_time in onsets:
+        if onset:
+            beat_interval = 60.0 / tempo
+            if len(beat_times) == 0:
+                beat_times.append(current_time)
+            elif current_time - beat_times[-1] >= beat_interval * 0.7:
+                beat_times.append(current_time)
+                if len(beat_times) >= 4:
+                    intervals = [beat_times[i + 1] - beat_times[i] for i in range(len(beat_times) - 1)]
+                    median_interval = np.median(intervals)
+                    if median_interval > 0:
+                        tempo = 0.7 * tempo + 0.3 * 60.0 / median_interval
+        tempos.append(tempo)
+    return tempos
+
+
+class TestIntervalStatistics:
+    """Test the fixed-size interval array."""
+
+    def test_matches_reference(self, tracker):
+        """Tempo follows exactly the same trajectory as the list-based version."""
+        onsets = click_onsets(100.0, duration=10.0)
+        expected = reference_track_beat(onsets)
+
+        for (onset, current_time), tempo in zip(onsets, expected):
+            tracker.process(onset, current_time)
+            assert tracker.tempo == pytest.approx(tempo, abs=1e-9)
+
+    def test_running_sums(self, tracker):
+        """Running mean/std equal the statistics of the stored intervals."""
+        rng = np.random.default_rng(0)
+        beat_time = 0.0
+        for _ in range(20):
+            tracker.process(True, beat_time)
+            beat_time += 0.5 + 0.02 * rng.standard_normal()
+
+        stored = tracker.intervals[:tracker.n_intervals]
+        assert tracker.n_intervals == 7
+        assert tracker.interval_mean == pytest.approx(stored.mean())
+        assert tracker.interval_std == pytest.approx(stored.std(), abs=1e-9)
+
+    def test_rejects_early_onsets(self, tracker):
+        """Onsets closer than 70% of the beat interval are not beats."""
+        assert tracker.process(True, 0.0)
+        assert not tracker.process(True, 0.3)  # < 0.35s at 120 BPM
+        assert tracker.process(True, 0.5)
+        assert tracker.n_beats == 2
+
+    def test_reset(self, tracker):
+        """reset() restores the initial tempo and clears the grid."""
+        for onset, current_time in click_onsets(90.0, duration=6.0):
+            tracker.process(onset, current_time)
+        tracker.reset()
+
+        assert tracker.tempo == 120.0
+        assert tracker.n_intervals == 0
+        assert tracker.predict_next_beat(1.0) is None
+
+
+class TestClickTracks:
+    """Deterministic convergence and prediction on synthetic click tracks."""
+
+    @pytest.mark.parametrize("tempo_bpm", [90.0, 100.0, 120.0, 140.0, 160.0])
+    def test_tempo_converges(self, tracker, tempo_bpm):
+        """Tempo settles within 2 BPM of the click rate (intervals are hop-quantized)."""
+        for onset, current_time in click_onsets(tempo_bpm, duration=16.0):
+            tracker.process(onset, current_time)
+
+        print(f"{tempo_bpm:.0f} BPM: tracked {tracker.tempo:.2f} BPM")
+        assert abs(tracker.tempo - tempo_bpm) < 2.0
+
+    @pytest.mark.parametrize("tempo_bpm", [90.0, 120.0, 140.0])
+    def test_predicts_next_beat(self, tracker, tempo_bpm):
+        """Once locked, the predicted next beat lands within one hop of the click."""
+        duration = 16.0
+        beat_times = np.arange(0.0, duration, 60.0 / tempo_bpm)
+
+        errors = []
+        for onset, current_time in click_onsets(tempo_bpm, duration):
+            tracker.process(onset, current_time)
+            if duration / 2 < current_time < duration - 1.0 and onset:
+                predicted = tracker.predict_next_beat(current_time)
+                actual = beat_times[beat_times > current_time + HOP_TIME][0]
+                errors.append(abs(predicted - actual))
+
+        print(f"{tempo_bpm:.0f} BPM: max prediction error {max(errors) * 1000:.1f}ms")
+        assert max(errors) < HOP_TIME
+
+    def test_prediction_is_ahead(self, tracker):
+        """The prediction is always in the future, even after missed beats."""
+        tracker.process(True, 0.0)
+        tracker.process(True, 0.5)
+        assert tracker.predict_next_beat(0.6) == pytest.approx(1.0)
+        assert tracker.predict_next_beat(2.2) == pytest.approx(2.5)
+
+
+class TestAnalyzerIntegration:
+    """Beat prediction through RealtimeAnalyzer.process_block."""
+
+    def test_next_beat_in_block_analysis(self):
+        """process_block reports the predicted next beat of a metronome."""
+        analyzer = RealtimeAnalyzer(sample_rate=SAMPLE_RATE)
+        duration = 12.0
+        audio = np.zeros(int(SAMPLE_RATE * duration), dtype=np.float32)
+        beat_times = np.arange(0.0, duration, 0.5)
+        for beat_time in beat_times:
+            idx = int(beat_time * SAMPLE_RATE)
+            t = np.linspace(0, 0.01, 100)
+            audio[idx:idx + 100] += np.sin(2 * np.pi * 1000 * t) * np.exp(-t * 200)
+
+        for i in range(0, len(audio) - HOP_LENGTH, HOP_LENGTH):
+            result = analyzer.process_block(audio[i:i + HOP_LENGTH])
+
+        assert result.next_beat is not None and result.next_beat > result.time
+        # On the click grid, up to the block/onset reporting delay
+        grid_offset = (result.next_beat + 0.25) % 0.5 - 0.25
+        assert abs(grid_offset) < 3 * HOP_TIME
+        assert analyzer.get_performance_stats()['beats_tracked'] == analyzer.beat_tracker.n_beats
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "-s"])
@@ -0,0 +1,222 @@
+"""
+Unit tests for the SPSC audio block ring.
+"""
+
+import pytest
+import numpy as np
+import asyncio
+import threading
+import time
+import os
+import sys
+from queue import Empty
+
+# Add src to path for imports
+src_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../src'))
+sys.path.insert(0, src_path)
+
+from realtime.block_ring import BlockRing
+
+
+def make_block(value: float, block_size: int = 8, channels: int = 1) -> np.ndarray:
+    """Block filled with one value, shaped like sounddevice's indata."""
+    return np.full((block_size, channels), value, dtype=np.float32)
+
+
+class TestBlockRing:
+    """Test single-threaded ring behavior."""
+
+    def test_fifo(self):
+        """Blocks come out in write order."""
+        ring = BlockRing(capacity=4, block_size=8)
+        for i in range(3):
+            assert ring.write(make_block(i))
+
+        for i in range(3):
+            block = ring.read_nowait()
+            assert block.shape == (8, 1)
+            assert block.dtype == np.float32
+            assert np.all(block == i)
+
+        assert ring.read_nowait() is None
+
+    def test_read_is_view(self):
+        """Reads return views into the preallocated slots."""
+        ring = BlockRing(capacity=2, block_size=8)
+        ring.write(make_block(1.0))
+
+        block = ring.read_nowait()
+        assert np.shares_memory(block, ring.slots)
+
+    def test_drops_like_queue(self):
+        """Exactly ``capacity`` blocks can be pending, as with Queue(maxsize)."""
+        ring = BlockRing(capacity=3, block_size=8)
+        results = [ring.write(make_block(i)) for i in range(5)]
+
+        assert results == [True, True, True, False, False]
+        assert ring.pending == 3
+
+    def test_held_slot_not_overwritten(self):
+        """The block being read is not reused until the next read."""
+        ring = BlockRing(capacity=2, block_size=8)
+        ring.write(make_block(1.0))
+        block = ring.read_nowait()
+
+        # Capacity is still 2 pending blocks while one is held
+        assert ring.write(make_block(2.0))
+        assert ring.write(make_block(3.0))
+        assert not ring.write(make_block(4.0))
+        assert np.all(block == 1.0)
+
+        # Reading the next block releases the held one
+        assert np.all(ring.read_nowait() == 2.0)
+        assert ring.write(make_block(5.0))
+
+    def test_mono_and_short_blocks(self):
+        """1-D blocks are accepted and short blocks keep their length."""
+        ring = BlockRing(capacity=2, block_size=8)
+        ring.write(np.ones(5, dtype=np.float32))
+
+        block = ring.read_nowait()
+        assert block.shape == (5, 1)
+
+    def test_multichannel(self):
+        """Channels are kept per slot."""
+        ring = BlockRing(capacity=2, block_size=8, channels=2)
+        data = np.stack([np.zeros(8), np.ones(8)], axis=1).astype(np.float32)
+        ring.write(data)
+
+        np.testing.assert_array_equal(ring.read_nowait(), data)
+
+    def test_clear(self):
+        """clear() drops pending blocks and frees their slots."""
+        ring = BlockRing(capacity=3, block_size=8)
+        for i in range(3):
+            ring.write(make_block(i))
+        ring.read_nowait()
+
+        assert ring.clear() == 2
+        assert ring.pending == 0
+        assert ring.read_nowait() is None
+        assert all(ring.write(make_block(i)) for i in range(3))
+
+    def test_read_timeout(self):
+        """read() raises Empty when nothing arrives in time."""
+        ring = BlockRing(capacity=2, block_size=8)
+
+        start = time.perf_counter()
+        with pytest.raises(Empty):
+            ring.read(timeout=0.05)
+        assert time.perf_counter() - start >= 0.05
+
+
+class TestConcurrency:
+    """Test producer and consumer on separate threads."""
+
+    def test_wakes_waiting_consumer(self):
+        """A blocked read() returns as soon as a block is written."""
+        ring = BlockRing(capacity=2, block_size=8)
+
+        def produce():
+            time.sleep(0.02)
+            ring.write(make_block(7.0))
+
+        producer = threading.Thread(target=produce)
+        producer.start()
+        block = ring.read(timeout=1.0)
+        producer.join()
+
+        assert np.all(block == 7.0)
+
+    def test_stream_integrity(self):
+        """Every delivered block is intact and in order under contention."""
+        ring = BlockRing(capacity=4, block_size=64)
+        n_blocks = 5000
+        written = []
+
+        def produce():
+            for i in range(n_blocks):
+                if ring.write(make_block(i, block_size=64)):
+                    written.append(i)
+                if i % 50 == 0:
+                    time.sleep(0)
+
+        producer = threading.Thread(target=produce)
+        producer.start()
+
+        received = []
+        while producer.is_alive() or ring.pending:
+            try:
+                block = ring.read(timeout=0.01)
+            except Empty:
+                continue
+            # The whole block must come from a single write
+            assert np.all(block == block[0, 0])
+            received.append(int(block[0, 0]))
+        producer.join()
+
+        assert received == written
+
+
+class TestAsync:
+    """Test asyncio consumers."""
+
+    @pytest.mark.asyncio
+    async def test_read_async_wakes_on_write(self):
+        """An awaiting consumer is woken by a write from another thread."""
+        ring = BlockRing(capacity=2, block_size=8)
+        threading.Timer(0.02, ring.write, args=(make_block(3.0),)).start()
+
+        block = await ring.read_async(timeout=1.0)
+        assert np.all(block == 3.0)
+
+    @pytest.mark.asyncio
+    async def test_read_async_timeout(self):
+        """read_async() raises Empty when nothing arrives in time."""
+        ring = BlockRing(capacity=2, block_size=8)
+
+        with pytest.raises(Empty):
+            await ring.read_async(timeout=0.02)
+        assert ring._async_waiter is None
+
+    @pytest.mark.asyncio
+    async def test_event_loop_not_blocked(self):
+        """Other coroutines keep running while a consumer awaits a block."""
+        ring = BlockRing(capacity=2, block_size=8)
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.005)
+                ticks += 1
+
+        task = asyncio.create_task(ticker())
+        threading.Timer(0.1, ring.write, args=(make_block(1.0),)).start()
+        await ring.read_async(timeout=1.0)
+        task.cancel()
+
+        assert ticks >= 10
+
+
+class TestPerformance:
+    """Producer-side cost."""
+
+    def test_write_is_cheap(self):
+        """A full-size write costs a few microseconds and never allocates a block."""
+        ring = BlockRing(capacity=10, block_size=512)
+        block = np.zeros((512, 1), dtype=np.float32)
+
+        n = 10000
+        start = time.perf_counter()
+        for _ in range(n):
+            ring.write(block)
+            ring.read_nowait()
+        avg_us = (time.perf_counter() - start) / n * 1e6
+
+        print(f"Ring write + read: {avg_us:.2f}us")
+        assert avg_us < 20
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "-s"])
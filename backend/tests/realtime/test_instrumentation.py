@@ -0,0 +1,216 @@
+"""
+Unit tests for latency histograms and pipeline statistics.
+"""
+
+import pytest
+import numpy as np
+import gc
+import time
+import os
+import sys
+
+# Add src to path for imports
+src_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../src'))
+sys.path.insert(0, src_path)
+
+from realtime.instrumentation import LatencyHistogram, PipelineStats
+from realtime.analyzer import RealtimeAnalyzer
+from realtime.multichannel import MultiChannelAnalyzer
+
+
+@pytest.fixture
+def sample_rate():
+    """Standard sample rate for testing."""
+    return 44100
+
+
+class TestLatencyHistogram:
+    """Test histogram recording and percentiles."""
+
+    def test_empty(self):
+        """An empty histogram reports zeros."""
+        histogram = LatencyHistogram()
+
+        assert histogram.percentile(99) == 0.0
+        assert histogram.to_dict()['count'] == 0
+        assert histogram.to_dict()['mean_ms'] == 0.0
+
+    def test_percentiles_within_precision(self):
+        """Percentiles match exact ones within the bucket precision."""
+        rng = np.random.default_rng(0)
+        values = rng.lognormal(mean=np.log(1e-3), sigma=1.0, size=5000)
+
+        histogram = LatencyHistogram()
+        for value in values:
+            histogram.record(value)
+
+        for q in (50, 95, 99):
+            exact = np.percentile(values, q)
+            assert histogram.percentile(q) == pytest.approx(exact, rel=2.0 / histogram.sub_buckets)
+
+        assert histogram.max == values.max()
+        assert histogram.percentile(100) == values.max()
+        assert histogram.total / histogram.count == pytest.approx(values.mean())
+
+    def test_range(self):
+        """Sub-microsecond and very long values land in the edge buckets."""
+        histogram = LatencyHistogram()
+        histogram.record(1e-8)
+        histogram.record(1e4)
+
+        assert histogram.counts[0] == 1
+        assert histogram.counts[-1] == 1
+        assert histogram.percentile(100) == 1e4
+
+    def test_reset(self):
+        """reset() clears everything."""
+        histogram = LatencyHistogram()
+        histogram.record(0.002)
+        histogram.reset()
+
+        assert histogram.count == 0
+        assert histogram.max == 0.0
+        assert histogram.counts.sum() == 0
+
+
+class TestPipelineStats:
+    """Test per-stage timing and deadline accounting."""
+
+    def test_stages(self):
+        """Each stage mark records one value per block."""
+        stats = PipelineStats(stages=('a', 'b'))
+
+        for _ in range(3):
+            start = stats.begin_block()
+            mark = stats.stage('a', start)
+            stats.stage('b', mark)
+            stats.end_block(start, block_period=1.0)
+
+        result = stats.get_stats()
+        assert result['latency']['a']['count'] == 3
+        assert result['latency']['b']['count'] == 3
+        assert result['latency']['total']['count'] == 3
+        assert result['deadline']['blocks'] == 3
+        assert result['deadline']['misses'] == 0
+
+    def test_deadline_misses(self):
+        """Blocks slower than their period are counted as misses."""
+        stats = PipelineStats(stages=())
+
+        start = stats.begin_block()
+        time.sleep(0.002)
+        stats.end_block(start, block_period=0.001)
+
+        start = stats.begin_block()
+        stats.end_block(start, block_period=1.0)
+
+        deadline = stats.get_stats()['deadline']
+        assert deadline['misses'] == 1
+        assert deadline['miss_rate'] == 0.5
+        assert deadline['worst_overrun_ms'] >= 1.0
+
+    def test_gc_in_block(self):
+        """Garbage collections inside a block are counted."""
+        stats = PipelineStats(stages=())
+
+        start = stats.begin_block()
+        gc.collect()
+        stats.end_block(start, block_period=1.0)
+
+        start = stats.begin_block()
+        stats.end_block(start, block_period=1.0)
+
+        allocations = stats.get_stats()['allocations']
+        assert allocations['gc_collections_in_blocks'] >= 1
+        assert allocations['blocks_with_gc'] == 1
+        assert allocations['gc_pause_in_blocks_ms'] > 0
+
+    def test_extra_stages(self):
+        """Histograms recorded elsewhere are reported alongside."""
+        stats = PipelineStats(stages=('a',))
+        worker = LatencyHistogram()
+        worker.record(0.001)
+
+        latency = stats.get_stats({'worker': worker})['latency']
+        assert latency['worker']['count'] == 1
+
+
+class TestAnalyzerStats:
+    """Test the structured stats of the analyzers."""
+
+    def test_realtime_analyzer(self, sample_rate):
+        """process_block fills every stage histogram."""
+        analyzer = RealtimeAnalyzer(sample_rate=sample_rate)
+        block = np.zeros(512, dtype=np.float32)
+        for _ in range(10):
+            analyzer.process_block(block)
+
+        stats = analyzer.get_performance_stats()
+        for stage in ('total', 'frame', 'onset', 'tempo', 'beat', 'pitch'):
+            assert stats['latency'][stage]['count'] == 10
+        assert stats['deadline']['blocks'] == 10
+        assert stats['deadline']['block_period_ms'] == pytest.approx(512 / sample_rate * 1000)
+        assert 'allocations' in stats
+        assert stats['last_analysis_time_ms'] > 0
+
+    def test_legacy_methods(self, sample_rate):
+        """Per-detector calls are recorded in their stage histograms."""
+        analyzer = RealtimeAnalyzer(sample_rate=sample_rate)
+        block = np.zeros(512, dtype=np.float32)
+        analyzer.analyze_pitch(block)
+        analyzer.detect_onset(block)
+        analyzer.estimate_tempo(block)
+
+        latency = analyzer.get_performance_stats()['latency']
+        assert latency['pitch']['count'] == 1
+        assert latency['onset']['count'] == 1
+        assert latency['tempo']['count'] == 1
+        assert latency['total']['count'] == 0
+
+    def test_offload_worker_latency(self, sample_rate):
+        """The pitch worker's latency is reported as its own stage."""
+        with RealtimeAnalyzer(sample_rate=sample_rate, offload=True) as analyzer:
+            t = np.arange(512) / sample_rate
+            block = (0.5 * np.sin(2 * np.pi * 220 * t)).astype(np.float32)
+            for _ in range(20):
+                analyzer.process_block(block)
+                time.sleep(0.005)
+
+            stats = analyzer.get_performance_stats()
+            assert stats['latency']['pitch_worker']['count'] > 0
+            assert stats['worker']['latency']['count'] > 0
+
+    def test_multichannel_analyzer(self, sample_rate):
+        """MultiChannelAnalyzer reports the same structure."""
+        analyzer = MultiChannelAnalyzer(2, sample_rate=sample_rate)
+        analyzer.process_block(np.zeros((2, 512), dtype=np.float32))
+
+        stats = analyzer.get_performance_stats()
+        for stage in ('total', 'frame', 'onset', 'pitch'):
+            assert stats['latency'][stage]['count'] == 1
+        assert stats['deadline']['blocks'] == 1
+
+
+class TestPerformance:
+    """Overhead of always-on instrumentation."""
+
+    def test_overhead(self):
+        """A fully instrumented block costs only a few microseconds."""
+        stats = PipelineStats(stages=('frame', 'onset', 'tempo', 'beat', 'pitch'))
+
+        n = 2000
+        start_time = time.perf_counter()
+        for _ in range(n):
+            start = stats.begin_block()
+            mark = start
+            for stage in ('frame', 'onset', 'tempo', 'beat', 'pitch'):
+                mark = stats.stage(stage, mark)
+            stats.end_block(start, block_period=0.0116)
+        avg_us = (time.perf_counter() - start_time) / n * 1e6
+
+        print(f"Instrumentation overhead per block: {avg_us:.1f}us")
+        assert avg_us < 50
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "-s"])
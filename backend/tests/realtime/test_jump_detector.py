@@ -0,0 +1,166 @@
+"""
+Unit tests for section jump detection in the greedy position tracker.
+"""
+
+import pytest
+import numpy as np
+import time
+import os
+import sys
+
+# Add src to path for imports
+src_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../src'))
+sys.path.insert(0, src_path)
+
+from realtime.jump_detector import JumpDetector
+from realtime.position_tracker import SongMapPositionTracker
+from realtime.replay import replay
+from tests.realtime.tracker_helpers import make_song_map, section_starts, perform
+
+
+def section_onsets(n_sections: int = 8, seed: int = 0):
+    """Onset times of sections of 20 random intervals, and the section starts."""
+    rng = np.random.default_rng(seed)
+    iois = rng.choice([0.15, 0.25, 0.35, 0.5], (n_sections, 20))
+    iois[:, -1] = 1.0  # Gap before the next section
+    times = np.concatenate([[1.0], 1.0 + np.cumsum(iois)])
+    return times, np.arange(n_sections) * 20
+
+
+def confirmed_check(detector: JumpDetector, performed: np.ndarray, matched: list, expected_song_time: float):
+    """Check after the last two onsets, so a far jump gets its confirmation."""
+    detector.check(performed[:-1], matched[:-1], expected_song_time)
+    return detector.check(performed, matched, expected_song_time)
+
+
+class TestJumpDetector:
+    """Test hypothesis scoring directly."""
+
+    def test_finds_section_after_jump(self):
+        """Onsets played from another section start are placed there."""
+        times, starts = section_onsets()
+        detector = JumpDetector(times, starts)
+
+        # Matched 11-13 in section 0, then the performer jumps to section 5
+        # and the window keeps matching on from 14
+        performed = np.concatenate([times[11:14], times[100:107] - times[100] + times[13] + 0.5])
+        matched = list(range(11, 21))
+
+        assert detector.check(performed[:-1], matched[:-1], expected_song_time=times[19]) is None
+        position, cost, tempo_ratio = detector.check(performed, matched, expected_song_time=times[20])
+        assert position == 106
+        assert cost < 0.05
+        assert detector.get_stats()['jumps'] == 1
+
+    def test_relocks_near_current_position(self):
+        """A track that slipped a few onsets is put back at once."""
+        times, starts = section_onsets()
+        detector = JumpDetector(times, starts)
+
+        # The window lost onsets 45-47 (matched nothing), expecting ~44
+        position, cost, tempo_ratio = detector.check(times[42:48], [42, 43, -1, -1, -1, -1], expected_song_time=times[45])
+        assert position == 47
+        assert detector.get_stats()['relocks'] == 1
+        assert detector.get_stats()['jumps'] == 0
+
+    def test_no_check_while_track_fits(self):
+        """A track that follows the intervals is never second-guessed."""
+        times, starts = section_onsets()
+        detector = JumpDetector(times, starts)
+
+        assert detector.check(times[20:28], list(range(20, 28)), expected_song_time=times[27]) is None
+        assert detector.track_cost(times[20:28], list(range(20, 28))) == pytest.approx(0.0)
+        assert detector.get_stats()['checks'] == 0
+
+    def test_fits_tempo_per_hypothesis(self):
+        """A hypothesis is scored after fitting its own tempo, which is returned."""
+        times, starts = section_onsets()
+        detector = JumpDetector(times, starts)
+
+        performed = (times[60:67] - times[60]) / 0.9 + 3.0
+        position, cost, tempo_ratio = confirmed_check(detector, performed, [-1] * 7, expected_song_time=3.0)
+        assert position == 66
+        assert tempo_ratio == pytest.approx(0.9, abs=0.05)
+
+    def test_repeated_sections_prefer_expected_position(self):
+        """Identical sections fit equally well; the nearest to the expected position wins."""
+        rng = np.random.default_rng(1)
+        section = np.concatenate([rng.choice([0.15, 0.25, 0.35, 0.5], 19), [1.0]])
+        times = np.concatenate([[1.0], 1.0 + np.cumsum(np.tile(section, 4))])
+        detector = JumpDetector(times, np.arange(4) * 20)
+
+        performed = times[40:47] - times[40]
+        for expected, position in ((times[10], 6), (times[50], 46), (times[78], 66)):
+            detector.reset()
+            assert confirmed_check(detector, performed, [-1] * 7, expected_song_time=expected)[0] == position
+
+    def test_short_maps(self):
+        """Hypotheses without a full pattern of onsets after them are dropped."""
+        times, _ = section_onsets(1)
+        detector = JumpDetector(times[:4], [0])
+        assert len(detector.candidates) == 0
+        assert detector.check(np.arange(8) * 0.3, [-1] * 8, 0.0) is None
+
+
+class TestTrackerJumps:
+    """Test jump detection in the greedy tracker."""
+
+    @pytest.mark.parametrize('segments', [((0, 3), (6, 9)), ((0, 5), (2, 7))], ids=['skip', 'repeat'])
+    def test_recovers_after_jump(self, segments):
+        """Skips and repeats are followed within a few onsets."""
+        song_map = make_song_map()
+        tracker = SongMapPositionTracker(song_map, jump_detection=True)
+        starts = section_starts(tracker)
+        order = [s for first, last in segments for s in range(first, last)]
+        jump = starts[segments[0][1]] - starts[segments[0][0]]
+
+        result = replay(tracker, perform(tracker, order, tempo=0.95))
+
+        print(f"Recovery after {segments}: {result.recovery[0]} onsets")
+        assert result.recovery[0] is not None and result.recovery[0] <= 8
+        assert result.correct[jump + 10:].mean() > 0.95
+        assert tracker.get_stats()['jumps']['jumps'] >= 1
+
+    def test_straight_performance(self):
+        """Without jumps, a correct track is left alone and a lost one is found again."""
+        song_map = make_song_map(seed=4)
+        for tempo in (1.0, 0.95, 1.05):
+            results = {}
+            for jump_detection in (False, True):
+                tracker = SongMapPositionTracker(song_map, jump_detection=jump_detection)
+                results[jump_detection] = replay(tracker, perform(tracker, tempo=tempo, seed=4)).correct
+
+            # At 0.95 the plain window loses the performer before the tempo settles
+            assert results[True][30:].mean() > 0.97, tempo
+            assert results[True].mean() >= results[False].mean(), tempo
+            assert tracker.get_stats()['jumps']['jumps'] == 0
+
+    def test_disabled(self):
+        """Without jump_detection=True (or in the 'dtw' mode) there is no detector."""
+        song_map = make_song_map()
+        assert SongMapPositionTracker(song_map).jump_detector is None
+        assert SongMapPositionTracker(song_map, jump_detection=False).jump_detector is None
+        assert SongMapPositionTracker(song_map, mode='dtw', jump_detection=True).get_stats()['jumps'] is None
+
+
+class TestPerformance:
+    """Check cost on long maps."""
+
+    def test_check_cost_on_medley(self):
+        """Scoring every section start of a long medley stays well inside the 25ms budget."""
+        tracker = SongMapPositionTracker(make_song_map(600, seed=1), jump_detection=True)
+        detector = tracker.jump_detector
+        performed = np.cumsum(np.full(8, 0.3))
+
+        start = time.perf_counter()
+        for _ in range(200):
+            detector.check(performed, [-1] * 8, expected_song_time=5.0)
+        per_check_ms = (time.perf_counter() - start) / 200 * 1e3
+
+        print(f"{len(detector.candidates)} hypotheses: {per_check_ms:.2f}ms per check")
+        assert detector.get_stats()['checks'] == 200
+        assert per_check_ms < 5.0
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "-s"])
@@ -0,0 +1,223 @@
+"""
+Unit tests for adaptive latency management.
+"""
+
+import pytest
+import numpy as np
+import time
+import os
+import sys
+from queue import Empty
+
+# Add src to path for imports
+src_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../src'))
+sys.path.insert(0, src_path)
+
+from realtime.latency import LatencyManager
+from realtime.audio_input import RealtimeAudioInput
+from realtime.sources import ArraySource
+
+
+@pytest.fixture
+def sample_rate():
+    """Standard sample rate for testing."""
+    return 44100
+
+
+@pytest.fixture
+def ramp(sample_rate):
+    """One second of a ramp, so every block is distinguishable."""
+    return np.linspace(-1, 1, sample_rate, dtype=np.float32)
+
+
+class TestLatencyManager:
+    """Test the coalescing policy."""
+
+    def test_idle_stays_at_one_block(self):
+        """Without backlog or drops nothing changes."""
+        manager = LatencyManager()
+        assert all(manager.update(backlog=0, dropped=0) == 1 for _ in range(100))
+        assert manager.get_stats()['adjustments'] == 0
+
+    def test_grows_on_backlog(self):
+        """A backlog at the high watermark doubles the factor, up to the maximum."""
+        manager = LatencyManager(max_coalesce=4, high_watermark=5)
+
+        assert manager.update(backlog=5, dropped=0) == 2
+        assert manager.update(backlog=5, dropped=0) == 4
+        assert manager.update(backlog=5, dropped=0) == 4
+
+        stats = manager.get_stats(block_size=512)
+        assert stats['grown'] == 2
+        assert stats['analysis_block_size'] == 2048
+        assert [a['to'] for a in stats['recent_adjustments']] == [2, 4]
+        assert 'backlog' in stats['recent_adjustments'][0]['reason']
+
+    def test_grows_on_drops(self):
+        """New drops grow the factor even without a large backlog."""
+        manager = LatencyManager(high_watermark=5)
+
+        manager.update(backlog=0, dropped=3)
+        assert manager.coalesce == 2
+        assert 'dropped 3' in manager.adjustments[-1]['reason']
+
+        # Old drops do not count again
+        manager.update(backlog=1, dropped=3)
+        assert manager.coalesce == 2
+
+    def test_never_merges_more_than_queued(self):
+        """The merge count is capped by what is already queued."""
+        manager = LatencyManager(max_coalesce=4, high_watermark=2)
+        manager.update(backlog=2, dropped=0)
+        manager.update(backlog=2, dropped=0)
+
+        assert manager.coalesce == 4
+        assert manager.update(backlog=1, dropped=0) == 2
+        assert manager.update(backlog=0, dropped=0) == 1
+
+    def test_shrinks_after_recovery(self):
+        """The factor halves after enough backlog-free reads."""
+        manager = LatencyManager(max_coalesce=4, high_watermark=5, recovery_reads=10)
+        manager.update(backlog=5, dropped=0)
+        manager.update(backlog=5, dropped=0)
+
+        for _ in range(9):
+            manager.update(backlog=0, dropped=0)
+        assert manager.coalesce == 4
+        manager.update(backlog=0, dropped=0)
+        assert manager.coalesce == 2
+
+        # Any backlog restarts the count
+        for _ in range(9):
+            manager.update(backlog=0, dropped=0)
+        manager.update(backlog=1, dropped=0)
+        for _ in range(9):
+            manager.update(backlog=0, dropped=0)
+        assert manager.coalesce == 2
+        manager.update(backlog=0, dropped=0)
+        assert manager.coalesce == 1
+        assert manager.get_stats()['shrunk'] == 2
+
+    def test_reset(self):
+        """Reset returns to single blocks and clears the history."""
+        manager = LatencyManager()
+        manager.update(backlog=0, dropped=1)
+        manager.reset()
+
+        stats = manager.get_stats()
+        assert stats['coalesce'] == 1
+        assert stats['adjustments'] == 0
+        assert stats['recent_adjustments'] == []
+
+    def test_invalid_max(self):
+        """A maximum below one block is rejected."""
+        with pytest.raises(ValueError):
+            LatencyManager(max_coalesce=0)
+
+
+class TestAdaptiveInput:
+    """Test adaptive mode in RealtimeAudioInput."""
+
+    def test_coalesced_audio_is_lossless(self, sample_rate, ramp):
+        """Merged blocks hold the queued blocks in order."""
+        source = ArraySource(ramp, sample_rate, speed=None)
+        audio_input = RealtimeAudioInput(sample_rate=sample_rate, queue_size=8, source=source, adaptive=True)
+        audio_input.latency.high_watermark = 2
+
+        blocks = []
+        with audio_input:
+            while not audio_input.exhausted:
+                try:
+                    block = audio_input.get_block(timeout=0.01)
+                except Empty:
+                    continue
+                assert len(block) % 512 == 0
+                blocks.append(block.copy())
+                # Slow consumer: let the backlog build
+                time.sleep(0.001)
+            stats = audio_input.get_stats()
+
+        audio = np.concatenate(blocks)
+        np.testing.assert_array_equal(audio[:len(ramp), 0], ramp)
+        assert stats['latency_mode']['grown'] > 0
+        assert stats['latency_mode']['blocks_coalesced'] > 0
+        assert len(blocks) < source.blocks_delivered
+
+    def test_coalesces_short_block(self, sample_rate, ramp):
+        """A short block among merged ones keeps its own length."""
+        audio_input = RealtimeAudioInput(sample_rate=sample_rate, queue_size=8, adaptive=True)
+        audio_input.latency.high_watermark = 2
+        audio_input.is_running = True  # Consumer side only; no stream opened
+
+        lengths = [512, 200, 512, 512]
+        starts = np.cumsum([0] + lengths)
+        for start, n in zip(starts, lengths):
+            audio_input.callback(ramp[start:start + n, None], n, None, None)
+
+        blocks = [audio_input.get_block_nowait().copy() for _ in range(2)]
+
+        assert audio_input.latency.coalesce == 2
+        assert [len(block) for block in blocks] == [712, 1024]
+        np.testing.assert_array_equal(np.concatenate(blocks)[:, 0], ramp[:starts[-1]])
+
+    def test_slow_consumer_drops_less(self, sample_rate, ramp):
+        """Against a live-paced source, coalescing keeps a slow consumer from dropping audio."""
+        def run(adaptive: bool) -> dict:
+            source = ArraySource(ramp, sample_rate, speed=4.0)
+            with RealtimeAudioInput(sample_rate=sample_rate, source=source, adaptive=adaptive) as audio_input:
+                while not audio_input.exhausted:
+                    try:
+                        audio_input.get_block(timeout=0.01)
+                    except Empty:
+                        continue
+                    # ~2 blocks' worth of work per read at 4x speed
+                    time.sleep(0.006)
+                return audio_input.get_stats()
+
+        fixed = run(adaptive=False)
+        adaptive = run(adaptive=True)
+
+        print(f"Blocks dropped: fixed {fixed['blocks_dropped']}, adaptive {adaptive['blocks_dropped']}")
+        assert fixed['blocks_dropped'] > 10
+        assert adaptive['blocks_dropped'] < fixed['blocks_dropped'] // 2
+        assert adaptive['latency_mode']['coalesce'] > 1
+
+    def test_shrinks_when_consumer_catches_up(self, sample_rate, ramp):
+        """Once reads find no backlog, the input returns to single blocks."""
+        source = ArraySource(ramp, sample_rate, speed=4.0, loop=True)
+        audio_input = RealtimeAudioInput(sample_rate=sample_rate, source=source, adaptive=True)
+        audio_input.latency.recovery_reads = 10
+
+        with audio_input:
+            # Fall behind until the factor grows
+            deadline = time.perf_counter() + 2.0
+            while audio_input.latency.coalesce == 1 and time.perf_counter() < deadline:
+                audio_input.get_block(timeout=1.0)
+                time.sleep(0.01)
+            assert audio_input.latency.coalesce > 1
+
+            # Keep up until it shrinks back
+            deadline = time.perf_counter() + 2.0
+            while audio_input.latency.coalesce > 1 and time.perf_counter() < deadline:
+                block = audio_input.get_block(timeout=1.0)
+            stats = audio_input.get_stats()
+
+        assert stats['latency_mode']['coalesce'] == 1
+        assert len(block) == 512
+        assert stats['latency_mode']['shrunk'] > 0
+
+    def test_disabled_by_default(self, sample_rate, ramp):
+        """Without adaptive mode, every read is a single block."""
+        source = ArraySource(ramp, sample_rate, speed=None)
+        with RealtimeAudioInput(sample_rate=sample_rate, source=source) as audio_input:
+            time.sleep(0.01)
+            block = audio_input.get_block(timeout=1.0)
+            stats = audio_input.get_stats()
+
+        assert block.shape == (512, 1)
+        assert stats['latency_mode']['adaptive'] is False
+        assert stats['latency_mode']['adjustments'] == 0
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "-s"])
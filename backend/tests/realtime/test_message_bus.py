@@ -6,14 +6,20 @@ Comprehensive tests for message bus functionality, performance, and reliability.
 
 import pytest
 import asyncio
+import threading
 import time
 from typing import List
 
+from realtime import message_bus as message_bus_module
 from realtime.message_bus import (
     AgentMessageBus,
     AgentMessage,
     MessagePriority,
-    MessageStats
+    MessageStats,
+    MessageLanes,
+    DEFAULT_LANE_WEIGHTS,
+    BROADCAST,
+    SubscriberInbox
 )
 
 
@@ -86,6 +92,301 @@ class TestMessageCreation:
         assert msg2.message_id != ""
         assert msg1.message_id != msg2.message_id
 
+    def test_message_is_slotted(self):
+        """Messages carry no __dict__; IDs come from a sequence, formatted on demand."""
+        msg1 = AgentMessage(
+            from_agent="a", to_agent="b", message_type="test",
+            priority=MessagePriority.NORMAL, timestamp=time.time()
+        )
+        msg2 = AgentMessage(MessagePriority.LOW, 0.0, "a", "b", "test", {"x": 1}, message_id="given")
+
+        assert not hasattr(msg1, "__dict__")
+        assert msg1._message_id == ""  # Not formatted until asked for
+        assert msg1.message_id == f"a_{msg1.sequence}"
+        assert msg2.sequence == msg1.sequence + 1
+        assert msg2.message_id == "given"
+        assert msg2.payload == {"x": 1}
+        assert msg1.payload == {} and msg1.payload is not AgentMessage(
+            MessagePriority.LOW, 0.0, "a", "b", "test").payload
+        assert "message_type='test'" in repr(msg1)
+
+
+def make_message(priority: MessagePriority, index: int = 0) -> AgentMessage:
+    """A message with its index in the payload."""
+    return AgentMessage(
+        from_agent="a", to_agent="b", message_type="lane_test",
+        payload={"index": index}, priority=priority, timestamp=time.time()
+    )
+
+
+class TestMessageLanes:
+    """Test the per-priority FIFO lanes."""
+
+    def test_fifo_within_priority(self):
+        """Messages of one priority come out in publish order, after higher priorities."""
+        lanes = MessageLanes()
+        for i in range(40):
+            lanes.put_nowait(make_message(MessagePriority(i % 4), i))
+
+        order = [lanes.get_nowait() for _ in range(40)]
+
+        assert [m.priority for m in order] == sorted(m.priority for m in order)
+        for priority in MessagePriority:
+            indices = [m.payload["index"] for m in order if m.priority == priority]
+            assert indices == sorted(indices)
+        assert lanes.empty()
+
+    def test_weighted_draining(self):
+        """Weighted lanes serve every priority in each round, in proportion to the weights."""
+        lanes = MessageLanes(weights=DEFAULT_LANE_WEIGHTS)
+        for priority in MessagePriority:
+            for i in range(30):
+                lanes.put_nowait(make_message(priority, i))
+
+        first_round = [lanes.get_nowait().priority for _ in range(15)]
+        assert first_round == [MessagePriority.CRITICAL] * 8 + [MessagePriority.HIGH] * 4 + \
+            [MessagePriority.NORMAL] * 2 + [MessagePriority.LOW]
+
+        # Once CRITICAL runs dry the others share its slots, still FIFO
+        rest = [lanes.get_nowait() for _ in range(105)]
+        assert [m.payload["index"] for m in rest if m.priority == MessagePriority.LOW] == list(range(1, 30))
+        assert lanes.empty()
+
+        with pytest.raises(ValueError):
+            MessageLanes(weights={MessagePriority.CRITICAL: 1})
+
+    def test_bounded(self):
+        """A full bus refuses messages of any priority."""
+        lanes = MessageLanes(maxsize=2)
+        lanes.put_nowait(make_message(MessagePriority.LOW))
+        lanes.put_nowait(make_message(MessagePriority.NORMAL))
+
+        assert lanes.full()
+        with pytest.raises(asyncio.QueueFull):
+            lanes.put_nowait(make_message(MessagePriority.CRITICAL))
+        assert lanes.lane_sizes() == {"CRITICAL": 0, "HIGH": 0, "NORMAL": 1, "LOW": 1}
+
+    @pytest.mark.asyncio
+    async def test_get_waits_and_join(self):
+        """get() waits for a message; join() waits until every message is done."""
+        lanes = MessageLanes()
+        getter = asyncio.create_task(lanes.get())
+        await asyncio.sleep(0)
+        assert not getter.done()
+
+        lanes.put_nowait(make_message(MessagePriority.HIGH, 7))
+        message = await asyncio.wait_for(getter, timeout=1.0)
+        assert message.payload["index"] == 7
+
+        joiner = asyncio.create_task(lanes.join())
+        await asyncio.sleep(0)
+        assert not joiner.done()
+        lanes.task_done()
+        await asyncio.wait_for(joiner, timeout=1.0)
+
+    @pytest.mark.asyncio
+    async def test_bus_delivers_fifo(self, running_bus):
+        """Through the bus, equal-priority messages arrive in publish order."""
+        received = []
+
+        async def handler(msg: AgentMessage):
+            received.append(msg.payload["index"])
+
+        running_bus.subscribe("lane_test", handler)
+        for i in range(200):
+            await running_bus.publish(make_message(MessagePriority.NORMAL, i))
+        await asyncio.sleep(0.1)
+
+        assert received == list(range(200))
+        assert running_bus.get_stats()['lane_sizes']['NORMAL'] == 0
+
+
+class TestPublishMany:
+    """Test batched publishing."""
+
+    def beats(self, count: int) -> List[AgentMessage]:
+        """A burst of beat events."""
+        return [AgentMessage(
+            from_agent="conductor", to_agent=BROADCAST, message_type="beat_event",
+            payload={"beat": i}, priority=MessagePriority.CRITICAL, timestamp=time.time()
+        ) for i in range(count)]
+
+    @pytest.mark.asyncio
+    async def test_burst_delivered_in_order(self, running_bus):
+        """A bar of beats arrives in order, after which others follow by priority."""
+        received = []
+        running_bus.subscribe("beat_event", lambda msg: received.append(msg.payload["beat"]))
+
+        await running_bus.publish_many(self.beats(16))
+        await asyncio.sleep(0.01)
+
+        assert received == list(range(16))
+        stats = running_bus.get_stats()
+        assert stats['messages_published'] == 16
+        assert stats['priority_distribution'] == {'CRITICAL': 16}
+
+    @pytest.mark.asyncio
+    async def test_burst_all_or_nothing(self):
+        """A burst that does not fit is refused whole."""
+        bus = AgentMessageBus(max_queue_size=10)
+        await bus.publish_many(self.beats(6))
+
+        with pytest.raises(asyncio.QueueFull):
+            await bus.publish_many(self.beats(5))
+        assert bus.get_stats()['queue_size'] == 6
+
+        await bus.publish_many([])
+        assert bus.get_stats()['messages_published'] == 6
+
+
+class TestCoalescing:
+    """Test coalescing of state updates by (message_type, coalesce_key)."""
+
+    def update(self, index: int, key: str = "tracker",
+               priority: MessagePriority = MessagePriority.NORMAL) -> AgentMessage:
+        """A position update from one agent."""
+        return AgentMessage(
+            from_agent=key, to_agent=BROADCAST, message_type="position_update",
+            payload={"index": index}, priority=priority, timestamp=time.time(),
+            coalesce_key=key
+        )
+
+    def test_latest_replaces_queued(self):
+        """A newer update takes the queued one's place in line; other keys are separate."""
+        lanes = MessageLanes()
+        lanes.put_nowait(self.update(0))
+        lanes.put_nowait(make_message(MessagePriority.NORMAL, 100))
+        for i in range(1, 10):
+            lanes.put_nowait(self.update(i))
+        lanes.put_nowait(self.update(0, key="context"))
+
+        assert lanes.qsize() == 3
+        assert lanes.coalesced == 9
+        assert [m.payload["index"] for m in (lanes.get_nowait() for _ in range(3))] == [9, 100, 0]
+
+        # Once delivered, the next update is queued again
+        lanes.put_nowait(self.update(10))
+        assert lanes.get_nowait().payload["index"] == 10
+        assert lanes.empty() and lanes.coalesced == 9
+
+    def test_urgent_never_coalesced(self):
+        """CRITICAL and HIGH messages with a key are all queued."""
+        lanes = MessageLanes()
+        for priority in (MessagePriority.CRITICAL, MessagePriority.HIGH):
+            for i in range(3):
+                lanes.put_nowait(self.update(i, priority=priority))
+
+        assert lanes.qsize() == 6
+        assert lanes.coalesced == 0
+        assert [lanes.get_nowait().payload["index"] for _ in range(6)] == [0, 1, 2, 0, 1, 2]
+
+    def test_urgent_supersedes_queued(self):
+        """An urgent update of a queued key drops the stale one instead of following it."""
+        lanes = MessageLanes(maxsize=2)
+        lanes.put_nowait(self.update(0))
+        lanes.put_nowait(self.update(1, key="context"))
+        lanes.put_nowait(self.update(2))
+        lanes.put_nowait(self.update(3, priority=MessagePriority.HIGH))  # Fits: takes the slot of 0/2
+        assert lanes.lane_sizes() == {"CRITICAL": 0, "HIGH": 1, "NORMAL": 1, "LOW": 0}
+
+        received = [lanes.get_nowait()]
+        lanes.put_nowait(self.update(4))
+        received += [lanes.get_nowait() for _ in range(2)]
+        assert [(m.from_agent, m.payload["index"]) for m in received] == [
+            ("tracker", 3), ("context", 1), ("tracker", 4)
+        ]
+        assert lanes.empty()
+
+        # Within a burst too
+        lanes.put_many([self.update(5), self.update(6, priority=MessagePriority.CRITICAL), self.update(7)])
+        assert [lanes.get_nowait().payload["index"] for _ in range(2)] == [6, 7]
+        assert lanes.empty()
+        for _ in range(5):
+            lanes.task_done()
+        assert lanes._finished.is_set()
+
+    def test_more_urgent_update_moves_lane(self):
+        """A NORMAL update of a queued LOW one is not delivered behind later NORMAL messages."""
+        lanes = MessageLanes(maxsize=4)
+        lanes.put_nowait(self.update(0, priority=MessagePriority.LOW))
+        lanes.put_nowait(make_message(MessagePriority.LOW, 100))
+        lanes.put_nowait(self.update(1))  # Full queue or not, takes no new slot
+        for i in range(101, 103):
+            lanes.put_nowait(make_message(MessagePriority.NORMAL, i))
+        assert lanes.lane_sizes() == {"CRITICAL": 0, "HIGH": 0, "NORMAL": 3, "LOW": 1}
+
+        # A LOW update leaves it in the NORMAL lane; only its payload changes
+        lanes.put_nowait(self.update(2, priority=MessagePriority.LOW))
+        assert lanes.lane_sizes()["NORMAL"] == 3
+        assert [lanes.get_nowait().payload["index"] for _ in range(4)] == [2, 101, 102, 100]
+        assert lanes.empty() and lanes.coalesced == 2
+
+        # Within a burst too
+        lanes.put_many([
+            self.update(3, priority=MessagePriority.LOW), make_message(MessagePriority.NORMAL, 104),
+            self.update(4)
+        ])
+        assert [lanes.get_nowait().payload["index"] for _ in range(2)] == [104, 4]
+        assert lanes.empty()
+
+    def test_full_queue(self):
+        """Replacing a queued update needs no room; a new key or plain message does."""
+        lanes = MessageLanes(maxsize=2)
+        lanes.put_nowait(self.update(0))
+        lanes.put_nowait(make_message(MessagePriority.LOW, 0))
+
+        lanes.put_nowait(self.update(1))
+        with pytest.raises(asyncio.QueueFull):
+            lanes.put_nowait(self.update(0, key="context"))
+        with pytest.raises(asyncio.QueueFull):
+            lanes.put_many([self.update(2), self.update(0, key="context")])
+
+        lanes.put_many([self.update(2), self.update(3)])
+        assert lanes.qsize() == 2
+        assert lanes.get_nowait().payload["index"] == 3
+
+    def test_burst(self):
+        """Updates within a burst coalesce with each other and with queued ones."""
+        lanes = MessageLanes(maxsize=3)
+        lanes.put_many([self.update(i, key=key) for i in range(5) for key in ("tracker", "context")])
+        lanes.put_many([self.update(5), make_message(MessagePriority.CRITICAL, 0)])
+
+        assert lanes.qsize() == 3
+        assert lanes.coalesced == 9
+        assert [(m.from_agent, m.payload["index"]) for m in (lanes.get_nowait() for _ in range(3))] == [
+            ("a", 0), ("tracker", 5), ("context", 4)
+        ]
+
+    @pytest.mark.asyncio
+    async def test_bursty_producer(self):
+        """A flood of updates holds one queue slot; consumers see the latest, beats all arrive."""
+        bus = AgentMessageBus(max_queue_size=100)
+        positions, beats = [], []
+        bus.subscribe("position_update", lambda msg: positions.append(msg.payload["index"]))
+        bus.subscribe("beat_event", lambda msg: beats.append(msg.payload["index"]))
+
+        for i in range(1000):
+            await bus.publish(self.update(i))
+            if i % 100 == 0:
+                await bus.publish(AgentMessage(
+                    from_agent="conductor", to_agent=BROADCAST, message_type="beat_event",
+                    payload={"index": i}, priority=MessagePriority.CRITICAL, timestamp=time.time(),
+                    coalesce_key="conductor"
+                ))
+
+        stats = bus.get_stats()
+        assert stats['queue_size'] == 11
+        assert stats['messages_published'] == 1010
+        assert stats['messages_coalesced'] == 999
+
+        await bus.start()
+        await bus.stop()
+        assert positions == [999]
+        assert beats == list(range(0, 1000, 100))
+
+        bus.reset_stats()
+        assert bus.get_stats()['messages_coalesced'] == 0
+
 
 class TestSubscription:
     """Test message subscription and unsubscription."""
@@ -232,6 +533,335 @@ class TestPublishSubscribe:
         assert len(received2) == 1
 
 
+class TestRouting:
+    """Test delivery by (message_type, to_agent)."""
+
+    def agents(self, bus: AgentMessageBus, names: List[str], message_type: str = "note") -> dict:
+        """Subscribe one recording handler per agent; returns what each received."""
+        received = {name: [] for name in names}
+        for name in names:
+            bus.subscribe(message_type, received[name].append, agent_id=name)
+        return received
+
+    @pytest.mark.asyncio
+    async def test_direct_reaches_only_target(self, running_bus):
+        """A direct message reaches its agent and type-wide subscribers only."""
+        received = self.agents(running_bus, ["bass", "drums", "keys"])
+        monitor = []
+        running_bus.subscribe("note", monitor.append)
+
+        await running_bus.publish(AgentMessage(
+            from_agent="conductor", to_agent="bass", message_type="note",
+            priority=MessagePriority.HIGH, timestamp=time.time()
+        ))
+        await running_bus.publish(AgentMessage(
+            from_agent="conductor", to_agent="nobody", message_type="note",
+            priority=MessagePriority.HIGH, timestamp=time.time()
+        ))
+        await asyncio.sleep(0.01)
+
+        assert [len(received[name]) for name in ("bass", "drums", "keys")] == [1, 0, 0]
+        assert [m.to_agent for m in monitor] == ["bass", "nobody"]
+
+    @pytest.mark.asyncio
+    async def test_broadcast_reaches_all(self, running_bus):
+        """A broadcast fans out to every handler of its type."""
+        received = self.agents(running_bus, ["bass", "drums", "keys"])
+        other = self.agents(running_bus, ["bass"], message_type="chord")
+
+        await running_bus.publish(AgentMessage(
+            from_agent="conductor", to_agent=BROADCAST, message_type="note",
+            priority=MessagePriority.CRITICAL, timestamp=time.time()
+        ))
+        await asyncio.sleep(0.01)
+
+        assert all(len(messages) == 1 for messages in received.values())
+        assert other["bass"] == []
+
+    def test_routes_follow_subscriptions(self, message_bus):
+        """The routing table is rebuilt on subscribe and unsubscribe."""
+        def bass(msg): pass
+        def drums(msg): pass
+        def monitor(msg): pass
+
+        message_bus.subscribe("note", bass, agent_id="bass")
+        message_bus.subscribe("note", drums, agent_id="drums", min_priority=MessagePriority.HIGH)
+        message_bus.subscribe("note", monitor)
+
+        assert message_bus.get_routes("note", "bass") == [bass, monitor]
+        assert message_bus.get_routes("note", "keys") == [monitor]
+        assert message_bus.get_routes("note") == [bass, drums, monitor]
+
+        # Filtered handlers can be unsubscribed too
+        message_bus.unsubscribe("note", drums)
+        message_bus.unsubscribe("note", monitor)
+        assert message_bus.get_routes("note", "drums") == []
+        assert message_bus.get_routes("note", "bass") == [bass]
+        assert message_bus.subscribers["note"] == [bass]
+
+    @pytest.mark.asyncio
+    async def test_sync_handlers(self, running_bus):
+        """Plain functions are called inline, filtered by priority, and may fail alone."""
+        received = []
+
+        def failing(msg: AgentMessage):
+            raise ValueError("Test exception")
+
+        running_bus.subscribe("sync_test", failing)
+        running_bus.subscribe("sync_test", received.append, min_priority=MessagePriority.HIGH)
+
+        for priority in (MessagePriority.LOW, MessagePriority.HIGH, MessagePriority.CRITICAL):
+            await running_bus.publish(AgentMessage(
+                from_agent="a", to_agent="b", message_type="sync_test",
+                priority=priority, timestamp=time.time()
+            ))
+        await asyncio.sleep(0.01)
+
+        assert [m.priority for m in received] == [MessagePriority.CRITICAL, MessagePriority.HIGH]
+
+
+class TestInboxes:
+    """Test per-subscriber inboxes and their overflow policies."""
+
+    @pytest.mark.parametrize('overflow, expected, counter', [
+        ('drop_oldest', [0, 8, 9], 'dropped'),
+        ('drop_newest', [0, 1, 2], 'dropped'),
+        ('coalesce_latest', [0, 1, 9], 'coalesced'),
+    ])
+    @pytest.mark.asyncio
+    async def test_overflow_policies(self, overflow, expected, counter):
+        """A full two-message inbox behind a stalled handler keeps what its policy says."""
+        received = []
+        gate = asyncio.Event()
+
+        async def handler(msg: AgentMessage):
+            await gate.wait()
+            received.append(msg.payload["index"])
+
+        inbox = SubscriberInbox(handler, maxsize=2, overflow=overflow)
+        task = asyncio.create_task(inbox.run())
+        inbox.offer(make_message(MessagePriority.NORMAL, 0))
+        await asyncio.sleep(0)  # Handler takes message 0 and stalls
+        for i in range(1, 10):
+            assert inbox.offer(make_message(MessagePriority.NORMAL, i))
+
+        stats = inbox.get_stats()
+        assert stats['depth'] == 2
+        assert stats[counter] == 7
+
+        gate.set()
+        await asyncio.wait_for(inbox.join(), timeout=1.0)
+        task.cancel()
+
+        assert received == expected
+        assert inbox.get_stats()['delivered'] == 3
+
+    @pytest.mark.asyncio
+    async def test_block_policy(self):
+        """A full 'block' inbox makes the delivery wait, and loses nothing."""
+        bus = AgentMessageBus()
+        received = []
+        gate = asyncio.Event()
+
+        async def handler(msg: AgentMessage):
+            await gate.wait()
+            received.append(msg.payload["index"])
+
+        bus.subscribe("lane_test", handler, inbox_size=2, overflow='block')
+        await bus.start()
+        for i in range(6):
+            await bus.publish(make_message(MessagePriority.NORMAL, i))
+        await asyncio.sleep(0.01)
+
+        stats = bus.get_stats()
+        assert stats['queue_size'] == 2  # The worker waits with message 3
+        assert stats['subscribers'][0]['blocked'] >= 1
+
+        gate.set()
+        await bus.stop()
+        assert received == list(range(6))
+
+    @pytest.mark.asyncio
+    async def test_stop_with_stuck_subscriber(self, caplog):
+        """A subscriber that never finishes cannot keep the bus running."""
+        bus = AgentMessageBus(delivery_workers=2)
+
+        async def stuck(msg: AgentMessage):
+            await asyncio.Event().wait()
+
+        bus.subscribe("lane_test", stuck, inbox_size=4)
+        await bus.start()
+        for i in range(3):
+            await bus.publish(make_message(MessagePriority.NORMAL, i))
+        await asyncio.sleep(0.01)
+        tasks = bus.processing_tasks + bus._inboxes()
+
+        await bus.stop(timeout=0.05)
+
+        assert not bus.running
+        assert bus.processing_tasks == []
+        assert all(t.done() for t in tasks[:2])
+        assert tasks[2].task.done()
+        assert "2 messages pending" in caplog.text
+
+    @pytest.mark.asyncio
+    async def test_stop_timeout_covers_whole_drain(self, monkeypatch):
+        """The inbox drain only gets what the queue drain left of the timeout."""
+        bus = AgentMessageBus()
+        calls = []
+        wait_for = asyncio.wait_for
+
+        async def recording_wait_for(awaitable, timeout):
+            calls.append((asyncio.get_running_loop().time(), timeout))
+            return await wait_for(awaitable, timeout)
+        monkeypatch.setattr(message_bus_module.asyncio, 'wait_for', recording_wait_for)
+
+        async def slow_then_stuck(msg: AgentMessage):
+            await asyncio.sleep(0.05)
+            if msg.payload["index"] > 0:
+                await asyncio.Event().wait()
+
+        # The worker waits on the full inbox until message 0 is handled
+        bus.subscribe("lane_test", slow_then_stuck, inbox_size=1, overflow='block')
+        await bus.start()
+        for i in range(3):
+            await bus.publish(make_message(MessagePriority.NORMAL, i))
+
+        await bus.stop(timeout=0.2)
+
+        (queue_start, queue_timeout), (inbox_start, inbox_timeout) = calls
+        assert queue_timeout == 0.2
+        assert inbox_start + inbox_timeout <= queue_start + 0.2 + 1e-3
+        assert not bus.running
+
+    @pytest.mark.asyncio
+    async def test_blocking_sync_inbox_handler(self):
+        """A plain inbox handler that blocks does not stall the event loop."""
+        bus = AgentMessageBus()
+        beats = []
+        released = []
+        gate = threading.Event()
+
+        def blocking_logger(msg: AgentMessage):
+            released.append(gate.wait(timeout=2.0))
+
+        bus.subscribe("beat_event", beats.append, agent_id="drums")
+        bus.subscribe("beat_event", blocking_logger, agent_id="analytics", inbox_size=8)
+        await bus.start()
+        for _ in range(5):
+            await bus.publish(AgentMessage(
+                from_agent="conductor", to_agent=BROADCAST, message_type="beat_event",
+                priority=MessagePriority.CRITICAL, timestamp=time.perf_counter()
+            ))
+        for _ in range(100):
+            if len(beats) == 5:
+                break
+            await asyncio.sleep(0.01)
+
+        # Every beat arrived while the logger was still blocked on its first one
+        assert len(beats) == 5
+        gate.set()
+        await bus.stop()
+        assert released == [True] * 5
+
+    @pytest.mark.asyncio
+    async def test_start_twice(self, message_bus):
+        """A second start before the workers run spawns no extra workers."""
+        await message_bus.start()
+        await message_bus.start()
+        assert len(message_bus.processing_tasks) == message_bus.delivery_workers
+        await message_bus.stop()
+
+    def test_invalid_inbox(self, message_bus):
+        """Unknown policies and empty inboxes are rejected."""
+        with pytest.raises(ValueError):
+            message_bus.subscribe("t", print, inbox_size=4, overflow='drop_all')
+        with pytest.raises(ValueError):
+            message_bus.subscribe("t", print, inbox_size=0)
+        with pytest.raises(ValueError):
+            AgentMessageBus(delivery_workers=0)
+
+    @pytest.mark.asyncio
+    async def test_slow_subscriber_isolated(self):
+        """A stalled inbox subscriber falls behind alone; every beat reaches the others.
+
+        Beat latency next to a slow subscriber and the speed-up from
+        several delivery workers are measured by
+        ``src/realtime/test_message_bus_validation.py``.
+        """
+        bus = AgentMessageBus()
+        beats = []
+        logged = []
+        started = asyncio.Event()
+        gate = asyncio.Event()
+
+        async def slow_logger(msg: AgentMessage):
+            started.set()
+            await gate.wait()
+            logged.append(msg.payload["index"])
+
+        bus.subscribe("beat_event", beats.append, agent_id="drums")
+        bus.subscribe("beat_event", slow_logger, agent_id="analytics", inbox_size=8, overflow='drop_oldest')
+        await bus.start()
+
+        for i in range(100):
+            await bus.publish(AgentMessage(
+                from_agent="conductor", to_agent=BROADCAST, message_type="beat_event",
+                payload={"index": i}, priority=MessagePriority.CRITICAL, timestamp=time.perf_counter()
+            ))
+            if i == 0:
+                await asyncio.wait_for(started.wait(), timeout=1.0)
+        await asyncio.wait_for(bus.message_queue.join(), timeout=1.0)
+
+        # Every beat delivered while the logger is still on the first one
+        stats = bus.get_stats()['subscribers'][0]
+        assert len(beats) == 100 and not logged
+        assert stats['handler'].endswith('slow_logger')
+        assert stats['agent_id'] == 'analytics'
+        assert stats['depth'] == stats['max_depth'] == 8
+        assert stats['dropped'] == 100 - 1 - 8
+
+        # Dropping the oldest leaves the eight newest beats
+        gate.set()
+        await bus.stop()
+        assert logged == [0] + list(range(92, 100))
+
+    @pytest.mark.parametrize("workers", [1, 4])
+    @pytest.mark.asyncio
+    async def test_delivery_workers(self, workers):
+        """Each delivery worker runs a slow worker-run handler at the same time."""
+        active = []
+        most_active = 0
+        gate = asyncio.Event()
+
+        async def slow(msg: AgentMessage):
+            nonlocal most_active
+            active.append(msg)
+            most_active = max(most_active, len(active))
+            await gate.wait()
+            active.remove(msg)
+
+        bus = AgentMessageBus(delivery_workers=workers)
+        bus.subscribe("lane_test", slow)
+        await bus.start()
+        for i in range(8):
+            await bus.publish(make_message(MessagePriority.NORMAL, i))
+        for _ in range(100):
+            if len(active) == workers:
+                break
+            await asyncio.sleep(0.001)
+        await asyncio.sleep(0.01)
+
+        assert len(active) == workers
+        assert bus.get_stats()['queue_size'] == 8 - workers
+
+        gate.set()
+        await bus.stop()
+        assert most_active == workers
+        assert bus.get_stats()['messages_delivered'] == 8
+        assert bus.get_stats()['delivery_workers'] == workers
+
+
 class TestConcurrency:
     """Test concurrent publishers and subscribers."""
 
@@ -331,6 +961,34 @@ class TestPerformance:
         # Target: <0.1ms average
         assert avg_latency < 0.5  # Relaxed for safety
 
+    @pytest.mark.asyncio
+    async def test_publish_latency_at_rate(self, message_bus):
+        """At 100k+ messages/s, publish stays well under the 0.1ms target; bursts are cheaper still."""
+        message_bus.message_queue.maxsize = 0
+
+        start = time.perf_counter()
+        messages = [AgentMessage(
+            from_agent="conductor", to_agent=BROADCAST, message_type="beat_event",
+            payload={"beat": i}, priority=MessagePriority(i % 4), timestamp=0.0
+        ) for i in range(32000)]
+        construct_us = (time.perf_counter() - start) / len(messages) * 1e6
+
+        start = time.perf_counter()
+        for message in messages[:16000]:
+            await message_bus.publish(message)
+        single_us = (time.perf_counter() - start) / 16000 * 1e6
+
+        start = time.perf_counter()
+        for i in range(16000, 32000, 16):
+            await message_bus.publish_many(messages[i:i + 16])
+        burst_us = (time.perf_counter() - start) / 16000 * 1e6
+
+        print(f"\nPer message: construct {construct_us:.2f}us, publish {single_us:.2f}us, "
+              f"publish_many(16) {burst_us:.2f}us")
+        assert message_bus.get_stats()['messages_published'] == 32000
+        assert single_us < 10  # Target: <100us
+        assert burst_us < single_us
+
     @pytest.mark.asyncio
     async def test_throughput(self, running_bus):
         """Test message throughput (>10,000 messages/second target)."""
@@ -342,7 +1000,7 @@ class TestPerformance:
 
         running_bus.subscribe("throughput_test", handler)
 
-        # Publish messages
+        # Publish messages, all priorities mixed
         start_time = time.perf_counter()
 
         for i in range(message_count):
@@ -350,24 +1008,43 @@ class TestPerformance:
                 from_agent="sender", to_agent="target",
                 message_type="throughput_test",
                 payload={"index": i},
-                priority=MessagePriority.NORMAL,
+                priority=MessagePriority(i % 4),
                 timestamp=time.time()
             ))
 
-        # Wait for all messages to be processed
-        await asyncio.sleep(2.0)  # Give time for processing
+        publish_duration = time.perf_counter() - start_time
+
+        # Wait until all messages are delivered
+        while len(received) < message_count and time.perf_counter() - start_time < 5.0:
+            await asyncio.sleep(0.001)
 
         end_time = time.perf_counter()
         duration = end_time - start_time
 
         throughput = message_count / duration
 
-        print(f"\nThroughput: {throughput:.0f} messages/second")
+        print(f"\nThroughput: {throughput:.0f} messages/second delivered "
+              f"({message_count / publish_duration:.0f}/s published)")
         print(f"Duration: {duration:.2f}s for {message_count} messages")
         print(f"Received: {len(received)} messages")
 
-        # Target: >10,000 messages/second
-        assert throughput > 5000  # Relaxed for safety
+        # Target: >10,000 messages/second, publish to delivery
+        assert len(received) == message_count
+        assert throughput > 10000
+
+    def test_lane_order(self):
+        """A mixed-priority stream comes out by priority, FIFO within each.
+
+        Throughput against the PriorityQueue the lanes replaced is measured
+        by ``src/realtime/test_message_bus_validation.py``.
+        """
+        messages = [make_message(MessagePriority(i % 4), i) for i in range(5000)]
+        lanes = MessageLanes()
+        for message in messages:
+            lanes.put_nowait(message)
+
+        assert [lanes.get_nowait() for _ in messages] == sorted(messages, key=lambda m: m.priority)
+        assert lanes.empty()
 
     @pytest.mark.asyncio
     async def test_delivery_latency(self, running_bus):
@@ -403,6 +1080,80 @@ class TestPerformance:
             assert avg_latency < 5.0  # Relaxed for safety
 
 
+class TestRoutingPerformance:
+    """Delivery cost with many agents.
+
+    Delivery rates (direct vs broadcast, sync vs async handlers) are
+    measured by ``src/realtime/test_message_bus_validation.py``; these
+    tests check the routing that makes them differ.
+    """
+
+    @pytest.mark.asyncio
+    async def test_direct_cost_scales_with_recipients(self, message_bus):
+        """With 48 agents, a direct message visits only its recipient's handlers."""
+        counts = [0] * 48
+        type_wide = []
+
+        def make_handler(i: int):
+            async def handler(msg: AgentMessage):
+                counts[i] += 1
+            return handler
+
+        for i in range(48):
+            message_bus.subscribe("note", make_handler(i), agent_id=f"agent_{i}")
+        message_bus.subscribe("note", type_wide.append)
+
+        assert len(message_bus._routes("note", "agent_5")) == 2
+        assert len(message_bus._routes("note", "nobody")) == 1
+        assert len(message_bus._routes("note", BROADCAST)) == 49
+
+        for i in range(2000):
+            await message_bus._deliver_message(AgentMessage(
+                from_agent="conductor", to_agent=f"agent_{i % 48}", message_type="note",
+                priority=MessagePriority.HIGH, timestamp=0.0
+            ))
+        await message_bus._deliver_message(AgentMessage(
+            from_agent="conductor", to_agent="nobody", message_type="note",
+            priority=MessagePriority.HIGH, timestamp=0.0
+        ))
+        assert counts == [2000 // 48 + (i < 2000 % 48) for i in range(48)]
+        assert len(type_wide) == 2001
+
+        await message_bus._deliver_message(AgentMessage(
+            from_agent="conductor", to_agent=BROADCAST, message_type="note",
+            priority=MessagePriority.HIGH, timestamp=0.0
+        ))
+        assert counts == [2000 // 48 + (i < 2000 % 48) + 1 for i in range(48)]
+        assert len(type_wide) == 2002
+
+    @pytest.mark.asyncio
+    async def test_sync_fast_path(self, monkeypatch):
+        """Plain handlers are called inline, without the coroutine gather."""
+        received = []
+        gathers = []
+        gather = asyncio.gather
+
+        def counting_gather(*aws, **kwargs):
+            gathers.append(len(aws))
+            return gather(*aws, **kwargs)
+        monkeypatch.setattr(message_bus_module.asyncio, 'gather', counting_gather)
+
+        async def async_handler(msg: AgentMessage):
+            received.append(msg)
+
+        message = AgentMessage(from_agent="a", to_agent=BROADCAST, message_type="t",
+                               priority=MessagePriority.NORMAL, timestamp=0.0)
+        for handler, expected in ((received.append, []), (async_handler, [3])):
+            bus = AgentMessageBus()
+            for _ in range(3):
+                bus.subscribe("t", handler)
+            gathers.clear()
+            await bus._deliver_message(message)
+            assert gathers == expected
+
+        assert len(received) == 2 * 3
+
+
 class TestStatistics:
     """Test performance monitoring and statistics."""
 
@@ -0,0 +1,141 @@
+"""
+Unit tests for the batched multi-channel analyzer.
+"""
+
+import pytest
+import numpy as np
+import time
+import os
+import sys
+
+# Add src to path for imports
+src_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../src'))
+sys.path.insert(0, src_path)
+
+from realtime.analyzer import RealtimeAnalyzer, RingBuffer
+from realtime.frame import AnalysisFrame
+from realtime.multichannel import MultiChannelAnalyzer, MultiChannelAnalysis
+
+
+SAMPLE_RATE = 44100
+BLOCK_SIZE = 512
+
+
+def generate_ensemble(n_channels: int, duration: float = 1.5):
+    """One voice per channel: pitched notes with staggered attacks, plus a silent mic."""
+    rng = np.random.default_rng(0)
+    t = np.arange(int(SAMPLE_RATE * duration)) / SAMPLE_RATE
+    channels = []
+    for c in range(n_channels):
+        freq = 110.0 * 2 ** (c / 4)
+        envelope = 0.5 + 0.5 * np.exp(-((t + 0.1 * c) % 0.5) * 8)
+        channels.append(0.4 * np.sin(2 * np.pi * freq * t) * envelope + 0.01 * rng.standard_normal(len(t)))
+    channels[-1][:] = 0.0
+    return np.array(channels, dtype=np.float32)
+
+
+class TestStackedBuffers:
+    """Test the channel axis on RingBuffer and AnalysisFrame."""
+
+    @pytest.mark.parametrize("mirrored", [False, True])
+    def test_ring_buffer_channels(self, mirrored):
+        """Each channel row behaves like its own mono buffer."""
+        stacked = RingBuffer(size=1000, mirrored=mirrored, n_channels=3)
+        mono = [RingBuffer(size=1000, mirrored=mirrored) for _ in range(3)]
+        rng = np.random.default_rng(0)
+
+        for _ in range(5):
+            block = rng.standard_normal((3, 300)).astype(np.float32)
+            stacked.write(block)
+            for row, buffer in zip(block, mono):
+                buffer.write(row)
+
+        result = stacked.read(800)
+        view = stacked.read_view(800)
+        assert result.shape == view.shape == (3, 800)
+        for channel, buffer in enumerate(mono):
+            np.testing.assert_array_equal(result[channel], buffer.read(800))
+            np.testing.assert_array_equal(view[channel], buffer.read(800))
+
+    def test_frame_channels(self):
+        """A batched frame equals per-channel frames."""
+        samples = np.random.default_rng(0).standard_normal((4, 2048))
+        batched = AnalysisFrame(2048, n_channels=4).update(samples)
+
+        for channel, row in enumerate(samples):
+            single = AnalysisFrame(2048).update(row)
+            np.testing.assert_allclose(batched.magnitude[channel], single.magnitude, atol=1e-9)
+            np.testing.assert_allclose(batched.spectrum[channel], single.spectrum, atol=1e-9)
+
+
+class TestMultiChannelAnalyzer:
+    """Test batched analysis against separate analyzers."""
+
+    def test_matches_separate_analyzers(self):
+        """Every channel gets the same pitch and onsets as its own analyzer."""
+        n_channels = 4
+        audio = generate_ensemble(n_channels)
+        batched = MultiChannelAnalyzer(n_channels, sample_rate=SAMPLE_RATE)
+        separate = [RealtimeAnalyzer(sample_rate=SAMPLE_RATE) for _ in range(n_channels)]
+
+        n_onsets = 0
+        for i in range(0, audio.shape[1] - BLOCK_SIZE, BLOCK_SIZE):
+            block = audio[:, i:i + BLOCK_SIZE]
+            result = batched.process_block(block)
+            assert isinstance(result, MultiChannelAnalysis)
+
+            for channel, analyzer in enumerate(separate):
+                expected = analyzer.process_block(block[channel])
+                assert result.onset[channel] == expected.onset
+                assert result.onset_strength[channel] == pytest.approx(expected.onset_strength, abs=1e-9)
+                assert result.voiced_prob[channel] == pytest.approx(expected.voiced_prob, abs=1e-9)
+                if expected.pitch is None:
+                    assert np.isnan(result.pitch[channel])
+                else:
+                    assert result.pitch[channel] == pytest.approx(expected.pitch)
+
+            n_onsets += int(result.onset.sum())
+            assert result.any_onset == bool(result.onset.any())
+
+        assert n_onsets > 0
+        assert np.isnan(result.pitch[-1])  # Silent mic
+
+    def test_channel_count_mismatch(self):
+        """Blocks with the wrong number of channels are rejected."""
+        analyzer = MultiChannelAnalyzer(2, sample_rate=SAMPLE_RATE)
+        with pytest.raises(ValueError):
+            analyzer.process_block(np.zeros((3, BLOCK_SIZE), dtype=np.float32))
+
+
+class TestPerformance:
+    """Batched cost versus separate analyzers."""
+
+    def test_sublinear_scaling(self):
+        """Eight channels in one pass cost less than eight separate analyzers."""
+        n_channels = 8
+        audio = generate_ensemble(n_channels, duration=1.0)
+        batched = MultiChannelAnalyzer(n_channels, sample_rate=SAMPLE_RATE)
+        separate = [RealtimeAnalyzer(sample_rate=SAMPLE_RATE) for _ in range(n_channels)]
+
+        batched_time = 0.0
+        separate_time = 0.0
+        for i in range(0, audio.shape[1] - BLOCK_SIZE, BLOCK_SIZE):
+            block = audio[:, i:i + BLOCK_SIZE]
+
+            start = time.perf_counter()
+            batched.process_block(block)
+            batched_time += time.perf_counter() - start
+
+            start = time.perf_counter()
+            for channel, analyzer in enumerate(separate):
+                analyzer.process_block(block[channel])
+            separate_time += time.perf_counter() - start
+
+        print(f"{n_channels} channels: batched={batched_time * 1000:.1f}ms, "
+              f"separate={separate_time * 1000:.1f}ms")
+
+        assert batched_time < 0.8 * separate_time
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "-s"])
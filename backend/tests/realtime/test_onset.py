@@ -0,0 +1,111 @@
+"""
+Unit tests for the incremental spectral-flux onset detector.
+"""
+
+import pytest
+import numpy as np
+import time
+import os
+import sys
+
+# Add src to path for imports
+src_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../src'))
+sys.path.insert(0, src_path)
+
+from realtime.onset import SpectralFluxOnsetDetector
+
+
+SAMPLE_RATE = 44100
+FRAME_LENGTH = 2048
+HOP_LENGTH = 512
+
+
+@pytest.fixture
+def detector():
+    """Create detector instance with the analyzer's configuration."""
+    return SpectralFluxOnsetDetector(sample_rate=SAMPLE_RATE, n_fft=FRAME_LENGTH)
+
+
+def generate_click_train(click_times: list, duration: float, noise: float = 0.0):
+    """Generate clicks at the given times, optionally over white noise."""
+    rng = np.random.default_rng(0)
+    audio = (noise * rng.standard_normal(int(SAMPLE_RATE * duration))).astype(np.float32)
+    for click_time in click_times:
+        idx = int(click_time * SAMPLE_RATE)
+        t = np.linspace(0, 0.01, 100)
+        audio[idx:idx + 100] += np.sin(2 * np.pi * 1000 * t) * np.exp(-t * 200)
+    return audio
+
+
+def run_detector(detector, audio):
+    """Feed audio hop by hop and return detected onset times."""
+    frame = np.zeros(FRAME_LENGTH, dtype=np.float32)
+    onset_times = []
+    for i in range(0, len(audio) - HOP_LENGTH, HOP_LENGTH):
+        frame = np.concatenate([frame[HOP_LENGTH:], audio[i:i + HOP_LENGTH]])
+        is_onset, _ = detector.process_frame(frame)
+        if is_onset:
+            onset_times.append(i / SAMPLE_RATE)
+    return onset_times
+
+
+class TestOnsetDetection:
+    """Test detection behaviour."""
+
+    def test_click_train(self, detector):
+        """Every click is detected within one hop of its start."""
+        click_times = [0.25, 0.5, 0.75, 1.0, 1.25, 1.5, 1.75]
+        detected = run_detector(detector, generate_click_train(click_times, duration=2.0))
+
+        assert len(detected) == len(click_times)
+        for expected, actual in zip(click_times, detected):
+            assert abs(actual - expected) < HOP_LENGTH / SAMPLE_RATE
+
+    def test_silence(self, detector):
+        """Silence produces no onsets."""
+        assert run_detector(detector, np.zeros(SAMPLE_RATE, dtype=np.float32)) == []
+
+    def test_adaptive_threshold_rejects_noise(self, detector):
+        """The adaptive threshold keeps noise triggers rare while clicks still fire."""
+        click_times = [0.5, 1.0, 1.5]
+        audio = generate_click_train(click_times, duration=2.0, noise=0.01)
+        detected = run_detector(detector, audio)
+
+        for click_time in click_times:
+            assert any(abs(t - click_time) < 0.025 for t in detected)
+        assert len(detected) <= 2 * len(click_times)
+        assert detector.adaptive_threshold >= detector.threshold
+
+    def test_process_magnitude_matches_process_frame(self, detector):
+        """Feeding a precomputed spectrum is equivalent to feeding the frame."""
+        other = SpectralFluxOnsetDetector(sample_rate=SAMPLE_RATE, n_fft=FRAME_LENGTH)
+        audio = generate_click_train([0.1], duration=0.3)
+
+        for i in range(FRAME_LENGTH, len(audio), HOP_LENGTH):
+            frame = audio[i - FRAME_LENGTH:i]
+            magnitude = np.abs(np.fft.rfft(frame * other.window))
+            assert detector.process_frame(frame) == other.process_magnitude(magnitude)
+
+
+class TestPerformance:
+    """Per-block cost."""
+
+    def test_latency(self, detector):
+        """One FFT plus one mel projection stays well under 1ms."""
+        audio = generate_click_train([0.5, 1.0], duration=1.5, noise=0.01)
+        frames = [audio[i - FRAME_LENGTH:i] for i in range(FRAME_LENGTH, len(audio), HOP_LENGTH)]
+
+        latencies = []
+        for frame in frames:
+            start = time.perf_counter()
+            detector.process_frame(frame)
+            latencies.append((time.perf_counter() - start) * 1000)
+
+        avg_latency = np.mean(latencies)
+        print(f"Onset detection latency: avg={avg_latency:.3f}ms, max={np.max(latencies):.3f}ms")
+
+        assert avg_latency < 1.0
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "-s"])
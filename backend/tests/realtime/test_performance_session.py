@@ -0,0 +1,169 @@
+"""
+Tests for live performance sessions driven by virtual audio sources.
+"""
+
+import pytest
+import numpy as np
+import asyncio
+import json
+import time
+import threading
+import os
+import sys
+from fastapi import HTTPException
+
+# Add backend to path for imports (the API package uses relative imports into src)
+backend_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '../..'))
+sys.path.insert(0, backend_path)
+
+from src.services.api import performance
+from src.services.api.performance import PerformanceSession, create_session
+from src.realtime.sources import ArraySource
+from src.realtime.analyzer import RealtimeAnalyzer
+from src.realtime.multichannel import MultiChannelAnalyzer
+from src.realtime.tables import preload
+
+
+class RecordingWebSocket:
+    """Stand-in for the frontend connection: records every message."""
+
+    def __init__(self):
+        self.messages = []
+
+    async def send_json(self, message: dict):
+        self.messages.append(message)
+
+
+@pytest.fixture
+def song_map():
+    """Song map shipped with the backend."""
+    with open(os.path.join(backend_path, 'songmap_32193cf0.json')) as f:
+        return json.load(f)
+
+
+def click_track(song_map: dict, duration: float, sample_rate: int = 44100) -> np.ndarray:
+    """Clicks on the song map's beats over a quiet tone."""
+    t = np.arange(int(sample_rate * duration)) / sample_rate
+    audio = 0.05 * np.sin(2 * np.pi * 220 * t)
+    for beat in song_map['beats']:
+        start = int(beat * sample_rate)
+        if start < len(audio):
+            click = np.hanning(882)[441:] * 0.8
+            audio[start:start + 441] += click[:len(audio) - start]
+    return audio.astype(np.float32)
+
+
+class TestSharedEventLoop:
+    """Test several sessions on one event loop."""
+
+    @pytest.mark.asyncio
+    async def test_sessions_do_not_block_each_other(self, song_map):
+        """Live-paced sessions all run to completion without stalling the loop."""
+        # As create_session does: no table building inside the loop
+        preload(44100)
+
+        audio = click_track(song_map, duration=1.5)
+        sessions = [PerformanceSession(song_map, source=ArraySource(audio, 44100)) for _ in range(3)]
+        sockets = [RecordingWebSocket() for _ in sessions]
+
+        gaps = []
+        done = asyncio.Event()
+
+        async def ticker():
+            last = time.perf_counter()
+            while not done.is_set():
+                await asyncio.sleep(0.001)
+                now = time.perf_counter()
+                gaps.append(now - last)
+                last = now
+
+        async def run(session: PerformanceSession, websocket: RecordingWebSocket):
+            await session.start(websocket)
+            try:
+                await session.process_audio_loop()
+            finally:
+                await session.stop()
+
+        tick_task = asyncio.create_task(ticker())
+        await asyncio.gather(*(run(session, ws) for session, ws in zip(sessions, sockets)))
+        done.set()
+        await tick_task
+
+        for session, websocket in zip(sessions, sockets):
+            stats = session.get_stats()
+            assert stats['audio']['blocks_dropped'] == 0
+            assert stats['analysis']['deadline']['blocks'] == stats['audio']['source']['blocks_delivered']
+            assert len(websocket.messages) > 1
+            assert stats['tracking']['recent_onsets'] > 0
+            assert session.tracker.jump_detector is not None
+
+        print(f"Max event-loop gap with {len(sessions)} sessions: {max(gaps) * 1000:.1f}ms")
+        # Blocking get_block(timeout=0.1) calls would stall the loop for up to 100ms
+        assert max(gaps) < 0.05
+
+
+class TestMergedBlocks:
+    """Test analysis of blocks merged by adaptive mode."""
+
+    def test_merged_block_analyzed_per_hop(self, song_map):
+        """A two-hop block advances the onset and tempo envelopes by two frames."""
+        session = PerformanceSession(song_map)
+        session.analyzer = RealtimeAnalyzer(sample_rate=44100)
+        hop = session.analyzer.hop_length
+        audio = click_track(song_map, duration=1.0)
+
+        session._analyze_block(audio[:hop])
+        assert session.analyzer.tempo_tracker.frames_processed == 1
+
+        session._analyze_block(audio[hop:3 * hop])
+        assert session.analyzer.tempo_tracker.frames_processed == 3
+        assert session.analyzer.stats.get_stats()['deadline']['blocks'] == 3
+        assert session.analyzer.samples_processed == 3 * hop
+
+    def test_merged_multichannel_block_analyzed_per_hop(self, song_map):
+        """Multi-mic sessions split merged ``(block, channels)`` input the same way."""
+        session = PerformanceSession(song_map, channels=2)
+        session.multichannel_analyzer = MultiChannelAnalyzer(2, sample_rate=44100)
+        hop = session.multichannel_analyzer.hop_length
+        audio = np.stack([click_track(song_map, duration=0.1)] * 2, axis=1)
+
+        session._analyze_block(audio[:2 * hop])
+        assert session.multichannel_analyzer.stats.get_stats()['deadline']['blocks'] == 2
+        assert session.multichannel_analyzer.samples_processed == 2 * hop
+
+
+class TestCreateSession:
+    """Test the session creation endpoint."""
+
+    @pytest.mark.asyncio
+    async def test_tables_built_off_the_event_loop(self, monkeypatch):
+        """Preloading the DSP tables runs in a worker thread, not on the loop."""
+        threads = []
+
+        def preload(sample_rate: int):
+            threads.append(threading.current_thread())
+
+        monkeypatch.setattr(performance, 'preload_analysis_tables', preload)
+
+        response = await create_session('no_such_song')
+        performance.active_sessions.pop(response['session_id'])
+
+        assert threads and threads[0] is not threading.main_thread()
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("channels", [0, -1, 9])
+    async def test_invalid_channels(self, monkeypatch, channels):
+        """Channel counts the default input device cannot record are rejected up front."""
+        device = {'index': 0, 'name': 'Eight-channel interface', 'channels': 8}
+        monkeypatch.setattr(performance, 'get_default_device', lambda: device)
+        count = len(performance.active_sessions)
+
+        with pytest.raises(HTTPException) as excinfo:
+            await create_session('no_such_song', channels=channels)
+
+        assert excinfo.value.status_code == 400
+        assert len(performance.active_sessions) == count
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "-s"])
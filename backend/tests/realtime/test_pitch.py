@@ -0,0 +1,120 @@
+"""
+Unit tests for the streaming pYIN pitch tracker.
+
+Checks agreement with librosa.pyin, voicing decisions and the
+per-block latency budget.
+"""
+
+import pytest
+import numpy as np
+import librosa
+import time
+import os
+import sys
+
+# Add src to path for imports
+src_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../src'))
+sys.path.insert(0, src_path)
+
+from realtime.pitch import StreamingPitchTracker
+
+
+SAMPLE_RATE = 44100
+FRAME_LENGTH = 2048
+HOP_LENGTH = 512
+FMIN = librosa.note_to_hz('C2')
+FMAX = librosa.note_to_hz('C7')
+
+
+@pytest.fixture
+def tracker():
+    """Create tracker instance with the analyzer's configuration."""
+    return StreamingPitchTracker(SAMPLE_RATE, FMIN, FMAX, FRAME_LENGTH, HOP_LENGTH)
+
+
+def sine_frames(frequency: float, n_frames: int = 20, noise: float = 0.05):
+    """Generate consecutive hop-spaced frames of a noisy sine wave."""
+    rng = np.random.default_rng(0)
+    n_samples = FRAME_LENGTH + n_frames * HOP_LENGTH
+    t = np.arange(n_samples) / SAMPLE_RATE
+    audio = np.sin(2 * np.pi * frequency * t) + noise * rng.standard_normal(n_samples)
+    audio = audio.astype(np.float32)
+    return [audio[i:i + FRAME_LENGTH] for i in range(0, n_samples - FRAME_LENGTH + 1, HOP_LENGTH)]
+
+
+class TestPyinEquivalence:
+    """The streaming tracker should reproduce the per-block librosa.pyin output."""
+
+    @pytest.mark.parametrize("frequency", [110.0, 261.63, 440.0, 987.77])
+    def test_matches_librosa_pyin(self, tracker, frequency):
+        """f0 and voiced probability match a single-frame librosa.pyin call."""
+        for frame in sine_frames(frequency):
+            f0, voiced, voiced_prob = tracker.process_frame(frame)
+
+            ref_f0, ref_voiced, ref_probs = librosa.pyin(
+                frame, fmin=FMIN, fmax=FMAX, sr=SAMPLE_RATE,
+                frame_length=FRAME_LENGTH, hop_length=HOP_LENGTH, center=False
+            )
+
+            assert voiced_prob == pytest.approx(ref_probs[-1], abs=1e-9)
+            assert voiced == bool(ref_voiced[-1])
+            if voiced:
+                assert abs(1200 * np.log2(f0 / ref_f0[-1])) < 1.0
+
+    def test_silence_is_unvoiced(self, tracker):
+        """Silence produces no voiced frames."""
+        f0, voiced, voiced_prob = tracker.process_frame(np.zeros(FRAME_LENGTH, dtype=np.float32))
+
+        assert not voiced
+        assert np.isnan(f0)
+        assert voiced_prob == 0.0
+
+
+class TestStreamingState:
+    """Test the state carried between frames."""
+
+    def test_viterbi_state_persists(self, tracker):
+        """Frames are counted and the decoding state survives between calls."""
+        for frame in sine_frames(440.0, n_frames=5):
+            tracker.process_frame(frame)
+
+        assert tracker.frames_processed == 6
+
+    def test_reset(self, tracker):
+        """Reset clears the decoding history."""
+        for frame in sine_frames(440.0, n_frames=5):
+            tracker.process_frame(frame)
+
+        tracker.reset()
+        assert tracker.frames_processed == 0
+
+        f0, voiced, _ = tracker.process_frame(sine_frames(261.63, n_frames=0)[0])
+        assert voiced
+        assert abs(1200 * np.log2(f0 / 261.63)) < 10
+
+
+class TestPerformance:
+    """Per-block latency budget."""
+
+    def test_latency_under_1ms(self, tracker):
+        """Average per-frame cost stays under 1ms."""
+        frames = sine_frames(440.0, n_frames=100)
+
+        # Warm up
+        for frame in frames[:5]:
+            tracker.process_frame(frame)
+
+        latencies = []
+        for frame in frames:
+            start = time.perf_counter()
+            tracker.process_frame(frame)
+            latencies.append((time.perf_counter() - start) * 1000)
+
+        avg_latency = np.mean(latencies)
+        print(f"Streaming pitch latency: avg={avg_latency:.3f}ms, max={np.max(latencies):.3f}ms")
+
+        assert avg_latency < 1.0, f"Average latency {avg_latency:.3f}ms exceeds 1ms"
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "-s"])
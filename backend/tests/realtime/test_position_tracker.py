@@ -0,0 +1,275 @@
+"""
+Unit tests for the Song Map position tracker.
+"""
+
+import pytest
+import numpy as np
+import random
+import time
+import os
+import sys
+
+# Add src to path for imports
+src_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../src'))
+sys.path.insert(0, src_path)
+
+from realtime.position_tracker import SongMapPositionTracker, ONSET_DTYPE
+
+
+def make_song_map(n_sections: int, seed: int = 0) -> dict:
+    """Song map with random lines, syllable gaps (some simultaneous) and chords."""
+    rng = random.Random(seed)
+    t = 0.5
+    sections = []
+    for s in range(n_sections):
+        lines = []
+        for l in range(rng.randint(0, 4)):
+            syllables = []
+            for k in range(rng.randint(0, 8)):
+                syllables.append({
+                    'text': f's{s}.{l}.{k}',
+                    'startTime': round(t, 3),
+                    'duration': 0.2,
+                    'chord': rng.choice(['C', 'G', None, 'Am'])
+                })
+                t += rng.choice([0.0, 0.1, 0.25, 0.4])
+            lines.append({'syllables': syllables})
+        sections.append({'name': f'Section {s}', 'lines': lines})
+    return {'sections': sections}
+
+
+def reference_match(tracker: SongMapPositionTracker, expected_song_time: float):
+    """Candidate scoring as a plain loop over ±10 onsets."""
+    times = tracker.onset_times.tolist()
+    center = int(np.searchsorted(tracker.onset_times, expected_song_time))
+    best_idx, best_confidence = None, 0.0
+    for idx in range(center - 10, center + 11):
+        if idx < 0 or idx >= len(times):
+            continue
+        diff = abs(times[idx] - expected_song_time)
+        if diff <= tracker.onset_match_window:
+            confidence = 1.0 - diff / tracker.onset_match_window
+            if idx == tracker.expected_next_onset_idx:
+                confidence = min(1.0, confidence * 1.5)
+            if confidence > best_confidence:
+                best_idx, best_confidence = idx, confidence
+    return best_idx, best_confidence
+
+
+@pytest.fixture
+def song_map():
+    """A few hundred syllables."""
+    return make_song_map(30)
+
+
+class TestOnsetIndex:
+    """Test the structured onset array."""
+
+    def test_layout(self, song_map):
+        """One compact record per syllable, sorted by time."""
+        tracker = SongMapPositionTracker(song_map)
+        n_syllables = sum(len(line['syllables']) for section in song_map['sections'] for line in section['lines'])
+
+        assert tracker.onsets.dtype == ONSET_DTYPE
+        assert len(tracker.onsets) == n_syllables
+        assert tracker.onsets.nbytes == 24 * n_syllables
+        assert np.all(np.diff(tracker.onset_times) >= 0)
+        assert tracker.onset_times.flags['C_CONTIGUOUS']
+
+    def test_records_point_at_syllables(self, song_map):
+        """Every record's indices, time and chord match its syllable."""
+        tracker = SongMapPositionTracker(song_map)
+
+        for i in range(len(tracker.onsets)):
+            onset = tracker.get_onset(i)
+            syllable = song_map['sections'][onset.section_index]['lines'][onset.line_index]['syllables'][onset.syllable_index]
+            assert onset.time == syllable['startTime']
+            assert onset.chord == syllable['chord']
+            assert isinstance(onset.section_index, int)
+
+    def test_simultaneous_onsets_keep_map_order(self):
+        """Onsets at the same time stay in Song Map order."""
+        song_map = {'sections': [{'name': 'A', 'lines': [{'syllables': [
+            {'text': 'a', 'startTime': 1.0}, {'text': 'b', 'startTime': 1.0}, {'text': 'c', 'startTime': 0.5}
+        ]}]}]}
+        tracker = SongMapPositionTracker(song_map)
+
+        assert tracker.onsets['syllable'].tolist() == [2, 0, 1]
+
+    def test_empty_song_map(self):
+        """A map without syllables never matches."""
+        tracker = SongMapPositionTracker({'sections': []})
+        tracker.start()
+
+        position = tracker.update(True, current_time=tracker.performance_start_time + 1.0)
+        assert len(tracker.onsets) == 0
+        assert position.confidence == 0.0
+
+
+class TestMatching:
+    """Test vectorized candidate scoring."""
+
+    def test_matches_reference(self, song_map):
+        """Vectorized scoring picks the same onset and confidence as the loop."""
+        tracker = SongMapPositionTracker(song_map)
+        tracker.start()
+        rng = np.random.default_rng(0)
+
+        for expected_song_time in rng.uniform(-1.0, tracker.onset_times[-1] + 1.0, 2000):
+            tracker.expected_next_onset_idx = int(rng.integers(0, len(tracker.onsets)))
+            tracker.position.last_onset_time = None
+            assert tracker._find_matching_onset(expected_song_time) == reference_match(tracker, expected_song_time)
+
+    def test_expected_onset_boost(self):
+        """The expected next onset wins over a slightly closer one."""
+        song_map = {'sections': [{'name': 'A', 'lines': [{'syllables': [
+            {'text': 'a', 'startTime': 1.0}, {'text': 'b', 'startTime': 1.1}
+        ]}]}]}
+        tracker = SongMapPositionTracker(song_map)
+        tracker.start()
+        tracker.expected_next_onset_idx = 1
+
+        idx, confidence = tracker._find_matching_onset(1.04)
+        assert idx == 1
+        assert confidence == pytest.approx(min(1.0, (1 - 0.06 / 0.15) * 1.5))
+
+    def test_positions_are_python_types(self, song_map):
+        """Positions stay JSON-serializable (no numpy scalars)."""
+        tracker = SongMapPositionTracker(song_map)
+        tracker.start()
+        position = tracker.update(True, current_time=tracker.performance_start_time + tracker.onset_times[0])
+
+        assert position.confidence > 0
+        assert type(position.song_time) is float
+        assert type(position.section_index) is int
+        assert type(position.syllable_index) is int
+
+
+class TestSyllableTable:
+    """Test the onset-ordered syllable table and lookups."""
+
+    def test_table_aligned_with_onsets(self, song_map):
+        """Row i of the table is the syllable of onset i."""
+        tracker = SongMapPositionTracker(song_map)
+
+        assert len(tracker.syllables) == len(tracker.onsets)
+        for syllable, onset_time in zip(tracker.syllables, tracker.onset_times):
+            assert syllable['startTime'] == onset_time
+
+    def test_lookahead_matches_scan(self, song_map):
+        """The range slice returns exactly the syllables a full scan finds."""
+        tracker = SongMapPositionTracker(song_map)
+        rng = np.random.default_rng(1)
+
+        for song_time in rng.uniform(0, tracker.onset_times[-1], 200):
+            tracker.position.song_time = song_time
+            expected = [s for s in tracker.syllables if song_time < s['startTime'] <= song_time + 2.0]
+            assert tracker.get_lookahead(2.0) == expected
+
+        tracker.position.song_time = tracker.onset_times[5]
+        first = int(np.sum(tracker.onset_times <= tracker.onset_times[5]))
+        assert tracker.get_lookahead(100.0, limit=3) == tracker.syllables[first:first + 3]
+
+    def test_lookups_skip_empty_sections(self):
+        """Section indices refer to the Song Map, even after a section without syllables."""
+        song_map = {'sections': [
+            {'name': 'Intro', 'lines': []},
+            {'name': 'Verse', 'lines': [{'syllables': [{'text': 'la', 'startTime': 1.0}]}]}
+        ]}
+        tracker = SongMapPositionTracker(song_map)
+        tracker.start()
+        tracker.update(True, current_time=tracker.performance_start_time + 1.0)
+
+        assert tracker.position.section_index == 1
+        assert tracker.get_current_section().name == 'Verse'
+        assert tracker.get_current_syllable()['text'] == 'la'
+        assert tracker.get_stats()['section'] == 'Verse'
+
+        tracker.position.song_time = 0.0
+        assert [s['text'] for s in tracker.get_lookahead(2.0)] == ['la']
+
+
+class TestExtrapolation:
+    """Test greedy-mode extrapolation between onsets."""
+
+    @pytest.fixture
+    def steady_map(self) -> dict:
+        """Syllables every half second."""
+        return {'sections': [{'name': 'A', 'lines': [{'syllables': [
+            {'text': f'{i}', 'startTime': 0.5 * (i + 1)} for i in range(40)
+        ]}]}]}
+
+    def test_projects_from_last_match(self, steady_map):
+        """Onset-free updates project from the last matched onset rather than compounding."""
+        tracker = SongMapPositionTracker(steady_map, jump_detection=False)
+        tracker.start()
+        start = tracker.performance_start_time
+        tracker.update(True, current_time=start + 0.5)
+        matched_confidence = tracker.position.confidence
+
+        for dt in (0.1, 0.2, 0.3):
+            position = tracker.update(False, current_time=start + 0.5 + dt)
+
+        assert position.song_time == pytest.approx(0.5 + 0.3 * position.tempo_ratio)
+        assert position.confidence == pytest.approx(matched_confidence * np.exp(-0.3 * 0.693))
+
+    def test_block_rate_updates(self, steady_map):
+        """Updating every block between onsets, as live sessions do, keeps every onset matched."""
+        tracker = SongMapPositionTracker(steady_map, jump_detection=False)
+        tracker.start()
+        start = tracker.performance_start_time
+        block = 512 / 44100
+
+        matched = []
+        for onset_time in tracker.onset_times:
+            t = onset_time - 0.5 + block
+            while t < onset_time:
+                tracker.update(False, current_time=start + t)
+                t += block
+            tracker.update(True, current_time=start + onset_time)
+            matched.append(tracker.matched_onset_idx)
+
+        assert matched == list(range(len(tracker.onsets)))
+
+
+class TestPerformance:
+    """Matching cost on long maps."""
+
+    def test_medley_matching_speed(self):
+        """Per-onset updates on a long medley stay in the tens of microseconds."""
+        tracker = SongMapPositionTracker(make_song_map(3000, seed=1))
+        tracker.start()
+        start_time = tracker.performance_start_time
+        onset_times = tracker.onset_times[:2000] + 0.01
+
+        start = time.perf_counter()
+        for t in onset_times:
+            tracker.update(True, current_time=start_time + t)
+        per_onset_us = (time.perf_counter() - start) / len(onset_times) * 1e6
+
+        print(f"{len(tracker.onsets)} onsets ({tracker.onsets.nbytes / 1024:.0f} KB): "
+              f"{per_onset_us:.1f}us per onset")
+        assert tracker.position.confidence > 0.5
+        assert per_onset_us < 200
+
+    def test_update_cost_independent_of_map_size(self):
+        """A teleprompter update costs the same on a long medley as on a short song."""
+        def update_cost(song_map: dict) -> float:
+            tracker = SongMapPositionTracker(song_map)
+            tracker.position.song_time = tracker.onset_times[len(tracker.onsets) // 2]
+            start = time.perf_counter()
+            for _ in range(2000):
+                tracker.get_lookahead(seconds=3.0, limit=10)
+                tracker.get_current_syllable()
+                tracker.get_stats()
+            return (time.perf_counter() - start) / 2000 * 1e6
+
+        short = update_cost(make_song_map(10, seed=2))
+        medley = update_cost(make_song_map(3000, seed=2))
+
+        print(f"Teleprompter update: short song {short:.1f}us, medley {medley:.1f}us")
+        assert medley < 2 * short + 5
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "-s"])
@@ -0,0 +1,218 @@
+"""
+Unit tests for the position tracker replay harness.
+"""
+
+import pytest
+import numpy as np
+import glob
+import json
+import os
+import sys
+
+# Add src to path for imports
+src_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../src'))
+sys.path.insert(0, src_path)
+
+from realtime.position_tracker import SongMapPositionTracker, tracker_song_map
+from realtime.replay import (
+    PerformanceScenario, DEFAULT_SCENARIOS, synthetic_song_map,
+    synthesize_performance, replay, run_suite, compare
+)
+
+BACKEND = os.path.abspath(os.path.join(os.path.dirname(__file__), '../..'))
+
+
+def packaged_song_maps() -> dict:
+    """The packaged Song Maps shipped in backend/."""
+    song_maps = {}
+    for path in sorted(glob.glob(os.path.join(BACKEND, 'songmap_*.json'))):
+        with open(path) as f:
+            song_maps[os.path.basename(path)] = json.load(f)
+    return song_maps
+
+
+@pytest.fixture
+def tracker():
+    """Tracker over the 12-section synthetic song, configured as in live sessions."""
+    return SongMapPositionTracker(synthetic_song_map(), jump_detection=True)
+
+
+class TestSongMapConversion:
+    """Test conversion of packaged Song Maps."""
+
+    def test_beats_become_onsets(self):
+        """Without lyrics, every beat is an onset and every bar a line."""
+        song_maps = packaged_song_maps()
+        assert song_maps, "no packaged Song Maps in backend/"
+
+        for song_map in song_maps.values():
+            converted = tracker_song_map(song_map)
+            tracker = SongMapPositionTracker(converted)
+
+            assert tracker.onset_times.tolist() == song_map['beats']
+            assert len(converted['sections'][0]['lines']) == len(song_map['downbeats'])
+            assert tracker.get_onset(0).chord == 'A'
+
+    def test_lyrics_become_syllables(self):
+        """Lyric phrases become lines of evenly spread words, in their sections."""
+        song_map = {
+            'beats': [0.5, 1.0],
+            'sections': [{'start': 0.0, 'end': 4.0, 'label': 'verse'}, {'start': 4.0, 'end': 8.0, 'label': 'chorus'}],
+            'chords': [{'start': 0.0, 'end': 4.0, 'label': 'C:min'}, {'start': 4.0, 'end': 8.0, 'label': 'N'}],
+            'lyrics': [{'start': 1.0, 'end': 2.0, 'text': 'hello there'}, {'start': 5.0, 'end': 6.0, 'text': 'la'}]
+        }
+        converted = tracker_song_map(song_map)
+
+        verse, chorus = converted['sections']
+        assert [s['text'] for s in verse['lines'][0]['syllables']] == ['hello', 'there']
+        assert [s['startTime'] for s in verse['lines'][0]['syllables']] == [1.0, 1.5]
+        assert verse['lines'][0]['syllables'][0]['chord'] == 'Cm'
+        assert chorus['name'] == 'chorus'
+        assert chorus['lines'][0]['syllables'][0]['chord'] is None
+
+    def test_tracker_layout_unchanged(self):
+        """Maps already in the tracker's layout pass through."""
+        song_map = synthetic_song_map(2)
+        assert tracker_song_map(song_map) is song_map
+
+
+class TestSynthesis:
+    """Test performance synthesis."""
+
+    def test_straight(self, tracker):
+        """A straight performance plays every onset at the map's times over the tempo."""
+        performance = synthesize_performance(tracker, PerformanceScenario(tempo=0.8, jitter=0.0))
+
+        assert performance.truth.tolist() == list(range(len(tracker.onsets)))
+        assert np.allclose(performance.onset_times, tracker.onset_times / 0.8)
+        assert performance.jumps == []
+
+    def test_drift_and_rubato(self, tracker):
+        """Drift ends the performance at the drifted tempo; rubato averages out."""
+        drifted = synthesize_performance(tracker, PerformanceScenario(drift=0.2, jitter=0.0))
+        final_ioi = np.diff(drifted.path_times[-3:]) / np.diff(tracker.onset_times[-3:])
+        assert final_ioi == pytest.approx(1 / 1.2, rel=0.01)
+
+        rubato = synthesize_performance(tracker, PerformanceScenario(rubato=0.1, jitter=0.0))
+        assert rubato.onset_times[-1] == pytest.approx(tracker.onset_times[-1], rel=0.05)
+
+    def test_missed_and_extra_onsets(self, tracker):
+        """Missed onsets drop out of the detected ones; spurious ones have no truth."""
+        performance = synthesize_performance(tracker, PerformanceScenario(miss_rate=0.2, extra_rate=0.1))
+        n = len(tracker.onsets)
+
+        assert np.sum(performance.truth == -1) == round(0.1 * n)
+        assert 0.7 * n < np.sum(performance.truth >= 0) < 0.9 * n
+        assert np.all(np.diff(performance.onset_times) >= 0)
+        assert len(performance.path) == n
+
+    def test_section_order(self, tracker):
+        """Jumps follow the section order, with a pause and a recorded landing."""
+        performance = synthesize_performance(tracker, PerformanceScenario(section_order=[0, 1, 4, 5, 1], jitter=0.0))
+        sections = tracker.onsets['section'][performance.path]
+
+        assert [int(s) for s in sections[np.r_[True, np.diff(sections) != 0]]] == [0, 1, 4, 5, 1]
+        assert len(performance.jumps) == 2
+        landing = performance.jumps[0]
+        assert tracker.onsets['section'][performance.truth[landing]] == 4
+        assert performance.onset_times[landing] - performance.onset_times[landing - 1] == pytest.approx(0.5)
+
+    def test_random_jumps_are_seeded(self, tracker):
+        """Random skips and repeats are repeatable."""
+        scenario = PerformanceScenario(skips=1, repeats=1, seed=3)
+        first = synthesize_performance(tracker, scenario)
+        second = synthesize_performance(tracker, scenario)
+
+        assert len(first.jumps) == 2
+        assert np.array_equal(first.onset_times, second.onset_times)
+
+    def test_true_song_time(self, tracker):
+        """Ground truth interpolates between onsets and holds across a jump."""
+        performance = synthesize_performance(tracker, PerformanceScenario(section_order=[0, 2], jitter=0.0))
+        times = tracker.onset_times
+        path_times = performance.path_times
+        jump = int(np.argmax(np.diff(performance.path) != 1))
+
+        midway = (path_times[3] + path_times[4]) / 2
+        in_pause = path_times[jump] + 0.25
+        song = performance.song_time_at(times, np.array([0.0, midway, in_pause]))
+
+        assert np.isnan(song[0])
+        assert song[1] == pytest.approx((times[3] + times[4]) / 2)
+        assert song[2] == pytest.approx(times[performance.path[jump]])
+
+
+class TestReplay:
+    """Test replaying through the tracker."""
+
+    def test_straight_is_tracked(self, tracker):
+        """A straight performance is matched and locked throughout."""
+        result = replay(tracker, synthesize_performance(tracker, PerformanceScenario()))
+        summary = result.summary()
+
+        assert summary['onsets'] == len(tracker.onsets)
+        assert summary['updates'] > summary['onsets']
+        assert summary['matched'] == 1.0
+        assert summary['locked'] > 0.99
+        assert summary['error_p50_ms'] < 20
+        assert 0 < summary['onset_p50_us'] <= summary['onset_p99_us'] <= summary['onset_max_us']
+
+    def test_recovery_after_jumps(self, tracker):
+        """Each jump reports how many onsets it took to recover."""
+        performance = synthesize_performance(tracker, PerformanceScenario(section_order=[0, 1, 2, 6, 7, 8]))
+
+        greedy = replay(tracker, performance)
+        plain = replay(SongMapPositionTracker(synthetic_song_map(), jump_detection=False), performance)
+
+        assert greedy.recovery[0] is not None and greedy.recovery[0] <= 8
+        assert plain.recovery == [None]
+
+    def test_repeated_chorus_counts_as_matched(self, tracker):
+        """Following another instance of a repeated chorus counts as matched, not as locked."""
+        # After verse 0 the performer jumps to the second chorus; the tracker
+        # expects the first one, which sounds the same
+        performance = synthesize_performance(tracker, PerformanceScenario(section_order=[0, 3, 4, 5]))
+        result = replay(tracker, performance)
+        in_chorus = np.flatnonzero(tracker.onsets['section'][performance.truth] == 3)
+
+        assert result.correct[in_chorus[-15:]].all()
+        assert result.summary()['locked'] < 0.8
+        assert result.correct[-20:].all()
+
+
+class TestRegressionGate:
+    """Test the suite and baseline comparison."""
+
+    def test_suite_accuracy(self):
+        """Standard scenarios on the packaged maps and the synthetic song stay tracked."""
+        song_maps = dict(packaged_song_maps(), synthetic=synthetic_song_map())
+        results = run_suite(song_maps, make_tracker=lambda song_map: SongMapPositionTracker(song_map, jump_detection=True))
+
+        for run, summary in results.items():
+            print(f"{run:32s} p50={summary['onset_p50_us']:6.1f}us p99={summary['onset_p99_us']:7.1f}us "
+                  f"err50={summary['error_p50_ms']:5.1f}ms locked={summary['locked']:.3f} "
+                  f"matched={summary['matched']:.3f} recovery={summary['recovery']}")
+            assert summary['onset_p99_us'] < 25000, run
+            assert summary['matched'] > 0.85, run
+
+        assert len(results) == len(song_maps) * len(DEFAULT_SCENARIOS)
+        assert results['synthetic/straight']['matched'] == 1.0
+        assert None not in results['synthetic/jumps']['recovery']
+
+    def test_compare(self):
+        """Accuracy drops, slower medians, blown budgets and missing runs are regressions."""
+        base = {'matched': 0.95, 'locked': 0.95, 'onset_p50_us': 100.0, 'onset_p99_us': 200.0}
+        baseline = {'a': base, 'b': base}
+
+        assert compare({'a': dict(base), 'b': dict(base, onset_p50_us=180.0)}, baseline) == []
+
+        regressions = compare({'a': dict(base, matched=0.9, onset_p50_us=250.0, onset_p99_us=30000.0)}, baseline)
+        assert len(regressions) == 4
+        assert any('matched' in r for r in regressions)
+        assert any('p50' in r for r in regressions)
+        assert any('budget' in r for r in regressions)
+        assert regressions[-1] == 'b: missing'
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "-s"])
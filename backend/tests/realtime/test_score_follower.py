@@ -0,0 +1,204 @@
+"""
+Unit tests for onset-level DTW score following.
+"""
+
+import pytest
+import numpy as np
+import time
+import os
+import sys
+
+# Add src to path for imports
+src_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../src'))
+sys.path.insert(0, src_path)
+
+from realtime.score_follower import OnsetScoreFollower, chord_template
+from realtime.position_tracker import SongMapPositionTracker
+from realtime.replay import replay
+from tests.realtime.tracker_helpers import make_song_map, section_starts, perform
+
+
+@pytest.fixture
+def song_map():
+    """Twelve sections, a few hundred syllables."""
+    return make_song_map()
+
+
+class TestChordTemplate:
+    """Test chord symbol parsing."""
+
+    def test_major_and_minor(self):
+        """Triads land on the right pitch classes."""
+        assert np.flatnonzero(chord_template('C')).tolist() == [0, 4, 7]
+        assert np.flatnonzero(chord_template('Am')).tolist() == [0, 4, 9]
+        assert np.flatnonzero(chord_template('F#m7')).tolist() == [1, 6, 9]
+        assert np.flatnonzero(chord_template('Bbmaj7')).tolist() == [2, 5, 10]
+        assert np.linalg.norm(chord_template('G')) == pytest.approx(1.0)
+
+    def test_unknown(self):
+        """Symbols without a root have no template."""
+        assert chord_template(None) is None
+        assert chord_template('N.C.') is None
+
+
+class TestOnsetScoreFollower:
+    """Test the DTW follower directly."""
+
+    def test_follows_exact_performance(self):
+        """An exact performance is followed onset by onset at full confidence."""
+        times = np.cumsum(np.tile([0.2, 0.3, 0.5], 20))
+        follower = OnsetScoreFollower(times)
+
+        for i, t in enumerate(times):
+            position, confidence = follower.step(t)
+            assert position == i
+            assert confidence == pytest.approx(1.0)
+
+    def test_missed_and_extra_onsets(self):
+        """Skipped map onsets and spurious detections keep the alignment."""
+        times = np.cumsum(np.tile([0.2, 0.3, 0.5], 20))
+        follower = OnsetScoreFollower(times)
+
+        positions = []
+        for i, t in enumerate(times[:30]):
+            if i == 10:
+                continue  # Missed by the detector
+            positions.append(follower.step(t)[0])
+            if i == 20:
+                positions.append(follower.step(t + 0.08)[0])  # Spurious
+
+        assert positions[9] == 9
+        assert positions[10] == 11
+        assert positions[20] == positions[19] == 20
+        assert positions[-1] == 29
+
+    def test_tempo_ratio(self):
+        """Intervals are compared after scaling by the tempo ratio."""
+        times = np.cumsum(np.tile([0.2, 0.3, 0.5], 10))
+        follower = OnsetScoreFollower(times)
+
+        for i, t in enumerate(times):
+            position, confidence = follower.step(t / 0.8, tempo_ratio=0.8)
+        assert position == len(times) - 1
+        assert confidence > 0.9
+
+    def test_chroma_cost(self):
+        """Chroma matching the chord keeps full confidence; a clash lowers it."""
+        times = np.arange(1, 41) * 0.25
+        chord_ids = np.repeat([0, 1], 20)
+
+        def final_confidence(chroma: np.ndarray) -> float:
+            follower = OnsetScoreFollower(times, chord_ids, ['C', 'G'])
+            for t in times[:10]:
+                _, confidence = follower.step(t, chroma=chroma)
+            return confidence
+
+        assert final_confidence(chord_template('C')) == pytest.approx(1.0)
+        assert final_confidence(chord_template('F#')) < 0.5
+        assert final_confidence(np.zeros(12)) == pytest.approx(1.0)
+
+    def test_relocates_after_jump(self):
+        """A jump out of the band is found again from the interval pattern."""
+        rng = np.random.default_rng(3)
+        times = np.cumsum(rng.choice([0.15, 0.25, 0.35, 0.5], 400))
+        follower = OnsetScoreFollower(times)
+
+        for t in times[:50]:
+            follower.step(t)
+        offset = times[50] + 0.5 - times[300]
+        for t in times[300:320] + offset:
+            position, _ = follower.step(t)
+
+        assert follower.relocations >= 1
+        assert position == 319
+
+    def test_empty_map(self):
+        """A map without onsets never matches."""
+        follower = OnsetScoreFollower(np.zeros(0))
+        assert follower.step(1.0) == (None, 0.0)
+
+    def test_reset(self):
+        """Reset starts a new alignment from the clock."""
+        times = np.arange(1, 21) * 0.3
+        follower = OnsetScoreFollower(times)
+        for t in times[:10]:
+            follower.step(t)
+        follower.reset()
+
+        assert follower.step(times[2])[0] == 2
+        assert follower.get_stats()['steps'] == 1
+
+
+class TestTrackerModes:
+    """Test mode selection in SongMapPositionTracker."""
+
+    def test_invalid_mode(self, song_map):
+        """Unknown modes are rejected."""
+        with pytest.raises(ValueError):
+            SongMapPositionTracker(song_map, mode='viterbi')
+
+    def test_modes_agree_on_straight_performance(self, song_map):
+        """Without skips both modes match every onset."""
+        for mode in ('greedy', 'dtw'):
+            tracker = SongMapPositionTracker(song_map, mode=mode)
+            correct = replay(tracker, perform(tracker)).correct
+            assert correct.all(), mode
+
+        assert tracker.get_stats()['mode'] == 'dtw'
+        assert tracker.get_stats()['follower']['steps'] == len(tracker.onsets)
+
+    def test_extrapolation_between_onsets(self, song_map):
+        """Blocks without onsets extrapolate from the last match, not cumulatively."""
+        tracker = SongMapPositionTracker(song_map)
+        tracker.start()
+        start_time = tracker.performance_start_time
+        first = tracker.onset_times[0]
+
+        tracker.update(True, current_time=start_time + first)
+        for i in range(1, 11):
+            tracker.update(False, current_time=start_time + first + i * 0.01)
+
+        assert tracker.position.song_time == pytest.approx(first + 0.1)
+        assert tracker.position.confidence == pytest.approx(np.exp(-0.1 * 0.693))
+
+    def test_dtw_recovers_after_skip(self, song_map):
+        """After a section skip, DTW finds the performer again; the plain greedy window does not."""
+        starts = section_starts(SongMapPositionTracker(song_map))
+        jump = starts[3] - starts[0]
+
+        results = {}
+        for mode in ('greedy', 'dtw'):
+            tracker = SongMapPositionTracker(song_map, mode=mode, jump_detection=False)
+            results[mode] = replay(tracker, perform(tracker, [0, 1, 2, 6, 7, 8], tempo=0.95))
+
+        print(f"Recovery after skip: greedy {results['greedy'].recovery[0]}, "
+              f"dtw {results['dtw'].recovery[0]} onsets")
+        assert results['dtw'].recovery[0] is not None and results['dtw'].recovery[0] <= 12
+        assert results['dtw'].correct[jump + 15:].mean() > 0.9
+        assert results['greedy'].correct[jump + 15:].mean() < 0.5
+
+
+class TestPerformance:
+    """Per-onset cost."""
+
+    def test_step_cost_independent_of_map_size(self):
+        """DTW steps cost the same on a long medley as on a short song."""
+        def step_cost(n_sections: int) -> float:
+            tracker = SongMapPositionTracker(make_song_map(n_sections, seed=1), mode='dtw')
+            performance = perform(tracker).onset_times[:200]
+            tracker.start()
+            start = time.perf_counter()
+            for t in performance:
+                tracker.update(True, current_time=tracker.performance_start_time + t)
+            return (time.perf_counter() - start) / len(performance) * 1e6
+
+        short = step_cost(12)
+        medley = step_cost(600)
+
+        print(f"DTW update: short song {short:.1f}us, medley {medley:.1f}us")
+        assert medley < 2 * short + 20
+        assert medley < 1000
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "-s"])
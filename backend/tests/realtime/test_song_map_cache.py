@@ -0,0 +1,253 @@
+"""
+Unit tests for the compiled Song Map cache.
+"""
+
+import pytest
+import numpy as np
+import asyncio
+import glob
+import json
+import time
+import os
+import subprocess
+import sys
+
+# Add backend to path for imports (the API package uses relative imports into src)
+backend_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '../..'))
+sys.path.insert(0, backend_path)
+
+from src.realtime import song_map_cache
+from src.realtime.song_map_cache import (
+    CompiledSongMap, BlobTable, CACHE_VERSION, cache_path, compile_song_map, load_song_map
+)
+from src.realtime.position_tracker import SongMapPositionTracker, tracker_song_map
+from src.realtime.replay import PerformanceScenario, synthetic_song_map, synthesize_performance, replay
+
+
+def write_song_map(directory, song_map: dict, name: str = 'song') -> str:
+    """Write a Song Map JSON as the pipeline does; returns its path."""
+    path = os.path.join(str(directory), f'{name}.song_map.json')
+    with open(path, 'w') as f:
+        json.dump(song_map, f)
+    return path
+
+
+def in_memory(song_map: dict) -> CompiledSongMap:
+    """Compile without touching the filesystem."""
+    return CompiledSongMap.from_buffer(np.frombuffer(compile_song_map(song_map), dtype=np.uint8))
+
+
+def sections_of(tracker: SongMapPositionTracker) -> list:
+    """Comparable view of the tracker's sections."""
+    return [s and (s.name, s.start_time, s.end_time, s.lines) for s in tracker.section_by_index]
+
+
+class TestCompile:
+    """Test that a compiled map builds the same tracker."""
+
+    def test_same_tracker(self):
+        """Onsets, chords, syllables and sections match the dict tracker."""
+        song_map = synthetic_song_map(12)
+        song_map['title'] = 'Medley'
+        song_map['sections'].insert(3, {'name': 'Break', 'lines': []})
+        compiled = in_memory(song_map)
+        tracker = SongMapPositionTracker(compiled, jump_detection=True)
+        expected = SongMapPositionTracker(song_map, jump_detection=True)
+
+        assert np.array_equal(tracker.onsets, expected.onsets)
+        assert np.array_equal(tracker.onset_times, expected.onset_times)
+        assert tracker.chords == expected.chords
+        assert tracker.syllables[:] == expected.syllables
+        assert sections_of(tracker) == sections_of(expected)
+        assert sections_of(tracker)[3] is None
+        assert len(tracker.sections) == len(expected.sections) == 12
+        assert np.array_equal(tracker.jump_detector.candidates, expected.jump_detector.candidates)
+        assert tracker.song_map == {'title': 'Medley'}
+
+    def test_same_lookups(self):
+        """Lookahead, current line and syllable come out the same, decoded on access."""
+        song_map = synthetic_song_map(4)
+        tracker = SongMapPositionTracker(in_memory(song_map))
+        expected = SongMapPositionTracker(song_map)
+
+        for song_time in (0.0, 3.3, 17.0, 60.0):
+            for t in (tracker, expected):
+                t.position.song_time = song_time
+                t._update_position_from_song_time()
+            assert tracker.get_lookahead(3.0, limit=10) == expected.get_lookahead(3.0, limit=10)
+            assert tracker.get_current_line() == expected.get_current_line()
+            assert tracker.get_current_syllable() == expected.get_current_syllable()
+            assert tracker.get_stats() == expected.get_stats()
+
+    def test_same_tracking(self):
+        """A replayed performance is followed identically."""
+        song_map = synthetic_song_map(8)
+        tracker = SongMapPositionTracker(song_map)
+        performance = synthesize_performance(tracker, PerformanceScenario('jumps', tempo=0.95, skips=1, repeats=1))
+
+        for mode in ('greedy', 'dtw'):
+            expected = replay(SongMapPositionTracker(song_map, mode=mode), performance)
+            result = replay(SongMapPositionTracker(in_memory(song_map), mode=mode), performance)
+            assert np.array_equal(result.correct, expected.correct), mode
+            assert np.array_equal(result.position_error, expected.position_error, equal_nan=True), mode
+
+    def test_packaged_song_maps(self):
+        """Packaged maps are converted first; their top-level scalars are kept."""
+        paths = sorted(glob.glob(os.path.join(backend_path, 'songmap_*.json')))
+        assert paths, "no packaged Song Maps in backend/"
+
+        for path in paths:
+            with open(path) as f:
+                song_map = json.load(f)
+            compiled = in_memory(song_map)
+
+            assert compiled.metadata['id'] == song_map['id']
+            assert compiled.onset_times.tolist() == song_map['beats']
+            assert np.array_equal(compiled.onsets, SongMapPositionTracker(tracker_song_map(song_map)).onsets)
+
+    def test_empty_song_map(self):
+        """A map without onsets compiles to empty arrays."""
+        tracker = SongMapPositionTracker(in_memory({'title': 'Test Song', 'sections': []}))
+
+        assert len(tracker.onsets) == 0
+        assert tracker.get_lookahead() == []
+        assert tracker.get_stats()['total_sections'] == 0
+
+    def test_blob_table(self):
+        """Items decode once; slices and negative indices work like a list."""
+        items = [{'text': 'a'}, None, [1, 2], 'é']
+        table = BlobTable(*BlobTable.encode(items))
+
+        assert list(table) == items
+        assert table[1:] == items[1:]
+        assert table[-1] == 'é'
+        assert table[0] is table[0]
+        with pytest.raises(IndexError):
+            table[4]
+
+
+class TestCache:
+    """Test the cache file next to the Song Map JSON."""
+
+    def test_written_once_and_mapped(self, tmp_path, monkeypatch):
+        """The first load compiles; later loads map the file without reading the JSON."""
+        path = write_song_map(tmp_path, synthetic_song_map(4))
+        first = load_song_map(path)
+
+        assert cache_path(path) == tmp_path / 'song.song_map.tracker'
+        assert cache_path(path).exists()
+        assert isinstance(first.buffer, np.memmap)
+
+        def fail(*args, **kwargs):
+            raise AssertionError("recompiled")
+        monkeypatch.setattr(song_map_cache, 'compile_song_map', fail)
+
+        second = load_song_map(path)
+        assert isinstance(second.buffer, np.memmap)
+        assert not second.onsets.flags.writeable
+        assert np.array_equal(second.onsets, first.onsets)
+
+    def test_invalidated_when_song_map_changes(self, tmp_path):
+        """Rewriting the JSON recompiles the cache."""
+        path = write_song_map(tmp_path, synthetic_song_map(4))
+        assert len(load_song_map(path).section_names) == 4
+
+        write_song_map(tmp_path, synthetic_song_map(6))
+        compiled = load_song_map(path)
+        assert len(compiled.section_names) == 6
+        assert compiled.source['size'] == os.path.getsize(path)
+
+        # Same size, newer modification time
+        stat = os.stat(path)
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+        assert load_song_map(path).source['mtime_ns'] == stat.st_mtime_ns + 1_000_000
+
+    @pytest.mark.parametrize('damage', ['truncate', 'garbage', 'version'])
+    def test_damaged_cache_is_rebuilt(self, tmp_path, monkeypatch, damage):
+        """A truncated, foreign or older cache is compiled again."""
+        song_map = synthetic_song_map(4)
+        path = write_song_map(tmp_path, song_map)
+        load_song_map(path)
+
+        if damage == 'truncate':
+            with open(cache_path(path), 'r+b') as f:
+                f.truncate(os.path.getsize(cache_path(path)) // 2)
+        elif damage == 'garbage':
+            cache_path(path).write_bytes(b'not a song map')
+        else:
+            monkeypatch.setattr(song_map_cache, 'CACHE_VERSION', CACHE_VERSION + 1)
+
+        compiled = load_song_map(path)
+        assert compiled.header['version'] == song_map_cache.CACHE_VERSION
+        assert np.array_equal(compiled.onsets, SongMapPositionTracker(song_map).onsets)
+
+    def test_unwritable_cache_served_from_memory(self, tmp_path, monkeypatch):
+        """If the cache cannot be written, the compiled map still loads."""
+        path = write_song_map(tmp_path, synthetic_song_map(4))
+
+        def refuse(*args, **kwargs):
+            raise PermissionError("read-only")
+        monkeypatch.setattr(song_map_cache.os, 'replace', refuse)
+
+        compiled = load_song_map(path)
+        assert not cache_path(path).exists()
+        assert len(SongMapPositionTracker(compiled).onsets) == len(SongMapPositionTracker(synthetic_song_map(4)).onsets)
+
+    def test_create_session_uses_cache(self, tmp_path, monkeypatch):
+        """create_session loads pipeline output through the cache."""
+        from src.services.api import performance
+
+        song_dir = tmp_path / 'job1'
+        song_dir.mkdir()
+        path = write_song_map(song_dir, dict(synthetic_song_map(4), title='Cached'), name='job1')
+        monkeypatch.setattr(performance, 'SONG_MAP_DIR', tmp_path)
+
+        response = asyncio.run(performance.create_session('job1'))
+        session = performance.active_sessions.pop(response['session_id'])
+
+        assert isinstance(session.song_map, CompiledSongMap)
+        assert session.song_map.metadata['title'] == 'Cached'
+        assert cache_path(path).exists()
+
+    def test_session_path_does_not_load_replay(self):
+        """Loading a Song Map for a session leaves the replay harness unimported."""
+        code = (
+            "import sys; import src.services.api.performance; "
+            "assert 'src.realtime.replay' not in sys.modules, 'replay imported'"
+        )
+        result = subprocess.run([sys.executable, '-c', code], cwd=backend_path, capture_output=True, text=True)
+        assert result.returncode == 0, result.stderr
+
+
+class TestPerformance:
+    """Check that start-up does not grow with the song."""
+
+    def test_startup_independent_of_length(self, tmp_path):
+        """Opening a compiled map and building its tracker takes about as long for any length."""
+        timings = {}
+        for n_sections in (12, 600):
+            path = write_song_map(tmp_path, synthetic_song_map(n_sections, seed=1), name=f'medley{n_sections}')
+            load_song_map(path)
+
+            runs = []
+            for _ in range(20):
+                start = time.perf_counter()
+                tracker = SongMapPositionTracker(load_song_map(path))
+                tracker.start()
+                tracker.get_lookahead(3.0, limit=10)
+                runs.append(time.perf_counter() - start)
+            timings[n_sections] = np.median(runs) * 1e3
+
+        start = time.perf_counter()
+        with open(path) as f:
+            SongMapPositionTracker(json.load(f))
+        uncached_ms = (time.perf_counter() - start) * 1e3
+
+        print(f"Start-up: 12 sections {timings[12]:.2f}ms, 600 sections {timings[600]:.2f}ms "
+              f"(uncached {uncached_ms:.1f}ms)")
+        assert timings[600] < 5.0
+        assert timings[600] < uncached_ms / 5
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "-s"])
@@ -0,0 +1,270 @@
+"""
+Unit tests for virtual audio sources.
+
+Runs RealtimeAudioInput end to end without audio hardware.
+"""
+
+import pytest
+import numpy as np
+import asyncio
+import soundfile as sf
+import time
+import os
+import sys
+from queue import Empty
+
+# Add src to path for imports
+src_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../src'))
+sys.path.insert(0, src_path)
+
+from realtime.audio_input import RealtimeAudioInput
+from realtime.sources import VirtualSource, ArraySource, FileSource, GeneratorSource
+from realtime.analyzer import RealtimeAnalyzer
+
+
+@pytest.fixture
+def sample_rate():
+    """Standard sample rate for testing."""
+    return 44100
+
+
+@pytest.fixture
+def ramp(sample_rate):
+    """One second of a ramp, so every block is distinguishable."""
+    return np.linspace(-1, 1, sample_rate, dtype=np.float32)
+
+
+def drain(audio_input: RealtimeAudioInput) -> np.ndarray:
+    """Collect blocks until the source has finished and the ring is empty."""
+    blocks = []
+    while not audio_input.exhausted:
+        try:
+            blocks.append(audio_input.get_block(timeout=0.01).copy())
+        except Empty:
+            continue
+    return np.concatenate(blocks) if blocks else np.zeros((0, audio_input.channels))
+
+
+class TestArraySource:
+    """Test array-backed playback."""
+
+    def test_lossless_unpaced(self, sample_rate, ramp):
+        """Unpaced playback delivers every sample, in order, zero-padded."""
+        source = ArraySource(ramp, sample_rate, speed=None)
+        with RealtimeAudioInput(sample_rate=sample_rate, block_size=512, source=source) as audio_input:
+            audio = drain(audio_input)
+            stats = audio_input.get_stats()
+
+        n_blocks = -(-len(ramp) // 512)
+        assert audio.shape == (n_blocks * 512, 1)
+        np.testing.assert_array_equal(audio[:len(ramp), 0], ramp)
+        assert np.all(audio[len(ramp):] == 0)
+        assert stats['blocks_dropped'] == 0
+        assert stats['source']['blocks_delivered'] == n_blocks
+
+    def test_paced(self, sample_rate, ramp):
+        """Paced playback takes the audio duration divided by the speed."""
+        source = ArraySource(ramp[:sample_rate // 2], sample_rate, speed=10.0)
+
+        start = time.perf_counter()
+        with RealtimeAudioInput(sample_rate=sample_rate, source=source) as audio_input:
+            drain(audio_input)
+        elapsed = time.perf_counter() - start
+
+        assert 0.04 < elapsed < 0.5
+
+    def test_paced_drops_when_not_consumed(self, sample_rate, ramp):
+        """A paced source drops blocks like a device when nobody reads."""
+        source = ArraySource(ramp, sample_rate, speed=100.0)
+        with RealtimeAudioInput(sample_rate=sample_rate, queue_size=4, source=source) as audio_input:
+            assert source.wait(timeout=2.0)
+            stats = audio_input.get_stats()
+
+        assert stats['blocks_captured'] == 4
+        assert stats['blocks_dropped'] == source.blocks_delivered - 4
+
+    def test_mono_to_multichannel(self, sample_rate, ramp):
+        """A mono signal is copied to every channel."""
+        source = ArraySource(ramp, sample_rate, speed=None)
+        with RealtimeAudioInput(sample_rate=sample_rate, channels=2, source=source) as audio_input:
+            audio = drain(audio_input)
+
+        np.testing.assert_array_equal(audio[:len(ramp), 0], ramp)
+        np.testing.assert_array_equal(audio[:, 0], audio[:, 1])
+
+    def test_sample_rate_mismatch(self, ramp):
+        """A signal at another rate is rejected on start."""
+        source = ArraySource(ramp, 48000)
+        audio_input = RealtimeAudioInput(sample_rate=44100, source=source)
+
+        with pytest.raises(ValueError):
+            audio_input.start()
+        assert not audio_input.is_running
+
+    def test_loop_and_stop(self, sample_rate, ramp):
+        """A looping source runs until stopped."""
+        source = ArraySource(ramp[:1024], sample_rate, speed=None, loop=True)
+        with RealtimeAudioInput(sample_rate=sample_rate, source=source) as audio_input:
+            for _ in range(20):
+                audio_input.get_block(timeout=1.0)
+
+        assert source.blocks_delivered >= 20
+        assert not source.is_active
+
+
+class TestFileSource:
+    """Test file playback."""
+
+    def test_resample_and_downmix(self, tmp_path, sample_rate):
+        """A stereo 22.05 kHz file is resampled and downmixed for a mono input."""
+        path = tmp_path / 'take.wav'
+        t = np.arange(22050) / 22050
+        stereo = np.stack([np.sin(2 * np.pi * 220 * t), np.sin(2 * np.pi * 220 * t)], axis=1)
+        sf.write(path, 0.5 * stereo, 22050)
+
+        source = FileSource(str(path), speed=None)
+        with RealtimeAudioInput(sample_rate=sample_rate, source=source) as audio_input:
+            audio = drain(audio_input)
+
+        assert audio.shape[1] == 1
+        assert abs(len(audio) - sample_rate) < 1024
+        assert np.max(np.abs(audio)) == pytest.approx(0.5, abs=0.05)
+
+
+class TestGeneratorSource:
+    """Test generator playback."""
+
+    def test_blocks_in_order(self, sample_rate):
+        """Generated blocks arrive unchanged."""
+        blocks = (np.full(512, i, dtype=np.float32) for i in range(10))
+        source = GeneratorSource(blocks, speed=None)
+        with RealtimeAudioInput(sample_rate=sample_rate, source=source) as audio_input:
+            audio = drain(audio_input)
+
+        assert audio.shape == (5120, 1)
+        assert [audio[i * 512, 0] for i in range(10)] == list(range(10))
+
+    def test_bad_block_reported(self, sample_rate):
+        """A wrongly shaped block stops the source with an error."""
+        source = GeneratorSource([np.zeros(100)], speed=None)
+        with RealtimeAudioInput(sample_rate=sample_rate, source=source) as audio_input:
+            assert source.wait(timeout=1.0)
+
+        assert 'shape' in source.get_stats()['last_error']
+
+
+class TestVirtualSource:
+    """Test the source base class."""
+
+    def test_blocks_required(self):
+        """A source without ``_blocks`` fails when constructed, not mid-stream."""
+        class Incomplete(VirtualSource):
+            pass
+
+        with pytest.raises(TypeError):
+            VirtualSource()
+        with pytest.raises(TypeError):
+            Incomplete(speed=None)
+
+
+class TestAsyncDelivery:
+    """Test ``async for block in audio_input.blocks()``."""
+
+    @pytest.mark.asyncio
+    async def test_blocks_lossless(self, sample_rate, ramp):
+        """Async iteration delivers every block and ends with the source."""
+        source = ArraySource(ramp, sample_rate, speed=None)
+        with RealtimeAudioInput(sample_rate=sample_rate, source=source) as audio_input:
+            audio = np.concatenate([block.copy() async for block in audio_input.blocks()])
+
+        np.testing.assert_array_equal(audio[:len(ramp), 0], ramp)
+
+    @pytest.mark.asyncio
+    async def test_blocks_ends_on_stop(self, sample_rate, ramp):
+        """Stopping the input ends the iteration of an endless source."""
+        source = ArraySource(ramp, sample_rate, loop=True)
+        audio_input = RealtimeAudioInput(sample_rate=sample_rate, source=source)
+        audio_input.start()
+
+        async def stop_later():
+            await asyncio.sleep(0.05)
+            audio_input.stop()
+
+        stopper = asyncio.create_task(stop_later())
+        n_blocks = 0
+        async for block in audio_input.blocks(poll_interval=0.01):
+            n_blocks += 1
+        await stopper
+
+        assert n_blocks > 0
+        assert not audio_input.is_running
+
+    @pytest.mark.asyncio
+    async def test_inputs_share_event_loop(self, sample_rate, ramp):
+        """Several live-paced inputs on one loop never stall each other."""
+        gaps = []
+
+        async def ticker(stop: asyncio.Event):
+            last = time.perf_counter()
+            while not stop.is_set():
+                await asyncio.sleep(0.001)
+                now = time.perf_counter()
+                gaps.append(now - last)
+                last = now
+
+        async def consume(audio_input: RealtimeAudioInput) -> int:
+            n = 0
+            async for block in audio_input.blocks():
+                n += 1
+            return n
+
+        sources = [ArraySource(ramp[:sample_rate // 4], sample_rate) for _ in range(4)]
+        inputs = [RealtimeAudioInput(sample_rate=sample_rate, source=source) for source in sources]
+        for audio_input in inputs:
+            audio_input.start()
+
+        stop = asyncio.Event()
+        tick_task = asyncio.create_task(ticker(stop))
+        counts = await asyncio.gather(*(consume(audio_input) for audio_input in inputs))
+        stop.set()
+        await tick_task
+        for audio_input in inputs:
+            audio_input.stop()
+
+        assert counts == [source.blocks_delivered for source in sources]
+        # A blocking get_block(timeout=0.1) would stall the loop for tens of ms
+        assert max(gaps) < 0.02
+
+
+class TestPerformance:
+    """Headless throughput."""
+
+    def test_analysis_faster_than_realtime(self, sample_rate):
+        """The input -> analyzer chain runs well above real time without hardware."""
+        duration = 2.0
+        t = np.arange(int(sample_rate * duration)) / sample_rate
+        audio = (0.3 * np.sin(2 * np.pi * 220 * t)).astype(np.float32)
+
+        analyzer = RealtimeAnalyzer(sample_rate=sample_rate)
+        source = ArraySource(audio, sample_rate, speed=None)
+
+        start = time.perf_counter()
+        n_blocks = 0
+        with RealtimeAudioInput(sample_rate=sample_rate, source=source) as audio_input:
+            while not audio_input.exhausted:
+                try:
+                    block = audio_input.get_block(timeout=0.01)
+                except Empty:
+                    continue
+                analyzer.process_block(block[:, 0])
+                n_blocks += 1
+        elapsed = time.perf_counter() - start
+
+        speedup = duration / elapsed
+        print(f"Headless input -> analyzer: {speedup:.0f}x real time")
+        assert n_blocks == source.blocks_delivered
+        assert speedup > 5
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "-s"])
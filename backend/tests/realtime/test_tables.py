@@ -0,0 +1,89 @@
+"""
+Unit tests for the shared DSP table cache.
+"""
+
+import pytest
+import numpy as np
+import librosa
+import time
+import os
+import sys
+
+# Add src to path for imports
+src_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../src'))
+sys.path.insert(0, src_path)
+
+from realtime import tables
+from realtime.analyzer import RealtimeAnalyzer
+from realtime.multichannel import MultiChannelAnalyzer
+
+
+class TestTableCache:
+    """Test table construction and sharing."""
+
+    def test_shared_between_analyzers(self):
+        """All analyzers at one sample rate share the same table objects."""
+        a = RealtimeAnalyzer(sample_rate=44100)
+        b = RealtimeAnalyzer(sample_rate=44100)
+        multi = MultiChannelAnalyzer(2, sample_rate=44100)
+
+        assert a.onset_detector.mel_basis is b.onset_detector.mel_basis
+        assert a.onset_detector.mel_basis is multi.onset_detector.mel_basis
+        assert a.onset_detector.window is b.beat_onset_detector.window
+        assert a.pitch_tracker._log_band is b.pitch_tracker._log_band
+        assert a.pitch_tracker.freqs is multi.pitch_tracker.freqs
+
+    def test_keyed_by_sample_rate(self):
+        """Different sample rates get their own tables."""
+        a = RealtimeAnalyzer(sample_rate=44100)
+        b = RealtimeAnalyzer(sample_rate=48000)
+
+        assert a.onset_detector.mel_basis is not b.onset_detector.mel_basis
+        assert a.pitch_tracker.min_period != b.pitch_tracker.min_period
+
+    def test_read_only(self):
+        """Shared tables cannot be modified through one analyzer."""
+        analyzer = RealtimeAnalyzer(sample_rate=44100)
+        with pytest.raises(ValueError):
+            analyzer.onset_detector.mel_basis[0, 0] = 1.0
+        with pytest.raises(ValueError):
+            analyzer.pitch_tracker.freqs[0] = 1.0
+
+    def test_matches_librosa(self):
+        """Cached tables equal the librosa builds they replace."""
+        np.testing.assert_array_equal(
+            tables.hann_window(2048), librosa.filters.get_window('hann', 2048, fftbins=True)
+        )
+        np.testing.assert_array_equal(
+            tables.mel_filterbank(44100, 2048, 128), librosa.filters.mel(sr=44100, n_fft=2048, n_mels=128)
+        )
+        assert tables.note_hz('C2') == pytest.approx(librosa.note_to_hz('C2'))
+
+    def test_clear(self):
+        """clear() forces a rebuild."""
+        window = tables.hann_window(1024)
+        tables.clear()
+        rebuilt = tables.hann_window(1024)
+
+        assert rebuilt is not window
+        np.testing.assert_array_equal(rebuilt, window)
+
+
+class TestPerformance:
+    """Construction cost with warm tables."""
+
+    def test_construction_is_cheap(self):
+        """After preload, a new analyzer costs well under a millisecond."""
+        tables.preload(44100)
+
+        start = time.perf_counter()
+        for _ in range(20):
+            RealtimeAnalyzer(sample_rate=44100)
+        avg_ms = (time.perf_counter() - start) / 20 * 1000
+
+        print(f"RealtimeAnalyzer construction: {avg_ms:.3f}ms")
+        assert avg_ms < 1.0
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "-s"])
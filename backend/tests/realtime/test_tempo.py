@@ -0,0 +1,114 @@
+"""
+Unit tests for the online tempo estimator.
+"""
+
+import pytest
+import numpy as np
+import time
+import os
+import sys
+
+# Add src to path for imports
+src_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../src'))
+sys.path.insert(0, src_path)
+
+from realtime.onset import SpectralFluxOnsetDetector
+from realtime.tempo import OnlineTempoEstimator
+
+
+SAMPLE_RATE = 44100
+FRAME_LENGTH = 2048
+HOP_LENGTH = 512
+
+
+@pytest.fixture
+def estimator():
+    """Create estimator instance with the analyzer's configuration."""
+    return OnlineTempoEstimator(sample_rate=SAMPLE_RATE, hop_length=HOP_LENGTH)
+
+
+def generate_metronome(tempo_bpm: float, duration: float):
+    """Generate a metronome click track at the given tempo."""
+    audio = np.zeros(int(SAMPLE_RATE * duration), dtype=np.float32)
+    for beat_time in np.arange(0.0, duration, 60.0 / tempo_bpm):
+        idx = int(beat_time * SAMPLE_RATE)
+        if idx < len(audio) - 100:
+            t = np.linspace(0, 0.01, 100)
+            audio[idx:idx + 100] += np.sin(2 * np.pi * 1000 * t) * np.exp(-t * 200)
+    return audio
+
+
+def onset_strengths(audio):
+    """Per-hop onset strength of the audio, as the analyzer computes it."""
+    detector = SpectralFluxOnsetDetector(sample_rate=SAMPLE_RATE, n_fft=FRAME_LENGTH)
+    frame = np.zeros(FRAME_LENGTH, dtype=np.float32)
+    strengths = []
+    for i in range(0, len(audio) - HOP_LENGTH, HOP_LENGTH):
+        frame = np.concatenate([frame[HOP_LENGTH:], audio[i:i + HOP_LENGTH]])
+        strengths.append(detector.process_frame(frame)[1])
+    return strengths
+
+
+class TestTempoEstimation:
+    """Test estimation accuracy."""
+
+    @pytest.mark.parametrize("tempo_bpm", [60.0, 90.0, 120.0, 140.0, 180.0])
+    def test_metronome(self, estimator, tempo_bpm):
+        """Click tracks are estimated within 2 BPM (prior centered on 120)."""
+        for strength in onset_strengths(generate_metronome(tempo_bpm, duration=6.0)):
+            estimator.update(strength)
+
+        estimated = estimator.estimate(start_bpm=120.0)
+        print(f"{tempo_bpm:.0f} BPM: estimated {estimated:.1f} BPM")
+        assert abs(estimated - tempo_bpm) < 2.0
+
+    def test_needs_minimum_duration(self, estimator):
+        """No estimate before min_duration of envelope has been seen."""
+        strengths = onset_strengths(generate_metronome(120.0, duration=3.0))
+        for strength in strengths[:estimator.min_frames - 1]:
+            estimator.update(strength)
+        assert estimator.estimate() is None
+
+        for strength in strengths[estimator.min_frames - 1:]:
+            estimator.update(strength)
+        assert estimator.estimate() is not None
+
+    def test_silence(self, estimator):
+        """A flat envelope has no periodicity."""
+        for _ in range(3 * estimator.min_frames):
+            estimator.update(0.0)
+        assert estimator.estimate() is None
+
+    def test_reset(self, estimator):
+        """reset() clears the autocorrelation."""
+        for strength in onset_strengths(generate_metronome(120.0, duration=2.0)):
+            estimator.update(strength)
+        estimator.reset()
+
+        assert estimator.frames_processed == 0
+        assert not estimator.autocorrelation.any()
+        assert estimator.estimate() is None
+
+
+class TestPerformance:
+    """Per-block cost."""
+
+    def test_bounded_update_cost(self, estimator):
+        """Update plus estimate stays far below the block budget on every block."""
+        strengths = onset_strengths(generate_metronome(120.0, duration=8.0))
+
+        latencies = []
+        for strength in strengths:
+            start = time.perf_counter()
+            estimator.update(strength)
+            estimator.estimate()
+            latencies.append((time.perf_counter() - start) * 1000)
+
+        p99 = np.percentile(latencies, 99)
+        print(f"Tempo update latency: avg={np.mean(latencies):.3f}ms, p99={p99:.3f}ms")
+
+        assert p99 < 0.5
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "-s"])
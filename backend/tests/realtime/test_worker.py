@@ -0,0 +1,168 @@
+"""
+Unit tests for the background analysis worker and latest-value slot.
+"""
+
+import pytest
+import numpy as np
+import time
+import os
+import sys
+
+# Add src to path for imports
+src_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../src'))
+sys.path.insert(0, src_path)
+
+from realtime.analyzer import RealtimeAnalyzer
+from realtime.frame import AnalysisFrame
+from realtime.pitch import StreamingPitchTracker
+from realtime.worker import LatestValue, BackgroundAnalysisWorker, PitchResult
+
+
+SAMPLE_RATE = 44100
+FRAME_LENGTH = 2048
+HOP_LENGTH = 512
+
+
+def wait_for(condition, timeout: float = 2.0) -> bool:
+    """Poll until condition() is true or the timeout expires."""
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if condition():
+            return True
+        time.sleep(0.001)
+    return condition()
+
+
+@pytest.fixture
+def worker():
+    """Running worker with the analyzer's pitch configuration."""
+    tracker = StreamingPitchTracker(
+        sample_rate=SAMPLE_RATE, fmin=65.0, fmax=2093.0,
+        frame_length=FRAME_LENGTH, hop_length=HOP_LENGTH
+    )
+    worker = BackgroundAnalysisWorker(tracker)
+    worker.start()
+    yield worker
+    worker.stop()
+
+
+def sine_frame(freq: float = 440.0, index: int = 0) -> AnalysisFrame:
+    """Analysis frame of a sine wave."""
+    t = np.arange(FRAME_LENGTH) / SAMPLE_RATE
+    frame = AnalysisFrame(FRAME_LENGTH)
+    frame.index = index - 1
+    return frame.update(0.5 * np.sin(2 * np.pi * freq * t))
+
+
+class TestLatestValue:
+    """Test the latest-value slot."""
+
+    def test_initial_value(self):
+        """Before any publish the initial value is returned at version 0."""
+        slot = LatestValue(initial='empty')
+        assert slot.get() == 'empty'
+        assert slot.get_versioned() == (0, 'empty')
+
+    def test_latest_wins(self):
+        """Only the most recent value is kept; the version counts publishes."""
+        slot = LatestValue()
+        for value in range(5):
+            slot.publish(value)
+
+        assert slot.get() == 4
+        assert slot.version == 5
+
+
+class TestBackgroundWorker:
+    """Test the worker thread."""
+
+    def test_publishes_pitch(self, worker):
+        """A submitted frame produces a PitchResult for that frame."""
+        worker.submit(sine_frame(index=7), time=1.5)
+
+        assert wait_for(lambda: worker.pitch.get() is not None)
+        result = worker.pitch.get()
+        assert isinstance(result, PitchResult)
+        assert result.frame_index == 7
+        assert result.time == 1.5
+
+    def test_submit_copies_frame(self, worker):
+        """The caller may overwrite its frame right after submitting."""
+        frame = sine_frame(index=0)
+        worker.submit(frame, time=0.0)
+        frame.update(np.zeros(FRAME_LENGTH))
+
+        _, job = worker.frames.get_versioned()
+        assert np.abs(job[2]).max() > 0.4
+
+    def test_skips_to_latest_frame(self, worker):
+        """A burst of frames is not queued: the newest one is analyzed."""
+        for index in range(50):
+            worker.submit(sine_frame(index=index), time=index * HOP_LENGTH / SAMPLE_RATE)
+
+        assert wait_for(lambda: worker.pitch.get() is not None and worker.pitch.get().frame_index == 49)
+        stats = worker.get_stats()
+        assert stats['frames_submitted'] == 50
+        assert stats['frames_analyzed'] + stats['frames_skipped'] == 50
+
+    def test_errors_logged_and_counted(self, worker, caplog):
+        """A frame the tracker fails on is logged and counted; the worker keeps going."""
+        def fail(samples, spectrum):
+            raise ValueError("bad frame")
+        worker.pitch_tracker.process_frame = fail
+
+        worker.submit(sine_frame(index=3), time=0.0)
+        assert wait_for(lambda: worker.errors == 1)
+
+        assert worker.is_running
+        assert worker.get_stats()['errors'] == 1
+        assert worker.frames_analyzed == 0
+        assert "frame 3: bad frame" in caplog.text
+
+    def test_stop(self, worker):
+        """stop() joins the thread."""
+        worker.stop()
+        assert not worker.is_running
+        assert worker._thread is None
+
+
+class TestOffloadedAnalyzer:
+    """Test RealtimeAnalyzer with offloading enabled."""
+
+    def test_pitch_from_worker(self):
+        """Pitch still arrives (from the worker) and onsets are unchanged."""
+        t = np.arange(SAMPLE_RATE) / SAMPLE_RATE
+        audio = (0.5 * np.sin(2 * np.pi * 440.0 * t)).astype(np.float32)
+
+        inline = RealtimeAnalyzer(sample_rate=SAMPLE_RATE)
+        with RealtimeAnalyzer(sample_rate=SAMPLE_RATE, offload=True) as offloaded:
+            pitches = []
+            for i in range(0, len(audio) - HOP_LENGTH, HOP_LENGTH):
+                block = audio[i:i + HOP_LENGTH]
+                result = offloaded.process_block(block)
+                assert result.onset == inline.process_block(block).onset
+                if result.pitch is not None:
+                    pitches.append(result.pitch)
+                wait_for(lambda: offloaded.worker.frames_analyzed + offloaded.worker.frames_skipped
+                         == offloaded.worker.frames_submitted)
+
+            assert 'worker' in offloaded.get_performance_stats()
+
+        assert not offloaded.worker.is_running
+        assert len(pitches) > 0
+        assert abs(np.median(pitches) - 440.0) < 2.0
+
+    def test_worker_has_own_tracker(self):
+        """The worker's tracker is not the one analyze_pitch() drives on the caller thread."""
+        with RealtimeAnalyzer(sample_rate=SAMPLE_RATE, offload=True) as offloaded:
+            assert offloaded.worker.pitch_tracker is not offloaded.pitch_tracker
+
+            t = np.arange(FRAME_LENGTH) / SAMPLE_RATE
+            block = (0.5 * np.sin(2 * np.pi * 440.0 * t)).astype(np.float32)
+            offloaded.analyze_pitch(block)
+            assert offloaded.pitch_tracker.frames_processed == 1
+            assert offloaded.worker.pitch_tracker.frames_processed == 0
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "-s"])
@@ -0,0 +1,46 @@
+"""
+Shared Song Maps and performances for the position tracker tests.
+"""
+
+import numpy as np
+from typing import List, Optional
+
+from realtime.position_tracker import SongMapPositionTracker
+from realtime.replay import PerformanceScenario, SynthesizedPerformance, synthesize_performance
+
+
+def make_song_map(n_sections: int = 12, seed: int = 0) -> dict:
+    """Four-line sections of syllables 0.15-0.5s apart, chords cycling C-Am-F-G."""
+    rng = np.random.default_rng(seed)
+    song_time = 1.0
+    chords = ['C', 'Am', 'F', 'G']
+    sections = []
+    for s in range(n_sections):
+        lines = []
+        for l in range(4):
+            syllables = []
+            for k in range(rng.integers(4, 9)):
+                syllables.append({
+                    'text': f'{s}.{l}.{k}',
+                    'startTime': round(song_time, 3),
+                    'duration': 0.2,
+                    'chord': chords[l]
+                })
+                song_time += rng.choice([0.15, 0.25, 0.35, 0.5])
+            song_time += 0.6
+            lines.append({'syllables': syllables})
+        sections.append({'name': f'Section {s}', 'lines': lines})
+    return {'sections': sections}
+
+
+def section_starts(tracker: SongMapPositionTracker) -> list:
+    """First onset index of every section, plus the onset count."""
+    n_sections = int(tracker.onsets['section'].max()) + 1
+    return [int(np.argmax(tracker.onsets['section'] == s)) for s in range(n_sections)] + [len(tracker.onsets)]
+
+
+def perform(tracker: SongMapPositionTracker, section_order: Optional[List[int]] = None, tempo: float = 1.0,
+            seed: int = 0) -> SynthesizedPerformance:
+    """Performance of the sections in ``section_order`` (a 0.5s pause at each jump), 15ms jitter."""
+    scenario = PerformanceScenario(tempo=tempo, jitter=0.015, section_order=section_order, seed=seed)
+    return synthesize_performance(tracker, scenario)